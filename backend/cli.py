@@ -26,6 +26,13 @@ set-tenant-key-expiry
 
 set-tenant-key-external-user-id
     Assign or clear external_user_id on a key.
+
+dlq-list
+    Page through the ingestion dead-letter queue (Redis backend only).
+
+dlq-replay
+    Re-enqueue dead-letter entries by id, or every replayable entry with
+    --all, from their stored upload files (Redis backend only).
 """
 
 from __future__ import annotations
@@ -194,6 +201,74 @@ async def cmd_set_tenant_key_external_user_id(
         print(f"No matching key found for tenant '{tenant_id}'.")
 
 
+def _redis_ingestion_queue():
+    from core.config import config
+
+    if config.QUEUE_BACKEND != "redis":
+        print(
+            "Error: DLQ commands need QUEUE_BACKEND=redis. The in-memory DLQ "
+            "lives inside the API process; use GET /queue/dlq instead."
+        )
+        sys.exit(1)
+    from services.queue_redis import RedisIngestionQueue
+
+    return RedisIngestionQueue()
+
+
+def cmd_dlq_list(tenant_id: str | None, cursor: str | None, limit: int) -> None:
+    queue = _redis_ingestion_queue()
+    try:
+        page = queue.dlq_page(cursor=cursor, limit=limit, tenant_id=tenant_id)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+    if not page.entries:
+        print("Dead-letter queue is empty.")
+        return
+
+    print()
+    print(
+        f"{'Entry ID':<18} {'Document':<38} {'Tenant':<16} "
+        f"{'Try':<4} {'Replay':<7} Error"
+    )
+    print("-" * 110)
+    for entry in page.entries:
+        replay = "yes" if entry.payload_path else "no"
+        print(
+            f"{entry.entry_id:<18} {entry.doc_id:<38} {entry.tenant_id or '-':<16} "
+            f"{entry.attempt:<4} {replay:<7} {entry.error[:60]}"
+        )
+    print()
+    if page.next_cursor:
+        print(f"More entries: --cursor {page.next_cursor}")
+        print()
+
+
+async def cmd_dlq_replay(
+    entry_ids: list[str],
+    tenant_id: str | None,
+    replay_all: bool,
+) -> None:
+    queue = _redis_ingestion_queue()
+
+    if replay_all:
+        entry_ids = [
+            entry.entry_id
+            for entry in queue.dlq_jobs()
+            if entry.payload_path and (tenant_id is None or entry.tenant_id == tenant_id)
+        ]
+    if not entry_ids:
+        print("Nothing to replay.")
+        return
+
+    replayed = await queue.replay_dlq(entry_ids, tenant_id=tenant_id)
+    for entry in replayed:
+        print(f"Replayed {entry.entry_id} -> document {entry.doc_id}")
+    skipped = len(entry_ids) - len(replayed)
+    print(f"Replayed {len(replayed)} entries ({skipped} skipped).")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog="backend.cli",
@@ -277,6 +352,39 @@ def main() -> None:
         help="Developer-side user identifier, or 'clear' to remove",
     )
 
+    dlq_list_parser = subparsers.add_parser(
+        "dlq-list",
+        help="List ingestion dead-letter entries (Redis backend)",
+    )
+    dlq_list_parser.add_argument("--tenant-id", metavar="ID", default=None)
+    dlq_list_parser.add_argument(
+        "--cursor",
+        metavar="ENTRY_ID",
+        default=None,
+        help="Continue after this entry id (printed at the end of a page)",
+    )
+    dlq_list_parser.add_argument("--limit", type=int, default=50)
+
+    dlq_replay_parser = subparsers.add_parser(
+        "dlq-replay",
+        help="Re-enqueue ingestion dead-letter entries (Redis backend)",
+    )
+    dlq_replay_parser.add_argument(
+        "--entry-id",
+        dest="entry_ids",
+        action="append",
+        default=[],
+        metavar="ENTRY_ID",
+        help="Entry to replay; repeat for several",
+    )
+    dlq_replay_parser.add_argument(
+        "--all",
+        dest="replay_all",
+        action="store_true",
+        help="Replay every replayable entry (optionally for --tenant-id only)",
+    )
+    dlq_replay_parser.add_argument("--tenant-id", metavar="ID", default=None)
+
     args = parser.parse_args()
 
     if args.command == "create-tenant-key":
@@ -318,6 +426,15 @@ def main() -> None:
                 external_user_id,
             )
         )
+    elif args.command == "dlq-list":
+        cmd_dlq_list(args.tenant_id, args.cursor, max(1, args.limit))
+    elif args.command == "dlq-replay":
+        if not args.entry_ids and not args.replay_all:
+            print("Error: must provide --entry-id or --all")
+            sys.exit(1)
+        asyncio.run(
+            cmd_dlq_replay(args.entry_ids, args.tenant_id, args.replay_all)
+        )
     else:
         parser.print_help()
         sys.exit(1)
@@ -39,6 +39,8 @@ VALID_CHUNKING_STRATEGIES = {"fixed", "paragraph", "semantic"}
 VALID_QUERY_TRANSFORMATION_STRATEGIES = {"rewrite", "expand", "stepback"}
 VALID_LLM_PROVIDERS = set(LLM_PROVIDER_NAMES)
 VALID_EMBEDDING_PROVIDERS = set(EMBEDDING_PROVIDER_NAMES)
+# Ingestion priority classes, served strictly in this order.
+QUEUE_PRIORITY_CLASSES = ("high", "normal", "low")
 
 
 def _get_chunking_strategy() -> str:
@@ -73,6 +75,63 @@ def _get_llm_provider() -> str:
     return provider
 
 
+def _get_embedding_rps_by_provider() -> dict[str, float]:
+    """Parse ``QUEUE_EMBEDDING_RPS_BY_PROVIDER`` (e.g. ``openai=10,gemini=2``)."""
+    overrides: dict[str, float] = {}
+    raw = os.getenv("QUEUE_EMBEDDING_RPS_BY_PROVIDER", "")
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in VALID_EMBEDDING_PROVIDERS:
+            raise ValueError(
+                f"Invalid QUEUE_EMBEDDING_RPS_BY_PROVIDER entry {item.strip()!r}. "
+                f"Expected provider=rps with provider one of: "
+                f"{', '.join(sorted(VALID_EMBEDDING_PROVIDERS))}."
+            )
+        overrides[name] = max(0.1, float(value))
+    return overrides
+
+
+def _get_tenant_weights() -> dict[str, int]:
+    """Parse ``QUEUE_TENANT_WEIGHTS`` (e.g. ``acme=4,trial=1``)."""
+    weights: dict[str, int] = {}
+    raw = os.getenv("QUEUE_TENANT_WEIGHTS", "")
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        tenant, sep, value = item.partition("=")
+        tenant = tenant.strip()
+        if not sep or not tenant or not value.strip().isdigit():
+            raise ValueError(
+                f"Invalid QUEUE_TENANT_WEIGHTS entry {item.strip()!r}. "
+                f"Expected tenant_id=weight with a positive integer weight."
+            )
+        weights[tenant] = max(1, int(value))
+    return weights
+
+
+def _get_tenant_priorities() -> dict[str, str]:
+    """Parse ``QUEUE_TENANT_PRIORITIES`` (e.g. ``acme=high,backfill=low``)."""
+    priorities: dict[str, str] = {}
+    raw = os.getenv("QUEUE_TENANT_PRIORITIES", "")
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        tenant, sep, value = item.partition("=")
+        tenant = tenant.strip()
+        value = value.strip().lower()
+        if not sep or not tenant or value not in QUEUE_PRIORITY_CLASSES:
+            raise ValueError(
+                f"Invalid QUEUE_TENANT_PRIORITIES entry {item.strip()!r}. "
+                f"Expected tenant_id=class with class one of: "
+                f"{', '.join(QUEUE_PRIORITY_CLASSES)}."
+            )
+        priorities[tenant] = value
+    return priorities
+
+
 def _get_embedding_provider() -> str:
     provider = os.getenv("EMBEDDING_PROVIDER", "gemini").strip().lower()
     if provider not in VALID_EMBEDDING_PROVIDERS:
@@ -83,6 +142,27 @@ def _get_embedding_provider() -> str:
     return provider
 
 
+def _get_provider_chain(env_var: str, valid: set[str]) -> list[tuple[str, str | None]]:
+    """Parse a fallback chain (e.g. ``anthropic,ollama:llama3.1``) into (provider, model) pairs.
+
+    The model is optional; Ollama tags keep their colon (``ollama:llama3:8b``).
+    """
+    chain: list[tuple[str, str | None]] = []
+    raw = os.getenv(env_var, "")
+    for item in raw.split(","):
+        if not item.strip():
+            continue
+        name, _, model = item.strip().partition(":")
+        name = name.strip().lower()
+        if name not in valid:
+            raise ValueError(
+                f"Invalid {env_var} entry {item.strip()!r}. "
+                f"Expected provider[:model] with provider one of: {', '.join(sorted(valid))}."
+            )
+        chain.append((name, model.strip() or None))
+    return chain
+
+
 VALID_PERSONAS = {"default", "concise", "conversational", "academic", "technical"}
 
 
@@ -121,6 +201,18 @@ class Settings:
     LLM_MODEL: str | None = os.getenv("LLM_MODEL") or None
     EMBEDDING_PROVIDER: str = _get_embedding_provider()
     EMBEDDING_MODEL: str | None = os.getenv("EMBEDDING_MODEL") or None
+    # Ordered failover providers tried after the primary (provider[:model],...).
+    LLM_FALLBACK_PROVIDERS: list[tuple[str, str | None]] = _get_provider_chain(
+        "LLM_FALLBACK_PROVIDERS", VALID_LLM_PROVIDERS
+    )
+    EMBEDDING_FALLBACK_PROVIDERS: list[tuple[str, str | None]] = _get_provider_chain(
+        "EMBEDDING_FALLBACK_PROVIDERS", VALID_EMBEDDING_PROVIDERS
+    )
+    # Embedding fallbacks with another model than the primary are rejected
+    # unless this opts in to serving query embeds from them.
+    EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS: bool = os.getenv(
+        "EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS", "false"
+    ).lower() in ("1", "true", "yes")
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY") or None
     OPENAI_BASE_URL: str | None = os.getenv("OPENAI_BASE_URL") or None
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -139,6 +231,7 @@ class Settings:
 
     MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
     MAX_UPLOAD_SIZE_BYTES: int = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    UPLOAD_BATCH_MAX_FILES: int = max(1, int(os.getenv("UPLOAD_BATCH_MAX_FILES", "50")))
     CHUNK_SIZE: int = max(1, int(os.getenv("CHUNK_SIZE", "1000")))
     CHUNK_OVERLAP: int = max(0, int(os.getenv("CHUNK_OVERLAP", "200")))
     CHUNKING_STRATEGY: str = _get_chunking_strategy()
@@ -146,6 +239,19 @@ class Settings:
         "QUERY_TRANSFORMATION_ENABLED", "false"
     ).lower() in ("1", "true", "yes")
     QUERY_TRANSFORMATION_STRATEGY: str = _get_query_transformation_strategy()
+    QUERY_TRANSFORM_CACHE_SIZE: int = max(0, int(os.getenv("QUERY_TRANSFORM_CACHE_SIZE", "1024")))
+    QUERY_TRANSFORM_CACHE_TTL_SECONDS: int = max(
+        1, int(os.getenv("QUERY_TRANSFORM_CACHE_TTL_SECONDS", "3600"))
+    )
+    QUERY_TRANSFORM_CACHE_REDIS_ENABLED: bool = os.getenv(
+        "QUERY_TRANSFORM_CACHE_REDIS_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    QUERY_SPECULATIVE_RETRIEVAL_ENABLED: bool = os.getenv(
+        "QUERY_SPECULATIVE_RETRIEVAL_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    QUERY_SPECULATIVE_SIMILARITY_THRESHOLD: float = min(
+        1.0, max(0.0, float(os.getenv("QUERY_SPECULATIVE_SIMILARITY_THRESHOLD", "0.9")))
+    )
     RETRIEVAL_MAX_CONCURRENCY: int = max(1, int(os.getenv("RETRIEVAL_MAX_CONCURRENCY", "8")))
     ENABLE_RERANKING: bool = os.getenv("ENABLE_RERANKING", "false").lower() in (
         "1",
@@ -161,8 +267,45 @@ class Settings:
     CHAT_BATCH_LLM_CONCURRENCY: int = max(
         1, int(os.getenv("CHAT_BATCH_LLM_CONCURRENCY", "4"))
     )
+    CHAT_SINGLEFLIGHT_ENABLED: bool = os.getenv(
+        "CHAT_SINGLEFLIGHT_ENABLED", "true"
+    ).lower() in ("1", "true", "yes")
+    CHAT_SINGLEFLIGHT_REDIS_ENABLED: bool = os.getenv(
+        "CHAT_SINGLEFLIGHT_REDIS_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    CHAT_SINGLEFLIGHT_REDIS_WAIT_SECONDS: float = max(
+        1.0, float(os.getenv("CHAT_SINGLEFLIGHT_REDIS_WAIT_SECONDS", "60"))
+    )
+    CHAT_TURN_WRITE_BEHIND_ENABLED: bool = os.getenv(
+        "CHAT_TURN_WRITE_BEHIND_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    CHAT_TURN_WRITE_BEHIND_INTERVAL_MS: int = max(
+        1, int(os.getenv("CHAT_TURN_WRITE_BEHIND_INTERVAL_MS", "50"))
+    )
+    CHAT_TURN_WRITE_BEHIND_BATCH_SIZE: int = max(
+        1, int(os.getenv("CHAT_TURN_WRITE_BEHIND_BATCH_SIZE", "200"))
+    )
+    CHAT_TURN_WRITE_BEHIND_MAX_PENDING: int = max(
+        1, int(os.getenv("CHAT_TURN_WRITE_BEHIND_MAX_PENDING", "5000"))
+    )
+    CHAT_TURN_WRITE_BEHIND_SHUTDOWN_TIMEOUT_SECONDS: float = max(
+        0.1, float(os.getenv("CHAT_TURN_WRITE_BEHIND_SHUTDOWN_TIMEOUT_SECONDS", "10"))
+    )
     MAX_SESSION_HISTORY_MESSAGES: int = max(1, int(os.getenv("MAX_SESSION_HISTORY_MESSAGES", "20")))
     QUERY_TRANSFORMATION_HISTORY_WINDOW: int = max(1, int(os.getenv("QUERY_TRANSFORMATION_HISTORY_WINDOW", "6")))
+    # Rolling per-session summary that replaces older raw turns in prompts.
+    SESSION_SUMMARY_ENABLED: bool = os.getenv(
+        "SESSION_SUMMARY_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    SESSION_SUMMARY_TRIGGER_TOKENS: int = max(
+        1, int(os.getenv("SESSION_SUMMARY_TRIGGER_TOKENS", "2000"))
+    )
+    SESSION_SUMMARY_KEEP_MESSAGES: int = max(
+        0, int(os.getenv("SESSION_SUMMARY_KEEP_MESSAGES", "6"))
+    )
+    SESSION_SUMMARY_MAX_OUTPUT_TOKENS: int = max(
+        16, int(os.getenv("SESSION_SUMMARY_MAX_OUTPUT_TOKENS", "512"))
+    )
     SQLALCHEMY_POOL_SIZE: int = max(1, int(os.getenv("SQLALCHEMY_POOL_SIZE", "5")))
     SQLALCHEMY_MAX_OVERFLOW: int = max(0, int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", "10")))
     SQLALCHEMY_POOL_TIMEOUT_SEC: int = max(1, int(os.getenv("SQLALCHEMY_POOL_TIMEOUT_SEC", "30")))
@@ -185,7 +328,20 @@ class Settings:
     QUEUE_WORKER_COUNT: int = max(1, min(5, int(os.getenv("QUEUE_WORKER_COUNT", "3"))))
     QUEUE_MAX_SIZE: int = max(1, int(os.getenv("QUEUE_MAX_SIZE", "100")))
     QUEUE_EMBEDDING_RPS: float = max(0.1, float(os.getenv("QUEUE_EMBEDDING_RPS", "2.0")))
+    QUEUE_EMBEDDING_RPS_BY_PROVIDER: dict[str, float] = _get_embedding_rps_by_provider()
+    # "local" = per-process bucket; "redis" = one bucket shared by all replicas.
+    QUEUE_EMBEDDING_RATE_LIMITER: str = os.getenv(
+        "QUEUE_EMBEDDING_RATE_LIMITER", "local"
+    ).strip().lower()
+    # Fair scheduling: jobs served per round-robin turn, and strict priority classes.
+    QUEUE_TENANT_WEIGHTS: dict[str, int] = _get_tenant_weights()
+    QUEUE_TENANT_PRIORITIES: dict[str, str] = _get_tenant_priorities()
     QUEUE_SPILL_DIR: str = os.getenv("QUEUE_SPILL_DIR", "/tmp/chatvector")
+    # Memory backend only: keep upload bytes in QUEUE_SPILL_DIR instead of the
+    # in-process queue; workers read them back when the job starts.
+    QUEUE_MEMORY_SPILL_ENABLED: bool = os.getenv(
+        "QUEUE_MEMORY_SPILL_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
     QUEUE_DLQ_MAX_ENTRIES: int = max(1, int(os.getenv("QUEUE_DLQ_MAX_ENTRIES", "1000")))
     QUEUE_JOB_MAX_RETRIES: int = max(0, int(os.getenv("QUEUE_JOB_MAX_RETRIES", "3")))
     QUEUE_RETRY_BASE_DELAY: float = max(
@@ -200,6 +356,7 @@ class Settings:
     ).lower() in ("1", "true", "yes")
 
     RATE_LIMIT_UPLOAD: str = os.getenv("RATE_LIMIT_UPLOAD", "20/hour")
+    RATE_LIMIT_UPLOAD_BATCH: str = os.getenv("RATE_LIMIT_UPLOAD_BATCH", "5/hour")
     RATE_LIMIT_CHAT: str = os.getenv("RATE_LIMIT_CHAT", "30/minute")
     RATE_LIMIT_CHAT_BATCH: str = os.getenv("RATE_LIMIT_CHAT_BATCH", "10/minute")
     RATE_LIMIT_STATUS: str = os.getenv("RATE_LIMIT_STATUS", "10/minute")
@@ -219,6 +376,15 @@ class Settings:
         min(2.0, float(os.getenv("LLM_TEMPERATURE", "0.2"))),
     )
     LLM_MAX_OUTPUT_TOKENS: int = max(1, int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "1024")))
+    # Retrieved-context budget, further capped by the active model's context
+    # window minus LLM_MAX_OUTPUT_TOKENS and the prompt reserve.
+    MAX_CONTEXT_TOKENS: int = max(1, int(os.getenv("MAX_CONTEXT_TOKENS", "8000")))
+    CONTEXT_PROMPT_RESERVE_TOKENS: int = max(
+        0, int(os.getenv("CONTEXT_PROMPT_RESERVE_TOKENS", "1024"))
+    )
+    CONTEXT_CHARS_PER_TOKEN: float = max(
+        1.0, float(os.getenv("CONTEXT_CHARS_PER_TOKEN", "4"))
+    )
     LLM_HTTP_TIMEOUT_MS: int = max(
         1000, int(os.getenv("LLM_HTTP_TIMEOUT_MS", "60000"))
     )
@@ -226,6 +392,26 @@ class Settings:
     EMBEDDING_HTTP_TIMEOUT_SEC: int = max(
         1, int(os.getenv("EMBEDDING_HTTP_TIMEOUT_SEC", "60"))
     )
+    # Batches of one embed call (Gemini, Voyage) sent to the provider at once.
+    EMBEDDING_BATCH_CONCURRENCY: int = max(
+        1, int(os.getenv("EMBEDDING_BATCH_CONCURRENCY", "4"))
+    )
+    # Hedged query-time embeddings (services/providers/hedging.py).
+    EMBEDDING_HEDGE_ENABLED: bool = os.getenv(
+        "EMBEDDING_HEDGE_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    EMBEDDING_HEDGE_PERCENTILE: float = max(
+        50.0, min(99.9, float(os.getenv("EMBEDDING_HEDGE_PERCENTILE", "95")))
+    )
+    EMBEDDING_HEDGE_BUDGET_RATIO: float = max(
+        0.0, min(0.5, float(os.getenv("EMBEDDING_HEDGE_BUDGET_RATIO", "0.05")))
+    )
+    EMBEDDING_HEDGE_MIN_DELAY_MS: int = max(
+        0, int(os.getenv("EMBEDDING_HEDGE_MIN_DELAY_MS", "50"))
+    )
+    EMBEDDING_HEDGE_MIN_SAMPLES: int = max(
+        1, int(os.getenv("EMBEDDING_HEDGE_MIN_SAMPLES", "20"))
+    )
     # /status health probe for the embedding sub-check only.
     EMBEDDING_HEALTH_CHECK_TIMEOUT_SEC: int = max(
         1, int(os.getenv("EMBEDDING_HEALTH_CHECK_TIMEOUT_SEC", "10"))
@@ -234,7 +420,98 @@ class Settings:
         1, int(os.getenv("LLM_HEALTH_CHECK_TIMEOUT_SEC", "10"))
     )
 
+    # Adaptive (AIMD) in-flight caps for embedding and LLM provider calls.
+    PROVIDER_ADAPTIVE_CONCURRENCY_ENABLED: bool = os.getenv(
+        "PROVIDER_ADAPTIVE_CONCURRENCY_ENABLED", "true"
+    ).lower() in ("1", "true", "yes")
+    PROVIDER_CONCURRENCY_MIN: int = max(1, int(os.getenv("PROVIDER_CONCURRENCY_MIN", "1")))
+    PROVIDER_CONCURRENCY_MAX: int = max(
+        PROVIDER_CONCURRENCY_MIN, int(os.getenv("PROVIDER_CONCURRENCY_MAX", "64"))
+    )
+    PROVIDER_CONCURRENCY_INITIAL: int = max(
+        PROVIDER_CONCURRENCY_MIN,
+        min(PROVIDER_CONCURRENCY_MAX, int(os.getenv("PROVIDER_CONCURRENCY_INITIAL", "8"))),
+    )
+    PROVIDER_CONCURRENCY_DECREASE_FACTOR: float = max(
+        0.1, min(0.99, float(os.getenv("PROVIDER_CONCURRENCY_DECREASE_FACTOR", "0.5")))
+    )
+
+    # Circuit breakers for provider failover chains (services/providers/failover.py).
+    PROVIDER_BREAKER_WINDOW: int = max(2, int(os.getenv("PROVIDER_BREAKER_WINDOW", "20")))
+    PROVIDER_BREAKER_MIN_CALLS: int = max(
+        1, int(os.getenv("PROVIDER_BREAKER_MIN_CALLS", "5"))
+    )
+    PROVIDER_BREAKER_FAILURE_RATE: float = max(
+        0.05, min(1.0, float(os.getenv("PROVIDER_BREAKER_FAILURE_RATE", "0.5")))
+    )
+    PROVIDER_BREAKER_OPEN_SEC: float = max(
+        1.0, float(os.getenv("PROVIDER_BREAKER_OPEN_SEC", "30"))
+    )
+    # Calls slower than these count as failures for the breaker.
+    LLM_BREAKER_SLOW_CALL_MS: int = max(
+        100, int(os.getenv("LLM_BREAKER_SLOW_CALL_MS", "30000"))
+    )
+    EMBEDDING_BREAKER_SLOW_CALL_MS: int = max(
+        100, int(os.getenv("EMBEDDING_BREAKER_SLOW_CALL_MS", "5000"))
+    )
+
+    # Shared per-host httpx pools for provider clients (services/providers/transport.py).
+    PROVIDER_HTTP_MAX_CONNECTIONS: int = max(
+        1, int(os.getenv("PROVIDER_HTTP_MAX_CONNECTIONS", "128"))
+    )
+    PROVIDER_HTTP_MAX_KEEPALIVE: int = max(
+        0, int(os.getenv("PROVIDER_HTTP_MAX_KEEPALIVE", "32"))
+    )
+    PROVIDER_HTTP_KEEPALIVE_EXPIRY_SEC: float = max(
+        1.0, float(os.getenv("PROVIDER_HTTP_KEEPALIVE_EXPIRY_SEC", "60"))
+    )
+    PROVIDER_HTTP_CONNECT_TIMEOUT_SEC: float = max(
+        0.5, float(os.getenv("PROVIDER_HTTP_CONNECT_TIMEOUT_SEC", "5"))
+    )
+    PROVIDER_HTTP2_ENABLED: bool = os.getenv(
+        "PROVIDER_HTTP2_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    # Keep-alive connections opened per provider host at startup (0 disables).
+    PROVIDER_HTTP_WARMUP_CONNECTIONS: int = max(
+        0, int(os.getenv("PROVIDER_HTTP_WARMUP_CONNECTIONS", "2"))
+    )
+
+    # Offline fake providers for load testing (services/providers/fake.py).
+    FAKE_EMBEDDING_DIM: int = max(
+        1, int(os.getenv("FAKE_EMBEDDING_DIM") or os.getenv("EMBEDDING_DIM") or "768")
+    )
+    FAKE_EMBEDDING_LATENCY_MS: float = max(
+        0.0, float(os.getenv("FAKE_EMBEDDING_LATENCY_MS", "20"))
+    )
+    # Median time to first token; tokens then stream at FAKE_LLM_TOKENS_PER_SEC.
+    FAKE_LLM_LATENCY_MS: float = max(0.0, float(os.getenv("FAKE_LLM_LATENCY_MS", "400")))
+    FAKE_LLM_TOKENS_PER_SEC: float = max(
+        1.0, float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "50"))
+    )
+    FAKE_LLM_OUTPUT_TOKENS: int = max(1, int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "120")))
+    FAKE_RERANKER_LATENCY_MS: float = max(
+        0.0, float(os.getenv("FAKE_RERANKER_LATENCY_MS", "20"))
+    )
+    # Log-normal spread of fake latencies (0 = constant).
+    FAKE_LATENCY_SIGMA: float = max(0.0, float(os.getenv("FAKE_LATENCY_SIGMA", "0.5")))
+    FAKE_PROVIDER_RATE_LIMIT_RATE: float = max(
+        0.0, min(1.0, float(os.getenv("FAKE_PROVIDER_RATE_LIMIT_RATE", "0")))
+    )
+    FAKE_PROVIDER_TIMEOUT_RATE: float = max(
+        0.0, min(1.0, float(os.getenv("FAKE_PROVIDER_TIMEOUT_RATE", "0")))
+    )
+    FAKE_PROVIDER_SEED: int = int(os.getenv("FAKE_PROVIDER_SEED", "0"))
+
 VALID_QUEUE_BACKENDS = {"memory", "redis"}
+VALID_EMBEDDING_RATE_LIMITERS = {"local", "redis"}
+
+
+def _validate_embedding_rate_limiter(limiter: str) -> None:
+    if limiter not in VALID_EMBEDDING_RATE_LIMITERS:
+        valid = ", ".join(sorted(VALID_EMBEDDING_RATE_LIMITERS))
+        raise ValueError(
+            f"Invalid QUEUE_EMBEDDING_RATE_LIMITER={limiter!r}. Expected one of: {valid}."
+        )
 
 
 def _validate_queue_backend(backend: str) -> None:
@@ -256,6 +533,7 @@ def _validate_queue_backend_for_env(app_env: str, backend: str) -> None:
 
 config = Settings()
 _validate_queue_backend_for_env(config.APP_ENV, config.QUEUE_BACKEND)
+_validate_embedding_rate_limiter(config.QUEUE_EMBEDDING_RATE_LIMITER)
 
 if config.QUERY_TRANSFORMATION_HISTORY_WINDOW > config.MAX_SESSION_HISTORY_MESSAGES:
     logger.warning(
@@ -2,12 +2,12 @@
 from datetime import datetime
 import uuid
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import declarative_base
 
 from core.config import get_embedding_dim
+from core.vectors import Float32Vector
 
 Base = declarative_base()
 
@@ -59,7 +59,7 @@ class DocumentChunk(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False)
     chunk_text = Column(String, nullable=False)
-    embedding = Column(Vector(get_embedding_dim()), nullable=False)
+    embedding = Column(Float32Vector(get_embedding_dim()), nullable=False)
     chunk_index = Column(Integer, nullable=False, default=0)
     page_number = Column(Integer, nullable=True)
     character_offset_start = Column(Integer, nullable=False, default=0)
@@ -87,6 +87,9 @@ class SessionRecord(Base):
     tenant_id = Column(String(255), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_active = Column(DateTime, default=datetime.utcnow)
+    # Rolling summary of messages created at or before summarized_through.
+    summary = Column(Text, nullable=True)
+    summarized_through = Column(DateTime, nullable=True)
 
 
 class SessionDocument(Base):
@@ -56,6 +56,13 @@ LLM_CAPABILITIES: dict[str, ProviderCapabilities] = {
         supports_streaming=True,
         placeholder_values=_ANTHROPIC_PLACEHOLDER,
     ),
+    # Offline deterministic provider for load testing (services/providers/fake.py).
+    "fake": ProviderCapabilities(
+        name="fake",
+        role="llm",
+        api_key_env_var=None,
+        supports_streaming=True,
+    ),
 }
 
 EMBEDDING_CAPABILITIES: dict[str, ProviderCapabilities] = {
@@ -82,6 +89,11 @@ EMBEDDING_CAPABILITIES: dict[str, ProviderCapabilities] = {
         api_key_env_var="VOYAGE_API_KEY",
         placeholder_values=_VOYAGE_PLACEHOLDER,
     ),
+    "fake": ProviderCapabilities(
+        name="fake",
+        role="embedding",
+        api_key_env_var=None,
+    ),
 }
 
 LLM_PROVIDER_NAMES = frozenset(LLM_CAPABILITIES)
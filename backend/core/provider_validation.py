@@ -27,6 +27,8 @@ class ProviderConfigSnapshot:
     embedding_provider: str
     enable_streaming: bool
     env: dict[str, str | None]
+    llm_fallbacks: tuple[str, ...] = ()
+    embedding_fallbacks: tuple[str, ...] = ()
 
 
 def _is_configured_value(value: str | None, placeholders: frozenset[str]) -> bool:
@@ -101,6 +103,27 @@ def validate_provider_configuration(snapshot: ProviderConfigSnapshot) -> None:
                     "or set ENABLE_STREAMING=false."
                 )
 
+    for name in snapshot.llm_fallbacks:
+        cap = LLM_CAPABILITIES.get(name)
+        if cap is None:
+            errors.append(f"Invalid LLM_FALLBACK_PROVIDERS entry {name!r}.")
+            continue
+        if cred_err := _credential_error(cap, snapshot.env):
+            errors.append(f"{cred_err} (LLM_FALLBACK_PROVIDERS)")
+        if snapshot.enable_streaming and not cap.supports_streaming:
+            errors.append(
+                f"ENABLE_STREAMING=true but fallback LLM provider {name!r} does not "
+                "support streaming."
+            )
+
+    for name in snapshot.embedding_fallbacks:
+        cap = EMBEDDING_CAPABILITIES.get(name)
+        if cap is None:
+            errors.append(f"Invalid EMBEDDING_FALLBACK_PROVIDERS entry {name!r}.")
+            continue
+        if cred_err := _credential_error(cap, snapshot.env):
+            errors.append(f"{cred_err} (EMBEDDING_FALLBACK_PROVIDERS)")
+
     if errors:
         combo_hint = (
             f"Configured combination: LLM={llm} + embedding={embedding}. "
@@ -118,6 +141,8 @@ def validate_provider_configuration_from_env(
     llm_provider: str,
     embedding_provider: str,
     enable_streaming: bool,
+    llm_fallbacks: tuple[str, ...] = (),
+    embedding_fallbacks: tuple[str, ...] = (),
 ) -> None:
     """Validate provider configuration using the current process environment."""
     env = {key: os.getenv(key) for key in _tracked_env_vars()}
@@ -126,6 +151,8 @@ def validate_provider_configuration_from_env(
         embedding_provider=embedding_provider,
         enable_streaming=enable_streaming,
         env=env,
+        llm_fallbacks=llm_fallbacks,
+        embedding_fallbacks=embedding_fallbacks,
     )
     validate_provider_configuration(snapshot)
 
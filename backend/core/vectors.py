@@ -0,0 +1,128 @@
+"""float32 embedding arrays and their pgvector wire format.
+
+Embeddings are ``numpy`` float32 arrays from the embedding service to the
+database and back. A 3072-dim vector is then one 12 KB buffer instead of 3072
+boxed Python floats, and it reaches PostgreSQL in pgvector's binary format
+(see ``Float32Vector``) rather than as a ``'[0.1,...]'`` string. No API
+response carries embeddings; call ``.tolist()`` if one ever needs to.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import struct
+from typing import Any, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from pgvector.sqlalchemy import VECTOR
+
+logger = logging.getLogger(__name__)
+
+Embedding = NDArray[np.float32]
+EmbeddingLike = Union[Embedding, Sequence[float]]
+
+# pgvector binary layout: uint16 dimensions, uint16 unused, then big-endian float32s.
+_HEADER = struct.Struct(">HH")
+_WIRE_DTYPE = np.dtype(">f4")
+
+
+def as_embedding(values: EmbeddingLike) -> Embedding:
+    """Return *values* as a 1-D float32 array (no copy if it already is one)."""
+    array = np.asarray(values, dtype=np.float32)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D embedding, got shape {array.shape}")
+    return array
+
+
+def as_embeddings(vectors: Sequence[EmbeddingLike]) -> list[Embedding]:
+    """Return one float32 array per vector.
+
+    Arrays pass through unchanged. Anything else is packed into a single
+    float32 matrix whose rows are returned, so a batch costs one allocation.
+    """
+    if all(isinstance(v, np.ndarray) and v.dtype == np.float32 and v.ndim == 1 for v in vectors):
+        return list(vectors)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected equal-length embeddings, got shape {matrix.shape}")
+    return list(matrix)
+
+
+def embedding_from_response(value: Union[str, Sequence[float]]) -> Embedding:
+    """float32 array from an API response item.
+
+    Strings are base64 little-endian float32 (``encoding_format="base64"`` in
+    the OpenAI and Voyage APIs) and are read without building Python floats.
+    """
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype="<f4").astype(np.float32, copy=False)
+    return as_embedding(value)
+
+
+def cosine_similarity(a: EmbeddingLike, b: EmbeddingLike) -> float:
+    """Cosine similarity of two vectors; 0.0 when either has zero norm."""
+    a, b = as_embedding(a), as_embedding(b)
+    norm = float(np.linalg.norm(a)) * float(np.linalg.norm(b))
+    return float(np.dot(a, b)) / norm if norm else 0.0
+
+
+def encode_pgvector(value: EmbeddingLike) -> bytearray:
+    """pgvector binary encoding; the byte swap writes straight into the output buffer."""
+    array = as_embedding(value)
+    buffer = bytearray(_HEADER.size + array.size * _WIRE_DTYPE.itemsize)
+    _HEADER.pack_into(buffer, 0, array.size, 0)
+    np.frombuffer(buffer, dtype=_WIRE_DTYPE, offset=_HEADER.size)[:] = array
+    return buffer
+
+
+def decode_pgvector(data: bytes) -> Embedding:
+    """Native float32 array from pgvector's binary encoding."""
+    dim, _ = _HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=_WIRE_DTYPE, count=dim, offset=_HEADER.size).astype(np.float32)
+
+
+async def register_vector_codec(connection: Any) -> None:
+    """Make an asyncpg connection send and receive ``vector`` in binary format."""
+    try:
+        await connection.set_type_codec(
+            "vector",
+            schema="public",
+            encoder=encode_pgvector,
+            decoder=decode_pgvector,
+            format="binary",
+        )
+    except ValueError as exc:
+        if not str(exc).startswith("unknown type:"):
+            raise
+        logger.warning(
+            "pgvector extension not found; vector columns cannot be read or written "
+            "until the migrations are applied."
+        )
+
+
+class Float32Vector(VECTOR):
+    """pgvector column bound as float32 arrays.
+
+    On asyncpg the array goes to the connection's binary codec (registered by
+    ``register_vector_codec``) and results come back as float32 arrays. Other
+    drivers keep pgvector's text format.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+        dim = self.dim
+
+        def process(value):
+            if value is None:
+                return None
+            array = as_embedding(value)
+            if dim is not None and array.size != dim:
+                raise ValueError(f"expected {dim} dimensions, not {array.size}")
+            return array
+
+        return process
@@ -10,7 +10,9 @@ the target PostgreSQL/pgvector instance.
 import logging
 import threading
 from contextlib import asynccontextmanager
+from datetime import datetime
 
+from core.vectors import EmbeddingLike
 from utils.retry import (
     DEFAULT_BACKOFF,
     DEFAULT_BASE_DELAY,
@@ -18,7 +20,7 @@ from utils.retry import (
     get_default_db_timeout_sec,
     retry_async,
 )
-from .base import ChunkMatch, ChunkRecord
+from .base import ChatPreflight, ChatTurnRecord, ChunkMatch, ChunkRecord
 from .tenant_scope import require_tenant_id
 
 logger = logging.getLogger(__name__)
@@ -92,6 +94,29 @@ async def create_document(filename: str, tenant_id: str) -> str:
     )
 
 
+async def create_documents(
+    filenames: list[str],
+    tenant_id: str,
+    *,
+    status: str = "uploaded",
+) -> list[str]:
+    tenant_id = require_tenant_id(tenant_id, method="create_documents")
+    service = get_db_service()
+
+    async def _create():
+        return await service.create_documents(filenames, tenant_id=tenant_id, status=status)
+
+    return await retry_async(
+        _create,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        backoff=DEFAULT_BACKOFF,
+        timeout=get_default_db_timeout_sec(),
+        retry_on_timeout=False,
+        func_name=f"{service.__class__.__name__}.create_documents",
+    )
+
+
 async def store_chunks_with_embeddings(
     doc_id: str,
     chunk_records: list[ChunkRecord],
@@ -133,6 +158,23 @@ async def get_document(doc_id: str, tenant_id: str) -> dict:
     )
 
 
+async def get_document_statuses(doc_ids: list[str], tenant_id: str) -> dict[str, str]:
+    tenant_id = require_tenant_id(tenant_id, method="get_document_statuses")
+    service = get_db_service()
+
+    async def _get():
+        return await service.get_document_statuses(doc_ids, tenant_id=tenant_id)
+
+    return await retry_async(
+        _get,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        backoff=DEFAULT_BACKOFF,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.get_document_statuses",
+    )
+
+
 async def create_document_with_chunks_atomic(
     file_name: str,
     chunk_records: list[ChunkRecord],
@@ -159,7 +201,7 @@ async def create_document_with_chunks_atomic(
 
 async def find_similar_chunks(
     doc_id: str,
-    query_embedding: list[float],
+    query_embedding: EmbeddingLike,
     match_count: int,
     *,
     tenant_id: str,
@@ -189,6 +231,36 @@ async def find_similar_chunks(
     )
 
 
+async def find_similar_chunks_multi(
+    doc_id: str,
+    query_embeddings: list[EmbeddingLike],
+    match_count: int,
+    *,
+    tenant_id: str,
+    query_texts: list[str | None] | None = None,
+) -> list[list[ChunkMatch]]:
+    tenant_id = require_tenant_id(tenant_id, method="find_similar_chunks_multi")
+    service = get_db_service()
+
+    async def _search():
+        return await service.find_similar_chunks_multi(
+            doc_id,
+            query_embeddings,
+            match_count,
+            tenant_id=tenant_id,
+            query_texts=query_texts,
+        )
+
+    return await retry_async(
+        _search,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        backoff=DEFAULT_BACKOFF,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.find_similar_chunks_multi",
+    )
+
+
 async def update_document_status(
     doc_id: str,
     status: str,
@@ -219,6 +291,34 @@ async def update_document_status(
     )
 
 
+async def update_documents_status(
+    doc_ids: list[str],
+    status: str,
+    tenant_id: str,
+    *,
+    error: dict | None = None,
+) -> None:
+    tenant_id = require_tenant_id(tenant_id, method="update_documents_status")
+    service = get_db_service()
+
+    async def _update():
+        await service.update_documents_status(
+            doc_ids,
+            status,
+            tenant_id=tenant_id,
+            error=error,
+        )
+
+    await retry_async(
+        _update,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=0.5,
+        backoff=2.0,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.update_documents_status",
+    )
+
+
 async def get_document_status(doc_id: str, tenant_id: str) -> dict | None:
     tenant_id = require_tenant_id(tenant_id, method="get_document_status")
     service = get_db_service()
@@ -359,18 +459,40 @@ async def store_chat_turn(
     )
 
 
+async def store_chat_turns(turns: list[ChatTurnRecord]) -> None:
+    service = get_db_service()
+
+    async def _store():
+        await service.store_chat_turns(turns)
+
+    await retry_async(
+        _store,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=0.5,
+        backoff=2.0,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.store_chat_turns",
+    )
+
+
 async def get_session_history(
     session_id: str,
     tenant_id: str,
     *,
     limit: int = 20,
+    with_summary: bool = False,
+    oldest_first: bool = False,
 ) -> list[dict]:
     tenant_id = require_tenant_id(tenant_id, method="get_session_history")
     service = get_db_service()
 
     async def _get():
         return await service.get_session_history(
-            session_id=session_id, tenant_id=tenant_id, limit=limit
+            session_id=session_id,
+            tenant_id=tenant_id,
+            limit=limit,
+            with_summary=with_summary,
+            oldest_first=oldest_first,
         )
 
     return await retry_async(
@@ -383,6 +505,36 @@ async def get_session_history(
     )
 
 
+async def store_session_summary(
+    session_id: str,
+    tenant_id: str,
+    summary: str,
+    summarized_through: datetime,
+    *,
+    previous_through: datetime | None = None,
+) -> bool:
+    tenant_id = require_tenant_id(tenant_id, method="store_session_summary")
+    service = get_db_service()
+
+    async def _store():
+        return await service.store_session_summary(
+            session_id,
+            tenant_id,
+            summary,
+            summarized_through,
+            previous_through=previous_through,
+        )
+
+    return await retry_async(
+        _store,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=0.5,
+        backoff=2.0,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.store_session_summary",
+    )
+
+
 async def create_session_record(session_id: str, tenant_id) -> "Session":
     from core.session import Session  # noqa: F401 (re-exported)
 
@@ -395,6 +547,26 @@ async def get_or_create_session_record(session_id: str, tenant_id) -> "Session |
     return await service.get_or_create_session_record(session_id, tenant_id)
 
 
+async def resolve_batch_sessions(
+    tenant_id: str, requested_ids: list[str], new_count: int
+) -> tuple[dict[str, str], list[str]]:
+    tenant_id = require_tenant_id(tenant_id, method="resolve_batch_sessions")
+    service = get_db_service()
+
+    async def _resolve():
+        return await service.resolve_batch_sessions(tenant_id, requested_ids, new_count)
+
+    return await retry_async(
+        _resolve,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        backoff=DEFAULT_BACKOFF,
+        timeout=get_default_db_timeout_sec(),
+        retry_on_timeout=False,
+        func_name=f"{service.__class__.__name__}.resolve_batch_sessions",
+    )
+
+
 async def get_session_record(session_id: str, tenant_id) -> "Session | None":
     service = get_db_service()
 
@@ -443,6 +615,53 @@ async def delete_session_record(session_id: str, tenant_id) -> bool:
     )
 
 
+async def add_session_documents(bindings: list[tuple[str, str]]) -> None:
+    service = get_db_service()
+
+    async def _add():
+        await service.add_session_documents(bindings)
+
+    await retry_async(
+        _add,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=0.5,
+        backoff=2.0,
+        timeout=get_default_db_timeout_sec(),
+        func_name=f"{service.__class__.__name__}.add_session_documents",
+    )
+
+
+async def chat_preflight(
+    doc_id: str,
+    tenant_id: str,
+    *,
+    session_id: str | None = None,
+    history_limit: int = 20,
+    with_summary: bool = False,
+) -> ChatPreflight | None:
+    tenant_id = require_tenant_id(tenant_id, method="chat_preflight")
+    service = get_db_service()
+
+    async def _preflight():
+        return await service.chat_preflight(
+            doc_id,
+            tenant_id=tenant_id,
+            session_id=session_id,
+            history_limit=history_limit,
+            with_summary=with_summary,
+        )
+
+    return await retry_async(
+        _preflight,
+        max_retries=DEFAULT_MAX_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        backoff=DEFAULT_BACKOFF,
+        timeout=get_default_db_timeout_sec(),
+        retry_on_timeout=False,
+        func_name=f"{service.__class__.__name__}.chat_preflight",
+    )
+
+
 async def add_session_document(session_id: str, document_id: str) -> None:
     service = get_db_service()
 
@@ -462,13 +681,17 @@ async def add_session_document(session_id: str, document_id: str) -> None:
 __all__ = [
     "get_db_service",
     "create_document",
+    "create_documents",
     "store_chunks_with_embeddings",
     "get_document",
+    "get_document_statuses",
     "create_document_with_chunks_atomic",
     "find_similar_chunks",
+    "find_similar_chunks_multi",
     "list_tenant_documents",
     "list_tenant_document_summaries",
     "update_document_status",
+    "update_documents_status",
     "get_document_status",
     "delete_document_chunks",
     "delete_document",
@@ -476,13 +699,20 @@ __all__ = [
     "fail_stale_documents_global",
     "store_chat_message",
     "store_chat_turn",
+    "store_chat_turns",
     "get_session_history",
+    "store_session_summary",
     "create_session_record",
     "get_or_create_session_record",
     "get_session_record",
     "list_session_records",
     "delete_session_record",
     "add_session_document",
+    "add_session_documents",
+    "resolve_batch_sessions",
+    "chat_preflight",
+    "ChatPreflight",
+    "ChatTurnRecord",
     "ChunkMatch",
     "ChunkRecord",
     "db_service",
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Optional
 
+from core.vectors import Embedding, EmbeddingLike
+
 SCORE_TYPE_VECTOR = "vector"
 SCORE_TYPE_HYBRID_RRF = "hybrid_rrf"
 SCORE_TYPE_RERANKED = "reranked"
@@ -15,7 +18,7 @@ class ChunkRecord:
     """Chunk payload passed to store_chunks_with_embeddings."""
 
     chunk_text: str
-    embedding: list[float]
+    embedding: EmbeddingLike = field(compare=False)
     chunk_index: int
     character_offset_start: int
     character_offset_end: int
@@ -34,7 +37,8 @@ class ChunkMatch:
     id: str
     chunk_text: str
     document_id: Optional[str] = None
-    embedding: Optional[list[float]] = None
+    # Arrays have no boolean ==, so the vector stays out of __eq__.
+    embedding: Optional[Embedding] = field(default=None, compare=False)
     created_at: Optional[str] = None
     similarity: Optional[float] = None
     score_type: Optional[str] = None
@@ -50,6 +54,28 @@ class ChunkMatch:
     file_name: Optional[str] = None
 
 
+@dataclass
+class ChatPreflight:
+    """Everything a chat request needs from the database before retrieval."""
+
+    session: "Session"
+    document_status: str
+    history: list[dict]
+
+
+@dataclass
+class ChatTurnRecord:
+    """A user/assistant turn with pre-assigned ids, for batched inserts."""
+
+    session_id: str
+    tenant_id: str
+    question: str
+    answer: str
+    user_message_id: str
+    assistant_message_id: str
+    created_at: datetime
+
+
 class DatabaseService(ABC):
     """Abstract base class for database services."""
 
@@ -60,6 +86,17 @@ class DatabaseService(ABC):
         """Create a document record owned by tenant_id and return document ID."""
         pass
 
+    @abstractmethod
+    async def create_documents(
+        self,
+        filenames: list[str],
+        tenant_id: str,
+        *,
+        status: str = "uploaded",
+    ) -> list[str]:
+        """Create several tenant-owned documents in one statement; IDs follow *filenames*."""
+        pass
+
     @abstractmethod
     async def store_chunks_with_embeddings(
         self,
@@ -75,11 +112,18 @@ class DatabaseService(ABC):
         """Fetch a document by ID, scoped to tenant_id."""
         pass
 
+    @abstractmethod
+    async def get_document_statuses(
+        self, doc_ids: list[str], tenant_id: str
+    ) -> dict[str, str]:
+        """Map each of doc_ids owned by tenant_id to its status (one query); others are omitted."""
+        pass
+
     @abstractmethod
     async def find_similar_chunks(
         self,
         doc_id: str,
-        query_embedding: list[float],
+        query_embedding: EmbeddingLike,
         match_count: int,
         *,
         tenant_id: str,
@@ -89,6 +133,19 @@ class DatabaseService(ABC):
         """Run tenant-scoped vector/hybrid search for chunks."""
         pass
 
+    @abstractmethod
+    async def find_similar_chunks_multi(
+        self,
+        doc_id: str,
+        query_embeddings: list[EmbeddingLike],
+        match_count: int,
+        *,
+        tenant_id: str,
+        query_texts: Optional[list[Optional[str]]] = None,
+    ) -> list[list[ChunkMatch]]:
+        """Search one document for several queries in a single pass; one result list per query."""
+        pass
+
     @abstractmethod
     async def create_document_with_chunks_atomic(
         self,
@@ -112,6 +169,18 @@ class DatabaseService(ABC):
         """Update upload status/progress metadata for a tenant-owned document."""
         pass
 
+    @abstractmethod
+    async def update_documents_status(
+        self,
+        doc_ids: list[str],
+        status: str,
+        tenant_id: str,
+        *,
+        error: Optional[dict] = None,
+    ) -> None:
+        """Set the same status (and error) on several tenant-owned documents at once."""
+        pass
+
     @abstractmethod
     async def get_document_status(self, doc_id: str, tenant_id: str) -> Optional[dict]:
         """Get document upload status payload for a tenant-owned document."""
@@ -179,6 +248,11 @@ class DatabaseService(ABC):
         """Store a user/assistant chat turn atomically for a tenant-owned session."""
         pass
 
+    @abstractmethod
+    async def store_chat_turns(self, turns: list[ChatTurnRecord]) -> None:
+        """Insert many turns in one statement; rows whose id already exists are skipped."""
+        pass
+
     @abstractmethod
     async def get_session_history(
         self,
@@ -186,8 +260,45 @@ class DatabaseService(ABC):
         tenant_id: str,
         *,
         limit: int = 20,
+        with_summary: bool = False,
+        oldest_first: bool = False,
     ) -> list[dict]:
-        """Retrieve recent chat history for a tenant-owned session."""
+        """Retrieve recent chat history for a tenant-owned session.
+
+        With ``with_summary``, messages already folded into the session's
+        rolling summary are replaced by one leading ``role="summary"`` message.
+        With ``oldest_first``, the *limit* oldest messages (after the summary)
+        are returned instead of the newest. Either way they are in
+        chronological order.
+        """
+        pass
+
+    @abstractmethod
+    async def store_session_summary(
+        self,
+        session_id: str,
+        tenant_id: str,
+        summary: str,
+        summarized_through: datetime,
+        *,
+        previous_through: Optional[datetime] = None,
+    ) -> bool:
+        """Replace the session summary if it still covers ``previous_through``; False otherwise."""
+        pass
+
+    @abstractmethod
+    async def chat_preflight(
+        self,
+        doc_id: str,
+        tenant_id: str,
+        *,
+        session_id: Optional[str] = None,
+        history_limit: int = 20,
+        with_summary: bool = False,
+    ) -> Optional[ChatPreflight]:
+        """Check document ownership, get/create the session, bind the document and
+        load recent history in one transaction; ``None`` if the tenant does not own doc_id.
+        """
         pass
 
     # ── Session persistence ───────────────────────────────────────────────────
@@ -204,6 +315,17 @@ class DatabaseService(ABC):
         """Get or create a session record (conflict-safe)."""
         pass
 
+    @abstractmethod
+    async def resolve_batch_sessions(
+        self, tenant_id: str, requested_ids: list[str], new_count: int
+    ) -> tuple[dict[str, str], list[str]]:
+        """Get or create many sessions in one transaction.
+
+        Returns the session id to use for each requested id (a fresh one when
+        another tenant owns it) and *new_count* newly created session ids.
+        """
+        pass
+
     @abstractmethod
     async def get_session_record(self, session_id: str, tenant_id) -> "Session | None":
         """Fetch a session record scoped to tenant_id."""
@@ -223,3 +345,8 @@ class DatabaseService(ABC):
     async def add_session_document(self, session_id: str, document_id: str) -> None:
         """Bind a document to a session (idempotent)."""
         pass
+
+    @abstractmethod
+    async def add_session_documents(self, bindings: list[tuple[str, str]]) -> None:
+        """Bind many ``(session_id, document_id)`` pairs in one statement (idempotent)."""
+        pass
@@ -0,0 +1,19 @@
+-- Rolling session summaries.
+--
+-- Adds a nullable summary column to sessions plus summarized_through, the
+-- created_at of the newest chat message folded into the summary. Prompts use
+-- the summary in place of messages at or before summarized_through.
+
+BEGIN;
+
+ALTER TABLE sessions
+    ADD COLUMN IF NOT EXISTS summary TEXT;
+
+ALTER TABLE sessions
+    ADD COLUMN IF NOT EXISTS summarized_through TIMESTAMP;
+
+INSERT INTO public.schema_migrations (filename)
+VALUES ('013_session_summaries.sql')
+ON CONFLICT (filename) DO NOTHING;
+
+COMMIT;
@@ -4,19 +4,23 @@ import asyncio
 import time
 import uuid
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 from sqlalchemy import (
+    any_,
+    bindparam,
     delete,
+    event,
     func,
     literal,
     literal_column,
+    or_,
     select,
     text,
     update as sql_update,
 )
-from sqlalchemy.dialects.postgresql import TSVECTOR, insert
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, insert
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -24,7 +28,8 @@ from sqlalchemy.orm import sessionmaker
 from core.models import Document, DocumentChunk, SessionRecord, SessionDocument
 from core.config import config
 from core.session import Session
-from db.base import ChunkMatch, ChunkRecord, DatabaseService
+from core.vectors import EmbeddingLike, register_vector_codec
+from db.base import ChatPreflight, ChatTurnRecord, ChunkMatch, ChunkRecord, DatabaseService
 from db.migration_ledger import MigrationLedgerSchemaError
 from db.tenant_scope import require_tenant_id
 from services.retrieval_service import (
@@ -51,6 +56,11 @@ def _is_missing_content_tsv_error(exc: BaseException) -> bool:
     return False
 
 
+def _register_vector_codec(dbapi_connection, connection_record) -> None:
+    """Send and receive ``vector`` columns as binary float32 (see core.vectors)."""
+    dbapi_connection.run_async(register_vector_codec)
+
+
 def _document_row_to_dict(document: Document) -> dict:
     return {
         "id": str(document.id),
@@ -99,6 +109,7 @@ class SQLAlchemyService(DatabaseService):
                 "command_timeout": config.SQLALCHEMY_STATEMENT_TIMEOUT_SEC,
             },
         )
+        event.listen(self.engine.sync_engine, "connect", _register_vector_codec)
         self.async_session = sessionmaker(
             self.engine,
             class_=AsyncSession,
@@ -239,6 +250,37 @@ class SQLAlchemyService(DatabaseService):
             logger.info(f"[PostgreSQL] Created document {doc_id}")
             return doc_id
 
+    async def create_documents(
+        self,
+        filenames: list[str],
+        tenant_id: str,
+        *,
+        status: str = "uploaded",
+    ) -> list[str]:
+        tenant_id = require_tenant_id(tenant_id, method="create_documents")
+        if not filenames:
+            return []
+        doc_ids = [str(uuid.uuid4()) for _ in filenames]
+        now = datetime.utcnow()
+        async with self.async_session() as session:
+            await session.execute(
+                insert(Document).values([
+                    {
+                        "id": doc_id,
+                        "file_name": filename,
+                        "tenant_id": tenant_id,
+                        "status": status,
+                        "chunks": {"total": 0, "processed": 0},
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for doc_id, filename in zip(doc_ids, filenames)
+                ])
+            )
+            await session.commit()
+        logger.info(f"[PostgreSQL] Created {len(doc_ids)} document(s) with status={status}")
+        return doc_ids
+
     async def store_chunks_with_embeddings(
         self,
         doc_id: str,
@@ -299,6 +341,27 @@ class SQLAlchemyService(DatabaseService):
                 return None
             return _document_row_to_dict(document)
 
+    async def get_document_statuses(
+        self, doc_ids: list[str], tenant_id: str
+    ) -> dict[str, str]:
+        tenant_id = require_tenant_id(tenant_id, method="get_document_statuses")
+        ids: list[uuid.UUID] = []
+        for doc_id in doc_ids:
+            try:
+                ids.append(uuid.UUID(str(doc_id)))
+            except ValueError:
+                continue  # not a UUID, so it cannot be an owned document
+        if not ids:
+            return {}
+        async with self.async_session() as session:
+            result = await session.execute(
+                select(Document.id, Document.status).where(
+                    Document.id == any_(bindparam("doc_ids", ids, type_=ARRAY(Document.id.type))),
+                    Document.tenant_id == tenant_id,
+                )
+            )
+            return {str(row.id): row.status for row in result}
+
     async def create_document_with_chunks_atomic(
         self,
         file_name: str,
@@ -381,6 +444,31 @@ class SQLAlchemyService(DatabaseService):
             await session.commit()
             logger.debug(f"[PostgreSQL] Updated status for {doc_id} -> {status}")
 
+    async def update_documents_status(
+        self,
+        doc_ids: list[str],
+        status: str,
+        tenant_id: str,
+        *,
+        error: dict | None = None,
+    ) -> None:
+        tenant_id = require_tenant_id(tenant_id, method="update_documents_status")
+        if not doc_ids:
+            return
+        values = {"status": status, "updated_at": datetime.utcnow()}
+        if error is not None:
+            values["error"] = error
+        elif status != "failed":
+            values["error"] = None
+        async with self.async_session() as session:
+            await session.execute(
+                sql_update(Document)
+                .where(Document.id.in_(doc_ids), Document.tenant_id == tenant_id)
+                .values(**values)
+            )
+            await session.commit()
+        logger.debug(f"[PostgreSQL] Updated status for {len(doc_ids)} document(s) -> {status}")
+
     async def get_document_status(self, doc_id: str, tenant_id: str) -> dict | None:
         tenant_id = require_tenant_id(tenant_id, method="get_document_status")
         async with self.async_session() as session:
@@ -449,26 +537,24 @@ class SQLAlchemyService(DatabaseService):
                 raise
 
     async def fail_stale_documents_global(self, statuses: list[str]) -> set[str]:
+        # One UPDATE ... RETURNING: selects and fails the stale rows in a single
+        # statement instead of SELECT + UPDATE WHERE id IN (<every stale id>).
         async with self.async_session() as session:
             rows = await session.execute(
-                select(Document.id).where(Document.status.in_(statuses))
+                sql_update(Document)
+                .where(Document.status.in_(statuses))
+                .values(
+                    status="failed",
+                    error={
+                        "stage": "server_restart",
+                        "message": "Server restarted while document was being processed.",
+                    },
+                    updated_at=datetime.utcnow(),
+                )
+                .returning(Document.id)
             )
             doc_ids = {str(row[0]) for row in rows}
-
-            if doc_ids:
-                await session.execute(
-                    sql_update(Document)
-                    .where(Document.id.in_(doc_ids))
-                    .values(
-                        status="failed",
-                        error={
-                            "stage": "server_restart",
-                            "message": "Server restarted while document was being processed.",
-                        },
-                        updated_at=datetime.utcnow(),
-                    )
-                )
-                await session.commit()
+            await session.commit()
 
             logger.info(f"[PostgreSQL] Marked {len(doc_ids)} stale document(s) as failed on startup")
             return doc_ids
@@ -537,7 +623,7 @@ class SQLAlchemyService(DatabaseService):
         self,
         session: AsyncSession,
         doc_id: str,
-        query_embedding: list[float],
+        query_embedding: EmbeddingLike,
         limit: int,
         tenant_id: Optional[str] = None,
     ) -> list[ChunkMatch]:
@@ -594,6 +680,9 @@ class SQLAlchemyService(DatabaseService):
                     "content_tsv column missing; apply backend/db/init/004_hybrid_retrieval.sql. "
                     "Using vector-only results for this request."
                 )
+                # Clear the aborted transaction so later searches on this
+                # session (multi-query passes) can still run.
+                await session.rollback()
                 return []
             raise
         rows = result.all()
@@ -607,68 +696,96 @@ class SQLAlchemyService(DatabaseService):
             for chunk, file_name, rank in rows
         ]
 
-    async def _search_similar_chunks(
+    async def _search_in_session(
         self,
+        session: AsyncSession,
         doc_id: str,
-        query_embedding: list[float],
+        query_embedding: EmbeddingLike,
         match_count: int,
         *,
-        session_id: Optional[str] = None,
         query_text: Optional[str] = None,
         tenant_id: Optional[str] = None,
+        keyword_cache: Optional[dict[str, list[ChunkMatch]]] = None,
     ) -> list[ChunkMatch]:
-        del session_id  # reserved for future session-scoped retrieval
-        start = time.perf_counter()
         use_hybrid = (
             config.HYBRID_RETRIEVAL_ENABLED
             and query_text
             and query_text.strip()
         )
+        if not use_hybrid:
+            return await self._find_vector_chunks(
+                session, doc_id, query_embedding, match_count,
+                tenant_id=tenant_id,
+            )
+
         candidate_limit = match_count * 2
+        vector_matches = await self._find_vector_chunks(
+            session, doc_id, query_embedding, candidate_limit,
+            tenant_id=tenant_id,
+        )
+        keyword_text = query_text.strip()
+        if keyword_cache is not None and keyword_text in keyword_cache:
+            keyword_matches = keyword_cache[keyword_text]
+        else:
+            keyword_matches = await self._find_keyword_chunks(
+                session, doc_id, keyword_text, candidate_limit,
+                tenant_id=tenant_id,
+            )
+            if keyword_cache is not None:
+                keyword_cache[keyword_text] = keyword_matches
+        matches_by_id: dict[str, ChunkMatch] = {}
+        for match in vector_matches:
+            matches_by_id[match.id] = match
+        for match in keyword_matches:
+            matches_by_id[match.id] = self._merge_hybrid_match(
+                matches_by_id.get(match.id),
+                match,
+            )
 
+        rrf_scores = reciprocal_rank_fusion_scores(
+            [
+                [m.id for m in vector_matches],
+                [m.id for m in keyword_matches],
+            ],
+            limit=match_count,
+        )
+        fused_ids = list(rrf_scores.keys())
+        return merge_chunk_matches_with_scores(
+            fused_ids,
+            matches_by_id,
+            rrf_scores,
+            score_type=SCORE_TYPE_HYBRID_RRF,
+        )
+
+    async def _search_similar_chunks(
+        self,
+        doc_id: str,
+        query_embedding: EmbeddingLike,
+        match_count: int,
+        *,
+        session_id: Optional[str] = None,
+        query_text: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> list[ChunkMatch]:
+        del session_id  # reserved for future session-scoped retrieval
+        start = time.perf_counter()
         try:
             async with self._retrieval_semaphore:
                 async with self.async_session() as session:
-                    if not use_hybrid:
-                        matches = await self._find_vector_chunks(
-                            session, doc_id, query_embedding, match_count,
-                            tenant_id=tenant_id,
-                        )
-                    else:
-                        vector_matches = await self._find_vector_chunks(
-                            session, doc_id, query_embedding, candidate_limit,
-                            tenant_id=tenant_id,
-                        )
-                        keyword_matches = await self._find_keyword_chunks(
-                            session, doc_id, query_text.strip(), candidate_limit,
-                            tenant_id=tenant_id,
-                        )
-                        matches_by_id: dict[str, ChunkMatch] = {}
-                        for match in vector_matches:
-                            matches_by_id[match.id] = match
-                        for match in keyword_matches:
-                            matches_by_id[match.id] = self._merge_hybrid_match(
-                                matches_by_id.get(match.id),
-                                match,
-                            )
-
-                        rrf_scores = reciprocal_rank_fusion_scores(
-                            [
-                                [m.id for m in vector_matches],
-                                [m.id for m in keyword_matches],
-                            ],
-                            limit=match_count,
-                        )
-                        fused_ids = list(rrf_scores.keys())
-                        matches = merge_chunk_matches_with_scores(
-                            fused_ids,
-                            matches_by_id,
-                            rrf_scores,
-                            score_type=SCORE_TYPE_HYBRID_RRF,
-                        )
-
+                    matches = await self._search_in_session(
+                        session,
+                        doc_id,
+                        query_embedding,
+                        match_count,
+                        query_text=query_text,
+                        tenant_id=tenant_id,
+                    )
                     duration_ms = int((time.perf_counter() - start) * 1000)
-                    mode = "hybrid" if use_hybrid else "vector"
+                    mode = (
+                        "hybrid"
+                        if config.HYBRID_RETRIEVAL_ENABLED and query_text and query_text.strip()
+                        else "vector"
+                    )
                     logger.debug(
                         "[PostgreSQL] %s search returned %s chunks for doc_id=%s in %sms",
                         mode,
@@ -689,7 +806,7 @@ class SQLAlchemyService(DatabaseService):
     async def find_similar_chunks(
         self,
         doc_id: str,
-        query_embedding: list[float],
+        query_embedding: EmbeddingLike,
         match_count: int,
         *,
         tenant_id: str,
@@ -706,6 +823,56 @@ class SQLAlchemyService(DatabaseService):
             tenant_id=tenant_id,
         )
 
+    async def find_similar_chunks_multi(
+        self,
+        doc_id: str,
+        query_embeddings: list[EmbeddingLike],
+        match_count: int,
+        *,
+        tenant_id: str,
+        query_texts: Optional[list[Optional[str]]] = None,
+    ) -> list[list[ChunkMatch]]:
+        tenant_id = require_tenant_id(tenant_id, method="find_similar_chunks_multi")
+        if query_texts is None:
+            query_texts = [None] * len(query_embeddings)
+        if len(query_texts) != len(query_embeddings):
+            raise ValueError("query_texts must match query_embeddings in length")
+        if not query_embeddings:
+            return []
+        start = time.perf_counter()
+        # Keyword results depend only on the text, so repeated texts in one
+        # pass (several embeddings for the same question) share one search.
+        keyword_cache: dict[str, list[ChunkMatch]] = {}
+        try:
+            async with self._retrieval_semaphore:
+                async with self.async_session() as session:
+                    results = [
+                        await self._search_in_session(
+                            session,
+                            doc_id,
+                            query_embedding,
+                            match_count,
+                            query_text=query_text,
+                            tenant_id=tenant_id,
+                            keyword_cache=keyword_cache,
+                        )
+                        for query_embedding, query_text in zip(query_embeddings, query_texts)
+                    ]
+            logger.debug(
+                "[PostgreSQL] multi-query search ran %s queries for doc_id=%s in %sms",
+                len(results),
+                doc_id,
+                int((time.perf_counter() - start) * 1000),
+            )
+            return results
+        except Exception:
+            logger.exception(
+                "[PostgreSQL] Multi-query chunk search failed for doc_id=%s in %sms",
+                doc_id,
+                int((time.perf_counter() - start) * 1000),
+            )
+            raise
+
     async def list_tenant_documents(self, tenant_id: str) -> list[str]:
         tenant_id = require_tenant_id(tenant_id, method="list_tenant_documents")
         async with self.async_session() as session:
@@ -793,25 +960,30 @@ class SQLAlchemyService(DatabaseService):
 
             user_msg_id = str(uuid.uuid4())
             assistant_msg_id = str(uuid.uuid4())
-            async with session.begin():
-                session.add(
-                    ChatMessage(
-                        id=user_msg_id,
-                        session_id=session_id,
-                        tenant_id=tenant_id,
-                        role="user",
-                        content=question,
-                    )
-                )
-                session.add(
-                    ChatMessage(
-                        id=assistant_msg_id,
-                        session_id=session_id,
-                        tenant_id=tenant_id,
-                        role="assistant",
-                        content=answer,
-                    )
-                )
+            # One multi-row INSERT; the assistant row is stamped 1µs later so
+            # history ordering never depends on the random id tie-break.
+            created_at = datetime.utcnow()
+            await session.execute(
+                insert(ChatMessage).values([
+                    {
+                        "id": user_msg_id,
+                        "session_id": session_id,
+                        "tenant_id": tenant_id,
+                        "role": "user",
+                        "content": question,
+                        "created_at": created_at,
+                    },
+                    {
+                        "id": assistant_msg_id,
+                        "session_id": session_id,
+                        "tenant_id": tenant_id,
+                        "role": "assistant",
+                        "content": answer,
+                        "created_at": created_at + timedelta(microseconds=1),
+                    },
+                ])
+            )
+            await session.commit()
             logger.debug(
                 "[PostgreSQL] Stored chat turn for session %s (user=%s, assistant=%s)",
                 session_id,
@@ -820,41 +992,232 @@ class SQLAlchemyService(DatabaseService):
             )
             return user_msg_id, assistant_msg_id
 
+    async def store_chat_turns(self, turns: list[ChatTurnRecord]) -> None:
+        if not turns:
+            return
+        rows: list[dict] = []
+        for turn in turns:
+            tenant_id = require_tenant_id(turn.tenant_id, method="store_chat_turns")
+            rows.append({
+                "id": turn.user_message_id,
+                "session_id": turn.session_id,
+                "tenant_id": tenant_id,
+                "role": "user",
+                "content": turn.question,
+                "created_at": turn.created_at,
+            })
+            rows.append({
+                "id": turn.assistant_message_id,
+                "session_id": turn.session_id,
+                "tenant_id": tenant_id,
+                "role": "assistant",
+                "content": turn.answer,
+                "created_at": turn.created_at + timedelta(microseconds=1),
+            })
+        async with self.async_session() as session:
+            from core.models import ChatMessage
+
+            # Idempotent on id so a flush retried after an unclear commit
+            # never duplicates messages.
+            await session.execute(
+                insert(ChatMessage).values(rows).on_conflict_do_nothing(index_elements=["id"])
+            )
+            await session.commit()
+            logger.debug("[PostgreSQL] Stored %s chat turns in one insert", len(turns))
+
+    async def _select_session_history(
+        self,
+        db_session: AsyncSession,
+        session_id: str,
+        tenant_id: str,
+        limit: int,
+        *,
+        with_summary: bool = False,
+        oldest_first: bool = False,
+    ) -> list[dict]:
+        from core.models import ChatMessage
+
+        summary_row = None
+        if with_summary:
+            summary_row = (
+                await db_session.execute(
+                    select(SessionRecord.summary, SessionRecord.summarized_through).where(
+                        SessionRecord.id == session_id,
+                        SessionRecord.tenant_id == tenant_id,
+                    )
+                )
+            ).one_or_none()
+            if summary_row is not None and not (
+                summary_row.summary and summary_row.summarized_through
+            ):
+                summary_row = None
+
+        stmt = (
+            select(ChatMessage)
+            .where(
+                ChatMessage.session_id == session_id,
+                ChatMessage.tenant_id == tenant_id,
+            )
+            .order_by(
+                *(
+                    (ChatMessage.created_at.asc(), ChatMessage.id.asc())
+                    if oldest_first
+                    else (ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                )
+            )
+            .limit(limit)
+        )
+
+        if summary_row is not None:
+            # Messages folded into the summary are replaced by it.
+            stmt = stmt.where(ChatMessage.created_at > summary_row.summarized_through)
+
+        result = await db_session.execute(stmt)
+        messages = result.scalars().all()
+
+        history = [
+            {
+                "id": str(msg.id),
+                "role": msg.role,
+                "content": msg.content,
+                "created_at": str(msg.created_at) if msg.created_at else None,
+            }
+            for msg in (messages if oldest_first else reversed(messages))
+        ]
+        if summary_row is not None:
+            history.insert(
+                0,
+                {
+                    "id": f"summary:{session_id}",
+                    "role": "summary",
+                    "content": summary_row.summary,
+                    "created_at": str(summary_row.summarized_through),
+                },
+            )
+        return history
+
     async def get_session_history(
         self,
         session_id: str,
         tenant_id: str,
         *,
         limit: int = 20,
+        with_summary: bool = False,
+        oldest_first: bool = False,
     ) -> list[dict]:
         tenant_id = require_tenant_id(tenant_id, method="get_session_history")
         async with self.async_session() as session:
-            from core.models import ChatMessage
-            stmt = (
-                select(ChatMessage)
-                .where(
-                    ChatMessage.session_id == session_id,
-                    ChatMessage.tenant_id == tenant_id,
-                )
-                .order_by(
-                    ChatMessage.created_at.desc(),
-                    ChatMessage.id.desc(),
-                )
-                .limit(limit)
+            return await self._select_session_history(
+                session,
+                session_id,
+                tenant_id,
+                limit,
+                with_summary=with_summary,
+                oldest_first=oldest_first,
             )
 
+    async def store_session_summary(
+        self,
+        session_id: str,
+        tenant_id: str,
+        summary: str,
+        summarized_through: datetime,
+        *,
+        previous_through: Optional[datetime] = None,
+    ) -> bool:
+        tenant_id = require_tenant_id(tenant_id, method="store_session_summary")
+        # Compare-and-set on summarized_through so concurrent summarizers
+        # (other processes) cannot overwrite a newer summary.
+        stmt = (
+            sql_update(SessionRecord)
+            .where(
+                SessionRecord.id == session_id,
+                SessionRecord.tenant_id == tenant_id,
+                SessionRecord.summarized_through.is_not_distinct_from(previous_through),
+            )
+            .values(summary=summary, summarized_through=summarized_through)
+        )
+        async with self.async_session() as session:
             result = await session.execute(stmt)
-            messages = result.scalars().all()
+            await session.commit()
+            return result.rowcount > 0
 
-            return [
-                {
-                    "id": str(msg.id),
-                    "role": msg.role,
-                    "content": msg.content,
-                    "created_at": str(msg.created_at) if msg.created_at else None,
-                }
-                for msg in reversed(messages)
-            ]
+    async def chat_preflight(
+        self,
+        doc_id: str,
+        tenant_id: str,
+        *,
+        session_id: Optional[str] = None,
+        history_limit: int = 20,
+        with_summary: bool = False,
+    ) -> Optional[ChatPreflight]:
+        tenant_id = require_tenant_id(tenant_id, method="chat_preflight")
+        session_columns = (
+            SessionRecord.id,
+            SessionRecord.tenant_id,
+            SessionRecord.created_at,
+            SessionRecord.last_active,
+        )
+        async with self.async_session() as db_session:
+            async with db_session.begin():
+                document_status = await db_session.scalar(
+                    select(Document.status).where(
+                        Document.id == doc_id,
+                        Document.tenant_id == tenant_id,
+                    )
+                )
+                if document_status is None:
+                    return None
+
+                record = None
+                if session_id:
+                    # Create the session or touch last_active, unless another
+                    # tenant owns the id (then no row comes back).
+                    result = await db_session.execute(
+                        insert(SessionRecord)
+                        .values(id=session_id, tenant_id=tenant_id)
+                        .on_conflict_do_update(
+                            index_elements=["id"],
+                            set_={"last_active": datetime.utcnow()},
+                            where=or_(
+                                SessionRecord.tenant_id == tenant_id,
+                                SessionRecord.tenant_id.is_(None),
+                            ),
+                        )
+                        .returning(*session_columns)
+                    )
+                    record = result.one_or_none()
+                is_new_session = record is None
+                if record is None:
+                    result = await db_session.execute(
+                        insert(SessionRecord)
+                        .values(id=str(uuid.uuid4()), tenant_id=tenant_id)
+                        .returning(*session_columns)
+                    )
+                    record = result.one()
+
+                await db_session.execute(
+                    insert(SessionDocument)
+                    .values(session_id=record.id, document_id=doc_id)
+                    .on_conflict_do_nothing(index_elements=["session_id", "document_id"])
+                )
+                doc_ids = await self._load_session_document_ids(db_session, record.id)
+                history = (
+                    []
+                    if is_new_session
+                    else await self._select_session_history(
+                        db_session,
+                        record.id,
+                        tenant_id,
+                        history_limit,
+                        with_summary=with_summary,
+                    )
+                )
+            return ChatPreflight(
+                session=self._session_from_record(record, doc_ids),
+                document_status=document_status,
+                history=history,
+            )
 
     # ── Session persistence ──────────────────────────────────────────────────
 
@@ -922,6 +1285,42 @@ class SQLAlchemyService(DatabaseService):
             doc_ids = await self._load_session_document_ids(db_session, session_id)
             return self._session_from_record(record, doc_ids)
 
+    async def resolve_batch_sessions(
+        self, tenant_id: str, requested_ids: list[str], new_count: int
+    ) -> tuple[dict[str, str], list[str]]:
+        tenant_id = require_tenant_id(tenant_id, method="resolve_batch_sessions")
+        requested_ids = list(dict.fromkeys(requested_ids))
+        async with self.async_session() as db_session:
+            async with db_session.begin():
+                resolved: dict[str, str] = {}
+                if requested_ids:
+                    # Create missing sessions or touch last_active, unless
+                    # another tenant owns the id (then no row comes back).
+                    result = await db_session.execute(
+                        insert(SessionRecord)
+                        .values([{"id": sid, "tenant_id": tenant_id} for sid in requested_ids])
+                        .on_conflict_do_update(
+                            index_elements=["id"],
+                            set_={"last_active": datetime.utcnow()},
+                            where=or_(
+                                SessionRecord.tenant_id == tenant_id,
+                                SessionRecord.tenant_id.is_(None),
+                            ),
+                        )
+                        .returning(SessionRecord.id)
+                    )
+                    resolved = {sid: sid for sid in result.scalars()}
+                foreign = [sid for sid in requested_ids if sid not in resolved]
+                fresh_ids = [str(uuid.uuid4()) for _ in range(new_count + len(foreign))]
+                if fresh_ids:
+                    await db_session.execute(
+                        insert(SessionRecord).values(
+                            [{"id": sid, "tenant_id": tenant_id} for sid in fresh_ids]
+                        )
+                    )
+                resolved.update(zip(foreign, fresh_ids[new_count:]))
+            return resolved, fresh_ids[:new_count]
+
     async def get_session_record(
         self, session_id: str, tenant_id: Optional[str]
     ) -> Optional[Session]:
@@ -1024,3 +1423,19 @@ class SQLAlchemyService(DatabaseService):
             logger.debug(
                 f"[PostgreSQL] Bound document {document_id} to session {session_id}"
             )
+
+    async def add_session_documents(self, bindings: list[tuple[str, str]]) -> None:
+        unique = list(dict.fromkeys(bindings))
+        if not unique:
+            return
+        async with self.async_session() as db_session:
+            await db_session.execute(
+                insert(SessionDocument)
+                .values([
+                    {"session_id": session_id, "document_id": document_id}
+                    for session_id, document_id in unique
+                ])
+                .on_conflict_do_nothing(index_elements=["session_id", "document_id"])
+            )
+            await db_session.commit()
+            logger.debug(f"[PostgreSQL] Bound {len(unique)} session document(s)")
@@ -34,6 +34,10 @@ from core.provider_validation import (
     ProviderConfigError,
     validate_provider_configuration_from_env,
 )
+from services.chat_turn_writer import chat_turn_writer
+from services.providers import get_embedding_provider, get_llm_provider, reset_providers
+from services.providers.transport import close_http_clients, warm_http_clients
+from services.session_summary_service import session_summarizer
 from services.queue_service import ingestion_queue
 
 import logging
@@ -74,6 +78,17 @@ async def _read_migration_ledger_with_retry() -> list[str] | None:
     return None
 
 
+async def _warm_provider_connections() -> None:
+    """Build the configured providers and pre-open connections to their hosts."""
+
+    try:
+        get_embedding_provider()
+        get_llm_provider()
+        await warm_http_clients()
+    except Exception:
+        logger.warning("Provider connection warmup failed — continuing", exc_info=True)
+
+
 def _log_operator_issue(level: int, message: str) -> None:
     """Write migration drift to both app logs and Docker-visible Uvicorn logs."""
 
@@ -99,6 +114,10 @@ async def lifespan(app: FastAPI):
                 llm_provider=config.LLM_PROVIDER,
                 embedding_provider=config.EMBEDDING_PROVIDER,
                 enable_streaming=config.ENABLE_STREAMING,
+                llm_fallbacks=tuple(name for name, _ in config.LLM_FALLBACK_PROVIDERS),
+                embedding_fallbacks=tuple(
+                    name for name, _ in config.EMBEDDING_FALLBACK_PROVIDERS
+                ),
             )
         except ProviderConfigError as exc:
             logger.error("%s Startup aborted.", exc)
@@ -205,10 +224,17 @@ async def lifespan(app: FastAPI):
             dev_tenant,
         )
 
+    if config.APP_ENV.lower() != "test" and config.PROVIDER_HTTP_WARMUP_CONNECTIONS > 0:
+        await _warm_provider_connections()
+
     await ingestion_queue.start()
     logger.info("Application startup complete.")
     yield
     await ingestion_queue.stop()
+    await chat_turn_writer.stop()
+    await session_summarizer.stop()
+    await close_http_clients()
+    reset_providers()
     logger.info("Application shutdown complete.")
 
 
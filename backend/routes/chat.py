@@ -18,7 +18,7 @@ from services.chat_service import (
     merge_batch_results,
     prepare_batch_chat_items,
 )
-from services.session_service import get_or_create_session, register_session_document
+from services.chat_turn_writer import chat_turn_writer
 from services.tenant_registry import register_tenant_document
 
 logger = logging.getLogger(__name__)
@@ -82,10 +82,22 @@ class ChatSourceResponse(BaseModel):
     )
 
 
-async def _assert_document_owned(doc_id: str, tenant_id: str) -> None:
-    """Raise 404 if the document does not exist or belongs to a different tenant."""
-    doc = await db.get_document(doc_id, tenant_id=tenant_id)
-    if doc is None:
+async def _chat_preflight(
+    doc_id: str, tenant_id: str, session_id: Optional[str]
+) -> db.ChatPreflight:
+    """Resolve document, session and history in one DB transaction.
+
+    Raises 404 if the document does not exist or belongs to a different tenant,
+    and 409 if it has not finished ingestion.
+    """
+    preflight = await db.chat_preflight(
+        doc_id,
+        tenant_id=tenant_id,
+        session_id=session_id,
+        history_limit=config.MAX_SESSION_HISTORY_MESSAGES,
+        with_summary=config.SESSION_SUMMARY_ENABLED,
+    )
+    if preflight is None:
         raise HTTPException(
             status_code=404,
             detail={
@@ -94,6 +106,24 @@ async def _assert_document_owned(doc_id: str, tenant_id: str) -> None:
                 "document_id": doc_id,
             },
         )
+    if preflight.document_status != "completed":
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "code": "document_not_ready",
+                "message": "Document is still being processed or failed ingestion.",
+                "document_id": doc_id,
+                "status": preflight.document_status,
+            },
+        )
+    register_tenant_document(tenant_id, doc_id)
+    preflight.history = chat_turn_writer.merge_history(
+        preflight.session.id,
+        tenant_id,
+        preflight.history,
+        limit=config.MAX_SESSION_HISTORY_MESSAGES,
+    )
+    return preflight
 
 
 class ChatBatchItem(BaseModel):
@@ -150,22 +180,17 @@ async def chat(
 
     doc_id_str = str(payload.doc_id)
     tenant_id = require_current_tenant(auth)
-    await _assert_document_owned(doc_id_str, tenant_id)
-
-    # Initialize or retrieve session
-    session = await get_or_create_session(
-        session_id=payload.session_id, tenant_id=tenant_id
-    )
-    await register_session_document(session.id, doc_id_str, tenant_id)
-    register_tenant_document(tenant_id, doc_id_str)
+    preflight = await _chat_preflight(doc_id_str, tenant_id, payload.session_id)
 
     return await answer_question_for_document(
         question=payload.question,
         doc_id=doc_id_str,
         match_count=payload.match_count,
         auth=auth,
-        session_id=session.id,
+        session_id=preflight.session.id,
         scope=payload.scope,
+        history=preflight.history,
+        session_doc_ids=preflight.session.document_ids,
         debug_retrieval=_resolve_debug_retrieval(
             query_param=debug_retrieval,
             request_field=payload.debug_retrieval,
@@ -196,7 +221,9 @@ async def chat_stream(
 
     Interrupted streams (client disconnect, cancellation, or provider failure
     mid-stream) do not persist assistant messages. Successful streams persist
-    the user/assistant turn atomically before the ``complete`` event is emitted.
+    the user/assistant turn atomically before the ``complete`` event is emitted
+    (with CHAT_TURN_WRITE_BEHIND_ENABLED the turn is buffered and inserted
+    shortly after, but is already visible to the session's next request).
     """
     if not config.ENABLE_STREAMING:
         raise HTTPException(
@@ -211,14 +238,7 @@ async def chat_stream(
 
     doc_id_str = str(payload.doc_id)
     tenant_id = require_current_tenant(auth)
-    await _assert_document_owned(doc_id_str, tenant_id)
-
-    # Initialize or retrieve session
-    session = await get_or_create_session(
-        session_id=payload.session_id, tenant_id=tenant_id
-    )
-    await register_session_document(session.id, doc_id_str, tenant_id)
-    register_tenant_document(tenant_id, doc_id_str)
+    preflight = await _chat_preflight(doc_id_str, tenant_id, payload.session_id)
 
     return StreamingResponse(
         answer_question_stream_for_document(
@@ -226,8 +246,10 @@ async def chat_stream(
             doc_id=doc_id_str,
             match_count=payload.match_count,
             auth=auth,
-            session_id=session.id,
+            session_id=preflight.session.id,
             scope=payload.scope,
+            history=preflight.history,
+            session_doc_ids=preflight.session.document_ids,
             debug_retrieval=_resolve_debug_retrieval(
                 query_param=debug_retrieval,
                 request_field=payload.debug_retrieval,
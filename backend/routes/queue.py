@@ -1,10 +1,16 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Annotated, Optional
 
-from core.auth import AuthContext, require_auth
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+
+from core.auth import AuthContext, require_auth, require_current_tenant
 from core.config import config
 from middleware.rate_limit import limiter
+from services.providers.concurrency import provider_concurrency_stats
+from services.providers.transport import http_client_stats
+from services.queue_base import DLQEntry, tenant_queue_key
 from services.queue_service import ingestion_queue
 
 logger = logging.getLogger(__name__)
@@ -14,50 +20,121 @@ router = APIRouter()
 # SECURITY / OPS — READ BEFORE DEPLOYMENT
 # -----------------------------------------------------------------------------
 # GET /queue/stats returns internal operational metrics (queue depth, worker
-# count, DLQ metadata). It is disabled when APP_ENV=production (404). In
+# count, DLQ metadata, provider concurrency limits). It is disabled when APP_ENV=production (404). In
 # non-production environments it remains available for local debugging; gate
 # further (auth, allowlist) if you run a shared staging environment.
+#
+# The DLQ list/replay routes below follow the same gate; in production use
+# the `dlq-list` / `dlq-replay` CLI commands instead.
 # =============================================================================
 
+DLQ_PAGE_MAX = 500
+
+
+class DLQReplayRequest(BaseModel):
+    entry_ids: list[str] = Field(..., min_length=1, max_length=DLQ_PAGE_MAX)
+
+
+def _require_non_production() -> None:
+    """Hide the queue inspection routes in production (404, checked before auth)."""
+    if config.APP_ENV.lower() == "production":
+        raise HTTPException(status_code=404, detail="Not found")
+
 
-@router.get("/queue/stats")
+def _format_dlq_entry(entry: DLQEntry) -> dict:
+    return {
+        "entry_id": entry.entry_id,
+        "doc_id": entry.doc_id,
+        "file_name": entry.file_name,
+        "attempt": entry.attempt,
+        "error": entry.error,
+        "failed_at": entry.failed_at.isoformat(),
+        "replayable": entry.payload_path is not None,
+    }
+
+
+@router.get("/queue/stats", dependencies=[Depends(_require_non_production)])
 @limiter.limit(config.RATE_LIMIT_QUEUE_STATS)
 def get_queue_stats(request: Request, auth: AuthContext = Depends(require_auth)):
     """
     Return live ingestion queue statistics and dead-letter queue entries.
 
-    DLQ entries are scoped to the authenticated tenant; cross-tenant entries
-    are not visible. File bytes are never exposed.
+    DLQ entries and queue depth are scoped to the authenticated tenant;
+    cross-tenant entries are not visible. File bytes are never exposed.
 
     This endpoint returns 404 in production (APP_ENV=production) — it is
     intended for local debugging only and must not be exposed on shared
     staging environments without additional access controls.
     """
-    if config.APP_ENV.lower() == "production":
-        raise HTTPException(status_code=404, detail="Not found")
-
     tenant_id = auth.tenant_id
-    all_dlq = ingestion_queue.dlq_jobs()
 
-    # Filter to entries belonging to the authenticated tenant only.
-    # Entries with no tenant_id (from before this change was deployed) are
+    # Only the first DLQ page is inlined; page further with GET /queue/dlq.
+    # Entries with no tenant_id (from before tenant scoping was deployed) are
     # excluded from all filtered views to avoid cross-tenant leakage.
-    tenant_dlq = [e for e in all_dlq if e.tenant_id == tenant_id]
-
-    dlq_entries = [
-        {
-            "doc_id": entry.doc_id,
-            "file_name": entry.file_name,
-            "attempt": entry.attempt,
-            "error": entry.error,
-            "failed_at": entry.failed_at.isoformat(),
-        }
-        for entry in tenant_dlq
-    ]
+    dlq_page = (
+        ingestion_queue.dlq_page(tenant_id=tenant_id)
+        if tenant_id
+        else None
+    )
+    dlq_entries = [_format_dlq_entry(e) for e in dlq_page.entries] if dlq_page else []
+
+    # Per-tenant depth follows the same isolation rule: callers see their own
+    # sub-queue depth and only a count of other tenants with queued work.
+    tenant_depths = ingestion_queue.tenant_depths()
 
     return {
         "queue_size": ingestion_queue.queue_size(),
+        "tenant_queue_depth": tenant_depths.get(tenant_queue_key(tenant_id), 0),
+        "tenants_queued": len(tenant_depths),
+        "retry_scheduled": ingestion_queue.scheduled_retry_count(),
         "worker_count": ingestion_queue.active_worker_count(),
         "dlq_size": len(dlq_entries),
         "dlq": dlq_entries,
+        "dlq_next_cursor": dlq_page.next_cursor if dlq_page else None,
+        "provider_concurrency": provider_concurrency_stats(),
+        "provider_http": http_client_stats(),
+    }
+
+
+@router.get("/queue/dlq", dependencies=[Depends(_require_non_production)])
+@limiter.limit(config.RATE_LIMIT_QUEUE_STATS)
+def list_dlq_entries(
+    request: Request,
+    cursor: Annotated[Optional[str], Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=DLQ_PAGE_MAX)] = 50,
+    auth: AuthContext = Depends(require_auth),
+):
+    """Page through the tenant's dead-letter entries, oldest first."""
+    tenant_id = require_current_tenant(auth)
+    try:
+        page = ingestion_queue.dlq_page(cursor=cursor, limit=limit, tenant_id=tenant_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "entries": [_format_dlq_entry(e) for e in page.entries],
+        "next_cursor": page.next_cursor,
+    }
+
+
+@router.post("/queue/dlq/replay", dependencies=[Depends(_require_non_production)])
+@limiter.limit(config.RATE_LIMIT_QUEUE_STATS)
+async def replay_dlq_entries(
+    request: Request,
+    payload: DLQReplayRequest,
+    auth: AuthContext = Depends(require_auth),
+):
+    """
+    Put selected dead-letter entries back on the queue as fresh attempts.
+
+    Entries that are not the caller's, no longer exist or have no stored
+    payload are reported under ``skipped``.
+    """
+    tenant_id = require_current_tenant(auth)
+    replayed = await ingestion_queue.replay_dlq(payload.entry_ids, tenant_id=tenant_id)
+    replayed_ids = {entry.entry_id for entry in replayed}
+    return {
+        "replayed": [
+            {"entry_id": entry.entry_id, "doc_id": entry.doc_id} for entry in replayed
+        ],
+        "skipped": [i for i in dict.fromkeys(payload.entry_ids) if i not in replayed_ids],
     }
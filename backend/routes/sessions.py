@@ -9,6 +9,7 @@ from core.auth import AuthContext, require_auth, require_current_tenant
 from core.config import config
 from core.session import Session
 from services import session_service
+from services.chat_turn_writer import chat_turn_writer
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -108,6 +109,9 @@ async def get_session_history(session_id: str, auth: AuthContext = Depends(requi
         tenant_id=tenant_id,
         limit=config.MAX_SESSION_HISTORY_MESSAGES,
     )
+    messages = chat_turn_writer.merge_history(
+        session_id, tenant_id, messages, limit=config.MAX_SESSION_HISTORY_MESSAGES
+    )
 
     return SessionHistoryResponse(
         messages=[
@@ -18,6 +18,12 @@ from core.clients import redis_client
 from core.config import config
 from middleware.rate_limit import limiter
 from routes.root import _is_browser
+from services.chat_service import chat_singleflight_stats
+from services.chat_turn_writer import chat_turn_writer
+from services.providers.failover import provider_failover_stats
+from services.providers.hedging import query_embedding_hedger
+from services.session_summary_service import session_summarizer
+from services.query_service import query_transform_cache_stats
 from services.queue_service import ingestion_queue
 
 logger = logging.getLogger(__name__)
@@ -362,6 +368,12 @@ def _build_payload(
             "memory_usage": memory_pct,
             "documents_indexed": documents_indexed,
             "total_queries": None,
+            "query_transform_cache": query_transform_cache_stats(),
+            "chat_singleflight": chat_singleflight_stats(),
+            "chat_turn_writer": chat_turn_writer.stats(),
+            "session_summarizer": session_summarizer.stats(),
+            "embedding_hedging": query_embedding_hedger.stats(),
+            "provider_failover": provider_failover_stats(),
         },
         "uptime": uptime_str,
         "version": version,
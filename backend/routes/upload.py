@@ -1,4 +1,7 @@
+import io
 import logging
+import zipfile
+from dataclasses import dataclass
 
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 
@@ -16,6 +19,10 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 ingestion_pipeline = IngestionPipeline()
 
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+_ZIP_MEMBER_CONTENT_TYPES = {".pdf": "application/pdf", ".txt": "text/plain"}
+QUEUE_FULL_ERROR = {"stage": "queued", "message": "Queue is at capacity. Please retry later."}
+
 
 def _http_error(
     status_code: int,
@@ -35,6 +42,80 @@ def _http_error(
     return HTTPException(status_code=status_code, detail=detail, headers=headers)
 
 
+@dataclass
+class _BatchFile:
+    """One file of a batch upload; duck-types the UploadFile fields validate_file reads."""
+
+    filename: str
+    content_type: str | None
+    file_bytes: bytes
+    error: UploadPipelineError | None = None
+
+
+def _is_zip(file: UploadFile) -> bool:
+    return file.content_type in ZIP_CONTENT_TYPES or (
+        (file.filename or "").lower().endswith(".zip")
+    )
+
+
+def _expand_zip(archive_name: str, data: bytes) -> list[_BatchFile]:
+    """
+    Unpack a zip upload into batch files, typed by extension.
+
+    An unreadable archive becomes a single rejected entry; too many members
+    rejects the whole batch.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+        ]
+        if len(members) > config.UPLOAD_BATCH_MAX_FILES:
+            raise _too_many_files_error()
+        files = []
+        for info in members:
+            name = _sanitize_filename(info.filename)
+            suffix = name[name.rfind("."):].lower() if "." in name else ""
+            with archive.open(info) as member:
+                # Read one byte past the limit so validate_file reports the size
+                # without inflating an arbitrarily large member.
+                member_bytes = member.read(config.MAX_UPLOAD_SIZE_BYTES + 1)
+            files.append(_BatchFile(name, _ZIP_MEMBER_CONTENT_TYPES.get(suffix), member_bytes))
+        return files
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, RuntimeError):
+        return [_BatchFile(archive_name, None, b"", error=UploadPipelineError(
+            status_code=400,
+            code="invalid_archive",
+            stage="validation",
+            message="Zip archive could not be read.",
+        ))]
+
+
+def _too_many_files_error() -> UploadPipelineError:
+    return UploadPipelineError(
+        status_code=413,
+        code="too_many_files",
+        stage="validation",
+        message=f"A batch may contain at most {config.UPLOAD_BATCH_MAX_FILES} files.",
+    )
+
+
+def _rejected_entry(
+    file_name: str,
+    error: UploadPipelineError,
+    document_id: str | None = None,
+) -> dict:
+    entry = {
+        "file_name": file_name,
+        "status": "rejected" if document_id is None else "failed",
+        "error": {"code": error.code, "stage": error.stage, "message": error.message},
+    }
+    if document_id:
+        entry["document_id"] = document_id
+    return entry
+
+
 @router.post("/upload", status_code=202)
 @limiter.limit(config.RATE_LIMIT_UPLOAD)
 async def upload(request: Request, file: UploadFile = File(...), auth: AuthContext = Depends(require_auth)):
@@ -74,7 +155,7 @@ async def upload(request: Request, file: UploadFile = File(...), auth: AuthConte
             await db.update_document_status(
                 doc_id=doc_id,
                 status="failed",
-                error={"stage": "queued", "message": "Queue is at capacity. Please retry later."},
+                error=QUEUE_FULL_ERROR,
                 tenant_id=tenant_id,
             )
             raise _http_error(
@@ -153,3 +234,154 @@ async def upload(request: Request, file: UploadFile = File(...), auth: AuthConte
             message="Upload failed. Please try again.",
             document_id=doc_id,
         )
+
+
+@router.post("/upload/batch", status_code=202)
+@limiter.limit(config.RATE_LIMIT_UPLOAD_BATCH)
+async def upload_batch(
+    request: Request,
+    files: list[UploadFile] = File(...),
+    auth: AuthContext = Depends(require_auth),
+):
+    """
+    Accept many files (or zip archives of PDF/TXT files) in one request.
+
+    Valid files become documents in a single INSERT already marked queued and
+    are enqueued together; invalid files are reported per file without
+    failing the rest. The response lists every file in upload order.
+    """
+    tenant_id = require_current_tenant(auth)
+
+    batch: list[_BatchFile] = []
+    try:
+        for file in files:
+            file_bytes = await file.read()
+            safe_filename = _sanitize_filename(file.filename)
+            if _is_zip(file):
+                batch.extend(_expand_zip(safe_filename, file_bytes))
+            else:
+                batch.append(_BatchFile(safe_filename, file.content_type, file_bytes))
+            if len(batch) > config.UPLOAD_BATCH_MAX_FILES:
+                raise _too_many_files_error()
+    except UploadPipelineError as e:
+        raise _http_error(
+            status_code=e.status_code,
+            code=e.code,
+            stage=e.stage,
+            message=e.message,
+        )
+
+    results: list[dict | None] = [None] * len(batch)
+    valid: list[int] = []
+    for index, item in enumerate(batch):
+        try:
+            if item.error is not None:
+                raise item.error
+            ingestion_pipeline.validate_file(item, item.file_bytes)
+        except UploadPipelineError as e:
+            results[index] = _rejected_entry(item.filename, e)
+        else:
+            valid.append(index)
+
+    if not valid:
+        exc = _http_error(
+            status_code=400,
+            code="no_valid_files",
+            stage="validation",
+            message="None of the uploaded files could be accepted.",
+        )
+        exc.detail["files"] = results
+        raise exc
+
+    doc_ids: list[str] = []
+    try:
+        doc_ids = await db.create_documents(
+            [batch[i].filename for i in valid], tenant_id=tenant_id, status="queued"
+        )
+        for doc_id in doc_ids:
+            register_tenant_document(tenant_id, doc_id)
+
+        jobs = [
+            QueueJob(
+                doc_id=doc_id,
+                file_name=batch[i].filename,
+                content_type=batch[i].content_type,
+                file_bytes=batch[i].file_bytes,
+                tenant_id=tenant_id,
+            )
+            for i, doc_id in zip(valid, doc_ids)
+        ]
+        positions = await ingestion_queue.enqueue_many(jobs)
+    except Exception as e:
+        if doc_ids:
+            await db.update_documents_status(
+                doc_ids,
+                "failed",
+                tenant_id=tenant_id,
+                error={
+                    "stage": "queued",
+                    "code": "upload_failed",
+                    "message": "An unexpected error occurred during upload.",
+                },
+            )
+        logger.error(
+            f"Unexpected error during batch upload of {len(valid)} file(s) "
+            f"(tenant_id={tenant_id!r}): {e}",
+            exc_info=True,
+        )
+        raise _http_error(
+            status_code=500,
+            code="upload_failed",
+            stage="queued",
+            message="Upload failed. Please try again.",
+        )
+
+    queued_ids = doc_ids[:len(positions)]
+    overflow_ids = doc_ids[len(positions):]
+    if overflow_ids:
+        await db.update_documents_status(
+            overflow_ids, "failed", tenant_id=tenant_id, error=QUEUE_FULL_ERROR
+        )
+    if not queued_ids:
+        raise _http_error(
+            status_code=503,
+            code="queue_full",
+            stage="queued",
+            message="The processing queue is currently full. Please try again later.",
+            headers={"Retry-After": "30"},
+        )
+
+    session_id = request.headers.get("x-session-id")
+    if session_id:
+        session = await get_or_create_session(session_id=session_id.strip(), tenant_id=tenant_id)
+        for doc_id in queued_ids:
+            await register_session_document(session.id, doc_id, tenant_id)
+
+    queue_full = UploadPipelineError(
+        status_code=503,
+        code="queue_full",
+        stage="queued",
+        message="The processing queue is currently full. Please try again later.",
+    )
+    for n, (index, doc_id) in enumerate(zip(valid, doc_ids)):
+        if n < len(positions):
+            results[index] = {
+                "file_name": batch[index].filename,
+                "document_id": doc_id,
+                "status": "queued",
+                "queue_position": positions[n],
+                "status_endpoint": f"/documents/{doc_id}/status",
+            }
+        else:
+            results[index] = _rejected_entry(batch[index].filename, queue_full, doc_id)
+
+    logger.info(
+        f"Accepted batch upload: {len(queued_ids)} queued, "
+        f"{len(batch) - len(queued_ids)} not accepted (tenant_id={tenant_id!r})"
+    )
+    return {
+        "message": "Accepted",
+        "accepted": len(queued_ids),
+        "rejected": len(batch) - len(queued_ids),
+        "documents": results,
+    }
@@ -8,6 +8,7 @@ from typing import AsyncGenerator
 
 from core.config import config
 from services.providers import get_llm_provider
+from services.providers.concurrency import get_llm_concurrency_limiter
 from services.providers.base import (
     ProviderAuthError,
     ProviderConnectionError,
@@ -113,14 +114,18 @@ async def generate_answer(question: str, context: str) -> tuple[str, int, str]:
 
     try:
         provider = get_llm_provider()
+        limiter = get_llm_concurrency_limiter()
         t0 = time.perf_counter()
 
         async def _generate() -> str:
-            return await provider.generate(
-                contents,
-                system_instruction=_get_system_prompt(),
-                temperature=config.LLM_TEMPERATURE,
-                max_output_tokens=config.LLM_MAX_OUTPUT_TOKENS,
+            return await limiter.call(
+                lambda: provider.generate(
+                    contents,
+                    system_instruction=_get_system_prompt(),
+                    temperature=config.LLM_TEMPERATURE,
+                    max_output_tokens=config.LLM_MAX_OUTPUT_TOKENS,
+                ),
+                timeout=config.LLM_HTTP_TIMEOUT_MS / 1000.0,
             )
 
         answer = await retry_async(
@@ -128,7 +133,7 @@ async def generate_answer(question: str, context: str) -> tuple[str, int, str]:
             max_retries=DEFAULT_MAX_RETRIES,
             base_delay=DEFAULT_BASE_DELAY,
             backoff=DEFAULT_BACKOFF,
-            timeout=config.LLM_HTTP_TIMEOUT_MS / 1000.0,
+            timeout=None,
             func_name="answer_service.generate_answer",
         )
         latency_ms = int((time.perf_counter() - t0) * 1000)
@@ -310,13 +315,14 @@ async def generate_answer_stream(question: str, context: str) -> AsyncGenerator[
 
     try:
         provider = get_llm_provider()
-        async for chunk in provider.generate_stream(
-            contents,
-            system_instruction=_get_system_prompt(),
-            temperature=config.LLM_TEMPERATURE,
-            max_output_tokens=config.LLM_MAX_OUTPUT_TOKENS,
-        ):
-            yield chunk
+        async with get_llm_concurrency_limiter().slot():
+            async for chunk in provider.generate_stream(
+                contents,
+                system_instruction=_get_system_prompt(),
+                temperature=config.LLM_TEMPERATURE,
+                max_output_tokens=config.LLM_MAX_OUTPUT_TOKENS,
+            ):
+                yield chunk
 
         logger.info("Answer stream generated successfully")
 
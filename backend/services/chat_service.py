@@ -1,15 +1,20 @@
 import logging
 import asyncio
+import hashlib
 import json
+import math
 import time
-from typing import Optional, AsyncGenerator, cast
+import uuid
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Optional, AsyncGenerator, cast
 
 from core.auth import AuthContext, require_current_tenant
 from core.config import config
 from core.session import SessionContext
-from db import find_similar_chunks
+from core.vectors import Embedding, EmbeddingLike, cosine_similarity
+from db import find_similar_chunks, find_similar_chunks_multi
 from services.context_service import build_context_from_chunks
-from services.query_service import QueryTransformResult, transform_query
+from services.query_service import QueryTransformResult, normalize_question, transform_query
 from services.retrieval_service import (
     filter_doc_ids_for_tenant,
     parse_retrieval_scope,
@@ -17,6 +22,7 @@ from services.retrieval_service import (
     resolve_scoped_doc_ids,
 )
 from services.session_service import get_session
+from services.session_summary_service import recent_history
 from services.tenant_registry import get_tenant_document_ids
 
 logger = logging.getLogger(__name__)
@@ -77,13 +83,250 @@ def _get_batch_llm_semaphore() -> asyncio.Semaphore:
     return _batch_llm_semaphore
 
 
-async def get_embedding(text: str) -> list[float]:
+CHAT_SINGLEFLIGHT_REDIS_PREFIX = "chatvector:chat_singleflight"
+_SINGLEFLIGHT_REDIS_POLL_SECONDS = 0.05
+_SINGLEFLIGHT_REDIS_RESULT_TTL_SECONDS = 10
+
+
+class _StreamFanout:
+    """Replays one producer's events to any number of subscribers.
+
+    Late subscribers first receive everything buffered so far, then follow
+    live. The producer runs in its own task, so a subscriber disconnecting
+    does not end the stream for the others; it is cancelled only once the
+    last subscriber detaches.
+    """
+
+    def __init__(self, source_factory: Callable[[], AsyncGenerator[Any, None]]) -> None:
+        self._source_factory = source_factory
+        self._events: list[Any] = []
+        self._finished = False
+        self._error: BaseException | None = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+        self._subscribers = 0
+        self.closing = False
+        self.on_finish: Callable[[], None] | None = None
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _pump(self) -> None:
+        source = self._source_factory()
+        try:
+            try:
+                async for event in source:
+                    self._events.append(event)
+                    await self._notify()
+            finally:
+                await source.aclose()
+        except asyncio.CancelledError:
+            self._error = RuntimeError("stream producer was cancelled")
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._finished = True
+            if self.on_finish is not None:
+                self.on_finish()
+            await self._notify()
+
+    async def subscribe(self) -> AsyncGenerator[Any, None]:
+        self._subscribers += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._pump())
+        index = 0
+        try:
+            while True:
+                if index < len(self._events):
+                    yield self._events[index]
+                    index += 1
+                    continue
+                if self._finished:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                async with self._changed:
+                    if index >= len(self._events) and not self._finished:
+                        await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._task.done():
+                self.closing = True
+                self._task.cancel()
+
+
+class _ChatSingleFlight:
+    """Coalesces identical in-flight chat requests within this process.
+
+    ``do`` shares one awaited result; ``stream`` shares one event stream via
+    a _StreamFanout. With CHAT_SINGLEFLIGHT_REDIS_ENABLED, ``do`` also takes a
+    Redis lock so identical requests on other API processes wait for the
+    lock holder's result instead of recomputing it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Task] = {}
+        self._streams: dict[str, _StreamFanout] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.redis_coalesced = 0
+
+    def clear(self) -> None:
+        self._calls.clear()
+        self._streams.clear()
+        self.leaders = self.coalesced = self.redis_coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.create_task(self._run_leader(key, fn))
+            self._calls[key] = task
+
+            def _done(finished: asyncio.Task) -> None:
+                if self._calls.get(key) is finished:
+                    del self._calls[key]
+                if not finished.cancelled():
+                    finished.exception()  # retrieved here in case every waiter left
+
+            task.add_done_callback(_done)
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting does not cancel the shared run.
+        return await asyncio.shield(task)
+
+    def stream(
+        self, key: str, source_factory: Callable[[], AsyncGenerator[Any, None]]
+    ) -> AsyncGenerator[Any, None]:
+        fanout = self._streams.get(key)
+        if fanout is None or fanout.closing:
+            self.leaders += 1
+            fanout = _StreamFanout(source_factory)
+            self._streams[key] = fanout
+
+            def _finished() -> None:
+                if self._streams.get(key) is fanout:
+                    del self._streams[key]
+
+            fanout.on_finish = _finished
+        else:
+            self.coalesced += 1
+        return fanout.subscribe()
+
+    async def _run_leader(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        if not config.CHAT_SINGLEFLIGHT_REDIS_ENABLED:
+            return await fn()
+
+        from core.clients import redis_client
+
+        lock_key = f"{CHAT_SINGLEFLIGHT_REDIS_PREFIX}:lock:{key}"
+
+        # Results are keyed by the lock holder's token, so a follower never
+        # reads a result an earlier holder left behind for the same key.
+        def _result_key(holder: str) -> str:
+            return f"{CHAT_SINGLEFLIGHT_REDIS_PREFIX}:result:{key}:{holder}"
+
+        wait_seconds = config.CHAT_SINGLEFLIGHT_REDIS_WAIT_SECONDS
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, ex=max(1, math.ceil(wait_seconds))
+            )
+        except Exception:
+            logger.debug("Redis singleflight lock unavailable; running locally", exc_info=True)
+            return await fn()
+
+        if acquired:
+            try:
+                result = await fn()
+                try:
+                    await redis_client.setex(
+                        _result_key(token),
+                        _SINGLEFLIGHT_REDIS_RESULT_TTL_SECONDS,
+                        json.dumps(result),
+                    )
+                except Exception:
+                    logger.warning("Failed to publish singleflight chat result to Redis")
+                return result
+            finally:
+                try:
+                    if await redis_client.get(lock_key) == token:
+                        await redis_client.delete(lock_key)
+                except Exception:
+                    logger.debug("Failed to release Redis singleflight lock", exc_info=True)
+
+        # Another process holds the lock: wait for its result. If it gives up
+        # (lock released or taken over without a result) or the wait runs out,
+        # compute locally.
+        holder: Optional[str] = None
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            try:
+                current = await redis_client.get(lock_key)
+                holder = holder or current
+                if holder is None:
+                    break
+                raw = await redis_client.get(_result_key(holder))
+                if raw:
+                    self.redis_coalesced += 1
+                    return json.loads(raw)
+                if current != holder:
+                    break
+            except Exception:
+                logger.debug("Redis singleflight wait failed; running locally", exc_info=True)
+                break
+            await asyncio.sleep(_SINGLEFLIGHT_REDIS_POLL_SECONDS)
+        return await fn()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": config.CHAT_SINGLEFLIGHT_ENABLED,
+            "in_flight": len(self._calls) + len(self._streams),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "redis_coalesced": self.redis_coalesced,
+        }
+
+
+_chat_singleflight = _ChatSingleFlight()
+
+
+def chat_singleflight_stats() -> dict:
+    """Leader/coalesced counters for chat request singleflight in this process."""
+    return _chat_singleflight.stats()
+
+
+def _chat_flight_key(
+    *,
+    tenant_id: str,
+    doc_ids: list[str],
+    question: str,
+    match_count: int,
+    debug_retrieval: bool,
+    history: list[dict] | None,
+) -> str:
+    """Digest of everything that shapes a chat answer except the session id."""
+    material = json.dumps(
+        [
+            tenant_id,
+            sorted(doc_ids),
+            normalize_question(question),
+            match_count,
+            debug_retrieval,
+            [(m.get("role"), m.get("content")) for m in history or []],
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+async def get_embedding(text: str) -> Embedding:
     """
     Lazily import embedding dependency to keep module import side-effect free.
     """
-    from services.embedding_service import get_embedding as _get_embedding
+    from services.embedding_service import get_query_embeddings as _get_query_embeddings
 
-    return await _get_embedding(text)
+    return (await _get_query_embeddings([text]))[0]
 
 
 async def generate_answer(question: str, context: str) -> tuple[str, int, str]:
@@ -106,13 +349,13 @@ async def generate_answer_stream(question: str, context: str) -> AsyncGenerator[
         yield chunk
 
 
-async def get_embeddings(texts: list[str]) -> list[list[float]]:
+async def get_embeddings(texts: list[str]) -> list[Embedding]:
     """
     Lazily import batch embedding dependency to keep module import side-effect free.
     """
-    from services.embedding_service import get_embeddings as _get_embeddings
+    from services.embedding_service import get_query_embeddings as _get_query_embeddings
 
-    return await _get_embeddings(texts)
+    return await _get_query_embeddings(texts)
 
 
 def _normalize_doc_ids(doc_ids: list[str], *, query_index: int) -> list[str]:
@@ -153,20 +396,23 @@ async def _resolve_retrieval_doc_ids(
     requested_doc_ids: list[str],
     session_id: Optional[str] = None,
     tenant_id: Optional[str] = None,
+    session_doc_ids: Optional[list[str]] = None,
 ) -> list[str]:
     """Apply retrieval scope rules and tenant isolation checks.
 
     Falls back to the database when the in-memory tenant registry is empty
     (e.g. after a server restart) so that tenant-scope retrieval continues
-    to work correctly across process restarts.
+    to work correctly across process restarts. ``session_doc_ids`` skips the
+    session lookup when the caller already loaded the session.
     """
     retrieval_scope = parse_retrieval_scope(scope)
 
-    session_doc_ids: list[str] = []
-    if session_id:
-        session = await get_session(session_id, tenant_id)
-        if session:
-            session_doc_ids = list(session.document_ids)
+    if session_doc_ids is None:
+        session_doc_ids = []
+        if session_id:
+            session = await get_session(session_id, tenant_id)
+            if session:
+                session_doc_ids = list(session.document_ids)
 
     tenant_doc_ids = await get_tenant_document_ids(tenant_id)
 
@@ -182,7 +428,7 @@ async def _resolve_retrieval_doc_ids(
 
 async def _retrieve_chunks_for_documents(
     doc_ids: list[str],
-    query_embedding: list[float],
+    query_embedding: EmbeddingLike,
     match_count: int,
     tenant_id: str,
     *,
@@ -213,6 +459,136 @@ async def _retrieve_chunks_for_documents(
     return merged_chunks
 
 
+async def _retrieve_chunks_for_scope(
+    doc_ids: list[str],
+    query_embeddings: list[EmbeddingLike],
+    match_count: int,
+    tenant_id: str,
+    *,
+    query_texts: list[Optional[str]],
+) -> list[list]:
+    """Retrieve chunks for several queries over one document set.
+
+    Each document is searched once with all queries (a single multi-query DB
+    pass per document). Returns one merged chunk list per query embedding,
+    with documents in ``doc_ids`` order.
+    """
+    retrieval_semaphore = _get_retrieval_semaphore()
+
+    async def _search_one_document(doc_id: str) -> list[list]:
+        async with retrieval_semaphore:
+            return await find_similar_chunks_multi(
+                doc_id=doc_id,
+                query_embeddings=query_embeddings,
+                match_count=match_count,
+                query_texts=query_texts,
+                tenant_id=tenant_id,
+            )
+
+    per_document_results = await asyncio.gather(
+        *[_search_one_document(doc_id) for doc_id in doc_ids]
+    )
+
+    merged_chunks: list[list] = [[] for _ in query_embeddings]
+    for document_results in per_document_results:
+        for query_chunks, chunks in zip(merged_chunks, document_results):
+            query_chunks.extend(chunks)
+    return merged_chunks
+
+
+def _merge_unique_chunks(chunk_lists: list[list]) -> list:
+    """Concatenate retrieval results, keeping the first hit per (document, chunk_index)."""
+    all_chunks: list = []
+    seen_chunk_keys: set = set()
+    for chunks in chunk_lists:
+        for chunk in chunks:
+            key = (chunk.document_id, chunk.chunk_index)
+            if key not in seen_chunk_keys:
+                seen_chunk_keys.add(key)
+                all_chunks.append(chunk)
+    return all_chunks
+
+
+async def _transform_and_retrieve(
+    question: str,
+    history: list[dict] | None,
+    *,
+    doc_ids: list[str],
+    match_count: int,
+    tenant_id: str,
+    session_id: Optional[str] = None,
+) -> tuple[QueryTransformResult, list]:
+    """
+    Transform the question, embed the resulting queries and retrieve chunks.
+
+    With QUERY_SPECULATIVE_RETRIEVAL_ENABLED the raw question is embedded and
+    retrieved while the transformation LLM call is still running. A transformed
+    query that is the raw question, or whose embedding is within
+    QUERY_SPECULATIVE_SIMILARITY_THRESHOLD of it, reuses the speculative
+    result; if no query is that close the speculative result is discarded.
+    """
+
+    async def _retrieve(query_embedding: EmbeddingLike) -> list:
+        return await _retrieve_chunks_for_documents(
+            doc_ids=doc_ids,
+            query_embedding=query_embedding,
+            match_count=match_count,
+            tenant_id=tenant_id,
+            session_id=session_id,
+            query_text=question,
+        )
+
+    if not (config.QUERY_TRANSFORMATION_ENABLED and config.QUERY_SPECULATIVE_RETRIEVAL_ENABLED):
+        transform_result = await transform_query(question, history=history)
+        query_embeddings = await get_embeddings(transform_result.queries)
+        chunk_lists = [await _retrieve(embedding) for embedding in query_embeddings]
+        return transform_result, _merge_unique_chunks(chunk_lists)
+
+    async def _speculate() -> tuple[EmbeddingLike, list]:
+        [embedding] = await get_embeddings([question])
+        return embedding, await _retrieve(embedding)
+
+    speculative_task = asyncio.create_task(_speculate())
+    try:
+        transform_result = await transform_query(question, history=history)
+    except BaseException:
+        speculative_task.cancel()
+        raise
+
+    speculative: tuple[EmbeddingLike, list] | None = None
+    try:
+        speculative = await speculative_task
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("Speculative retrieval failed; using transformed queries only: %s", e)
+
+    queries = transform_result.queries
+    if speculative is not None and queries == [question]:
+        return transform_result, _merge_unique_chunks([speculative[1]])
+
+    # The raw question was already embedded speculatively.
+    to_embed = [q for q in queries if q != question] if speculative is not None else queries
+    embedded = dict(zip(to_embed, await get_embeddings(to_embed) if to_embed else []))
+    chunk_lists: list[list] = []
+    reused = 0
+    for query in queries:
+        if speculative is not None and (
+            query == question
+            or cosine_similarity(speculative[0], embedded[query])
+            >= config.QUERY_SPECULATIVE_SIMILARITY_THRESHOLD
+        ):
+            if reused == 0:
+                chunk_lists.append(speculative[1])
+            reused += 1
+        else:
+            chunk_lists.append(await _retrieve(embedded[query]))
+    logger.debug(
+        "Speculative retrieval reused for %d of %d transformed queries", reused, len(queries)
+    )
+    return transform_result, _merge_unique_chunks(chunk_lists)
+
+
 async def _finalize_retrieved_chunks(question: str, chunks: list, match_count: int) -> list:
     """Apply optional reranking before context assembly."""
     return await rerank_chunks_if_enabled(question, chunks, top_k=match_count)
@@ -252,6 +628,21 @@ def _is_compare_style_batch_query(doc_ids: list[str]) -> bool:
     return len(doc_ids) == 1
 
 
+def _batch_dedupe_key(query: dict) -> tuple:
+    """Items with equal keys get the same answer, so the batch answers them once.
+
+    A session created for the item itself has no history yet, so it does not
+    set identical items apart.
+    """
+    return (
+        query["question"],
+        tuple(query["doc_ids"]),
+        query.get("scope"),
+        query["match_count"],
+        None if query.get("new_session") else query.get("session_id"),
+    )
+
+
 def validate_and_normalize_batch_queries(queries: list[dict]) -> list[dict]:
     """Validate batch structure using runtime config. Raises ValueError on failure."""
     if not queries:
@@ -288,6 +679,7 @@ def validate_and_normalize_batch_queries(queries: list[dict]) -> list[dict]:
                 "match_count": match_count,
                 "session_id": query.get("session_id"),
                 "scope": query.get("scope"),
+                "new_session": bool(query.get("new_session")),
             }
         )
 
@@ -315,54 +707,87 @@ async def prepare_batch_chat_items(
     tenant_id: str,
     batch_session_id: str | None,
 ) -> tuple[list[tuple[int, dict]], list[dict | None]]:
-    """Validate batch items and perform per-item ownership/session setup.
+    """Validate batch items and perform ownership/session setup for the batch.
+
+    Ownership and readiness of every referenced document are checked with a
+    single set-based query, every session (requested or new) is resolved in
+    one ``db.resolve_batch_sessions`` transaction, and all session-document
+    bindings are written in one upsert. Items that name no session get a new
+    one each; every freshly created session is marked ``new_session``.
 
     Returns ``(service_items, slot_results)`` where ``service_items`` are
     ``(original_index, normalized_query)`` pairs ready for the batch service,
     and ``slot_results[i]`` is either ``None`` (proceed) or a structured error.
     """
     import db
-    from services.session_service import get_or_create_session, register_session_document
     from services.tenant_registry import register_tenant_document
 
     normalized = validate_and_normalize_batch_queries(raw_queries)
     slot_results: list[dict | None] = [None] * len(normalized)
-    service_items: list[tuple[int, dict]] = []
 
-    for index, query in enumerate(normalized):
-        missing_doc_ids: list[str] = []
-        for doc_id in query["doc_ids"]:
-            doc = await db.get_document(doc_id, tenant_id=tenant_id)
-            if doc is None:
-                missing_doc_ids.append(doc_id)
+    unique_doc_ids = list(dict.fromkeys(d for q in normalized for d in q["doc_ids"]))
+    statuses = (
+        await db.get_document_statuses(unique_doc_ids, tenant_id=tenant_id)
+        if unique_doc_ids
+        else {}
+    )
 
-        if missing_doc_ids:
+    ready: list[tuple[int, dict, str | None]] = []
+    for index, query in enumerate(normalized):
+        requested_session_id = query.get("session_id") or batch_session_id
+        error = None
+        if any(doc_id not in statuses for doc_id in query["doc_ids"]):
+            error = {
+                "code": "document_not_found",
+                "message": "One or more documents were not found.",
+            }
+        elif any(statuses[doc_id] != "completed" for doc_id in query["doc_ids"]):
+            error = {
+                "code": "document_not_ready",
+                "message": "One or more documents are still processing.",
+            }
+        if error is not None:
             slot_results[index] = {
                 "status": "error",
                 "question": query["question"],
                 "doc_ids": query["doc_ids"],
                 "chunks": 0,
-                "error": {
-                    "code": "document_not_found",
-                    "message": "One or more documents were not found.",
-                },
+                "error": error,
                 "latency_ms": 0,
                 "model": "",
-                "session_id": query.get("session_id") or batch_session_id,
+                "session_id": requested_session_id,
             }
             continue
+        ready.append((index, query, requested_session_id))
 
-        session = await get_or_create_session(
-            session_id=query.get("session_id") or batch_session_id,
-            tenant_id=tenant_id,
-        )
+    if not ready:
+        return [], slot_results
+
+    requested_ids = [sid for _, _, sid in ready if sid]
+    session_ids, new_session_ids = await db.resolve_batch_sessions(
+        tenant_id, requested_ids, len(ready) - len(requested_ids)
+    )
+    new_ids = iter(new_session_ids)
+
+    service_items: list[tuple[int, dict]] = []
+    bindings: list[tuple[str, str]] = []
+    for index, query, requested_session_id in ready:
         prepared = dict(query)
-        prepared["session_id"] = session.id
-        for doc_id in query["doc_ids"]:
-            await register_session_document(session.id, doc_id, tenant_id)
-            register_tenant_document(tenant_id, doc_id)
+        if requested_session_id:
+            prepared["session_id"] = session_ids[requested_session_id]
+        else:
+            prepared["session_id"] = next(new_ids)
+        # Foreign session ids were swapped for fresh sessions too.
+        if prepared["session_id"] != requested_session_id:
+            prepared["new_session"] = True
+        bindings.extend((prepared["session_id"], doc_id) for doc_id in query["doc_ids"])
         service_items.append((index, prepared))
 
+    bindings = list(dict.fromkeys(bindings))
+    await db.add_session_documents(bindings)
+    for _, doc_id in bindings:
+        register_tenant_document(tenant_id, doc_id)
+
     return service_items, slot_results
 
 
@@ -407,6 +832,75 @@ def _build_stream_error_payload(*, code: str, message: str) -> dict:
     }
 
 
+async def _load_session_history(session_id: Optional[str], tenant_id: str) -> list[dict]:
+    if not session_id:
+        return []
+    import db
+    from services.chat_turn_writer import chat_turn_writer
+
+    try:
+        history = await db.get_session_history(
+            session_id=session_id,
+            limit=config.MAX_SESSION_HISTORY_MESSAGES,
+            tenant_id=tenant_id,
+            with_summary=config.SESSION_SUMMARY_ENABLED,
+        )
+        return chat_turn_writer.merge_history(
+            session_id, tenant_id, history, limit=config.MAX_SESSION_HISTORY_MESSAGES
+        )
+    except Exception as e:
+        logger.error(f"Failed to load chat history for session {session_id}: {e}", exc_info=True)
+        return []
+
+
+async def _generate_chat_outcome(
+    question: str,
+    *,
+    doc_ids: list[str],
+    match_count: int,
+    tenant_id: str,
+    session_id: Optional[str],
+    history: list[dict],
+    session_context: Optional[SessionContext],
+    debug_retrieval: bool,
+) -> dict:
+    """Transform, retrieve and generate; the part of a chat singleflight shares.
+
+    Returns a JSON-ready dict so it can also be handed over through Redis.
+    """
+    transformation_history = (
+        recent_history(history, config.QUERY_TRANSFORMATION_HISTORY_WINDOW) if history else None
+    )
+    transform_result, all_chunks = await _transform_and_retrieve(
+        question,
+        transformation_history,
+        doc_ids=doc_ids,
+        match_count=match_count,
+        tenant_id=tenant_id,
+        session_id=session_id,
+    )
+    retrieval_debug = _maybe_retrieval_debug(
+        transform_result, debug_retrieval=debug_retrieval
+    )
+    matching_chunks = await _finalize_retrieved_chunks(question, all_chunks, match_count)
+
+    if history:
+        if not session_context:
+            session_context = SessionContext()
+        session_context.chat_history = history
+
+    context = build_context_from_chunks(matching_chunks, session_context=session_context)
+    answer, latency_ms, model_name = await generate_answer(question, context)
+    return {
+        "chunks": len(matching_chunks),
+        "answer": answer,
+        "sources": _build_sources(matching_chunks),
+        "latency_ms": latency_ms,
+        "model": model_name,
+        "retrieval_debug": retrieval_debug,
+    }
+
+
 async def answer_question_for_document(
     question: str,
     doc_id: str,
@@ -417,9 +911,15 @@ async def answer_question_for_document(
     session_context: Optional[SessionContext] = None,
     scope: Optional[str] = None,
     debug_retrieval: bool = False,
+    history: Optional[list[dict]] = None,
+    session_doc_ids: Optional[list[str]] = None,
 ) -> dict:
     """
     Orchestrate the chat flow for a single question/document pair.
+
+    ``history`` and ``session_doc_ids`` are the session's history and bound
+    documents when the caller already loaded them (e.g. via
+    ``db.chat_preflight``); otherwise they are fetched here.
     """
     logger.info(f"Starting chat for document {doc_id} (session={session_id}, scope={scope or 'session'})")
     tenant_id = require_current_tenant(auth)
@@ -429,6 +929,7 @@ async def answer_question_for_document(
         requested_doc_ids=[doc_id],
         session_id=session_id,
         tenant_id=tenant_id,
+        session_doc_ids=session_doc_ids,
     )
     if not doc_ids:
         return {
@@ -449,58 +950,46 @@ async def answer_question_for_document(
 
     # Load session history before query transformation so follow-up questions
     # can be resolved into standalone retrieval queries.
-    history: list[dict] = []
-    if session_id:
-        import db
-        try:
-            history = await db.get_session_history(
-                session_id=session_id, limit=config.MAX_SESSION_HISTORY_MESSAGES, tenant_id=tenant_id
-            )
-        except Exception as e:
-            logger.error(f"Failed to load chat history for session {session_id}: {e}", exc_info=True)
+    if history is None:
+        history = await _load_session_history(session_id, tenant_id)
 
-    transformation_history = (
-        history[-config.QUERY_TRANSFORMATION_HISTORY_WINDOW :] if history else None
-    )
-    transform_result = await transform_query(question, history=transformation_history)
-    transformed_queries = transform_result.queries
-    retrieval_debug = _maybe_retrieval_debug(
-        transform_result, debug_retrieval=debug_retrieval
-    )
-    query_embeddings = await get_embeddings(transformed_queries)
-    all_chunks: list = []
-    seen_chunk_keys: set = set()
-    for query_embedding in query_embeddings:
-        chunks = await _retrieve_chunks_for_documents(
+    async def _run_pipeline() -> dict:
+        return await _generate_chat_outcome(
+            question,
             doc_ids=doc_ids,
-            query_embedding=query_embedding,
             match_count=match_count,
             tenant_id=tenant_id,
             session_id=session_id,
-            query_text=question,
+            history=history,
+            session_context=session_context,
+            debug_retrieval=debug_retrieval,
         )
-        for chunk in chunks:
-            key = (chunk.document_id, chunk.chunk_index)
-            if key not in seen_chunk_keys:
-                seen_chunk_keys.add(key)
-                all_chunks.append(chunk)
-    matching_chunks = await _finalize_retrieved_chunks(question, all_chunks, match_count)
 
-    if history:
-        if not session_context:
-            session_context = SessionContext()
-        session_context.chat_history = history
+    if config.CHAT_SINGLEFLIGHT_ENABLED and session_context is None:
+        outcome = await _chat_singleflight.do(
+            _chat_flight_key(
+                tenant_id=tenant_id,
+                doc_ids=doc_ids,
+                question=question,
+                match_count=match_count,
+                debug_retrieval=debug_retrieval,
+                history=history,
+            ),
+            _run_pipeline,
+        )
+    else:
+        outcome = await _run_pipeline()
 
-    context = build_context_from_chunks(matching_chunks, session_context=session_context)
-    answer, latency_ms, model_name = await generate_answer(question, context)
+    answer = outcome["answer"]
+    retrieval_debug = outcome["retrieval_debug"]
     base: dict = {
         "question": question,
         "doc_id": doc_id,
-        "chunks": len(matching_chunks),
+        "chunks": outcome["chunks"],
         "answer": answer,
-        "sources": _build_sources(matching_chunks),
-        "latency_ms": latency_ms,
-        "model": model_name,
+        "sources": outcome["sources"],
+        "latency_ms": outcome["latency_ms"],
+        "model": outcome["model"],
         "session_id": session_id,
     }
     llm_err = _structured_error_from_llm_answer(answer)
@@ -519,8 +1008,9 @@ async def answer_question_for_document(
 
     if session_id:
         try:
-            import db
-            await db.store_chat_turn(
+            from services.chat_turn_writer import chat_turn_writer
+
+            await chat_turn_writer.store_turn(
                 session_id=session_id,
                 question=question,
                 answer=answer,
@@ -538,6 +1028,65 @@ async def answer_question_for_document(
     return response
 
 
+async def _chat_stream_events(
+    question: str,
+    *,
+    doc_ids: list[str],
+    match_count: int,
+    tenant_id: str,
+    session_id: Optional[str],
+    history: list[dict],
+    session_context: Optional[SessionContext],
+    debug_retrieval: bool,
+) -> AsyncGenerator[tuple[str, Any], None]:
+    """The shareable part of a streamed answer as ``(kind, payload)`` events.
+
+    Yields ``prepared`` (sources, retrieval_debug), then ``token`` chunks, and
+    ends with ``done`` (latency_ms, model) or a structured ``error``.
+    """
+    transformation_history = (
+        recent_history(history, config.QUERY_TRANSFORMATION_HISTORY_WINDOW) if history else None
+    )
+    transform_result, all_chunks = await _transform_and_retrieve(
+        question,
+        transformation_history,
+        doc_ids=doc_ids,
+        match_count=match_count,
+        tenant_id=tenant_id,
+        session_id=session_id,
+    )
+    retrieval_debug = _maybe_retrieval_debug(
+        transform_result, debug_retrieval=debug_retrieval
+    )
+    matching_chunks = await _finalize_retrieved_chunks(question, all_chunks, match_count)
+    yield "prepared", {
+        "sources": _build_sources(matching_chunks),
+        "retrieval_debug": retrieval_debug,
+    }
+
+    if history:
+        if not session_context:
+            session_context = SessionContext()
+        session_context.chat_history = history
+
+    context = build_context_from_chunks(matching_chunks, session_context=session_context)
+
+    t0 = time.perf_counter()
+    async for chunk in generate_answer_stream(question, context):
+        err = _structured_error_from_llm_answer(chunk)
+        if err is not None:
+            yield "error", err
+            return
+        yield "token", chunk
+
+    from services.providers import get_llm_provider
+
+    yield "done", {
+        "latency_ms": int((time.perf_counter() - t0) * 1000),
+        "model": getattr(get_llm_provider(), "model_name", ""),
+    }
+
+
 async def answer_question_stream_for_document(
     question: str,
     doc_id: str,
@@ -548,10 +1097,13 @@ async def answer_question_stream_for_document(
     session_context: Optional[SessionContext] = None,
     scope: Optional[str] = None,
     debug_retrieval: bool = False,
+    history: Optional[list[dict]] = None,
+    session_doc_ids: Optional[list[str]] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Orchestrate the chat flow for a single question/document pair, yielding
-    a server-sent events (SSE) stream.
+    a server-sent events (SSE) stream. ``history`` and ``session_doc_ids``
+    behave as in answer_question_for_document.
     """
     logger.info(f"Starting chat stream for document {doc_id} (scope={scope or 'session'})")
     tenant_id = require_current_tenant(auth)
@@ -562,6 +1114,7 @@ async def answer_question_stream_for_document(
             requested_doc_ids=[doc_id],
             session_id=session_id,
             tenant_id=tenant_id,
+            session_doc_ids=session_doc_ids,
         )
         if not doc_ids:
             yield _format_sse_event(
@@ -575,67 +1128,61 @@ async def answer_question_stream_for_document(
 
         # Load session history before query transformation so follow-up questions
         # can be resolved into standalone retrieval queries.
-        history: list[dict] = []
-        if session_id:
-            import db
-            try:
-                history = await db.get_session_history(
-                    session_id=session_id, limit=config.MAX_SESSION_HISTORY_MESSAGES, tenant_id=tenant_id
-                )
-            except Exception as e:
-                logger.error(f"Failed to load chat history for session {session_id}: {e}", exc_info=True)
+        if history is None:
+            history = await _load_session_history(session_id, tenant_id)
 
-        transformation_history = (
-            history[-config.QUERY_TRANSFORMATION_HISTORY_WINDOW :] if history else None
-        )
-        transform_result = await transform_query(question, history=transformation_history)
-        transformed_queries = transform_result.queries
-        retrieval_debug = _maybe_retrieval_debug(
-            transform_result, debug_retrieval=debug_retrieval
-        )
-        query_embeddings = await get_embeddings(transformed_queries)
-        all_chunks: list = []
-        seen_chunk_keys: set = set()
-        for query_embedding in query_embeddings:
-            chunks = await _retrieve_chunks_for_documents(
+        def _open_event_stream() -> AsyncGenerator[tuple[str, Any], None]:
+            return _chat_stream_events(
+                question,
                 doc_ids=doc_ids,
-                query_embedding=query_embedding,
                 match_count=match_count,
                 tenant_id=tenant_id,
                 session_id=session_id,
-                query_text=question,
+                history=history,
+                session_context=session_context,
+                debug_retrieval=debug_retrieval,
             )
-            for chunk in chunks:
-                key = (chunk.document_id, chunk.chunk_index)
-                if key not in seen_chunk_keys:
-                    seen_chunk_keys.add(key)
-                    all_chunks.append(chunk)
-        matching_chunks = await _finalize_retrieved_chunks(question, all_chunks, match_count)
-        sources = _build_sources(matching_chunks)
 
-        if history:
-            if not session_context:
-                session_context = SessionContext()
-            session_context.chat_history = history
-
-        context = build_context_from_chunks(matching_chunks, session_context=session_context)
+        if config.CHAT_SINGLEFLIGHT_ENABLED and session_context is None:
+            events = _chat_singleflight.stream(
+                _chat_flight_key(
+                    tenant_id=tenant_id,
+                    doc_ids=doc_ids,
+                    question=question,
+                    match_count=match_count,
+                    debug_retrieval=debug_retrieval,
+                    history=history,
+                ),
+                _open_event_stream,
+            )
+        else:
+            events = _open_event_stream()
 
+        sources: list[dict] = []
+        retrieval_debug: dict | None = None
+        latency_ms = 0
+        model_name = ""
         full_answer_chunks: list[str] = []
-        t0 = time.perf_counter()
         try:
-            async for chunk in generate_answer_stream(question, context):
-                err = _structured_error_from_llm_answer(chunk)
-                if err is not None:
+            async for kind, payload in events:
+                if kind == "prepared":
+                    sources = payload["sources"]
+                    retrieval_debug = payload["retrieval_debug"]
+                elif kind == "token":
+                    full_answer_chunks.append(payload)
+                    yield f"event: token\ndata: {json.dumps(payload)}\n\n"
+                elif kind == "error":
                     yield _format_sse_event(
                         "error",
                         _build_stream_error_payload(
-                            code=err["code"],
-                            message=err["message"],
+                            code=payload["code"],
+                            message=payload["message"],
                         ),
                     )
                     return
-                full_answer_chunks.append(chunk)
-                yield f"event: token\ndata: {json.dumps(chunk)}\n\n"
+                else:
+                    latency_ms = payload["latency_ms"]
+                    model_name = payload["model"]
         except asyncio.CancelledError:
             logger.info(
                 "Chat stream cancelled for document %s (session=%s)",
@@ -643,11 +1190,8 @@ async def answer_question_stream_for_document(
                 session_id,
             )
             raise
-
-        latency_ms = int((time.perf_counter() - t0) * 1000)
-        from services.providers import get_llm_provider
-
-        model_name = getattr(get_llm_provider(), "model_name", "")
+        finally:
+            await events.aclose()
 
         full_answer = "".join(full_answer_chunks)
         if not full_answer.strip():
@@ -655,8 +1199,9 @@ async def answer_question_stream_for_document(
 
         if session_id:
             try:
-                import db
-                await db.store_chat_turn(
+                from services.chat_turn_writer import chat_turn_writer
+
+                await chat_turn_writer.store_turn(
                     session_id=session_id,
                     question=question,
                     answer=full_answer,
@@ -705,6 +1250,14 @@ async def answer_questions_for_documents_batch(
     """
     Process multiple question/document retrieval requests in one call.
 
+    Identical items (same question, documents, scope, match count and
+    session, where sessions created for the item count as none) are answered
+    once; each item still gets the answer under, and stored in, its own
+    session. All
+    distinct transformed queries are embedded in one provider call, and
+    queries over the same resolved document set share one multi-query
+    retrieval pass.
+
     Note: The `session_context` provided is shared across all queries in the batch.
     It is assumed that a batch does not mix queries from different sessions.
     """
@@ -718,6 +1271,21 @@ async def answer_questions_for_documents_batch(
         if query.get("scope") is None:
             query["scope"] = scope
 
+    unique_queries: list[dict] = []
+    item_to_unique: list[int] = []
+    unique_index_by_key: dict[tuple, int] = {}
+    # Sessions that receive each unique query's turn, in request order.
+    member_session_ids: list[dict[str, None]] = []
+    for query in normalized_queries:
+        key = _batch_dedupe_key(query)
+        if key not in unique_index_by_key:
+            unique_index_by_key[key] = len(unique_queries)
+            unique_queries.append(query)
+            member_session_ids.append({})
+        item_to_unique.append(unique_index_by_key[key])
+        if query.get("session_id"):
+            member_session_ids[unique_index_by_key[key]][query["session_id"]] = None
+
     batch_llm_semaphore = _get_batch_llm_semaphore()
 
     async def _batch_transform(question: str, history: list[dict] | None):
@@ -734,11 +1302,17 @@ async def answer_questions_for_documents_batch(
         if not session_id:
             return []
         import db
+        from services.chat_turn_writer import chat_turn_writer
+
         try:
-            return await db.get_session_history(
+            history = await db.get_session_history(
                 session_id=session_id,
                 limit=config.MAX_SESSION_HISTORY_MESSAGES,
                 tenant_id=tenant_id,
+                with_summary=config.SESSION_SUMMARY_ENABLED,
+            )
+            return chat_turn_writer.merge_history(
+                session_id, tenant_id, history, limit=config.MAX_SESSION_HISTORY_MESSAGES
             )
         except Exception as e:
             logger.warning(
@@ -749,27 +1323,40 @@ async def answer_questions_for_documents_batch(
             )
             return []
 
-    per_query_histories: list[list[dict]] = list(
-        await asyncio.gather(
-            *[_load_batch_history(q.get("session_id")) for q in normalized_queries]
+    # Sessions created for this batch have no history to load.
+    unique_session_ids = list(
+        dict.fromkeys(
+            q["session_id"]
+            for q in unique_queries
+            if q.get("session_id") and not q.get("new_session")
         )
     )
+    loaded_histories = dict(
+        zip(
+            unique_session_ids,
+            await asyncio.gather(*[_load_batch_history(sid) for sid in unique_session_ids]),
+        )
+    )
+    # Queries on the same session share one (read-only) history list.
+    per_query_histories: list[list[dict]] = [
+        loaded_histories.get(q.get("session_id"), []) for q in unique_queries
+    ]
 
     transform_results = await asyncio.gather(
         *[
             _batch_transform(
                 q["question"],
                 history=(
-                    h[-config.QUERY_TRANSFORMATION_HISTORY_WINDOW :] if h else None
+                    recent_history(h, config.QUERY_TRANSFORMATION_HISTORY_WINDOW) if h else None
                 ),
             )
-            for q, h in zip(normalized_queries, per_query_histories)
+            for q, h in zip(unique_queries, per_query_histories)
         ]
     )
     transformed_query_lists = [result.queries for result in transform_results]
-    flat_queries = [q for queries in transformed_query_lists for q in queries]
+    unique_texts = list(dict.fromkeys(q for queries in transformed_query_lists for q in queries))
     try:
-        flat_embeddings = await get_embeddings(flat_queries)
+        unique_embeddings = await get_embeddings(unique_texts)
     except Exception as e:
         logger.error("Batch embedding call failed: %s", e, exc_info=True)
         embedding_message = "Failed to generate embeddings for batch request."
@@ -789,9 +1376,9 @@ async def answer_questions_for_documents_batch(
             }
             for query in normalized_queries
         ]
-    if len(flat_embeddings) != len(flat_queries):
+    if len(unique_embeddings) != len(unique_texts):
         mismatch_message = (
-            f"Embedding mismatch: got {len(flat_embeddings)} embeddings for {len(flat_queries)} queries"
+            f"Embedding mismatch: got {len(unique_embeddings)} embeddings for {len(unique_texts)} queries"
         )
         logger.error(mismatch_message)
         return [
@@ -808,28 +1395,69 @@ async def answer_questions_for_documents_batch(
             for query in normalized_queries
         ]
 
-    per_query_embeddings: list[list[list[float]]] = []
-    offset = 0
-    for tq_list in transformed_query_lists:
-        n = len(tq_list)
-        per_query_embeddings.append(flat_embeddings[offset : offset + n])
-        offset += n
+    embedding_by_text = dict(zip(unique_texts, unique_embeddings))
+
+    async def _resolve_doc_ids(query: dict) -> list[str]:
+        return await _resolve_retrieval_doc_ids(
+            scope=query.get("scope"),
+            requested_doc_ids=query["doc_ids"],
+            session_id=query.get("session_id"),
+            tenant_id=tenant_id,
+        )
+
+    resolved_doc_ids = await asyncio.gather(
+        *[_resolve_doc_ids(q) for q in unique_queries], return_exceptions=True
+    )
+
+    # Group retrieval by shared scope: one (transformed query, question)
+    # request list per (resolved doc ids, match_count).
+    scope_requests: dict[tuple, dict[tuple[str, str], None]] = {}
+    for query, doc_ids, transformed in zip(
+        unique_queries, resolved_doc_ids, transformed_query_lists
+    ):
+        if isinstance(doc_ids, BaseException) or not doc_ids:
+            continue
+        requests = scope_requests.setdefault((tuple(doc_ids), query["match_count"]), {})
+        for text in transformed:
+            requests[(text, query["question"])] = None
+
+    async def _run_scope_pass(
+        scope_key: tuple, requests: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], list]:
+        doc_ids, match_count = scope_key
+        chunk_lists = await _retrieve_chunks_for_scope(
+            list(doc_ids),
+            [embedding_by_text[text] for text, _ in requests],
+            match_count,
+            tenant_id,
+            query_texts=[question for _, question in requests],
+        )
+        return dict(zip(requests, chunk_lists))
+
+    scope_results = dict(
+        zip(
+            scope_requests,
+            await asyncio.gather(
+                *[
+                    _run_scope_pass(scope_key, list(requests))
+                    for scope_key, requests in scope_requests.items()
+                ],
+                return_exceptions=True,
+            ),
+        )
+    )
 
     async def _process_query(
         query: dict,
-        query_embeddings: list[list[float]],
+        doc_ids: list[str] | BaseException,
         preloaded_history: list[dict],
         transform_result: QueryTransformResult,
+        turn_session_ids: dict[str, None],
     ) -> dict:
         try:
             session_id = query.get("session_id")
-            query_scope = query.get("scope")
-            doc_ids = await _resolve_retrieval_doc_ids(
-                scope=query_scope,
-                requested_doc_ids=query["doc_ids"],
-                session_id=session_id,
-                tenant_id=tenant_id,
-            )
+            if isinstance(doc_ids, BaseException):
+                raise doc_ids
             if not doc_ids:
                 return {
                     "status": "error",
@@ -845,22 +1473,12 @@ async def answer_questions_for_documents_batch(
                     "session_id": session_id,
                 }
 
-            all_chunks: list = []
-            seen_chunk_keys: set = set()
-            for query_embedding in query_embeddings:
-                chunks = await _retrieve_chunks_for_documents(
-                    doc_ids=doc_ids,
-                    query_embedding=query_embedding,
-                    match_count=query["match_count"],
-                    tenant_id=tenant_id,
-                    session_id=session_id,
-                    query_text=query["question"],
-                )
-                for chunk in chunks:
-                    key = (chunk.document_id, chunk.chunk_index)
-                    if key not in seen_chunk_keys:
-                        seen_chunk_keys.add(key)
-                        all_chunks.append(chunk)
+            retrieved = scope_results[(tuple(doc_ids), query["match_count"])]
+            if isinstance(retrieved, BaseException):
+                raise retrieved
+            all_chunks = _merge_unique_chunks(
+                [retrieved[(text, query["question"])] for text in transform_result.queries]
+            )
             matching_chunks = await _finalize_retrieved_chunks(
                 query["question"], all_chunks, query["match_count"]
             )
@@ -868,9 +1486,13 @@ async def answer_questions_for_documents_batch(
             is_compare_style = _is_compare_style_batch_query(query["doc_ids"])
             query_session_context = session_context
             if preloaded_history and not is_compare_style:
-                from copy import deepcopy
-                query_session_context = deepcopy(session_context) if session_context else SessionContext()
-                query_session_context.chat_history = preloaded_history
+                # Shallow replace: the per-query context shares the caller's
+                # lists instead of deep-copying them for every query.
+                query_session_context = (
+                    replace(session_context, chat_history=preloaded_history)
+                    if session_context
+                    else SessionContext(chat_history=preloaded_history)
+                )
 
             context = build_context_from_chunks(matching_chunks, session_context=query_session_context)
             answer, latency_ms, model_name = await _batch_generate(query["question"], context)
@@ -897,20 +1519,22 @@ async def answer_questions_for_documents_batch(
                     error_payload["retrieval_debug"] = retrieval_debug
                 return error_payload
 
-            if session_id and not is_compare_style:
-                try:
-                    import db
-                    await db.store_chat_turn(
-                        session_id=session_id,
-                        question=query["question"],
-                        answer=answer,
-                        tenant_id=tenant_id,
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to store batch chat turn for session {session_id}: {e}",
-                        exc_info=True,
-                    )
+            if not is_compare_style:
+                from services.chat_turn_writer import chat_turn_writer
+
+                for turn_session_id in turn_session_ids:
+                    try:
+                        await chat_turn_writer.store_turn(
+                            session_id=turn_session_id,
+                            question=query["question"],
+                            answer=answer,
+                            tenant_id=tenant_id,
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to store batch chat turn for session {turn_session_id}: {e}",
+                            exc_info=True,
+                        )
 
             result_payload = {
                 "status": "ok",
@@ -943,14 +1567,28 @@ async def answer_questions_for_documents_batch(
                 },
             }
 
-    return await asyncio.gather(
+    unique_results = await asyncio.gather(
         *[
-            _process_query(query, embeddings, history, transform_result)
-            for query, embeddings, history, transform_result in zip(
-                normalized_queries,
-                per_query_embeddings,
+            _process_query(query, doc_ids, history, transform_result, turn_session_ids)
+            for query, doc_ids, history, transform_result, turn_session_ids in zip(
+                unique_queries,
+                resolved_doc_ids,
                 per_query_histories,
                 transform_results,
+                member_session_ids,
             )
         ]
     )
+    # Fan out in request order; duplicates get their own top-level dict (with
+    # their own session id) while nested values (sources, error) are shared.
+    results: list[dict] = []
+    returned: set[int] = set()
+    for query, unique_index in zip(normalized_queries, item_to_unique):
+        result = unique_results[unique_index]
+        if unique_index in returned:
+            result = dict(result)
+            if "session_id" in result:
+                result["session_id"] = query.get("session_id")
+        results.append(result)
+        returned.add(unique_index)
+    return results
@@ -0,0 +1,248 @@
+"""Write-behind buffer that batches chat-turn inserts across requests."""
+
+import asyncio
+import logging
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Optional
+
+import db
+from core.config import config
+from db.base import ChatTurnRecord
+from services.session_summary_service import recent_history, session_summarizer
+
+logger = logging.getLogger(__name__)
+
+
+def _turn_messages(turn: ChatTurnRecord) -> list[dict]:
+    """Render a buffered turn the way get_session_history returns messages."""
+    return [
+        {
+            "id": turn.user_message_id,
+            "role": "user",
+            "content": turn.question,
+            "created_at": str(turn.created_at),
+        },
+        {
+            "id": turn.assistant_message_id,
+            "role": "assistant",
+            "content": turn.answer,
+            "created_at": str(turn.created_at + timedelta(microseconds=1)),
+        },
+    ]
+
+
+class ChatTurnWriter:
+    """Buffers chat turns and writes them with multi-row INSERTs.
+
+    With CHAT_TURN_WRITE_BEHIND_ENABLED, ``store_turn`` only appends to an
+    in-memory buffer; a background task flushes it every
+    CHAT_TURN_WRITE_BEHIND_INTERVAL_MS (or as soon as a full batch is
+    waiting). Turns stay visible through ``merge_history`` until their insert
+    commits, so a session's next request sees its previous turns when it
+    reaches the same process. The buffer is per process: with several API
+    workers, a request served by another worker can miss turns for up to one
+    flush interval.
+    Disabled, ``store_turn`` is a plain ``db.store_chat_turn`` call.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[ChatTurnRecord] = []
+        self._in_flight: list[ChatTurnRecord] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.buffered = 0
+        self.flushed = 0
+        self.failed = 0
+        self.direct_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.CHAT_TURN_WRITE_BEHIND_ENABLED
+
+    def clear(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._pending.clear()
+        self._in_flight.clear()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.buffered = self.flushed = self.failed = self.direct_writes = 0
+
+    async def store_turn(
+        self, session_id: str, question: str, answer: str, tenant_id: str
+    ) -> None:
+        await self._store_turn(session_id, question, answer, tenant_id)
+        session_summarizer.schedule(session_id, tenant_id)
+
+    async def _store_turn(
+        self, session_id: str, question: str, answer: str, tenant_id: str
+    ) -> None:
+        if not self.enabled:
+            await db.store_chat_turn(
+                session_id=session_id, question=question, answer=answer, tenant_id=tenant_id
+            )
+            return
+
+        if len(self._pending) + len(self._in_flight) >= config.CHAT_TURN_WRITE_BEHIND_MAX_PENDING:
+            # Backpressure: write through instead of growing the buffer.
+            self.direct_writes += 1
+            await db.store_chat_turn(
+                session_id=session_id, question=question, answer=answer, tenant_id=tenant_id
+            )
+            return
+
+        self._pending.append(
+            ChatTurnRecord(
+                session_id=session_id,
+                tenant_id=tenant_id,
+                question=question,
+                answer=answer,
+                user_message_id=str(uuid.uuid4()),
+                assistant_message_id=str(uuid.uuid4()),
+                created_at=datetime.utcnow(),
+            )
+        )
+        self.buffered += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= config.CHAT_TURN_WRITE_BEHIND_BATCH_SIZE:
+            self._wakeup.set()
+
+    def merge_history(
+        self,
+        session_id: Optional[str],
+        tenant_id: str,
+        history: list[dict],
+        *,
+        limit: int,
+    ) -> list[dict]:
+        """Append this session's not-yet-committed turns to a loaded history."""
+        if not session_id or not (self._pending or self._in_flight):
+            return history
+        turns = sorted(
+            (
+                turn
+                for turn in (*self._in_flight, *self._pending)
+                if turn.session_id == session_id and turn.tenant_id == tenant_id
+            ),
+            key=lambda turn: turn.created_at,
+        )
+        if not turns:
+            return history
+        # A turn whose insert committed after history was read is in both.
+        seen_ids = {message.get("id") for message in history}
+        merged = list(history)
+        for turn in turns:
+            merged.extend(m for m in _turn_messages(turn) if m["id"] not in seen_ids)
+        # A leading rolling-summary message is kept on top of the limit.
+        return recent_history(merged, limit)
+
+    async def discard_session(self, session_id: str, tenant_id: Optional[str] = None) -> None:
+        """Drop buffered turns of a session about to be deleted.
+
+        Called before the session's messages are deleted: turns already being
+        inserted cannot be recalled, so this waits for that insert to commit
+        and the delete then removes its rows too. With *tenant_id*, only that
+        tenant's turns are dropped.
+        """
+
+        def _matches(turn: ChatTurnRecord) -> bool:
+            return turn.session_id == session_id and (
+                tenant_id is None or turn.tenant_id == tenant_id
+            )
+
+        self._pending = [turn for turn in self._pending if not _matches(turn)]
+        if any(_matches(turn) for turn in self._in_flight):
+            async with self._flush_lock:
+                pass
+
+    async def _run(self) -> None:
+        interval = config.CHAT_TURN_WRITE_BEHIND_INTERVAL_MS / 1000
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Chat turn flush failed")
+
+    async def flush(self) -> None:
+        """Write every buffered turn, one multi-row INSERT per batch."""
+        async with self._flush_lock:
+            while self._pending:
+                batch_size = config.CHAT_TURN_WRITE_BEHIND_BATCH_SIZE
+                batch = self._pending[:batch_size]
+                del self._pending[:batch_size]
+                self._in_flight.extend(batch)
+                try:
+                    await self._write(batch)
+                except BaseException:
+                    # Interrupted (e.g. shutdown cancelled the loop): requeue;
+                    # the insert is idempotent on message id.
+                    self._pending[:0] = batch
+                    raise
+                finally:
+                    batch_ids = {id(turn) for turn in batch}
+                    self._in_flight = [t for t in self._in_flight if id(t) not in batch_ids]
+
+    async def _write(self, batch: list[ChatTurnRecord]) -> None:
+        try:
+            await db.store_chat_turns(batch)
+            self.flushed += len(batch)
+            return
+        except Exception:
+            logger.warning(
+                "Batched insert of %s chat turns failed; retrying one by one",
+                len(batch),
+                exc_info=True,
+            )
+        for turn in batch:
+            try:
+                await db.store_chat_turns([turn])
+                self.flushed += 1
+            except Exception:
+                self.failed += 1
+                logger.error(
+                    "Failed to persist buffered chat turn for session %s",
+                    turn.session_id,
+                    exc_info=True,
+                )
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write what is left, bounded by the shutdown timeout."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if not self._pending:
+            return
+        try:
+            await asyncio.wait_for(
+                self.flush(), timeout=config.CHAT_TURN_WRITE_BEHIND_SHUTDOWN_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                "Shutdown flush timed out; %s buffered chat turns were not persisted",
+                len(self._pending),
+            )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending) + len(self._in_flight),
+            "buffered": self.buffered,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "direct_writes": self.direct_writes,
+        }
+
+
+chat_turn_writer = ChatTurnWriter()
@@ -1,29 +1,190 @@
 import logging
+import math
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from core.config import config
 from core.session import SessionContext
+from services.providers.base import get_context_window
 
 logger = logging.getLogger(__name__)
 
 MAX_CONTEXT_CHARS: int = int(os.getenv("MAX_CONTEXT_CHARS", "32000"))
 
+# Adjacent chunks without character offsets are de-overlapped by matching the
+# end of one against the start of the next; shorter matches are coincidence.
+_MIN_TEXT_OVERLAP = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count using CONTEXT_CHARS_PER_TOKEN."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / config.CONTEXT_CHARS_PER_TOKEN)
+
+
+def _llm_chain_context_window() -> int:
+    """Smallest context window among the primary LLM and its configured fallbacks."""
+    windows = [get_context_window(config.LLM_PROVIDER, config.LLM_MODEL)]
+    windows.extend(
+        get_context_window(name, fallback_model)
+        for name, fallback_model in config.LLM_FALLBACK_PROVIDERS
+    )
+    return min(windows)
+
+
+def context_token_budget(model: Optional[str] = None) -> int:
+    """
+    Return the token budget for retrieved context sent to *model*.
+
+    MAX_CONTEXT_TOKENS, capped by the model's context window minus the
+    answer (LLM_MAX_OUTPUT_TOKENS) and the prompt reserve. Without *model*,
+    the smallest window in the LLM failover chain is used, since any member
+    may end up answering.
+    """
+    if model:
+        window = get_context_window(config.LLM_PROVIDER, model)
+    else:
+        window = _llm_chain_context_window()
+    available = window - config.LLM_MAX_OUTPUT_TOKENS - config.CONTEXT_PROMPT_RESERVE_TOKENS
+    return max(1, min(config.MAX_CONTEXT_TOKENS, available))
+
+
+@dataclass
+class _ContextSpan:
+    """A contiguous run of retrieved chunks from one document."""
+
+    chunks: list[Any]
+    text: str
+    rank: int
+    score: float
+    _rendered: Optional[str] = field(default=None, repr=False)
+
+    def render(self) -> str:
+        if self._rendered is None:
+            first = self.chunks[0]
+            label = f"[Source: {first.file_name or 'unknown'}"
+            pages = [c.page_number for c in self.chunks if c.page_number is not None]
+            if pages and pages[0] != pages[-1]:
+                label += f", pages {pages[0]}-{pages[-1]}"
+            elif pages:
+                label += f", page {pages[0]}"
+            label += "]"
+            self._rendered = f"{label}\n{self.text}"
+        return self._rendered
+
+
+def _chunk_scores(chunks: list) -> list[float]:
+    """Retrieval score per chunk; falls back to rank when any score is missing."""
+    scores = [getattr(chunk, "similarity", None) for chunk in chunks]
+    if any(score is None for score in scores):
+        return [1.0 / (rank + 1) for rank in range(len(chunks))]
+    return [max(float(score), 0.0) for score in scores]
+
+
+def _text_overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of *left* that is a prefix of *right*."""
+    for size in range(min(len(left), len(right)), _MIN_TEXT_OVERLAP - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _follows(previous: Any, chunk: Any) -> bool:
+    if chunk.chunk_index == previous.chunk_index + 1:
+        return True
+    start = getattr(chunk, "character_offset_start", None)
+    end = getattr(previous, "character_offset_end", None)
+    return start is not None and end is not None and start < end
+
+
+def _append_chunk_text(span_text: str, previous: Any, chunk: Any) -> str:
+    """Append *chunk* to a span ending in *previous*, dropping the shared overlap."""
+    text = chunk.chunk_text or ""
+    start = getattr(chunk, "character_offset_start", None)
+    end = getattr(previous, "character_offset_end", None)
+    if start is not None and end is not None:
+        overlap = end - start
+        if overlap == 0:
+            return span_text + text
+        if overlap > 0 and span_text.endswith(text[:overlap]):
+            return span_text + text[overlap:]
+        return f"{span_text}\n{text}"
+    overlap = _text_overlap(span_text, text)
+    return span_text + text[overlap:] if overlap else f"{span_text}\n{text}"
+
+
+def _coalesce_chunks(chunks: list) -> list[_ContextSpan]:
+    """
+    Merge chunks that are adjacent or overlapping in the same document.
+
+    Chunks need ``document_id`` and ``chunk_index`` to be merged; others
+    become single-chunk spans. A chunk retrieved twice is kept once.
+    """
+    scores = _chunk_scores(chunks)
+    spans: list[_ContextSpan] = []
+    by_document: dict[str, list[tuple[int, Any]]] = {}
+    seen: set[tuple[str, int]] = set()
+    for rank, chunk in enumerate(chunks):
+        document_id = getattr(chunk, "document_id", None)
+        chunk_index = getattr(chunk, "chunk_index", None)
+        if document_id is None or chunk_index is None:
+            spans.append(_ContextSpan([chunk], chunk.chunk_text or "", rank, scores[rank]))
+            continue
+        if (document_id, chunk_index) in seen:
+            continue
+        seen.add((document_id, chunk_index))
+        by_document.setdefault(document_id, []).append((rank, chunk))
+
+    for members in by_document.values():
+        members.sort(key=lambda member: member[1].chunk_index)
+        span: Optional[_ContextSpan] = None
+        for rank, chunk in members:
+            if span is not None and _follows(span.chunks[-1], chunk):
+                span.text = _append_chunk_text(span.text, span.chunks[-1], chunk)
+                span.chunks.append(chunk)
+                span.rank = min(span.rank, rank)
+                span.score += scores[rank]
+            else:
+                span = _ContextSpan([chunk], chunk.chunk_text or "", rank, scores[rank])
+                spans.append(span)
+    return spans
+
+
+def _best_member(span: _ContextSpan, chunks: list) -> _ContextSpan:
+    """The span's highest-ranked chunk on its own."""
+    members = {id(chunk) for chunk in span.chunks}
+    rank = min(i for i, chunk in enumerate(chunks) if id(chunk) in members)
+    chunk = chunks[rank]
+    return _ContextSpan([chunk], chunk.chunk_text or "", rank, _chunk_scores(chunks)[rank])
+
 
 def build_context_from_chunks(
-    chunks: list, session_context: Optional[SessionContext] = None
+    chunks: list,
+    session_context: Optional[SessionContext] = None,
+    *,
+    model: Optional[str] = None,
 ) -> str:
     """
     Combine chunk texts into a single context string for the LLM.
 
-    Each chunk is prefixed with a source label so the model can cite
-    the originating file and page in its answer.
+    Chunks that are adjacent or overlapping in the same document are merged
+    into one span with the repeated overlap text removed. Each span is
+    prefixed with a source label so the model can cite the originating file
+    and page in its answer.
 
-    Chunks are dropped (whole, from the end) if the total would exceed
-    MAX_CONTEXT_CHARS, preserving formatting of all included chunks.
+    Spans are packed by score density (retrieval score per estimated token)
+    into the token budget for the active model (see ``context_token_budget``)
+    and MAX_CONTEXT_CHARS, then emitted in retrieval order. Spans that do
+    not fit are dropped whole, preserving formatting of everything included.
     """
     parts: list[str] = []
     total_chars = 0
+    total_tokens = 0
     separator = "\n\n"
     sep_len = len(separator)
+    token_budget = context_token_budget(model)
 
     # 1. Inject Session Context (if provided)
     if session_context:
@@ -36,7 +197,9 @@ def build_context_from_chunks(
         
         if session_context.chat_history:
             for msg in session_context.chat_history:
-                role_label = "User" if msg.get("role") == "user" else "Assistant"
+                role_label = {"user": "User", "summary": "Earlier conversation"}.get(
+                    msg.get("role"), "Assistant"
+                )
                 session_lines.append(f"[{role_label}]: {msg.get('content')}")
         
         if len(session_lines) > 1:
@@ -44,37 +207,65 @@ def build_context_from_chunks(
             session_part = "\n".join(session_lines)
             parts.append(session_part)
             total_chars += len(session_part)
+            total_tokens += estimate_tokens(session_part)
 
-    for i, chunk in enumerate(chunks):
-        label = f"[Source: {chunk.file_name or 'unknown'}"
-        if chunk.page_number is not None:
-            label += f", page {chunk.page_number}"
-        label += "]"
-        part = f"{label}\n{chunk.chunk_text or ''}"
-
-        addition = (sep_len + len(part)) if parts else len(part)
-        if total_chars + addition > MAX_CONTEXT_CHARS:
-            if not parts:
-                # Single chunk exceeds cap; include it rather than returning empty context.
-                parts.append(part)
-                dropped = len(chunks) - i - 1
-                used = len(part)
-            else:
-                dropped = len(chunks) - i
-                used = total_chars
-            logger.warning(
-                "Context truncated: dropped %d of %d chunks to stay within "
-                "MAX_CONTEXT_CHARS=%d (used %d chars)",
-                dropped,
-                len(chunks),
-                MAX_CONTEXT_CHARS,
-                used,
-            )
-            break
-
-        parts.append(part)
-        total_chars += addition
+    # 2. Pack merged spans by score density
+    spans = _coalesce_chunks(chunks)
+    selected: list[_ContextSpan] = []
+
+    def fits(span: _ContextSpan) -> bool:
+        part = span.render()
+        addition = (sep_len + len(part)) if parts or selected else len(part)
+        return (
+            total_chars + addition <= MAX_CONTEXT_CHARS
+            and total_tokens + estimate_tokens(part) <= token_budget
+        )
+
+    def take(span: _ContextSpan) -> None:
+        nonlocal total_chars, total_tokens
+        part = span.render()
+        total_chars += (sep_len + len(part)) if parts or selected else len(part)
+        total_tokens += estimate_tokens(part)
+        selected.append(span)
+
+    by_density = sorted(
+        spans, key=lambda s: (-s.score / max(1, estimate_tokens(s.render())), s.rank)
+    )
+    for span in by_density:
+        if fits(span):
+            take(span)
+        elif len(span.chunks) > 1 and fits(single := _best_member(span, chunks)):
+            take(single)
+
+    if spans and not selected and not parts:
+        # Nothing fits the budget; include the top-ranked chunk rather than
+        # returning empty context.
+        top = min(spans, key=lambda s: s.rank)
+        take(_best_member(top, chunks) if len(top.chunks) > 1 else top)
+
+    selected.sort(key=lambda s: s.rank)
+    parts.extend(span.render() for span in selected)
+
+    included = sum(len(span.chunks) for span in selected)
+    retrieved = len({id(chunk) for span in spans for chunk in span.chunks})
+    if included < retrieved:
+        logger.warning(
+            "Context truncated: dropped %d of %d chunks to stay within "
+            "%d tokens / MAX_CONTEXT_CHARS=%d (used %d tokens, %d chars)",
+            retrieved - included,
+            retrieved,
+            token_budget,
+            MAX_CONTEXT_CHARS,
+            total_tokens,
+            total_chars,
+        )
 
     context = separator.join(parts)
-    logger.info("Constructed context of length %d", len(context))
+    logger.info(
+        "Constructed context of length %d (~%d tokens) from %d chunks in %d spans",
+        len(context),
+        total_tokens,
+        included,
+        len(selected),
+    )
     return context
@@ -3,7 +3,11 @@
 import logging
 
 from core.config import config, get_embedding_dim
+from core.vectors import Embedding, as_embeddings
 from services.providers import get_embedding_provider
+from services.providers.concurrency import get_embedding_concurrency_limiter
+from services.providers.failover import FailoverEmbeddingProvider
+from services.providers.hedging import query_embedding_hedger
 from utils.retry import (
     DEFAULT_BACKOFF,
     DEFAULT_BASE_DELAY,
@@ -18,39 +22,84 @@ logger = logging.getLogger(__name__)
 EMBEDDING_DIM = get_embedding_dim()
 
 
-async def get_embeddings(texts: list[str]) -> list[list[float]]:
+async def get_embeddings(texts: list[str], *, query: bool = False) -> list[Embedding]:
     """
-    Generate embeddings for multiple texts.
+    Generate embeddings for multiple texts, as float32 arrays.
 
     Delegates to whichever provider is selected via EMBEDDING_PROVIDER.
     Retry logic is applied at this service layer — providers raise on failure.
+    Each attempt holds a slot in the adaptive embedding concurrency limiter;
+    the per-attempt timeout starts once the slot is granted. Providers that
+    dispatch their own batches apply the slot, timeout and retry per batch.
+
+    ``query=True`` marks chat-query embeds. Each attempt then goes through
+    ``query_embedding_hedger``, which may send one duplicate request when the
+    first is slow, and a failover chain may use fallbacks with a different
+    model. Ingestion embeds never do either.
+
+    Providers may return lists or float32 arrays; either way the result is
+    one float32 array per text (see ``core.vectors``).
     """
     provider = get_embedding_provider()
+    if getattr(provider, "dispatches_batches", False) is True:
+        logger.info("Requesting embeddings for %d inputs", len(texts))
+        if isinstance(provider, FailoverEmbeddingProvider):
+            embed = lambda: provider.embed(texts, query=query)  # noqa: E731
+        else:
+            embed = lambda: provider.embed(texts)  # noqa: E731
+        if query:
+            embeddings = await query_embedding_hedger.call(embed)
+        else:
+            embeddings = await embed()
+        return as_embeddings(embeddings)
+
+    limiter = get_embedding_concurrency_limiter()
+
+    async def _attempt() -> list[list[float]]:
+        return await limiter.call(
+            lambda: provider.embed(texts),
+            timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
+        )
 
     async def _embed() -> list[list[float]]:
         logger.info("Requesting embeddings for %d inputs", len(texts))
-        return await provider.embed(texts)
+        if query:
+            return await query_embedding_hedger.call(_attempt)
+        return await _attempt()
 
-    return await retry_async(
+    embeddings = await retry_async(
         _embed,
         max_retries=DEFAULT_MAX_RETRIES,
         base_delay=DEFAULT_BASE_DELAY,
         backoff=DEFAULT_BACKOFF,
-        timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
+        timeout=None,
         func_name="embedding_service.get_embeddings",
     )
+    return as_embeddings(embeddings)
 
 
-async def get_embedding(text: str) -> list[float]:
+async def get_query_embeddings(texts: list[str]) -> list[Embedding]:
+    """Embed chat queries; slow requests may be hedged (EMBEDDING_HEDGE_*)."""
+    return await get_embeddings(texts, query=True)
+
+
+async def get_embedding(text: str) -> Embedding:
     """Convenience wrapper for single-text embedding."""
     return (await get_embeddings([text]))[0]
 
 
 async def probe_embedding_health(text: str) -> None:
-    """Single-attempt embedding probe for /status (no production retry policy)."""
+    """Single-attempt embedding probe for /status (no production retry policy).
+
+    Providers that dispatch their own batches are asked for one attempt too,
+    so a throttled provider fails the probe instead of backing off past the
+    health check timeout.
+    """
     provider = get_embedding_provider()
 
     async def _embed() -> list[list[float]]:
+        if getattr(provider, "dispatches_batches", False) is True:
+            return await provider.embed([text], max_retries=0)  # type: ignore[call-arg]
         return await provider.embed([text])
 
     await retry_async(
@@ -73,6 +73,7 @@ except ImportError:  # pragma: no cover - lightweight fallback for constrained e
 
 import db
 from core.config import config
+from core.vectors import Embedding
 from db.base import ChunkRecord
 from db.tenant_scope import require_tenant_id
 from services.embedding_service import get_embeddings
@@ -618,7 +619,7 @@ def _resolve_page_number(
 
 def _build_chunk_records(
     langchain_docs: list,
-    embeddings: list[list[float]],
+    embeddings: list[Embedding],
     page_boundaries: list[PageBoundary],
 ) -> list[ChunkRecord]:
     """
@@ -815,10 +816,10 @@ class IngestionPipeline:
         tenant_id: str,
         langchain_docs: list[LangChainDocument],
         rate_limiter=None,
-    ) -> list[list[float]]:
+    ) -> list[Embedding]:
         total = len(langchain_docs)
         texts = [doc.page_content for doc in langchain_docs]
-        embeddings: list[list[float]] = []
+        embeddings: list[Embedding] = []
 
         await self._update_status(
             doc_id=doc_id,
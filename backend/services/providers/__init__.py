@@ -23,8 +23,88 @@ _llm_provider: LLMProvider | None = None
 _provider_lock = threading.Lock()
 
 
+def build_embedding_provider(name: str, model: str | None = None) -> EmbeddingProvider:
+    """Instantiate the embedding provider *name* (``model=None`` uses its default)."""
+    if name == "gemini":
+        from services.providers.gemini import GeminiEmbeddingProvider
+
+        return GeminiEmbeddingProvider(model=model)
+
+    if name == "openai":
+        from services.providers.openai import OpenAIEmbeddingProvider
+
+        return OpenAIEmbeddingProvider(model=model)
+
+    if name == "ollama":
+        from services.providers.ollama import OllamaEmbeddingProvider
+
+        return OllamaEmbeddingProvider(model=model)
+
+    if name == "voyage":
+        from services.providers.voyage import VoyageEmbeddingProvider
+
+        return VoyageEmbeddingProvider(model=model)
+
+    if name == "fake":
+        from services.providers.fake import FakeEmbeddingProvider
+
+        return FakeEmbeddingProvider(model=model)
+
+    raise ValueError(
+        f"Unknown EMBEDDING_PROVIDER={name!r}. "
+        f"Expected one of: gemini, openai, ollama, voyage, fake."
+    )
+
+
+def build_llm_provider(name: str, model: str | None = None) -> LLMProvider:
+    """Instantiate the LLM provider *name* (``model=None`` uses its default)."""
+    if name == "gemini":
+        from services.providers.gemini import GeminiLLMProvider
+
+        return GeminiLLMProvider(model=model)
+
+    if name == "openai":
+        from services.providers.openai import OpenAILLMProvider
+
+        return OpenAILLMProvider(model=model)
+
+    if name == "ollama":
+        from services.providers.ollama import OllamaLLMProvider
+
+        return OllamaLLMProvider(model=model)
+
+    if name == "anthropic":
+        from services.providers.anthropic import AnthropicLLMProvider
+
+        return AnthropicLLMProvider(model=model)
+
+    if name == "fake":
+        from services.providers.fake import FakeLLMProvider
+
+        return FakeLLMProvider(model=model)
+
+    raise ValueError(
+        f"Unknown LLM_PROVIDER={name!r}. "
+        f"Expected one of: gemini, openai, ollama, anthropic, fake."
+    )
+
+
+_PROVIDER_LABELS = {
+    "gemini": "Gemini",
+    "openai": "OpenAI",
+    "ollama": "Ollama",
+    "voyage": "Voyage AI",
+    "anthropic": "Anthropic",
+    "fake": "fake (load testing)",
+}
+
+
 def get_embedding_provider() -> EmbeddingProvider:
-    """Return singleton embedding provider based on ``EMBEDDING_PROVIDER``."""
+    """Return singleton embedding provider based on ``EMBEDDING_PROVIDER``.
+
+    With ``EMBEDDING_FALLBACK_PROVIDERS`` set, the singleton is a
+    ``FailoverEmbeddingProvider`` over the primary and its fallbacks.
+    """
     global _embedding_provider
 
     if _embedding_provider is not None:
@@ -35,42 +115,26 @@ def get_embedding_provider() -> EmbeddingProvider:
             return _embedding_provider
 
         name = config.EMBEDDING_PROVIDER
+        provider = build_embedding_provider(name)
+        logger.info("Using %s embedding provider", _PROVIDER_LABELS.get(name, name))
 
-        if name == "gemini":
-            from services.providers.gemini import GeminiEmbeddingProvider
-
-            _embedding_provider = GeminiEmbeddingProvider()
-            logger.info("Using Gemini embedding provider")
-
-        elif name == "openai":
-            from services.providers.openai import OpenAIEmbeddingProvider
-
-            _embedding_provider = OpenAIEmbeddingProvider()
-            logger.info("Using OpenAI embedding provider")
-
-        elif name == "ollama":
-            from services.providers.ollama import OllamaEmbeddingProvider
-
-            _embedding_provider = OllamaEmbeddingProvider()
-            logger.info("Using Ollama embedding provider")
+        if config.EMBEDDING_FALLBACK_PROVIDERS:
+            from services.providers.failover import build_embedding_failover
 
-        elif name == "voyage":
-            from services.providers.voyage import VoyageEmbeddingProvider
-
-            _embedding_provider = VoyageEmbeddingProvider()
-            logger.info("Using Voyage AI embedding provider")
-
-        else:
-            raise ValueError(
-                f"Unknown EMBEDDING_PROVIDER={name!r}. "
-                f"Expected one of: gemini, openai, ollama, voyage."
+            provider = build_embedding_failover(
+                name, provider, config.EMBEDDING_FALLBACK_PROVIDERS
             )
 
+        _embedding_provider = provider
         return _embedding_provider
 
 
 def get_llm_provider() -> LLMProvider:
-    """Return singleton LLM provider based on ``LLM_PROVIDER``."""
+    """Return singleton LLM provider based on ``LLM_PROVIDER``.
+
+    With ``LLM_FALLBACK_PROVIDERS`` set, the singleton is a
+    ``FailoverLLMProvider`` over the primary and its fallbacks.
+    """
     global _llm_provider
 
     if _llm_provider is not None:
@@ -81,35 +145,26 @@ def get_llm_provider() -> LLMProvider:
             return _llm_provider
 
         name = config.LLM_PROVIDER
+        provider = build_llm_provider(name)
+        logger.info("Using %s LLM provider", _PROVIDER_LABELS.get(name, name))
 
-        if name == "gemini":
-            from services.providers.gemini import GeminiLLMProvider
-
-            _llm_provider = GeminiLLMProvider()
-            logger.info("Using Gemini LLM provider")
-
-        elif name == "openai":
-            from services.providers.openai import OpenAILLMProvider
+        if config.LLM_FALLBACK_PROVIDERS:
+            from services.providers.failover import build_llm_failover
 
-            _llm_provider = OpenAILLMProvider()
-            logger.info("Using OpenAI LLM provider")
+            provider = build_llm_failover(name, provider, config.LLM_FALLBACK_PROVIDERS)
 
-        elif name == "ollama":
-            from services.providers.ollama import OllamaLLMProvider
-
-            _llm_provider = OllamaLLMProvider()
-            logger.info("Using Ollama LLM provider")
+        _llm_provider = provider
+        return _llm_provider
 
-        elif name == "anthropic":
-            from services.providers.anthropic import AnthropicLLMProvider
 
-            _llm_provider = AnthropicLLMProvider()
-            logger.info("Using Anthropic LLM provider")
+def reset_providers() -> None:
+    """Drop the cached providers so the next lookup builds fresh ones.
 
-        else:
-            raise ValueError(
-                f"Unknown LLM_PROVIDER={name!r}. "
-                f"Expected one of: gemini, openai, ollama, anthropic."
-            )
+    Called after ``transport.close_http_clients()`` so no provider keeps a
+    closed HTTP client.
+    """
+    global _embedding_provider, _llm_provider
 
-        return _llm_provider
+    with _provider_lock:
+        _embedding_provider = None
+        _llm_provider = None
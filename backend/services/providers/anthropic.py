@@ -9,6 +9,7 @@ import anthropic
 
 from core.config import config
 from services.providers.base import (
+    _DEFAULT_LLM_MODELS,
     LLMProvider,
     ProviderAuthError,
     ProviderConnectionError,
@@ -16,11 +17,13 @@ from services.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
 )
+from services.providers.transport import get_http_client, request_timeout
 
 logger = logging.getLogger(__name__)
 
 # See https://docs.anthropic.com/en/docs/about-claude/models
-_DEFAULT_LLM_MODEL = "claude-sonnet-4-20250514"
+_DEFAULT_LLM_MODEL = _DEFAULT_LLM_MODELS["anthropic"]
+_DEFAULT_BASE_URL = "https://api.anthropic.com"
 
 
 def _classify_anthropic_error(exc: anthropic.APIError) -> ProviderError:
@@ -45,11 +48,13 @@ class AnthropicLLMProvider(LLMProvider):
         base_url: str | None = None,
     ) -> None:
         self._model = model or config.LLM_MODEL or _DEFAULT_LLM_MODEL
+        base_url = base_url or config.ANTHROPIC_BASE_URL or _DEFAULT_BASE_URL
         self._client = anthropic.AsyncAnthropic(
             api_key=api_key or config.ANTHROPIC_API_KEY,
-            base_url=base_url or config.ANTHROPIC_BASE_URL,
-            timeout=float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0,
+            base_url=base_url,
+            timeout=request_timeout(float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0),
             max_retries=0,
+            http_client=get_http_client(base_url),
         )
 
     async def generate(
@@ -5,6 +5,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator
 
+from core.vectors import EmbeddingLike
+
 # ---------------------------------------------------------------------------
 # Common provider exceptions
 # ---------------------------------------------------------------------------
@@ -73,9 +75,74 @@ _DEFAULT_EMBEDDING_MODELS: dict[str, str] = {
     "openai": "text-embedding-3-small",
     "ollama": "nomic-embed-text",
     "voyage": "voyage-3-large",
+    "fake": "fake-embedding",
 }
 
 
+# ---------------------------------------------------------------------------
+# Known LLM context windows
+# ---------------------------------------------------------------------------
+# Maps generation model names to their input context window in tokens.  Used
+# by the context builder to cap retrieved context for the active model.
+
+KNOWN_CONTEXT_WINDOWS: dict[str, int] = {
+    # Gemini
+    "gemini-2.5-flash": 1_048_576,
+    "gemini-2.5-pro": 1_048_576,
+    "gemini-2.0-flash": 1_048_576,
+    "gemini-1.5-flash": 1_048_576,
+    "gemini-1.5-pro": 2_097_152,
+    # OpenAI
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4.1-mini": 1_047_576,
+    "gpt-4-turbo": 128_000,
+    "gpt-3.5-turbo": 16_385,
+    # Anthropic
+    "claude-sonnet-4-20250514": 200_000,
+    "claude-opus-4-20250514": 200_000,
+    "claude-3-7-sonnet-latest": 200_000,
+    "claude-3-5-haiku-latest": 200_000,
+    # Ollama
+    "llama3": 8_192,
+    "llama3.1": 131_072,
+    "llama3.2": 131_072,
+    "mistral": 32_768,
+    "qwen2.5": 32_768,
+    # Fake (load testing)
+    "fake-llm": 128_000,
+}
+
+# Default generation model per provider; each provider module reads its
+# default from here, so the context-window lookup always agrees with it.
+_DEFAULT_LLM_MODELS: dict[str, str] = {
+    "gemini": "gemini-2.5-flash",
+    "openai": "gpt-4o-mini",
+    "ollama": "llama3",
+    "anthropic": "claude-sonnet-4-20250514",
+    "fake": "fake-llm",
+}
+
+# Conservative window assumed for models missing from KNOWN_CONTEXT_WINDOWS.
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+
+def get_context_window(provider: str, model: str | None = None) -> int:
+    """Return the input context window (tokens) for *model* on *provider*.
+
+    Falls back to the provider's default model when *model* is unset, strips
+    provider prefixes (``models/...``) and Ollama tags (``llama3:8b``), and
+    returns ``DEFAULT_CONTEXT_WINDOW`` for unknown models.
+    """
+    name = model or _DEFAULT_LLM_MODELS.get(provider, "")
+    for candidate in (name, name.rsplit("/", 1)[-1], name.rsplit("/", 1)[-1].split(":", 1)[0]):
+        window = KNOWN_CONTEXT_WINDOWS.get(candidate)
+        if window:
+            return window
+    return DEFAULT_CONTEXT_WINDOW
+
+
 # ---------------------------------------------------------------------------
 # Abstract base classes
 # ---------------------------------------------------------------------------
@@ -84,9 +151,20 @@ _DEFAULT_EMBEDDING_MODELS: dict[str, str] = {
 class EmbeddingProvider(ABC):
     """Common interface for text-embedding implementations."""
 
+    # True when ``embed`` splits its input into batches and takes limiter
+    # slots and retries per batch (see ``providers.batching``); the embedding
+    # service then calls it without its own slot and whole-call retry. Such
+    # providers also accept ``embed(texts, max_retries=...)``; callers that
+    # must not retry (failover chains, health probes) pass ``max_retries=0``.
+    dispatches_batches: bool = False
+
     @abstractmethod
-    async def embed(self, texts: list[str]) -> list[list[float]]:
-        """Return one embedding vector per input text."""
+    async def embed(self, texts: list[str]) -> list[EmbeddingLike]:
+        """Return one embedding vector per input text.
+
+        Vectors may be lists or float32 arrays; ``embedding_service`` turns
+        them into float32 arrays either way.
+        """
 
     @property
     def embedding_dim(self) -> int:
@@ -0,0 +1,88 @@
+"""Bounded-concurrency batch dispatch for embedding providers.
+
+Providers whose API caps inputs per request (Gemini, Voyage) split a call
+into batches. ``dispatch_embedding_batches`` sends up to
+``EMBEDDING_BATCH_CONCURRENCY`` of them at once and reassembles the vectors in
+input order. Each batch attempt holds its own slot in the adaptive embedding
+limiter and is retried on its own, so a throttled batch never re-sends the
+batches that already succeeded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from core.config import config
+from core.vectors import EmbeddingLike
+from services.providers.concurrency import get_embedding_concurrency_limiter
+from utils.retry import (
+    DEFAULT_BACKOFF,
+    DEFAULT_BASE_DELAY,
+    DEFAULT_MAX_RETRIES,
+    retry_async,
+)
+
+logger = logging.getLogger(__name__)
+
+EmbedBatch = Callable[[list[str]], Awaitable[list[EmbeddingLike]]]
+
+
+async def dispatch_embedding_batches(
+    texts: list[str],
+    batch_size: int,
+    embed_batch: EmbedBatch,
+    *,
+    func_name: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> list[EmbeddingLike]:
+    """Embed *texts* in batches of *batch_size*, several batches at a time.
+
+    Returns one vector per input text, in input order. If a batch still fails
+    after *max_retries* retries, the remaining batches are cancelled and the
+    error is raised. Callers with their own retry policy pass ``max_retries=0``.
+    """
+    batches = [texts[start : start + batch_size] for start in range(0, len(texts), batch_size)]
+    if not batches:
+        return []
+
+    limiter = get_embedding_concurrency_limiter()
+    semaphore = asyncio.Semaphore(config.EMBEDDING_BATCH_CONCURRENCY)
+    results: list[list[EmbeddingLike]] = [[] for _ in batches]
+
+    async def _run(index: int, batch: list[str]) -> None:
+        async def _attempt() -> list[EmbeddingLike]:
+            return await limiter.call(
+                lambda: embed_batch(batch),
+                timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
+            )
+
+        async with semaphore:
+            embeddings = await retry_async(
+                _attempt,
+                max_retries=max_retries,
+                base_delay=DEFAULT_BASE_DELAY,
+                backoff=DEFAULT_BACKOFF,
+                timeout=None,
+                func_name=f"{func_name} (batch {index + 1}/{len(batches)})",
+            )
+        if len(embeddings) != len(batch):
+            raise ValueError(
+                f"{func_name} returned {len(embeddings)} embeddings for a batch of {len(batch)}"
+            )
+        results[index] = embeddings
+
+    if len(batches) == 1:
+        await _run(0, batches[0])
+        return results[0]
+
+    tasks = [asyncio.create_task(_run(index, batch)) for index, batch in enumerate(batches)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return [embedding for batch_embeddings in results for embedding in batch_embeddings]
@@ -0,0 +1,266 @@
+"""Adaptive (AIMD) concurrency limits for outbound provider calls.
+
+One limiter per role (embedding, LLM) caps how many provider requests are in
+flight from this API process.  The cap follows TCP-style AIMD:
+
+- every successful call adds ``1 / limit`` (≈ +1 per full window of successes);
+- a rate-limit, timeout or connection failure — anything ``is_transient_error``
+  treats as transient — multiplies the cap by ``PROVIDER_CONCURRENCY_DECREASE_FACTOR``
+  (at most once per ``_DECREASE_COOLDOWN_SEC`` so one throttled burst counts once);
+- non-transient errors (bad request, auth) and cancellations leave it unchanged.
+
+Waiters may live on different event loops (RQ worker threads each run their own
+loop), so slot accounting uses a thread lock and waiters are woken with
+``call_soon_threadsafe`` on the loop that is waiting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DECREASE_COOLDOWN_SEC = 1.0
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_OVERLOAD = "overload"
+OUTCOME_NEUTRAL = "neutral"
+
+
+def classify_provider_outcome(exc: BaseException) -> str:
+    """Map a failed provider call to an AIMD outcome."""
+    if isinstance(exc, asyncio.CancelledError):
+        return OUTCOME_NEUTRAL
+    from utils.retry import is_transient_error
+
+    if isinstance(exc, Exception) and is_transient_error(exc):
+        return OUTCOME_OVERLOAD
+    return OUTCOME_NEUTRAL
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.future: asyncio.Future = loop.create_future()
+        self.granted = False
+
+
+def _resolve_waiter(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD-controlled concurrency cap, safe across threads and event loops."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        decrease_factor: float,
+        enabled: bool = True,
+    ) -> None:
+        self.name = name
+        self._min_limit = max(1.0, float(min_limit))
+        self._max_limit = max(self._min_limit, float(max_limit))
+        self._limit = min(self._max_limit, max(self._min_limit, float(initial_limit)))
+        self._decrease_factor = min(0.99, max(0.1, float(decrease_factor)))
+        self._enabled = enabled
+        self._in_flight = 0
+        self._waiters: collections.deque[_Waiter] = collections.deque()
+        self._last_decrease = 0.0
+        self._successes = 0
+        self._overloads = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number concurrency cap."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def stats(self) -> dict[str, Any]:
+        """Point-in-time snapshot for ``/queue/stats``."""
+        with self._lock:
+            return {
+                "enabled": self._enabled,
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "min_limit": int(self._min_limit),
+                "max_limit": int(self._max_limit),
+                "successes": self._successes,
+                "overloads": self._overloads,
+            }
+
+    # ------------------------------------------------------------------
+    # Slot accounting
+    # ------------------------------------------------------------------
+
+    def _grant_waiters_locked(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            if waiter.future.cancelled():
+                continue
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve_waiter, waiter.future)
+            except RuntimeError:
+                # Waiting loop already closed (e.g. RQ job finished); skip it.
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        if not self._enabled:
+            return
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._grant_waiters_locked()
+                else:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+            raise
+
+    def release(self, outcome: str) -> None:
+        """Return a slot and adjust the limit from the call's *outcome*."""
+        if not self._enabled:
+            return
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if outcome == OUTCOME_SUCCESS:
+                self._successes += 1
+                self._limit = min(self._max_limit, self._limit + 1.0 / self._limit)
+            elif outcome == OUTCOME_OVERLOAD:
+                self._overloads += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= _DECREASE_COOLDOWN_SEC:
+                    previous = self._limit
+                    self._limit = max(self._min_limit, self._limit * self._decrease_factor)
+                    self._last_decrease = now
+                    logger.warning(
+                        "Provider %s concurrency reduced %d -> %d after throttling",
+                        self.name,
+                        int(previous),
+                        int(self._limit),
+                    )
+            self._grant_waiters_locked()
+
+    # ------------------------------------------------------------------
+    # Call helpers
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the block (e.g. a token stream)."""
+        await self.acquire()
+        outcome = OUTCOME_NEUTRAL
+        try:
+            yield
+            outcome = OUTCOME_SUCCESS
+        except BaseException as exc:
+            outcome = classify_provider_outcome(exc)
+            raise
+        finally:
+            self.release(outcome)
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        *,
+        timeout: float | None = None,
+    ) -> T:
+        """Run *func* inside a slot.
+
+        *timeout* applies to the provider call only, not to time spent waiting
+        for a slot, so queueing behind a reduced limit is never reported as a
+        provider timeout.
+        """
+        async with self.slot():
+            if timeout is None:
+                return await func()
+            return await asyncio.wait_for(func(), timeout=timeout)
+
+
+_embedding_limiter: AdaptiveConcurrencyLimiter | None = None
+_llm_limiter: AdaptiveConcurrencyLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def _build_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        name,
+        initial_limit=config.PROVIDER_CONCURRENCY_INITIAL,
+        min_limit=config.PROVIDER_CONCURRENCY_MIN,
+        max_limit=config.PROVIDER_CONCURRENCY_MAX,
+        decrease_factor=config.PROVIDER_CONCURRENCY_DECREASE_FACTOR,
+        enabled=config.PROVIDER_ADAPTIVE_CONCURRENCY_ENABLED,
+    )
+
+
+def get_embedding_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for embedding provider calls."""
+    global _embedding_limiter
+    if _embedding_limiter is not None:
+        return _embedding_limiter
+    with _limiter_lock:
+        if _embedding_limiter is None:
+            _embedding_limiter = _build_limiter("embedding")
+        return _embedding_limiter
+
+
+def get_llm_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for LLM provider calls."""
+    global _llm_limiter
+    if _llm_limiter is not None:
+        return _llm_limiter
+    with _limiter_lock:
+        if _llm_limiter is None:
+            _llm_limiter = _build_limiter("llm")
+        return _llm_limiter
+
+
+def provider_concurrency_stats() -> dict[str, dict[str, Any]]:
+    return {
+        "embedding": get_embedding_concurrency_limiter().stats(),
+        "llm": get_llm_concurrency_limiter().stats(),
+    }
+
+
+def reset_provider_concurrency_limiters() -> None:
+    """Clear cached limiters — for tests only."""
+    global _embedding_limiter, _llm_limiter
+    with _limiter_lock:
+        _embedding_limiter = None
+        _llm_limiter = None
@@ -0,0 +1,447 @@
+"""Ordered provider failover chains guarded by circuit breakers.
+
+``LLM_FALLBACK_PROVIDERS`` / ``EMBEDDING_FALLBACK_PROVIDERS`` list providers to
+try, in order, after the primary one. The provider factories then return a
+``FailoverLLMProvider`` / ``FailoverEmbeddingProvider`` that wraps the chain.
+
+Each member has a ``CircuitBreaker`` that looks at its last
+``PROVIDER_BREAKER_WINDOW`` calls. A call counts as a failure if it raised a
+transient or auth error, or if it took longer than the role's slow-call
+threshold. Once at least ``PROVIDER_BREAKER_MIN_CALLS`` calls have been seen
+and the failure rate reaches ``PROVIDER_BREAKER_FAILURE_RATE``, the breaker
+opens and the member is skipped for ``PROVIDER_BREAKER_OPEN_SEC``. After that
+one trial call is let through: success closes the breaker, failure re-opens it.
+
+Request-specific errors (bad request, unexpected response shape) are raised
+straight away without failing over, because another provider would most
+likely reject the request too.
+
+Embedding fallbacks must produce vectors of the stored dimension, and their
+models must be listed in ``KNOWN_EMBEDDING_DIMS``. Different models with the
+same dimension are still not semantically interchangeable, so a fallback with
+another model than the primary is rejected unless
+``EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS`` opts in. Such a fallback then only
+serves query embeds, and ingestion never falls back to it, so no stored vector
+comes from another embedding space.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generic, TypeVar
+
+from core.config import config
+from core.vectors import EmbeddingLike
+from services.providers.base import (
+    _DEFAULT_EMBEDDING_MODELS,
+    _DEFAULT_LLM_MODELS,
+    EmbeddingProvider,
+    LLMProvider,
+    ProviderAuthError,
+    ProviderConnectionError,
+)
+from services.providers.concurrency import get_embedding_concurrency_limiter
+from utils.retry import (
+    DEFAULT_BACKOFF,
+    DEFAULT_BASE_DELAY,
+    DEFAULT_MAX_RETRIES,
+    is_transient_error,
+    retry_async,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+P = TypeVar("P")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def _should_fail_over(exc: BaseException) -> bool:
+    if isinstance(exc, ProviderAuthError):
+        return True
+    return isinstance(exc, Exception) and is_transient_error(exc)
+
+
+class CircuitBreaker:
+    """Error-rate and slow-call breaker for one provider in a chain."""
+
+    def __init__(self, name: str, *, slow_call_sec: float) -> None:
+        self.name = name
+        self._slow_call_sec = slow_call_sec
+        self._lock = threading.Lock()
+        self._outcomes: collections.deque[bool] = collections.deque(
+            maxlen=config.PROVIDER_BREAKER_WINDOW
+        )
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.calls = 0
+        self.failures = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state_locked()
+
+    def _current_state_locked(self) -> str:
+        if (
+            self._state == STATE_OPEN
+            and time.monotonic() - self._opened_at >= config.PROVIDER_BREAKER_OPEN_SEC
+        ):
+            self._state = STATE_HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now (takes the single half-open trial)."""
+        with self._lock:
+            state = self._current_state_locked()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok: bool, elapsed: float) -> None:
+        failed = not ok or elapsed >= self._slow_call_sec
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+            if self._state == STATE_HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open_locked()
+                else:
+                    self._state = STATE_CLOSED
+                    self._outcomes.clear()
+                    logger.info("Provider %s circuit closed after a successful trial", self.name)
+                return
+            if self._state == STATE_OPEN:
+                return
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= config.PROVIDER_BREAKER_MIN_CALLS:
+                rate = sum(self._outcomes) / len(self._outcomes)
+                if rate >= config.PROVIDER_BREAKER_FAILURE_RATE:
+                    self._open_locked()
+
+    def _open_locked(self) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning(
+            "Provider %s circuit opened for %.0fs", self.name, config.PROVIDER_BREAKER_OPEN_SEC
+        )
+
+    def record_cancelled(self, elapsed: float) -> None:
+        """Record a call cancelled from outside (e.g. an outer timeout).
+
+        A call cancelled after the slow-call threshold counts as slow; one
+        cancelled sooner (a lost hedge, a client disconnect) has no outcome.
+        """
+        if elapsed >= self._slow_call_sec:
+            self.record(False, elapsed)
+            return
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state_locked(),
+                "calls": self.calls,
+                "failures": self.failures,
+                "opened": self.opened,
+            }
+
+
+class _Chain(Generic[P]):
+    """Ordered (label, provider, breaker) members shared by both failover wrappers."""
+
+    def __init__(self, role: str, members: list[tuple[str, P]], *, slow_call_sec: float) -> None:
+        self.role = role
+        self.members = [
+            (label, provider, CircuitBreaker(f"{role}:{label}", slow_call_sec=slow_call_sec))
+            for label, provider in members
+        ]
+        self.failovers = 0
+        self.exhausted = 0
+
+    def preferred(self) -> P:
+        for _, provider, breaker in self.members:
+            if breaker.state != STATE_OPEN:
+                return provider
+        return self.members[0][1]
+
+    async def call(
+        self, invoke: Callable[[P], Awaitable[T]], *, skip: frozenset[str] = frozenset()
+    ) -> T:
+        last_error: BaseException | None = None
+        tried = 0
+        for label, provider, breaker in self.members:
+            if label in skip or not breaker.allow():
+                continue
+            if tried:
+                self.failovers += 1
+                logger.warning("Failing over %s call to %s", self.role, label)
+            tried += 1
+            started = time.monotonic()
+            try:
+                result = await invoke(provider)
+            except asyncio.CancelledError:
+                breaker.record_cancelled(time.monotonic() - started)
+                raise
+            except Exception as exc:
+                if not _should_fail_over(exc):
+                    breaker.record(True, time.monotonic() - started)
+                    raise
+                breaker.record(False, time.monotonic() - started)
+                last_error = exc
+                continue
+            breaker.record(True, time.monotonic() - started)
+            return result
+
+        self.exhausted += 1
+        if last_error is not None:
+            raise last_error
+        raise ProviderConnectionError(
+            f"All {self.role} providers are unavailable (circuit breakers open)."
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "failovers": self.failovers,
+            "exhausted": self.exhausted,
+            "providers": {label: breaker.stats() for label, _, breaker in self.members},
+        }
+
+
+class FailoverLLMProvider(LLMProvider):
+    """LLM provider that tries an ordered chain of providers."""
+
+    def __init__(self, members: list[tuple[str, LLMProvider]]) -> None:
+        self._chain: _Chain[LLMProvider] = _Chain(
+            "llm", members, slow_call_sec=config.LLM_BREAKER_SLOW_CALL_MS / 1000.0
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._chain.preferred().model_name
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        system_instruction: str,
+        temperature: float,
+        max_output_tokens: int,
+        extra_params: dict[str, Any] | None = None,
+    ) -> str:
+        return await self._chain.call(
+            lambda provider: provider.generate(
+                prompt,
+                system_instruction=system_instruction,
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                extra_params=extra_params,
+            )
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system_instruction: str,
+        temperature: float,
+        max_output_tokens: int,
+        extra_params: dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream from the first member that produces a chunk.
+
+        Failover happens only before the first chunk; once text has been
+        yielded, later errors propagate.
+        """
+
+        async def _open(provider: LLMProvider) -> tuple[AsyncGenerator[str, None], str | None]:
+            stream = provider.generate_stream(
+                prompt,
+                system_instruction=system_instruction,
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                extra_params=extra_params,
+            )
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream, first
+
+        stream, first = await self._chain.call(_open)
+        try:
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            await stream.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return self._chain.stats()
+
+
+class FailoverEmbeddingProvider(EmbeddingProvider):
+    """Embedding provider that tries an ordered chain of dimension-compatible providers.
+
+    It takes limiter slots itself (per member attempt, or per batch for
+    members that dispatch batches), so the embedding service calls it
+    directly. Members are called without their own retries, so a failing
+    member hands over at once; the chain as a whole is retried (with backoff)
+    only once every member has failed.
+
+    Members in *query_only* (a different model than the primary) are used
+    only for ``embed(..., query=True)``.
+    """
+
+    dispatches_batches = True
+
+    def __init__(
+        self,
+        members: list[tuple[str, EmbeddingProvider]],
+        embedding_dim: int,
+        *,
+        query_only: frozenset[str] = frozenset(),
+    ) -> None:
+        self._chain: _Chain[EmbeddingProvider] = _Chain(
+            "embedding", members, slow_call_sec=config.EMBEDDING_BREAKER_SLOW_CALL_MS / 1000.0
+        )
+        self._embedding_dim = embedding_dim
+        self._query_only = query_only
+
+    @property
+    def embedding_dim(self) -> int:
+        return self._embedding_dim
+
+    async def embed(
+        self, texts: list[str], *, max_retries: int = DEFAULT_MAX_RETRIES, query: bool = False
+    ) -> list[EmbeddingLike]:
+        limiter = get_embedding_concurrency_limiter()
+
+        async def _invoke(provider: EmbeddingProvider) -> list[EmbeddingLike]:
+            if getattr(provider, "dispatches_batches", False) is True:
+                return await provider.embed(texts, max_retries=0)  # type: ignore[call-arg]
+            return await limiter.call(
+                lambda: provider.embed(texts),
+                timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
+            )
+
+        # Retry the whole chain (with backoff) only once every member has failed.
+        return await retry_async(
+            lambda: self._chain.call(_invoke, skip=frozenset() if query else self._query_only),
+            max_retries=max_retries,
+            base_delay=DEFAULT_BASE_DELAY,
+            backoff=DEFAULT_BACKOFF,
+            timeout=None,
+            func_name="FailoverEmbeddingProvider.embed",
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return self._chain.stats()
+
+
+def _label(name: str, model: str | None) -> str:
+    return f"{name}:{model}" if model else name
+
+
+def build_llm_failover(
+    primary_name: str,
+    primary: LLMProvider,
+    fallbacks: list[tuple[str, str | None]],
+) -> FailoverLLMProvider:
+    """Wrap *primary* and the configured fallbacks in a failover chain."""
+    from services.providers import build_llm_provider
+
+    members: list[tuple[str, LLMProvider]] = [(_label(primary_name, primary.model_name), primary)]
+    for name, model in fallbacks:
+        provider = build_llm_provider(name, model or _DEFAULT_LLM_MODELS.get(name))
+        members.append((_label(name, provider.model_name), provider))
+    logger.info("LLM failover chain: %s", " -> ".join(label for label, _ in members))
+    return FailoverLLMProvider(members)
+
+
+def build_embedding_failover(
+    primary_name: str,
+    primary: EmbeddingProvider,
+    fallbacks: list[tuple[str, str | None]],
+) -> FailoverEmbeddingProvider:
+    """Wrap *primary* and the configured fallbacks in a failover chain.
+
+    Raises ``ValueError`` when a fallback model is missing from
+    ``KNOWN_EMBEDDING_DIMS``, its dimension differs from the stored one, or
+    it differs from the primary model without
+    ``EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS``. Allowed fallbacks with a
+    different model serve query embeds only.
+    """
+    from services.providers import build_embedding_provider
+
+    raw_dim = os.getenv("EMBEDDING_DIM")
+    dim = int(raw_dim) if raw_dim else primary.embedding_dim
+    primary_model = getattr(primary, "_model", None)
+    members: list[tuple[str, EmbeddingProvider]] = [(_label(primary_name, primary_model), primary)]
+    query_only: set[str] = set()
+    for name, model in fallbacks:
+        provider = build_embedding_provider(name, model or _DEFAULT_EMBEDDING_MODELS.get(name))
+        fallback_model = getattr(provider, "_model", None)
+        fallback_dim = provider.embedding_dim
+        if fallback_dim != dim:
+            raise ValueError(
+                f"EMBEDDING_FALLBACK_PROVIDERS entry {_label(name, fallback_model)!r} produces "
+                f"{fallback_dim}-dimensional vectors, but stored embeddings have {dim}. "
+                f"Only models with the same dimension can be used as fallbacks."
+            )
+        label = _label(name, fallback_model)
+        if fallback_model != primary_model:
+            if not config.EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS:
+                raise ValueError(
+                    f"EMBEDDING_FALLBACK_PROVIDERS entry {label!r} uses a different model than "
+                    f"{_label(primary_name, primary_model)!r}, so its query vectors would not "
+                    f"rank against the stored ones. Use the same model on another endpoint, or "
+                    f"set EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS=true to accept degraded retrieval."
+                )
+            query_only.add(label)
+            logger.warning(
+                "Embedding fallback %s uses a different model than %s; it serves query "
+                "embeds only (retrieval quality drops meanwhile) and never ingestion.",
+                label,
+                _label(primary_name, primary_model),
+            )
+        members.append((label, provider))
+    logger.info("Embedding failover chain: %s", " -> ".join(label for label, _ in members))
+    return FailoverEmbeddingProvider(members, dim, query_only=frozenset(query_only))
+
+
+def provider_failover_stats() -> dict[str, Any]:
+    """Breaker state per chain member; ``None`` for roles without a chain."""
+    import services.providers as providers
+
+    stats: dict[str, Any] = {}
+    for role, provider in (
+        ("llm", providers._llm_provider),
+        ("embedding", providers._embedding_provider),
+    ):
+        failover = isinstance(provider, (FailoverLLMProvider, FailoverEmbeddingProvider))
+        stats[role] = provider.stats() if failover else None
+    return stats
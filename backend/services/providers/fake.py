@@ -0,0 +1,149 @@
+"""Deterministic offline providers for load and performance testing.
+
+Select them with ``EMBEDDING_PROVIDER=fake`` / ``LLM_PROVIDER=fake`` (and
+``RERANKER_PROVIDER=fake``). They need no keys or network, so benchmarks
+measure this service rather than provider variance.
+
+- Embeddings are unit vectors of ``FAKE_EMBEDDING_DIM`` seeded from a SHA-256
+  of the text. The same text always gets the same vector, in every process.
+- Latencies are drawn from a log-normal distribution whose median is
+  ``FAKE_*_LATENCY_MS`` and whose spread is ``FAKE_LATENCY_SIGMA`` (0 means a
+  constant latency). For generation that latency is the time to first token.
+  Tokens then follow at ``FAKE_LLM_TOKENS_PER_SEC``.
+- ``FAKE_PROVIDER_RATE_LIMIT_RATE`` and ``FAKE_PROVIDER_TIMEOUT_RATE`` inject
+  429s and hangs into that share of calls. A hang waits for the role's HTTP
+  timeout and then raises ``ProviderTimeoutError``, like a stalled upstream.
+
+Latencies and faults come from one ``random.Random`` seeded with
+``FAKE_PROVIDER_SEED``, so a run with a fixed request order is repeatable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import re
+from typing import Any, AsyncGenerator
+
+import numpy as np
+
+from core.config import config
+from core.vectors import Embedding
+from services.providers.base import (
+    _DEFAULT_LLM_MODELS,
+    EmbeddingProvider,
+    LLMProvider,
+    ProviderRateLimitError,
+    ProviderTimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_EMBEDDING_MODEL = "fake-embedding"
+_DEFAULT_LLM_MODEL = _DEFAULT_LLM_MODELS["fake"]
+
+_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]+")
+_FALLBACK_WORDS = ("the", "document", "states", "that", "answer", "context", "source")
+
+_rng = random.Random(config.FAKE_PROVIDER_SEED)
+
+
+def reset_fake_randomness(seed: int | None = None) -> None:
+    """Re-seed the shared latency/fault generator (between benchmark runs, tests)."""
+    _rng.seed(config.FAKE_PROVIDER_SEED if seed is None else seed)
+
+
+def sample_latency(median_ms: float) -> float:
+    """Seconds drawn from a log-normal distribution with median *median_ms*."""
+    if median_ms <= 0:
+        return 0.0
+    sigma = config.FAKE_LATENCY_SIGMA
+    factor = math.exp(_rng.gauss(0.0, sigma)) if sigma > 0 else 1.0
+    return median_ms * factor / 1000.0
+
+
+async def inject_fault(timeout_sec: float) -> None:
+    """Raise a simulated 429 or stall-then-timeout for the configured share of calls."""
+    roll = _rng.random()
+    if roll < config.FAKE_PROVIDER_RATE_LIMIT_RATE:
+        raise ProviderRateLimitError("Fake provider: injected 429 Too Many Requests")
+    if roll < config.FAKE_PROVIDER_RATE_LIMIT_RATE + config.FAKE_PROVIDER_TIMEOUT_RATE:
+        await asyncio.sleep(timeout_sec)
+        raise ProviderTimeoutError(f"Fake provider: injected timeout after {timeout_sec:.1f}s")
+
+
+def fake_embedding(text: str, dim: int) -> Embedding:
+    """Unit float32 vector of *dim* values seeded from the SHA-256 of *text*."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    vector = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+    norm = np.linalg.norm(vector) or 1.0
+    return vector / norm
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """Hash-seeded embeddings with simulated latency and faults."""
+
+    def __init__(self, model: str | None = None, dim: int | None = None) -> None:
+        self._model = model or config.EMBEDDING_MODEL or _DEFAULT_EMBEDDING_MODEL
+        self._dim = dim or config.FAKE_EMBEDDING_DIM
+
+    @property
+    def embedding_dim(self) -> int:
+        return self._dim
+
+    async def embed(self, texts: list[str]) -> list[Embedding]:
+        await inject_fault(float(config.EMBEDDING_HTTP_TIMEOUT_SEC))
+        await asyncio.sleep(sample_latency(config.FAKE_EMBEDDING_LATENCY_MS))
+        return [fake_embedding(text, self._dim) for text in texts]
+
+
+class FakeLLMProvider(LLMProvider):
+    """Generates prompt-derived text at a configurable latency and token rate."""
+
+    def __init__(self, model: str | None = None) -> None:
+        self._model = model or config.LLM_MODEL or _DEFAULT_LLM_MODEL
+
+    def _tokens(self, prompt: str, max_output_tokens: int) -> list[str]:
+        # Words from the prompt, picked deterministically per prompt.
+        words = _WORD_PATTERN.findall(prompt) or list(_FALLBACK_WORDS)
+        seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        count = max(1, min(max_output_tokens, config.FAKE_LLM_OUTPUT_TOKENS))
+        return [rng.choice(words) for _ in range(count)]
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        system_instruction: str,
+        temperature: float,
+        max_output_tokens: int,
+        extra_params: dict[str, Any] | None = None,
+    ) -> str:
+        await inject_fault(config.LLM_HTTP_TIMEOUT_MS / 1000.0)
+        tokens = self._tokens(prompt, max_output_tokens)
+        await asyncio.sleep(
+            sample_latency(config.FAKE_LLM_LATENCY_MS) + len(tokens) / config.FAKE_LLM_TOKENS_PER_SEC
+        )
+        return " ".join(tokens)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        system_instruction: str,
+        temperature: float,
+        max_output_tokens: int,
+        extra_params: dict[str, Any] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        await inject_fault(config.LLM_HTTP_TIMEOUT_MS / 1000.0)
+        tokens = self._tokens(prompt, max_output_tokens)
+        await asyncio.sleep(sample_latency(config.FAKE_LLM_LATENCY_MS))
+        interval = 1.0 / config.FAKE_LLM_TOKENS_PER_SEC
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(interval)
+            yield token if index == 0 else f" {token}"
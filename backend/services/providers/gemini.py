@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, AsyncGenerator
 
@@ -13,6 +12,7 @@ from google.genai.errors import APIError
 
 from core.config import config
 from services.providers.base import (
+    _DEFAULT_LLM_MODELS,
     EmbeddingProvider,
     LLMProvider,
     ProviderAuthError,
@@ -21,6 +21,8 @@ from services.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
 )
+from services.providers.batching import dispatch_embedding_batches
+from utils.retry import DEFAULT_MAX_RETRIES
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ _BATCH_SIZE = 100
 
 # Default models when the user doesn't specify one via LLM_MODEL / EMBEDDING_MODEL.
 _DEFAULT_EMBEDDING_MODEL = "models/gemini-embedding-001"
-_DEFAULT_LLM_MODEL = "gemini-2.5-flash"
+_DEFAULT_LLM_MODEL = _DEFAULT_LLM_MODELS["gemini"]
 
 
 def _classify_gemini_error(exc: APIError) -> ProviderError:
@@ -83,7 +85,13 @@ def _classify_network_error(
 
 
 class GeminiEmbeddingProvider(EmbeddingProvider):
-    """Embedding provider backed by the Google Gemini API."""
+    """Embedding provider backed by the Google Gemini API.
+
+    All calls go through the SDK's async client (``client.aio``), so in-flight
+    requests do not hold default-executor threads.
+    """
+
+    dispatches_batches = True
 
     def __init__(
         self,
@@ -98,34 +106,38 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
             ),
         )
 
-    async def embed(self, texts: list[str]) -> list[list[float]]:
-        """Embed *texts* in batches of at most ``_BATCH_SIZE``."""
-        all_embeddings: list[list[float]] = []
-
-        for batch_start in range(0, len(texts), _BATCH_SIZE):
-            batch = texts[batch_start : batch_start + _BATCH_SIZE]
-            try:
-                result = await asyncio.to_thread(
-                    self._client.models.embed_content,
-                    model=self._model,
-                    contents=batch,
-                )
-                all_embeddings.extend(e.values for e in result.embeddings)
-
-            except APIError as exc:
-                raise _classify_gemini_error(exc) from exc
-            except (
-                httpx.TimeoutException,
-                httpx.ConnectError,
-                httpx.RemoteProtocolError,
-                httpx.NetworkError,
-                TimeoutError,
-                ConnectionError,
-                BrokenPipeError,
-            ) as exc:
-                raise _classify_network_error(exc) from exc
-
-        return all_embeddings
+    async def embed(
+        self, texts: list[str], *, max_retries: int = DEFAULT_MAX_RETRIES
+    ) -> list[list[float]]:
+        """Embed *texts* in batches of at most ``_BATCH_SIZE``, sent concurrently."""
+        return await dispatch_embedding_batches(
+            texts,
+            _BATCH_SIZE,
+            self._embed_batch,
+            func_name="gemini.embed",
+            max_retries=max_retries,
+        )
+
+    async def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        try:
+            result = await self._client.aio.models.embed_content(
+                model=self._model,
+                contents=batch,
+            )
+            return [e.values for e in result.embeddings]
+
+        except APIError as exc:
+            raise _classify_gemini_error(exc) from exc
+        except (
+            httpx.TimeoutException,
+            httpx.ConnectError,
+            httpx.RemoteProtocolError,
+            httpx.NetworkError,
+            TimeoutError,
+            ConnectionError,
+            BrokenPipeError,
+        ) as exc:
+            raise _classify_network_error(exc) from exc
 
 
 # ---------------------------------------------------------------------------
@@ -134,7 +146,7 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
 
 
 class GeminiLLMProvider(LLMProvider):
-    """LLM provider backed by the Google Gemini API."""
+    """LLM provider backed by the Google Gemini API (async client, see above)."""
 
     def __init__(
         self,
@@ -172,8 +184,7 @@ class GeminiLLMProvider(LLMProvider):
         gen_config = genai_types.GenerateContentConfig(**config_kwargs)
 
         try:
-            response = await asyncio.to_thread(
-                self._client.models.generate_content,
+            response = await self._client.aio.models.generate_content(
                 model=self._model,
                 contents=prompt,
                 config=gen_config,
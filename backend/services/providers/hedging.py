@@ -0,0 +1,151 @@
+"""Budgeted request hedging for idempotent, latency-sensitive provider calls.
+
+A hedged call starts the request and, if no result has arrived after the
+observed ``EMBEDDING_HEDGE_PERCENTILE`` latency of recent calls, starts one
+duplicate and returns whichever finishes first successfully. The other one is
+cancelled. Hedging only pays off for cheap idempotent calls, so it is used for
+query-time embeddings (``embedding_service.get_query_embeddings``) and never
+for ingestion or generation.
+
+Extra load is capped by a token bucket. Every call earns
+``EMBEDDING_HEDGE_BUDGET_RATIO`` tokens and every hedge spends one, so hedges
+stay at about that fraction of calls even while the provider is slow. Until
+``EMBEDDING_HEDGE_MIN_SAMPLES`` latencies have been seen, calls are not hedged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import math
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Recent successful latencies kept for the trigger percentile.
+_LATENCY_WINDOW = 256
+# Hedge tokens that can be saved up while calls are fast.
+_MAX_BUDGET_TOKENS = 10.0
+
+
+class RequestHedger:
+    """Issues a duplicate request when the first is slower than the recent pN."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies: collections.deque[float] = collections.deque(maxlen=_LATENCY_WINDOW)
+        self._tokens = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.EMBEDDING_HEDGE_ENABLED
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._tokens = 0.0
+            self.calls = self.hedged = self.hedge_wins = self.budget_exhausted = 0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while too few samples exist."""
+        with self._lock:
+            if len(self._latencies) < config.EMBEDDING_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        rank = math.ceil(config.EMBEDDING_HEDGE_PERCENTILE / 100.0 * len(ordered)) - 1
+        delay = ordered[min(len(ordered) - 1, max(0, rank))]
+        return max(delay, config.EMBEDDING_HEDGE_MIN_DELAY_MS / 1000.0)
+
+    def _record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.hedged += 1
+                return True
+            self.budget_exhausted += 1
+            return False
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()``, hedging it once if it is slower than the recent pN."""
+        if not self.enabled:
+            return await fn()
+
+        with self._lock:
+            self.calls += 1
+            self._tokens = min(
+                _MAX_BUDGET_TOKENS, self._tokens + config.EMBEDDING_HEDGE_BUDGET_RATIO
+            )
+        delay = self.hedge_delay()
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(fn())
+        hedge: asyncio.Future | None = None
+        if delay is None:
+            result = await primary
+            self._record(time.monotonic() - started)
+            return result
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._take_token():
+                result = await primary
+                self._record(time.monotonic() - started)
+                return result
+
+            logger.debug("%s call slower than %.0f ms; sending hedge", self.name, delay * 1000)
+            hedge_started = time.monotonic()
+            hedge = asyncio.ensure_future(fn())
+            pending = {primary, hedge}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    for other in pending:
+                        other.cancel()
+                    if task is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                        self._record(time.monotonic() - hedge_started)
+                    else:
+                        self._record(time.monotonic() - started)
+                    return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "budget_exhausted": self.budget_exhausted,
+                "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            }
+
+
+query_embedding_hedger = RequestHedger("query_embedding")
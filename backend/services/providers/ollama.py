@@ -10,6 +10,7 @@ import httpx
 
 from core.config import config
 from services.providers.base import (
+    _DEFAULT_LLM_MODELS,
     EmbeddingProvider,
     LLMProvider,
     ProviderAuthError,
@@ -18,6 +19,7 @@ from services.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
 )
+from services.providers.transport import get_http_client, request_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +28,7 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
-_DEFAULT_LLM_MODEL = "llama3"
+_DEFAULT_LLM_MODEL = _DEFAULT_LLM_MODELS["ollama"]
 
 
 # ---------------------------------------------------------------------------
@@ -72,17 +74,16 @@ class OllamaEmbeddingProvider(EmbeddingProvider):
     ) -> None:
         self._model = model or config.EMBEDDING_MODEL or _DEFAULT_EMBEDDING_MODEL
         self._base_url = (base_url or config.OLLAMA_BASE_URL).rstrip("/")
-        self._client = httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
-        )
+        self._client = get_http_client(self._base_url)
+        self._timeout = request_timeout(float(config.EMBEDDING_HTTP_TIMEOUT_SEC))
 
     async def embed(self, texts: list[str]) -> list[list[float]]:
         """POST to ``/api/embed`` for batch embedding."""
         try:
             response = await self._client.post(
-                "/api/embed",
+                f"{self._base_url}/api/embed",
                 json={"model": self._model, "input": texts},
+                timeout=self._timeout,
             )
             response.raise_for_status()
             data = response.json()
@@ -123,10 +124,8 @@ class OllamaLLMProvider(LLMProvider):
     ) -> None:
         self._model = model or config.LLM_MODEL or _DEFAULT_LLM_MODEL
         self._base_url = (base_url or config.OLLAMA_BASE_URL).rstrip("/")
-        self._client = httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0,
-        )
+        self._client = get_http_client(self._base_url)
+        self._timeout = request_timeout(float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0)
 
     async def generate(
         self,
@@ -148,7 +147,7 @@ class OllamaLLMProvider(LLMProvider):
                     if key in extra_params:
                         options[key] = extra_params[key]
             response = await self._client.post(
-                "/api/generate",
+                f"{self._base_url}/api/generate",
                 json={
                     "model": self._model,
                     "prompt": prompt,
@@ -156,6 +155,7 @@ class OllamaLLMProvider(LLMProvider):
                     "stream": False,
                     "options": options,
                 },
+                timeout=self._timeout,
             )
             response.raise_for_status()
             return response.json().get("response", "No response.")
@@ -187,7 +187,7 @@ class OllamaLLMProvider(LLMProvider):
             
             async with self._client.stream(
                 "POST",
-                "/api/generate",
+                f"{self._base_url}/api/generate",
                 json={
                     "model": self._model,
                     "prompt": prompt,
@@ -195,6 +195,7 @@ class OllamaLLMProvider(LLMProvider):
                     "stream": True,
                     "options": options,
                 },
+                timeout=self._timeout,
             ) as response:
                 response.raise_for_status()
                 async for line in response.aiter_lines():
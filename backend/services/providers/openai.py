@@ -8,7 +8,9 @@ from typing import Any, AsyncGenerator
 import openai
 
 from core.config import config
+from core.vectors import Embedding, embedding_from_response
 from services.providers.base import (
+    _DEFAULT_LLM_MODELS,
     EmbeddingProvider,
     LLMProvider,
     ProviderAuthError,
@@ -17,6 +19,7 @@ from services.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
 )
+from services.providers.transport import get_http_client, request_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +28,8 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
-_DEFAULT_LLM_MODEL = "gpt-4o-mini"
+_DEFAULT_LLM_MODEL = _DEFAULT_LLM_MODELS["openai"]
+_DEFAULT_BASE_URL = "https://api.openai.com/v1"
 
 
 # ---------------------------------------------------------------------------
@@ -71,21 +75,26 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         base_url: str | None = None,
     ) -> None:
         self._model = model or config.EMBEDDING_MODEL or _DEFAULT_EMBEDDING_MODEL
+        base_url = base_url or config.OPENAI_BASE_URL or _DEFAULT_BASE_URL
         self._client = openai.AsyncOpenAI(
             api_key=api_key or config.OPENAI_API_KEY,
-            base_url=base_url or config.OPENAI_BASE_URL,
-            timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
+            base_url=base_url,
+            timeout=request_timeout(float(config.EMBEDDING_HTTP_TIMEOUT_SEC)),
             max_retries=0,
+            http_client=get_http_client(base_url),
         )
 
-    async def embed(self, texts: list[str]) -> list[list[float]]:
+    async def embed(self, texts: list[str]) -> list[Embedding]:
         """Embed *texts* via the OpenAI embeddings endpoint."""
         try:
+            # Asking for base64 explicitly keeps the SDK from expanding each
+            # vector into a list of Python floats.
             response = await self._client.embeddings.create(
                 model=self._model,
                 input=texts,
+                encoding_format="base64",
             )
-            return [item.embedding for item in response.data]
+            return [embedding_from_response(item.embedding) for item in response.data]
 
         except openai.APIError as exc:
             raise _classify_openai_error(exc) from exc
@@ -106,11 +115,13 @@ class OpenAILLMProvider(LLMProvider):
         base_url: str | None = None,
     ) -> None:
         self._model = model or config.LLM_MODEL or _DEFAULT_LLM_MODEL
+        base_url = base_url or config.OPENAI_BASE_URL or _DEFAULT_BASE_URL
         self._client = openai.AsyncOpenAI(
             api_key=api_key or config.OPENAI_API_KEY,
-            base_url=base_url or config.OPENAI_BASE_URL,
-            timeout=float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0,
+            base_url=base_url,
+            timeout=request_timeout(float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0),
             max_retries=0,
+            http_client=get_http_client(base_url),
         )
 
     async def generate(
@@ -0,0 +1,155 @@
+"""Shared, tuned HTTP connection pools for provider clients.
+
+Every provider that talks HTTP through httpx (OpenAI, Anthropic, Ollama,
+Voyage) gets its ``httpx.AsyncClient`` from ``get_http_client``, which keeps
+one client per upstream origin (scheme + host + port). Embedding and LLM
+providers that point at the same host therefore share one pool of warm
+keep-alive connections instead of each paying its own TCP/TLS handshakes.
+
+Pool limits, keep-alive expiry, the connect timeout and HTTP/2 are set from
+``PROVIDER_HTTP_*``. Read timeouts stay per request, so embedding and LLM calls
+keep their own budgets on a shared client. HTTP/2 needs the optional ``h2``
+package (``pip install httpx[http2]``); without it the pools fall back to
+HTTP/1.1 with a warning.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+_http2_warning_logged = False
+
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"Provider base URL must be absolute, got {base_url!r}")
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def _http2_enabled() -> bool:
+    global _http2_warning_logged
+
+    if not config.PROVIDER_HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is not None:
+        return True
+    if not _http2_warning_logged:
+        _http2_warning_logged = True
+        logger.warning(
+            "PROVIDER_HTTP2_ENABLED is set but the 'h2' package is not installed; "
+            "provider connections use HTTP/1.1. Install httpx[http2] to enable HTTP/2."
+        )
+    return False
+
+
+def request_timeout(read_timeout_sec: float) -> httpx.Timeout:
+    """Per-request timeout: *read_timeout_sec* overall, the shared connect cap."""
+    return httpx.Timeout(
+        read_timeout_sec,
+        connect=min(read_timeout_sec, float(config.PROVIDER_HTTP_CONNECT_TIMEOUT_SEC)),
+    )
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=config.PROVIDER_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.PROVIDER_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=config.PROVIDER_HTTP_KEEPALIVE_EXPIRY_SEC,
+        ),
+        timeout=request_timeout(float(config.LLM_HTTP_TIMEOUT_MS) / 1000.0),
+    )
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Return the shared client for *base_url*'s origin, creating it if needed.
+
+    The client has no ``base_url`` of its own (providers on the same host may
+    use different path prefixes), so callers pass absolute URLs.
+    """
+    key = _origin(base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = _build_client()
+            _clients[key] = client
+        return client
+
+
+async def warm_http_clients(connections: int | None = None) -> int:
+    """Open up to *connections* keep-alive connections to each registered origin.
+
+    Sends ``HEAD /`` requests concurrently per origin so the first real provider
+    calls reuse warm connections. Any response counts, including 4xx; network
+    errors are logged and ignored. Returns the number of connections opened.
+    """
+    count = config.PROVIDER_HTTP_WARMUP_CONNECTIONS if connections is None else connections
+    count = min(count, config.PROVIDER_HTTP_MAX_KEEPALIVE)
+    if count <= 0:
+        return 0
+
+    with _clients_lock:
+        targets = [(origin, client) for origin, client in _clients.items() if not client.is_closed]
+
+    async def _probe(origin: str, client: httpx.AsyncClient) -> bool:
+        try:
+            await client.head(
+                f"{origin}/",
+                timeout=float(config.PROVIDER_HTTP_CONNECT_TIMEOUT_SEC),
+            )
+        except httpx.HTTPError as exc:
+            logger.info("Connection warmup to %s failed: %s", origin, exc)
+            return False
+        return True
+
+    results = await asyncio.gather(
+        *(_probe(origin, client) for origin, client in targets for _ in range(count))
+    )
+    opened = sum(results)
+    if targets:
+        logger.info(
+            "Warmed %d provider connection(s) across %d host(s)", opened, len(targets)
+        )
+    return opened
+
+
+async def close_http_clients() -> None:
+    """Close and forget every shared client."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            logger.warning("Failed to close provider HTTP client", exc_info=True)
+
+
+def reset_http_clients() -> None:
+    """Forget every shared client without closing it (tests, event-loop changes)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def http_client_stats() -> dict:
+    with _clients_lock:
+        return {
+            "hosts": sorted(origin for origin, client in _clients.items() if not client.is_closed),
+            "http2": _http2_enabled(),
+            "max_connections": config.PROVIDER_HTTP_MAX_CONNECTIONS,
+            "max_keepalive": config.PROVIDER_HTTP_MAX_KEEPALIVE,
+        }
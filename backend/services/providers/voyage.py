@@ -7,6 +7,7 @@ import logging
 import httpx
 
 from core.config import config
+from core.vectors import Embedding, embedding_from_response
 from services.providers.base import (
     EmbeddingProvider,
     ProviderAuthError,
@@ -15,6 +16,9 @@ from services.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
 )
+from services.providers.batching import dispatch_embedding_batches
+from services.providers.transport import get_http_client, request_timeout
+from utils.retry import DEFAULT_MAX_RETRIES
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,8 @@ def _classify_network_error(
 class VoyageEmbeddingProvider(EmbeddingProvider):
     """Embedding provider backed by the Voyage AI REST API."""
 
+    dispatches_batches = True
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -55,37 +61,40 @@ class VoyageEmbeddingProvider(EmbeddingProvider):
         self._model = model or config.EMBEDDING_MODEL or _DEFAULT_EMBEDDING_MODEL
         self._api_key = api_key or config.VOYAGE_API_KEY
         self._base_url = (base_url or "https://api.voyageai.com").rstrip("/")
-        self._client = httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=float(config.EMBEDDING_HTTP_TIMEOUT_SEC),
-        )
+        self._client = get_http_client(self._base_url)
+        self._timeout = request_timeout(float(config.EMBEDDING_HTTP_TIMEOUT_SEC))
 
-    async def embed(self, texts: list[str]) -> list[list[float]]:
+    async def embed(
+        self, texts: list[str], *, max_retries: int = DEFAULT_MAX_RETRIES
+    ) -> list[Embedding]:
         if not self._api_key:
             raise ProviderAuthError("VOYAGE_API_KEY is not configured.")
 
-        all_embeddings: list[list[float]] = []
-
-        for batch_start in range(0, len(texts), _BATCH_SIZE):
-            batch = texts[batch_start : batch_start + _BATCH_SIZE]
-            try:
-                response = await self._client.post(
-                    "/v1/embeddings",
-                    headers={"Authorization": f"Bearer {self._api_key}"},
-                    json={"input": batch, "model": self._model},
-                )
-                response.raise_for_status()
-                data = response.json()
-                embeddings = [item["embedding"] for item in data["data"]]
-                all_embeddings.extend(embeddings)
-
-            except httpx.HTTPStatusError as exc:
-                raise _classify_http_error(exc) from exc
-            except (
-                httpx.TimeoutException,
-                httpx.ConnectError,
-                httpx.NetworkError,
-            ) as exc:
-                raise _classify_network_error(exc) from exc
-
-        return all_embeddings
+        return await dispatch_embedding_batches(
+            texts,
+            _BATCH_SIZE,
+            self._embed_batch,
+            func_name="voyage.embed",
+            max_retries=max_retries,
+        )
+
+    async def _embed_batch(self, batch: list[str]) -> list[Embedding]:
+        try:
+            response = await self._client.post(
+                f"{self._base_url}/v1/embeddings",
+                headers={"Authorization": f"Bearer {self._api_key}"},
+                json={"input": batch, "model": self._model, "encoding_format": "base64"},
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return [embedding_from_response(item["embedding"]) for item in data["data"]]
+
+        except httpx.HTTPStatusError as exc:
+            raise _classify_http_error(exc) from exc
+        except (
+            httpx.TimeoutException,
+            httpx.ConnectError,
+            httpx.NetworkError,
+        ) as exc:
+            raise _classify_network_error(exc) from exc
@@ -1,11 +1,17 @@
 """Query transformation for retrieval (rewrite, expand, step-back)."""
 
+import hashlib
+import json
 import logging
 import re
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 from core.config import config
 from services.providers import get_llm_provider
+from services.providers.concurrency import get_llm_concurrency_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -38,20 +44,154 @@ class QueryTransformResult:
 
 
 _TRANSFORM_MAX_OUTPUT_TOKENS = 512
+QUERY_TRANSFORM_CACHE_REDIS_PREFIX = "chatvector:query_transform"
+
+# Set by _llm_transform when a call falls back to the input, so that degraded
+# transformations are never cached.
+_transform_llm_failed: ContextVar[bool] = ContextVar("_transform_llm_failed", default=False)
+
+
+class _TransformCache:
+    """In-process LRU of transformation outputs with an optional shared Redis tier.
+
+    Values are JSON-ready dicts; entries expire after
+    QUERY_TRANSFORM_CACHE_TTL_SECONDS in both tiers.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.QUERY_TRANSFORM_CACHE_SIZE > 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.redis_hits = self.misses = 0
+
+    def _put_local(self, key: str, value: dict) -> None:
+        self._entries[key] = (time.monotonic() + config.QUERY_TRANSFORM_CACHE_TTL_SECONDS, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > config.QUERY_TRANSFORM_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if config.QUERY_TRANSFORM_CACHE_REDIS_ENABLED:
+            from core.clients import redis_client
+
+            try:
+                raw = await redis_client.get(f"{QUERY_TRANSFORM_CACHE_REDIS_PREFIX}:{key}")
+                if raw:
+                    value = json.loads(raw)
+                    self._put_local(key, value)
+                    self.redis_hits += 1
+                    return value
+            except Exception:
+                logger.debug("Redis query transform cache read failed", exc_info=True)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict) -> None:
+        self._put_local(key, value)
+        if config.QUERY_TRANSFORM_CACHE_REDIS_ENABLED:
+            from core.clients import redis_client
+
+            try:
+                await redis_client.setex(
+                    f"{QUERY_TRANSFORM_CACHE_REDIS_PREFIX}:{key}",
+                    config.QUERY_TRANSFORM_CACHE_TTL_SECONDS,
+                    json.dumps(value),
+                )
+            except Exception:
+                logger.warning("Failed to update Redis query transform cache")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else None,
+        }
+
+
+_transform_cache = _TransformCache()
+
+
+def query_transform_cache_stats() -> dict:
+    """Hit/miss counters for the query transformation cache in this process."""
+    return _transform_cache.stats()
+
+
+def normalize_question(question: str) -> str:
+    """Question with whitespace collapsed and case folded, for cache and flight keys."""
+    return " ".join(question.split()).casefold()
+
+
+def _transform_cache_key(strategy: str, question: str, history: list[dict] | None) -> str:
+    """Digest of (strategy, LLM model, normalized question, history window)."""
+    try:
+        model = getattr(get_llm_provider(), "model_name", "") or ""
+    except Exception:
+        model = ""
+    history_hash = (
+        hashlib.sha256(_format_history_context(history).encode("utf-8")).hexdigest()
+        if history
+        else ""
+    )
+    material = json.dumps([strategy, model, normalize_question(question), history_hash])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cache_value(result: QueryTransformResult) -> dict:
+    # The original question is stored as None so a hit for a differently
+    # spaced or cased question returns that caller's own wording.
+    original = result.original_query
+    return {
+        "queries": [None if q == original else q for q in result.queries],
+        "history_resolved_query": result.history_resolved_query,
+    }
+
+
+def _result_from_cache(question: str, value: dict, strategy: str) -> QueryTransformResult:
+    return QueryTransformResult(
+        queries=[question if q is None else q for q in value["queries"]],
+        original_query=question,
+        history_resolved_query=value.get("history_resolved_query"),
+        transformation_strategy=strategy,
+    )
 
 
 async def _llm_transform(system_instruction: str, user_text: str) -> str | None:
     try:
         provider = get_llm_provider()
-        text = await provider.generate(
-            user_text,
-            system_instruction=system_instruction,
-            temperature=_TRANSFORM_TEMPERATURE,
-            max_output_tokens=_TRANSFORM_MAX_OUTPUT_TOKENS,
+        text = await get_llm_concurrency_limiter().call(
+            lambda: provider.generate(
+                user_text,
+                system_instruction=system_instruction,
+                temperature=_TRANSFORM_TEMPERATURE,
+                max_output_tokens=_TRANSFORM_MAX_OUTPUT_TOKENS,
+            )
         )
         text = (text or "").strip()
         return text if text else None
     except Exception as e:
+        _transform_llm_failed.set(True)
         logger.warning(
             "Query transformation LLM call failed (%s): %s",
             type(e).__name__,
@@ -150,6 +290,8 @@ def _format_history_context(history: list[dict]) -> str:
             lines.append(f"User: {content}")
         elif role == "assistant":
             lines.append(f"Assistant: {content}")
+        elif role == "summary":
+            lines.append(f"Summary of earlier conversation: {content}")
     return "\n".join(lines)
 
 
@@ -193,6 +335,29 @@ async def transform_query(
             original_query=question,
         )
 
+    strategy = config.QUERY_TRANSFORMATION_STRATEGY
+    cache_key: str | None = None
+    if _transform_cache.enabled:
+        cache_key = _transform_cache_key(strategy, question, history)
+        cached = await _transform_cache.get(cache_key)
+        if cached is not None:
+            return _result_from_cache(question, cached, strategy)
+
+    failed_token = _transform_llm_failed.set(False)
+    try:
+        result = await _transform_query_uncached(question, history, strategy)
+        llm_failed = _transform_llm_failed.get()
+    finally:
+        _transform_llm_failed.reset(failed_token)
+
+    if cache_key is not None and not llm_failed and result.transformation_strategy is not None:
+        await _transform_cache.set(cache_key, _cache_value(result))
+    return result
+
+
+async def _transform_query_uncached(
+    question: str, history: list[dict] | None, strategy: str
+) -> QueryTransformResult:
     # When recent session history is available, resolve any follow-up references
     # into a standalone question before applying the retrieval strategy.
     effective_question = question
@@ -202,7 +367,6 @@ async def transform_query(
         if effective_question != question:
             history_resolved_query = effective_question
 
-    strategy = config.QUERY_TRANSFORMATION_STRATEGY
     if strategy == "rewrite":
         queries = [await rewrite_query(effective_question)]
     elif strategy == "expand":
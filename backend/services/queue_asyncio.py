@@ -10,12 +10,43 @@ Status flow
 -----------
     queued → extracting → chunking → embedding → storing → completed
                                                          ↘ failed (→ DLQ after max retries)
+
+Fair scheduling
+---------------
+The queue holds one FIFO per tenant drained by deficit round robin within
+priority classes (see ``FairScheduler``), so a bulk upload from one tenant does
+not starve another tenant's single document.  Queue positions are reported
+within the caller's tenant sub-queue.
+
+Delayed retries
+---------------
+A transiently failed job is not slept on by its worker.  It is pushed onto a
+min-heap keyed by its not-before time and the worker moves straight on to the
+next job; a single scheduler task moves due jobs back onto the queue.
+
+Disk spill
+----------
+With ``QUEUE_MEMORY_SPILL_ENABLED`` the upload bytes are written to
+``QUEUE_SPILL_DIR`` on enqueue and the queue holds only the job descriptor.
+The worker reads the bytes when the job starts and deletes the file after a
+successful run; a dead-lettered job hands the file over to its DLQ entry.
+
+Dead-letter queue
+-----------------
+DLQ records stay in memory (capped at ``QUEUE_DLQ_MAX_ENTRIES``) but the
+upload bytes are written to ``QUEUE_SPILL_DIR`` when a job is dead-lettered,
+so entries can be replayed later without holding the file in memory.
 """
 
 import asyncio
+import bisect
+import collections
+import dataclasses
+import heapq
+import itertools
 import logging
 import random
-import collections
+from pathlib import Path
 from typing import Optional
 
 import db
@@ -23,15 +54,42 @@ from core.config import config
 from services.queue_base import (
     BaseIngestionQueue,
     DLQEntry,
+    DLQPage,
+    FairScheduler,
     QueueFull,
     QueueJob,
-    TokenBucketRateLimiter,
+    get_process_embedding_rate_limiter,
+    dlq_entry_visible,
     is_retryable_ingestion_failure,
+    job_payload_missing_error,
+    remove_spill_file,
+    spill_dir,
+    tenant_queue_key,
 )
 
 logger = logging.getLogger(__name__)
 
 
+class _FairJobQueue(asyncio.Queue):
+    """``asyncio.Queue`` whose storage is a per-tenant ``FairScheduler``.
+
+    Uses the same ``_init``/``_put``/``_get`` hooks as ``PriorityQueue``, so
+    blocking, ``task_done`` and ``join`` semantics are unchanged.
+    """
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = FairScheduler()
+
+    def _put(self, job: QueueJob) -> None:
+        self._queue.push(tenant_queue_key(job.tenant_id), job)
+
+    def _get(self) -> QueueJob:
+        return self._queue.pop()
+
+    def depths(self) -> dict[str, int]:
+        return self._queue.depths()
+
+
 class AsyncioIngestionQueue(BaseIngestionQueue):
     """
     Manages a bounded asyncio queue + a pool of background worker tasks.
@@ -43,26 +101,53 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
     """
 
     def __init__(self) -> None:
-        self._queue: asyncio.Queue[QueueJob] = asyncio.Queue(
-            maxsize=config.QUEUE_MAX_SIZE
-        )
-        # Mirror asyncio.Queue FIFO order without touching asyncio.Queue private internals.
-        self._pending_doc_ids: collections.deque[str] = collections.deque()
+        self._queue: _FairJobQueue = _FairJobQueue(maxsize=config.QUEUE_MAX_SIZE)
+        # O(1) positions: each enqueue takes the next sequence number of its
+        # tenant sub-queue and position = seq - that tenant's dequeued count.
+        self._doc_seq: dict[str, tuple[str, int]] = {}
+        self._enqueued_count: collections.Counter[str] = collections.Counter()
+        self._dequeued_count: collections.Counter[str] = collections.Counter()
         self._dlq: list[DLQEntry] = []
+        self._dlq_ids = itertools.count(1)
         self._workers: list[asyncio.Task] = []
-        self._rate_limiter = TokenBucketRateLimiter(
-            rate=config.QUEUE_EMBEDDING_RPS,
-            capacity=config.QUEUE_EMBEDDING_RPS,
-        )
+        # (ready_at loop time, tie-breaker, job) — retries waiting out their backoff.
+        self._delayed: list[tuple[float, int, QueueJob]] = []
+        self._delayed_seq = itertools.count()
+        self._delayed_wakeup = asyncio.Event()
+        self._retry_scheduler: asyncio.Task | None = None
+        self._rate_limiter = get_process_embedding_rate_limiter()
         self._running = False
 
     def _append_dlq(self, entry: DLQEntry) -> None:
         """Append a DLQ entry and trim to ``QUEUE_DLQ_MAX_ENTRIES``."""
+        entry.entry_id = str(next(self._dlq_ids))
         self._dlq.append(entry)
         overflow = len(self._dlq) - config.QUEUE_DLQ_MAX_ENTRIES
         if overflow > 0:
+            for trimmed in self._dlq[:overflow]:
+                remove_spill_file(trimmed.payload_path)
             del self._dlq[:overflow]
 
+    async def _dead_letter(self, job: QueueJob, error: str) -> None:
+        """Spill the upload to disk (unless already spilled) and record a replayable DLQ entry."""
+        payload_path = job.payload_path
+        if payload_path is None:
+            path = spill_dir() / job.doc_id
+            try:
+                await asyncio.to_thread(path.write_bytes, job.file_bytes)
+                payload_path = str(path)
+            except OSError as exc:
+                logger.warning(f"Could not keep payload of {job.doc_id} for replay: {exc}")
+        self._append_dlq(DLQEntry(
+            doc_id=job.doc_id,
+            file_name=job.file_name,
+            content_type=job.content_type,
+            attempt=job.attempt,
+            error=error,
+            tenant_id=job.tenant_id,
+            payload_path=payload_path,
+        ))
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
@@ -74,10 +159,14 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
         self._running = True
         for i in range(config.QUEUE_WORKER_COUNT):
             self._spawn_worker(worker_id=i)
+        self._retry_scheduler = asyncio.create_task(
+            self._run_retry_scheduler(), name="ingestion-retry-scheduler"
+        )
         logger.info(
             f"Ingestion queue started with {config.QUEUE_WORKER_COUNT} workers "
             f"(max_size={config.QUEUE_MAX_SIZE}, "
-            f"embedding_rps={config.QUEUE_EMBEDDING_RPS}, "
+            f"embedding_rps={config.QUEUE_EMBEDDING_RPS} "
+            f"({config.QUEUE_EMBEDDING_RATE_LIMITER}), "
             f"max_retries={config.QUEUE_JOB_MAX_RETRIES})"
         )
 
@@ -115,10 +204,15 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
         self._running = False
         for worker in self._workers:
             worker.cancel()
+        if self._retry_scheduler is not None:
+            self._retry_scheduler.cancel()
+            await asyncio.gather(self._retry_scheduler, return_exceptions=True)
+            self._retry_scheduler = None
         await asyncio.gather(*self._workers, return_exceptions=True)
         self._workers.clear()
         logger.info(
-            f"Ingestion queue stopped (DLQ size={len(self._dlq)})"
+            f"Ingestion queue stopped (DLQ size={len(self._dlq)}, "
+            f"scheduled retries dropped={len(self._delayed)})"
         )
 
     # ------------------------------------------------------------------
@@ -132,14 +226,24 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
         Returns the 1-indexed queue position of the new job.
         Raises QueueFull if the queue is at capacity.
         """
+        spilled = False
+        if config.QUEUE_MEMORY_SPILL_ENABLED and job.payload_path is None:
+            if self._queue.full():
+                raise QueueFull(
+                    f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
+                )
+            job = await self._spill_payload(job)
+            spilled = True
         try:
             self._queue.put_nowait(job)
         except asyncio.QueueFull:
+            if spilled:
+                remove_spill_file(job.payload_path)
             raise QueueFull(
                 f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
             )
-        self._pending_doc_ids.append(job.doc_id)
-        position = self._queue.qsize()
+        self._record_enqueue(job)
+        position = self.queue_position(job.doc_id) or 1
         logger.info(
             f"Enqueued document {job.doc_id} "
             f"(file={job.file_name!r}, position={position})"
@@ -148,13 +252,15 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
 
     def queue_position(self, doc_id: str) -> Optional[int]:
         """
-        Return the 1-indexed queue position for *doc_id*, or None if the job
-        is not currently waiting in the queue (already processing or done).
+        Return the 1-indexed position of *doc_id* within its tenant's
+        sub-queue, or None if the job is not currently waiting in the queue
+        (already processing or done).
         """
-        for i, pending_id in enumerate(self._pending_doc_ids):
-            if pending_id == doc_id:
-                return i + 1
-        return None
+        entry = self._doc_seq.get(doc_id)
+        if entry is None:
+            return None
+        tenant_key, seq = entry
+        return max(1, seq - self._dequeued_count[tenant_key])
 
     def queue_size(self) -> int:
         return self._queue.qsize()
@@ -163,6 +269,35 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
         """Read-only view of dead-letter queue entries (file bytes not retained)."""
         return list(self._dlq)
 
+    def dlq_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+    ) -> DLQPage:
+        start = 0
+        if cursor is not None:
+            if not cursor.isdigit():
+                raise ValueError(f"Invalid DLQ cursor {cursor!r}")
+            start = bisect.bisect_right(
+                self._dlq, int(cursor), key=lambda e: int(e.entry_id)
+            )
+        entries: list[DLQEntry] = []
+        for entry in self._dlq[start:]:
+            if not dlq_entry_visible(entry, tenant_id):
+                continue
+            entries.append(entry)
+            if len(entries) == limit:
+                return DLQPage(entries=entries, next_cursor=entry.entry_id)
+        return DLQPage(entries=entries)
+
+    def scheduled_retry_count(self) -> int:
+        return len(self._delayed)
+
+    def tenant_depths(self) -> dict[str, int]:
+        return self._queue.depths()
+
     def active_worker_count(self) -> int:
         """Return the number of worker tasks that are still running."""
         return len([w for w in self._workers if not w.done()])
@@ -171,6 +306,48 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
     # Internal
     # ------------------------------------------------------------------
 
+    async def _spill_payload(self, job: QueueJob) -> QueueJob:
+        """Write the upload to ``QUEUE_SPILL_DIR``; return a bytes-free descriptor."""
+        path = spill_dir() / job.doc_id
+        await asyncio.to_thread(path.write_bytes, job.file_bytes)
+        return dataclasses.replace(job, file_bytes=b"", payload_path=str(path))
+
+    async def _load_payload(self, job: QueueJob) -> Optional[bytes]:
+        """Return the job's bytes, reading a spilled payload lazily; None if it is gone."""
+        if job.payload_path is None:
+            return job.file_bytes
+        try:
+            return await asyncio.to_thread(Path(job.payload_path).read_bytes)
+        except OSError as exc:
+            logger.error(f"Cannot read spilled payload for document {job.doc_id}: {exc}")
+        try:
+            await db.update_document_status(
+                doc_id=job.doc_id,
+                status="failed",
+                tenant_id=job.tenant_id,
+                error=job_payload_missing_error(),
+            )
+        except Exception:
+            logger.exception(f"Failed to mark document {job.doc_id} as failed")
+        self._append_dlq(DLQEntry(
+            doc_id=job.doc_id,
+            file_name=job.file_name,
+            content_type=job.content_type,
+            attempt=job.attempt,
+            error="job_payload_missing",
+            tenant_id=job.tenant_id,
+        ))
+        return None
+
+    def _record_enqueue(self, job: QueueJob) -> None:
+        tenant_key = tenant_queue_key(job.tenant_id)
+        self._enqueued_count[tenant_key] += 1
+        self._doc_seq[job.doc_id] = (tenant_key, self._enqueued_count[tenant_key])
+
+    def _record_dequeue(self, job: QueueJob) -> None:
+        self._dequeued_count[tenant_queue_key(job.tenant_id)] += 1
+        self._doc_seq.pop(job.doc_id, None)
+
     async def _worker(self, worker_id: int) -> None:
         logger.info(f"Ingestion worker-{worker_id} ready")
         while self._running:
@@ -181,23 +358,7 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
             except asyncio.CancelledError:
                 break
 
-            if self._pending_doc_ids:
-                head = self._pending_doc_ids.popleft()
-                if head != job.doc_id:
-                    logger.error(
-                        "Ingestion queue order mismatch (worker %s): "
-                        "job doc_id=%s deque_head=%s",
-                        worker_id,
-                        job.doc_id,
-                        head,
-                    )
-            else:
-                logger.error(
-                    "Ingestion queue: received job %s but pending_doc_ids empty "
-                    "(worker %s)",
-                    job.doc_id,
-                    worker_id,
-                )
+            self._record_dequeue(job)
 
             try:
                 await self._process_job(job, worker_id)
@@ -220,16 +381,21 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
             f"(attempt {job.attempt + 1}/{config.QUEUE_JOB_MAX_RETRIES + 1})"
         )
 
+        file_bytes = await self._load_payload(job)
+        if file_bytes is None:
+            return
+
         pipeline = IngestionPipeline()
         try:
             await pipeline.process_document_background(
                 doc_id=job.doc_id,
                 file_name=job.file_name,
                 content_type=job.content_type,
-                file_bytes=job.file_bytes,
+                file_bytes=file_bytes,
                 tenant_id=job.tenant_id,
                 rate_limiter=self._rate_limiter,
             )
+            remove_spill_file(job.payload_path)
         except Exception as exc:
             if isinstance(exc, UploadPipelineError) and 400 <= exc.status_code < 500:
                 logger.error(
@@ -238,14 +404,7 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
                     f"— moving to DLQ: {exc}",
                     exc_info=True,
                 )
-                self._append_dlq(DLQEntry(
-                    doc_id=job.doc_id,
-                    file_name=job.file_name,
-                    content_type=job.content_type,
-                    attempt=job.attempt,
-                    error=str(exc),
-                    tenant_id=job.tenant_id,
-                ))
+                await self._dead_letter(job, str(exc))
                 return
 
             if not is_retryable_ingestion_failure(exc):
@@ -254,14 +413,7 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
                     f"non-retryable error — moving to DLQ: {exc}",
                     exc_info=True,
                 )
-                self._append_dlq(DLQEntry(
-                    doc_id=job.doc_id,
-                    file_name=job.file_name,
-                    content_type=job.content_type,
-                    attempt=job.attempt,
-                    error=str(exc),
-                    tenant_id=job.tenant_id,
-                ))
+                await self._dead_letter(job, str(exc))
                 return
 
             if job.attempt < config.QUEUE_JOB_MAX_RETRIES:
@@ -270,7 +422,7 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
                 delay = random.uniform(0, cap)
                 logger.warning(
                     f"Document {job.doc_id} failed on attempt {job.attempt} "
-                    f"— requeueing after {delay:.2f}s: {exc}"
+                    f"— scheduling retry in {delay:.2f}s: {exc}"
                 )
                 try:
                     await db.update_document_status(
@@ -282,42 +434,7 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
                     logger.error(
                         f"Failed to set retrying status for {job.doc_id}: {status_err}"
                     )
-                await asyncio.sleep(delay)
-                try:
-                    self._queue.put_nowait(job)
-                except asyncio.QueueFull:
-                    error_msg = (
-                        f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
-                    )
-                    logger.error(
-                        "Document %s retry could not be requeued — %s",
-                        job.doc_id,
-                        error_msg,
-                    )
-                    try:
-                        await db.update_document_status(
-                            doc_id=job.doc_id,
-                            status="failed",
-                            tenant_id=job.tenant_id,
-                            error={
-                                "stage": "queued",
-                                "message": error_msg,
-                            },
-                        )
-                    except Exception as status_err:
-                        logger.error(
-                            f"Failed to set failed status for {job.doc_id}: {status_err}"
-                        )
-                    self._append_dlq(DLQEntry(
-                        doc_id=job.doc_id,
-                        file_name=job.file_name,
-                        content_type=job.content_type,
-                        attempt=job.attempt,
-                        error=error_msg,
-                        tenant_id=job.tenant_id,
-                    ))
-                    return
-                self._pending_doc_ids.append(job.doc_id)
+                self._schedule_retry(job, delay)
             else:
                 logger.error(
                     f"Document {job.doc_id} ({job.file_name!r}) exhausted "
@@ -325,11 +442,117 @@ class AsyncioIngestionQueue(BaseIngestionQueue):
                     f"(final attempt={job.attempt}) — moving to DLQ: {exc}",
                     exc_info=True,
                 )
-                self._append_dlq(DLQEntry(
+                await self._dead_letter(job, str(exc))
+
+    # ------------------------------------------------------------------
+    # DLQ replay
+    # ------------------------------------------------------------------
+
+    async def _claim_dlq_entries(
+        self, entry_ids: list[str], tenant_id: Optional[str]
+    ) -> list[DLQEntry]:
+        # Runs on the event loop, like _append_dlq, so no entry is lost in between.
+        wanted = set(entry_ids)
+        claimed: list[DLQEntry] = []
+        kept: list[DLQEntry] = []
+        for entry in self._dlq:
+            if (
+                entry.entry_id in wanted
+                and entry.tenant_id is not None
+                and dlq_entry_visible(entry, tenant_id)
+                and entry.payload_path
+                and Path(entry.payload_path).exists()
+            ):
+                claimed.append(entry)
+            else:
+                kept.append(entry)
+        self._dlq = kept
+        return claimed
+
+    async def _restore_dlq_entry(self, entry: DLQEntry) -> None:
+        self._append_dlq(entry)
+
+    async def _enqueue_dlq_payload(self, entry: DLQEntry) -> None:
+        if config.QUEUE_MEMORY_SPILL_ENABLED:
+            # The DLQ's spill file becomes the job's payload as-is.
+            await self.enqueue(QueueJob(
+                doc_id=entry.doc_id,
+                file_name=entry.file_name,
+                content_type=entry.content_type,
+                file_bytes=b"",
+                tenant_id=entry.tenant_id,
+                payload_path=entry.payload_path,
+            ))
+            return
+        path = Path(entry.payload_path)
+        file_bytes = await asyncio.to_thread(path.read_bytes)
+        await self.enqueue(QueueJob(
+            doc_id=entry.doc_id,
+            file_name=entry.file_name,
+            content_type=entry.content_type,
+            file_bytes=file_bytes,
+            tenant_id=entry.tenant_id,
+        ))
+        # The bytes travel with the job again; a new failure re-spills them.
+        remove_spill_file(entry.payload_path)
+
+    # ------------------------------------------------------------------
+    # Delayed retries
+    # ------------------------------------------------------------------
+
+    def _schedule_retry(self, job: QueueJob, delay: float) -> None:
+        """Park *job* until ``now + delay`` without holding a worker."""
+        ready_at = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._delayed, (ready_at, next(self._delayed_seq), job))
+        self._delayed_wakeup.set()
+
+    async def _run_retry_scheduler(self) -> None:
+        """Move retries whose backoff has elapsed back onto the work queue."""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            self._delayed_wakeup.clear()
+            if not self._delayed:
+                await self._delayed_wakeup.wait()
+                continue
+            wait = self._delayed[0][0] - loop.time()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._delayed_wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, _, job = heapq.heappop(self._delayed)
+            try:
+                await self._requeue_retry(job)
+            except Exception:
+                logger.exception("Failed to requeue retry for document %s", job.doc_id)
+
+    async def _requeue_retry(self, job: QueueJob) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            error_msg = (
+                f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
+            )
+            logger.error(
+                "Document %s retry could not be requeued — %s",
+                job.doc_id,
+                error_msg,
+            )
+            try:
+                await db.update_document_status(
                     doc_id=job.doc_id,
-                    file_name=job.file_name,
-                    content_type=job.content_type,
-                    attempt=job.attempt,
-                    error=str(exc),
+                    status="failed",
                     tenant_id=job.tenant_id,
-                ))
+                    error={
+                        "stage": "queued",
+                        "message": error_msg,
+                    },
+                )
+            except Exception as status_err:
+                logger.error(
+                    f"Failed to set failed status for {job.doc_id}: {status_err}"
+                )
+            await self._dead_letter(job, error_msg)
+            return
+        self._record_enqueue(job)
@@ -10,12 +10,17 @@ and Redis backends can import them without circular dependencies.
 """
 
 import asyncio
+import collections
+import logging
 import threading
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from pathlib import Path
+from typing import Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
 
 
 class QueueFull(Exception):
@@ -25,6 +30,12 @@ class QueueFull(Exception):
 
 @dataclass
 class QueueJob:
+    """
+    One upload waiting for ingestion.
+
+    When the payload has been spilled to disk, ``file_bytes`` is empty and
+    ``payload_path`` names the spill file the worker reads when it starts.
+    """
     doc_id: str
     file_name: str
     content_type: str
@@ -34,6 +45,7 @@ class QueueJob:
     enqueued_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    payload_path: Optional[str] = None
 
 
 @dataclass
@@ -42,7 +54,12 @@ class DLQEntry:
     Lightweight dead-letter record kept after a job exhausts all retries.
 
     File bytes are intentionally omitted to avoid unbounded memory growth
-    when large uploads fail repeatedly.
+    when large uploads fail repeatedly.  When the upload could be kept,
+    ``payload_path`` points at its file in ``QUEUE_SPILL_DIR`` so the entry
+    can be replayed; the file is deleted when the entry is trimmed.
+
+    ``entry_id`` is assigned by the backend store and doubles as the
+    pagination cursor (ids increase with insertion order).
     """
     doc_id: str
     file_name: str
@@ -53,6 +70,52 @@ class DLQEntry:
     failed_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    payload_path: Optional[str] = None
+    entry_id: Optional[str] = None
+
+
+@dataclass
+class DLQPage:
+    """One cursor page of DLQ entries, oldest first."""
+    entries: list[DLQEntry]
+    next_cursor: Optional[str] = None
+
+
+JOB_PAYLOAD_MISSING_USER_MESSAGE = (
+    "Upload payload was lost before processing could start. "
+    "Please re-upload the document."
+)
+
+
+def job_payload_missing_error() -> dict:
+    return {
+        "code": "job_payload_missing",
+        "stage": "queued",
+        "message": JOB_PAYLOAD_MISSING_USER_MESSAGE,
+    }
+
+
+def spill_dir() -> Path:
+    """Return the configured spill directory, creating it if needed."""
+    from core.config import config
+
+    path = Path(config.QUEUE_SPILL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def remove_spill_file(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError:
+        logger.warning("Could not remove spill file %s", path)
+
+
+def dlq_entry_visible(entry: DLQEntry, tenant_id: Optional[str]) -> bool:
+    """Tenant filter for DLQ reads; ``None`` means every tenant (operator CLI)."""
+    return tenant_id is None or entry.tenant_id == tenant_id
 
 
 class TokenBucketRateLimiter:
@@ -92,33 +155,270 @@ class TokenBucketRateLimiter:
             await asyncio.sleep(wait_time)
 
 
-_process_embedding_limiter: TokenBucketRateLimiter | None = None
-_process_embedding_limiter_lock = threading.Lock()
+EMBEDDING_RATE_LIMIT_KEY_PREFIX = "chatvector:ratelimit:embedding"
+
+# Atomic refill-and-take over a Redis hash {tokens, ts}.  Uses the Redis server
+# clock so replicas with skewed wall clocks share one consistent bucket.
+# Returns 0 when a token was consumed, otherwise the milliseconds to wait.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return wait_ms
+"""
 
 
-def get_process_embedding_rate_limiter() -> TokenBucketRateLimiter:
-    """Return one shared embedding rate limiter for this API process."""
-    global _process_embedding_limiter
+class RedisTokenBucketRateLimiter:
+    """
+    Token bucket shared by every API process that points at the same Redis.
 
-    if _process_embedding_limiter is not None:
-        return _process_embedding_limiter
+    Same ``acquire`` contract as ``TokenBucketRateLimiter``.  Each acquisition
+    runs one Lua script round trip (off the event loop, on a sync client so the
+    limiter works from RQ worker threads that each own their own loop).
 
-    with _process_embedding_limiter_lock:
-        if _process_embedding_limiter is None:
-            from core.config import config
+    When Redis is unreachable the limiter degrades to a process-local bucket
+    with the same rate and retries Redis after ``fallback_retry_sec``, so
+    ingestion keeps moving during a Redis blip instead of failing every job.
+    """
 
-            _process_embedding_limiter = TokenBucketRateLimiter(
-                rate=config.QUEUE_EMBEDDING_RPS,
-                capacity=config.QUEUE_EMBEDDING_RPS,
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        key: str,
+        conn=None,
+        fallback_retry_sec: float = 5.0,
+    ) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._key = key
+        if conn is None:
+            import redis as redis_lib
+            from core.config import config, redis_connection_kwargs
+
+            conn = redis_lib.Redis.from_url(
+                config.REDIS_URL, **redis_connection_kwargs()
+            )
+        self._conn = conn
+        self._script = conn.register_script(_TOKEN_BUCKET_LUA)
+        self._fallback = TokenBucketRateLimiter(rate=rate, capacity=capacity)
+        self._fallback_retry_sec = fallback_retry_sec
+        self._fallback_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def using_fallback(self) -> bool:
+        """True while Redis is considered unavailable and the local bucket is used."""
+        return time.monotonic() < self._fallback_until
+
+    def _try_acquire(self) -> float:
+        """Run the bucket script once; return seconds to wait (0.0 = acquired)."""
+        wait_ms = self._script(
+            keys=[self._key],
+            args=[self._rate, self._capacity],
+        )
+        return max(0.0, float(wait_ms) / 1000.0)
+
+    def _enter_fallback(self, exc: Exception) -> None:
+        with self._lock:
+            already_degraded = self.using_fallback
+            self._fallback_until = time.monotonic() + self._fallback_retry_sec
+        if not already_degraded:
+            logger.warning(
+                "Redis rate limiter unavailable for %s — using process-local "
+                "bucket for %.0fs: %s",
+                self._key,
+                self._fallback_retry_sec,
+                exc,
             )
-        return _process_embedding_limiter
+
+    async def acquire(self) -> None:
+        """Block until a token is available in the shared bucket, then consume one."""
+        import redis as redis_lib
+
+        while True:
+            if self.using_fallback:
+                await self._fallback.acquire()
+                return
+            try:
+                wait_time = await asyncio.to_thread(self._try_acquire)
+            except (redis_lib.exceptions.RedisError, OSError) as exc:
+                self._enter_fallback(exc)
+                continue
+            if wait_time <= 0.0:
+                return
+            await asyncio.sleep(wait_time)
+
+
+EmbeddingRateLimiter = TokenBucketRateLimiter | RedisTokenBucketRateLimiter
+
+_process_embedding_limiters: dict[str, EmbeddingRateLimiter] = {}
+_process_embedding_limiter_lock = threading.Lock()
+
+
+def embedding_rps_for_provider(provider: str) -> float:
+    """Return the configured embedding RPS for *provider* (override or global)."""
+    from core.config import config
+
+    return config.QUEUE_EMBEDDING_RPS_BY_PROVIDER.get(
+        provider, config.QUEUE_EMBEDDING_RPS
+    )
+
+
+def _build_embedding_rate_limiter(provider: str) -> EmbeddingRateLimiter:
+    from core.config import config
+
+    rate = embedding_rps_for_provider(provider)
+    if config.QUEUE_EMBEDDING_RATE_LIMITER == "redis":
+        return RedisTokenBucketRateLimiter(
+            rate=rate,
+            capacity=rate,
+            key=f"{EMBEDDING_RATE_LIMIT_KEY_PREFIX}:{provider}",
+        )
+    return TokenBucketRateLimiter(rate=rate, capacity=rate)
+
+
+def get_process_embedding_rate_limiter(
+    provider: str | None = None,
+) -> EmbeddingRateLimiter:
+    """Return one shared embedding rate limiter per provider for this API process.
+
+    With ``QUEUE_EMBEDDING_RATE_LIMITER=redis`` the bucket itself lives in Redis,
+    so every replica and worker process draws from the same per-provider quota.
+    """
+    if provider is None:
+        from core.config import config
+
+        provider = config.EMBEDDING_PROVIDER
+
+    limiter = _process_embedding_limiters.get(provider)
+    if limiter is not None:
+        return limiter
+
+    with _process_embedding_limiter_lock:
+        limiter = _process_embedding_limiters.get(provider)
+        if limiter is None:
+            limiter = _build_embedding_rate_limiter(provider)
+            _process_embedding_limiters[provider] = limiter
+        return limiter
 
 
 def reset_process_embedding_rate_limiter() -> None:
-    """Clear the process limiter — for tests only."""
-    global _process_embedding_limiter
+    """Clear the process limiters — for tests only."""
     with _process_embedding_limiter_lock:
-        _process_embedding_limiter = None
+        _process_embedding_limiters.clear()
+
+
+# ---------------------------------------------------------------------------
+# Per-tenant fair scheduling
+# ---------------------------------------------------------------------------
+
+# Sub-queue key for jobs without a tenant (pre-auth uploads, tests).
+DEFAULT_TENANT_KEY = "-"
+
+T = TypeVar("T")
+
+
+def tenant_queue_key(tenant_id: Optional[str]) -> str:
+    return tenant_id or DEFAULT_TENANT_KEY
+
+
+def tenant_weight(tenant_key: str) -> int:
+    """Jobs a tenant may take per round-robin turn (``QUEUE_TENANT_WEIGHTS``)."""
+    from core.config import config
+
+    return config.QUEUE_TENANT_WEIGHTS.get(tenant_key, 1)
+
+
+def tenant_priority(tenant_key: str) -> str:
+    """Priority class for a tenant (``QUEUE_TENANT_PRIORITIES``, default normal)."""
+    from core.config import config
+
+    return config.QUEUE_TENANT_PRIORITIES.get(tenant_key, "normal")
+
+
+class FairScheduler(Generic[T]):
+    """
+    Per-tenant FIFOs drained by deficit round robin inside strict priority classes.
+
+    Every job costs one unit, so a tenant's quantum is simply its weight: on
+    its turn a tenant is served up to ``weight`` jobs before the rotation moves
+    on.  A class is only served when every higher class is empty.  One tenant
+    with thousands of queued files therefore delays another tenant's single
+    upload by at most one turn.
+
+    Not thread-safe; the asyncio backend calls it from the event loop only.
+    The Redis backend implements the same policy in a Lua script.
+    """
+
+    def __init__(self) -> None:
+        from core.config import QUEUE_PRIORITY_CLASSES
+
+        self._classes = QUEUE_PRIORITY_CLASSES
+        self._queues: dict[str, collections.deque[T]] = {}
+        self._rotation: dict[str, collections.deque[str]] = {
+            cls: collections.deque() for cls in self._classes
+        }
+        self._served: dict[str, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, tenant_key: str, item: T) -> None:
+        queue = self._queues.get(tenant_key)
+        if queue is None:
+            queue = self._queues[tenant_key] = collections.deque()
+            self._rotation[tenant_priority(tenant_key)].append(tenant_key)
+        queue.append(item)
+        self._size += 1
+
+    def pop(self) -> T:
+        """Remove and return the next job; raises IndexError when empty."""
+        for cls in self._classes:
+            rotation = self._rotation[cls]
+            if not rotation:
+                continue
+            tenant_key = rotation[0]
+            queue = self._queues[tenant_key]
+            item = queue.popleft()
+            self._size -= 1
+            served = self._served.get(tenant_key, 0) + 1
+            if not queue:
+                rotation.popleft()
+                del self._queues[tenant_key]
+                self._served.pop(tenant_key, None)
+            elif served >= tenant_weight(tenant_key):
+                rotation.rotate(-1)
+                self._served.pop(tenant_key, None)
+            else:
+                self._served[tenant_key] = served
+            return item
+        raise IndexError("pop from an empty FairScheduler")
+
+    def depths(self) -> dict[str, int]:
+        return {key: len(queue) for key, queue in self._queues.items()}
 
 
 class BaseIngestionQueue(ABC):
@@ -139,6 +439,21 @@ class BaseIngestionQueue(ABC):
         """Enqueue a job and return its 1-indexed queue position (never 0)."""
         ...
 
+    async def enqueue_many(self, jobs: list[QueueJob]) -> list[int]:
+        """
+        Enqueue *jobs* in order and return their queue positions.
+
+        Stops at the first job that does not fit, so the result can be shorter
+        than *jobs*; the caller owns the rejected tail.
+        """
+        positions: list[int] = []
+        for job in jobs:
+            try:
+                positions.append(await self.enqueue(job))
+            except QueueFull:
+                break
+        return positions
+
     @abstractmethod
     def queue_position(self, doc_id: str) -> Optional[int]:
         """Return the 1-indexed position for *doc_id*, or None if not waiting."""
@@ -152,11 +467,106 @@ class BaseIngestionQueue(ABC):
     def dlq_jobs(self) -> list[DLQEntry]:
         ...
 
+    @abstractmethod
+    def dlq_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+    ) -> DLQPage:
+        """Return up to *limit* DLQ entries after *cursor* (ValueError if malformed)."""
+        ...
+
+    @abstractmethod
+    async def _claim_dlq_entries(
+        self, entry_ids: list[str], tenant_id: Optional[str]
+    ) -> list[DLQEntry]:
+        """Atomically remove and return replayable entries among *entry_ids*."""
+        ...
+
+    @abstractmethod
+    async def _restore_dlq_entry(self, entry: DLQEntry) -> None:
+        """Put a claimed entry back (e.g. when replay hits a full queue)."""
+        ...
+
+    @abstractmethod
+    async def _enqueue_dlq_payload(self, entry: DLQEntry) -> None:
+        """Enqueue a fresh attempt for *entry* from its spill file; may raise QueueFull."""
+        ...
+
+    async def replay_dlq(
+        self,
+        entry_ids: list[str],
+        *,
+        tenant_id: Optional[str] = None,
+    ) -> list[DLQEntry]:
+        """
+        Re-enqueue selected DLQ entries from their spill files, attempt 0.
+
+        Entries without a tenant, another tenant's entries (when *tenant_id*
+        is given) and entries whose spill file is gone are left untouched.
+        Stops at the first ``QueueFull``; that entry and the rest go back to
+        the DLQ.  Returns the entries that were queued again.
+        """
+        import db
+
+        claimed = await self._claim_dlq_entries(entry_ids, tenant_id)
+        replayed: list[DLQEntry] = []
+        for index, entry in enumerate(claimed):
+            try:
+                # Same order as upload: status first, so a fast worker's
+                # progress update is never overwritten with "queued".
+                await db.update_document_status(
+                    doc_id=entry.doc_id, status="queued", tenant_id=entry.tenant_id
+                )
+                await self._enqueue_dlq_payload(entry)
+            except QueueFull as exc:
+                for rest in claimed[index:]:
+                    await self._restore_dlq_entry(rest)
+                await db.update_document_status(
+                    doc_id=entry.doc_id,
+                    status="failed",
+                    tenant_id=entry.tenant_id,
+                    error={"stage": "queued", "message": str(exc)},
+                )
+                break
+            except Exception as exc:
+                for rest in claimed[index:]:
+                    await self._restore_dlq_entry(rest)
+                # The status may already read "queued"; the entry is back in the DLQ.
+                try:
+                    await db.update_document_status(
+                        doc_id=entry.doc_id,
+                        status="failed",
+                        tenant_id=entry.tenant_id,
+                        error={"stage": "queued", "message": str(exc)},
+                    )
+                except Exception:
+                    logger.warning(
+                        "Failed to reset status for %s after a failed replay",
+                        entry.doc_id,
+                        exc_info=True,
+                    )
+                raise
+            replayed.append(entry)
+        if replayed:
+            logger.info("Replayed %d DLQ entries", len(replayed))
+        return replayed
+
     @abstractmethod
     def active_worker_count(self) -> int:
         """Return workers actively listening in this API process."""
         ...
 
+    def scheduled_retry_count(self) -> int:
+        """Return retries parked until their backoff elapses (not yet queued)."""
+        return 0
+
+    def tenant_depths(self) -> dict[str, int]:
+        """Return queued (not yet started) job counts keyed by tenant."""
+        return {}
+
     def clear_stale_jobs(self, failed_doc_ids: set[str]) -> int:
         """Remove stale jobs for already-failed documents.
 
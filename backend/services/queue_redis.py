@@ -13,8 +13,42 @@ thread so the FastAPI event loop is not blocked.
 
 Rate limiting
 -------------
-One process-scoped ``TokenBucketRateLimiter`` (see ``get_process_embedding_rate_limiter``)
-limits embedding HTTP batches across all RQ worker threads in this API process.
+One process-scoped limiter per embedding provider (see
+``get_process_embedding_rate_limiter``) limits embedding HTTP batches across all
+RQ worker threads in this API process.  With ``QUEUE_EMBEDDING_RATE_LIMITER=redis``
+the bucket lives in Redis and is shared by every process using the same Redis.
+
+Delayed retries
+---------------
+A transiently failed job does not sleep in its worker.  The retry is written to
+the ``RETRY_SCHEDULE_KEY`` sorted set scored by its not-before Unix time and the
+worker returns to RQ for the next job.  A promoter thread moves due entries
+onto the RQ queue; ``ZREM`` acts as the claim so concurrent promoters never
+enqueue the same retry twice.
+
+Fair scheduling
+---------------
+Uploads are not pushed straight onto the RQ list.  Each tenant has its own
+sub-queue list in Redis; a Lua script picks the next job by deficit round
+robin inside priority classes (the same policy as ``FairScheduler``) and the
+dispatcher keeps only about one ready job per worker on the RQ list.  A bulk
+upload from one tenant therefore delays another tenant's upload by at most a
+turn plus that small buffer.
+
+Queue positions
+---------------
+Every enqueue takes the next value of its tenant's counter and records it in a
+``doc_id -> seq:tenant`` hash; workers bump the tenant's dequeued counter when
+they pick a job up.  ``queue_position`` is ``seq - dequeued`` within the
+tenant's sub-queue — constant time.  Positions and per-tenant depths are
+rebuilt from Redis on ``start()``.
+
+Dead-letter queue
+-----------------
+DLQ entries live in a Redis stream capped at ``QUEUE_DLQ_MAX_ENTRIES``.  Stream
+ids are the pagination cursor, and each entry keeps a reference to its spill
+file so it can be replayed without the bytes passing through Redis.  The spill
+file is removed when the entry is trimmed.
 
 Topology
 --------
@@ -23,6 +57,7 @@ containers is not a supported topology; see DEPLOYMENT.md.
 """
 
 import asyncio
+import collections
 import json
 import logging
 import os
@@ -40,42 +75,37 @@ from rq import Queue as RQQueue
 from rq import SimpleWorker
 from rq.job import Job as RQJob
 
-from core.config import config, redis_connection_kwargs
+from core.config import QUEUE_PRIORITY_CLASSES, config, redis_connection_kwargs
 from utils.url_display import safe_url_display
 from services.queue_base import (
+    JOB_PAYLOAD_MISSING_USER_MESSAGE,
     BaseIngestionQueue,
     DLQEntry,
+    DLQPage,
     QueueFull,
     QueueJob,
+    dlq_entry_visible,
     get_process_embedding_rate_limiter,
     is_retryable_ingestion_failure,
+    job_payload_missing_error,
+    remove_spill_file,
+    spill_dir,
+    tenant_priority,
+    tenant_queue_key,
 )
 
 logger = logging.getLogger(__name__)
 
-DLQ_REDIS_KEY = "chatvector:dlq"
+# Redis stream: entry ids are the pagination cursor and survive trimming.
+DLQ_REDIS_KEY = "chatvector:dlq:stream"
+# Pre-stream DLQ list; migrated into the stream on start.
+LEGACY_DLQ_REDIS_KEY = "chatvector:dlq"
+RETRY_SCHEDULE_KEY = "chatvector:retry:scheduled"
 RQ_QUEUE_NAME = "chatvector-ingestion"
+RQ_JOB_TIMEOUT_SEC = 600
 
-JOB_PAYLOAD_MISSING_USER_MESSAGE = (
-    "Upload payload was lost before processing could start. "
-    "Please re-upload the document."
-)
-
-
-def spill_dir() -> Path:
-    """Return the configured spill directory, creating it if needed."""
-    path = Path(config.QUEUE_SPILL_DIR)
-    path.mkdir(parents=True, exist_ok=True)
-    return path
-
-
-def _job_payload_missing_error() -> dict:
-    return {
-        "code": "job_payload_missing",
-        "stage": "queued",
-        "message": JOB_PAYLOAD_MISSING_USER_MESSAGE,
-    }
-
+_SCHEDULER_INTERVAL_SEC = 0.5
+_RETRY_PROMOTE_BATCH = 100
 
 def _rq_worker_name(worker_id: int) -> str:
     host = socket.gethostname().split(".")[0][:32]
@@ -121,11 +151,18 @@ async def _async_execute_job(
 
     async with worker_db_context():
         _redis_conn = redis_lib.Redis.from_url(config.REDIS_URL, **redis_connection_kwargs())
+        try:
+            _record_dequeue(_redis_conn, doc_id, tenant_id)
+            _dispatch_fair_jobs(
+                _redis_conn, RQQueue(RQ_QUEUE_NAME, connection=_redis_conn)
+            )
+        except redis_lib.exceptions.RedisError:
+            logger.warning("Could not update fair queue state for %s", doc_id)
         temp_path = Path(temp_file_path)
 
         if not temp_path.exists():
             logger.error("Temp file missing for doc %s", doc_id)
-            error_payload = _job_payload_missing_error()
+            error_payload = job_payload_missing_error()
             try:
                 await db_module.update_document_status(
                     doc_id=doc_id,
@@ -193,7 +230,6 @@ async def _async_execute_job(
                     doc_id, file_name, exc.status_code, exc,
                     exc_info=True,
                 )
-                _cleanup_temp_file(temp_path)
                 _push_dlq_entry(DLQEntry(
                     doc_id=doc_id,
                     file_name=file_name,
@@ -201,6 +237,7 @@ async def _async_execute_job(
                     attempt=attempt,
                     error=str(exc),
                     tenant_id=tenant_id,
+                    payload_path=temp_file_path,
                 ), conn=_redis_conn)
                 return
 
@@ -210,7 +247,6 @@ async def _async_execute_job(
                     doc_id, file_name, exc,
                     exc_info=True,
                 )
-                _cleanup_temp_file(temp_path)
                 _push_dlq_entry(DLQEntry(
                     doc_id=doc_id,
                     file_name=file_name,
@@ -218,6 +254,7 @@ async def _async_execute_job(
                     attempt=attempt,
                     error=str(exc),
                     tenant_id=tenant_id,
+                    payload_path=temp_file_path,
                 ), conn=_redis_conn)
                 return
 
@@ -226,7 +263,7 @@ async def _async_execute_job(
                 cap = config.QUEUE_RETRY_BASE_DELAY * (2 ** next_attempt)
                 delay = random.uniform(0, cap)
                 logger.warning(
-                    "Document %s failed attempt %d — re-enqueuing after %.2fs: %s",
+                    "Document %s failed attempt %d — scheduling retry in %.2fs: %s",
                     doc_id, next_attempt, delay, exc,
                 )
                 try:
@@ -238,9 +275,11 @@ async def _async_execute_job(
                         "Failed to set retrying status for %s: %s",
                         doc_id, status_err,
                     )
-                await asyncio.sleep(delay)
-                rq_queue = RQQueue(RQ_QUEUE_NAME, connection=_redis_conn)
-                if len(rq_queue) >= config.QUEUE_MAX_SIZE:
+                pending = (
+                    _queued_job_count(_redis_conn)
+                    + _redis_conn.zcard(RETRY_SCHEDULE_KEY)
+                )
+                if pending >= config.QUEUE_MAX_SIZE:
                     error_msg = (
                         f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
                     )
@@ -271,13 +310,13 @@ async def _async_execute_job(
                         attempt=next_attempt,
                         error=error_msg,
                         tenant_id=tenant_id,
+                        payload_path=temp_file_path,
                     ), conn=_redis_conn)
                     return
-                rq_queue.enqueue(
-                    _execute_job,
+                _schedule_retry(
+                    _redis_conn,
+                    delay,
                     doc_id, file_name, content_type, temp_file_path, next_attempt, tenant_id,
-                    job_id=f"chatvector:{doc_id}:{next_attempt}",
-                    job_timeout=600,
                 )
             else:
                 logger.error(
@@ -285,7 +324,6 @@ async def _async_execute_job(
                     doc_id, file_name, config.QUEUE_JOB_MAX_RETRIES, exc,
                     exc_info=True,
                 )
-                _cleanup_temp_file(temp_path)
                 _push_dlq_entry(DLQEntry(
                     doc_id=doc_id,
                     file_name=file_name,
@@ -293,9 +331,235 @@ async def _async_execute_job(
                     attempt=attempt,
                     error=str(exc),
                     tenant_id=tenant_id,
+                    payload_path=temp_file_path,
                 ), conn=_redis_conn)
 
 
+def _retry_job_id(doc_id: str, attempt: int) -> str:
+    return f"chatvector:{doc_id}:{attempt}"
+
+
+def _doc_id_from_job_id(job_id: str) -> Optional[str]:
+    """Inverse of ``_retry_job_id``; None for ids not minted by this module."""
+    prefix, _, rest = job_id.partition(":")
+    doc_id, sep, attempt = rest.rpartition(":")
+    if prefix != "chatvector" or not sep or not attempt.isdigit():
+        return None
+    return doc_id
+
+
+def _schedule_retry(
+    conn: redis_lib.Redis,
+    delay: float,
+    doc_id: str,
+    file_name: str,
+    content_type: str,
+    temp_file_path: str,
+    attempt: int,
+    tenant_id: Optional[str] = None,
+) -> None:
+    """Park a retry in the schedule sorted set until ``now + delay``."""
+    member = json.dumps({
+        "doc_id": doc_id,
+        "file_name": file_name,
+        "content_type": content_type,
+        "temp_file_path": temp_file_path,
+        "attempt": attempt,
+        "tenant_id": tenant_id,
+    })
+    conn.zadd(RETRY_SCHEDULE_KEY, {member: time.time() + delay})
+
+
+def _promote_due_retries(
+    conn: redis_lib.Redis,
+    now: float | None = None,
+) -> int:
+    """Move scheduled retries whose not-before time has passed to their tenant sub-queue."""
+    cutoff = time.time() if now is None else now
+    due = conn.zrangebyscore(
+        RETRY_SCHEDULE_KEY, "-inf", cutoff, start=0, num=_RETRY_PROMOTE_BATCH
+    )
+    promoted = 0
+    for member in due:
+        if not conn.zrem(RETRY_SCHEDULE_KEY, member):
+            continue  # claimed by another promoter
+        try:
+            data = json.loads(member)
+            _enqueue_fair(
+                conn,
+                data["doc_id"],
+                data["file_name"],
+                data["content_type"],
+                data["temp_file_path"],
+                data["attempt"],
+                data.get("tenant_id"),
+            )
+        except (json.JSONDecodeError, KeyError) as exc:
+            logger.error("Dropping malformed scheduled retry: %s", exc)
+            continue
+        except Exception:
+            # Put it back so the next pass retries the promotion.
+            conn.zadd(RETRY_SCHEDULE_KEY, {member: cutoff})
+            raise
+        promoted += 1
+    return promoted
+
+
+def _position_key(suffix: str) -> str:
+    return f"chatvector:position:{RQ_QUEUE_NAME}:{suffix}"
+
+
+def _fair_key(suffix: str) -> str:
+    return f"chatvector:fair:{RQ_QUEUE_NAME}:{suffix}"
+
+
+# Tenant sub-queue keys are derived inside the scripts from ARGV prefixes, so
+# they assume a single Redis node (not Redis Cluster).
+_FAIR_PUSH_LUA = """
+-- KEYS[1] tenant job list      KEYS[2] rotation list for the tenant's class
+-- KEYS[3] depth hash           KEYS[4] position hash
+-- KEYS[5] tenant enqueued counter
+-- ARGV[1] tenant key  ARGV[2] job payload  ARGV[3] doc_id
+local seq = redis.call('INCR', KEYS[5])
+if redis.call('RPUSH', KEYS[1], ARGV[2]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+end
+redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+redis.call('HSET', KEYS[4], ARGV[3], seq .. ':' .. ARGV[1])
+return seq
+"""
+
+_FAIR_POP_LUA = """
+-- KEYS[1..n-1] rotation lists in priority order   KEYS[n] served-this-turn hash
+-- ARGV[1] tenant job list key prefix   ARGV[2] JSON {tenant: weight}
+local served_key = KEYS[#KEYS]
+local weights = cjson.decode(ARGV[2])
+for i = 1, #KEYS - 1 do
+    local rotation = KEYS[i]
+    while true do
+        local tenant = redis.call('LINDEX', rotation, 0)
+        if not tenant then break end
+        local jobs = ARGV[1] .. tenant
+        local payload = redis.call('LPOP', jobs)
+        if not payload then
+            redis.call('LPOP', rotation)
+            redis.call('HDEL', served_key, tenant)
+        else
+            local served = redis.call('HINCRBY', served_key, tenant, 1)
+            if redis.call('LLEN', jobs) == 0 then
+                redis.call('LPOP', rotation)
+                redis.call('HDEL', served_key, tenant)
+            elseif served >= (tonumber(weights[tenant]) or 1) then
+                redis.call('RPUSH', rotation, redis.call('LPOP', rotation))
+                redis.call('HDEL', served_key, tenant)
+            end
+            return {tenant, payload}
+        end
+    end
+end
+return false
+"""
+
+
+def _fair_push_params(
+    doc_id: str,
+    file_name: str,
+    content_type: str,
+    temp_file_path: str,
+    attempt: int,
+    tenant_id: Optional[str] = None,
+) -> tuple[list[str], list[str]]:
+    """KEYS/ARGV for one ``_FAIR_PUSH_LUA`` call."""
+    tenant_key = tenant_queue_key(tenant_id)
+    payload = json.dumps({
+        "doc_id": doc_id,
+        "file_name": file_name,
+        "content_type": content_type,
+        "temp_file_path": temp_file_path,
+        "attempt": attempt,
+        "tenant_id": tenant_id,
+    })
+    keys = [
+        _fair_key(f"jobs:{tenant_key}"),
+        _fair_key(f"rr:{tenant_priority(tenant_key)}"),
+        _fair_key("depth"),
+        _position_key("seq"),
+        _position_key(f"enqueued:{tenant_key}"),
+    ]
+    return keys, [tenant_key, payload, doc_id]
+
+
+def _enqueue_fair(
+    conn: redis_lib.Redis,
+    doc_id: str,
+    file_name: str,
+    content_type: str,
+    temp_file_path: str,
+    attempt: int,
+    tenant_id: Optional[str] = None,
+) -> int:
+    """Append a job to its tenant's sub-queue; returns its tenant-local sequence number."""
+    keys, args = _fair_push_params(
+        doc_id, file_name, content_type, temp_file_path, attempt, tenant_id
+    )
+    push = conn.register_script(_FAIR_PUSH_LUA)
+    return int(push(keys=keys, args=args))
+
+
+def _dispatch_fair_jobs(conn: redis_lib.Redis, rq_queue: RQQueue) -> int:
+    """Top the RQ list up to one ready job per worker, picking tenants fairly."""
+    pop = conn.register_script(_FAIR_POP_LUA)
+    keys = [_fair_key(f"rr:{cls}") for cls in QUEUE_PRIORITY_CLASSES]
+    keys.append(_fair_key("served"))
+    args = [_fair_key("jobs:"), json.dumps(config.QUEUE_TENANT_WEIGHTS)]
+    dispatched = 0
+    while len(rq_queue) < config.QUEUE_WORKER_COUNT:
+        popped = pop(keys=keys, args=args)
+        if not popped:
+            break
+        tenant_key, payload = (
+            v.decode() if isinstance(v, bytes) else v for v in popped
+        )
+        data = json.loads(payload)
+        try:
+            rq_queue.enqueue(
+                _execute_job,
+                data["doc_id"],
+                data["file_name"],
+                data["content_type"],
+                data["temp_file_path"],
+                data["attempt"],
+                data.get("tenant_id"),
+                job_id=_retry_job_id(data["doc_id"], data["attempt"]),
+                job_timeout=RQ_JOB_TIMEOUT_SEC,
+            )
+        except Exception:
+            # Return the job to the head of its sub-queue for the next pass.
+            if conn.lpush(_fair_key(f"jobs:{tenant_key}"), payload) == 1:
+                conn.rpush(_fair_key(f"rr:{tenant_priority(tenant_key)}"), tenant_key)
+            raise
+        dispatched += 1
+    return dispatched
+
+
+def _record_dequeue(
+    conn: redis_lib.Redis,
+    doc_id: str,
+    tenant_id: Optional[str] = None,
+) -> None:
+    tenant_key = tenant_queue_key(tenant_id)
+    pipe = conn.pipeline()
+    pipe.hdel(_position_key("seq"), doc_id)
+    pipe.incr(_position_key(f"dequeued:{tenant_key}"))
+    pipe.hincrby(_fair_key("depth"), tenant_key, -1)
+    pipe.execute()
+
+
+def _queued_job_count(conn: redis_lib.Redis) -> int:
+    """Jobs waiting to start: tenant sub-queues plus the ready RQ buffer."""
+    return sum(max(0, int(v)) for v in conn.hvals(_fair_key("depth")))
+
+
 def _cleanup_temp_file(path: Path) -> None:
     try:
         path.unlink(missing_ok=True)
@@ -303,33 +567,84 @@ def _cleanup_temp_file(path: Path) -> None:
         logger.warning("Could not remove temp file %s", path)
 
 
+def _dlq_entry_json(entry: DLQEntry) -> str:
+    data: dict = {
+        "doc_id": entry.doc_id,
+        "file_name": entry.file_name,
+        "content_type": entry.content_type,
+        "attempt": entry.attempt,
+        "error": entry.error,
+        "failed_at": entry.failed_at.isoformat(),
+    }
+    if entry.tenant_id is not None:
+        data["tenant_id"] = entry.tenant_id
+    if entry.payload_path is not None:
+        data["payload_path"] = entry.payload_path
+    return json.dumps(data)
+
+
+def _dlq_entry_from_stream(entry_id, fields: dict) -> Optional[DLQEntry]:
+    entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+    raw = fields.get(b"entry", fields.get("entry"))
+    try:
+        data = json.loads(raw)
+        return DLQEntry(
+            doc_id=data["doc_id"],
+            file_name=data["file_name"],
+            content_type=data["content_type"],
+            attempt=data["attempt"],
+            error=data["error"],
+            tenant_id=data.get("tenant_id"),
+            failed_at=datetime.fromisoformat(data["failed_at"]),
+            payload_path=data.get("payload_path"),
+            entry_id=entry_id,
+        )
+    except (TypeError, json.JSONDecodeError, KeyError) as exc:
+        logger.warning("Skipping malformed DLQ entry %s: %s", entry_id, exc)
+        return None
+
+
+def _next_stream_id(cursor: str) -> str:
+    """Smallest stream id strictly after *cursor* (exclusive XRANGE start)."""
+    ms, sep, seq = cursor.partition("-")
+    if not sep or not ms.isdigit() or not seq.isdigit():
+        raise ValueError(f"Invalid DLQ cursor {cursor!r}")
+    return f"{ms}-{int(seq) + 1}"
+
+
+def _trim_dlq(conn: redis_lib.Redis, overflow: int) -> None:
+    """Drop the *overflow* oldest DLQ entries together with their spill files."""
+    for entry_id, fields in conn.xrange(DLQ_REDIS_KEY, count=overflow):
+        # XDEL returns 0 when a concurrent trim or replay got there first.
+        if conn.xdel(DLQ_REDIS_KEY, entry_id):
+            entry = _dlq_entry_from_stream(entry_id, fields)
+            if entry is not None:
+                remove_spill_file(entry.payload_path)
+
+
 def _push_dlq_entry(
     entry: DLQEntry,
     conn: redis_lib.Redis | None = None,
 ) -> None:
-    """Persist a DLQ entry as JSON in a Redis list, trimming to max length."""
+    """Append a DLQ entry to the Redis stream, trimming to max length.
+
+    The spill file referenced by ``payload_path`` is kept for replay; it is
+    removed if the entry cannot be stored or is later trimmed.
+    """
     try:
         _conn = conn or redis_lib.Redis.from_url(
             config.REDIS_URL, **redis_connection_kwargs()
         )
-        data: dict = {
-            "doc_id": entry.doc_id,
-            "file_name": entry.file_name,
-            "content_type": entry.content_type,
-            "attempt": entry.attempt,
-            "error": entry.error,
-            "failed_at": entry.failed_at.isoformat(),
-        }
-        if entry.tenant_id is not None:
-            data["tenant_id"] = entry.tenant_id
-        payload = json.dumps(data)
-        max_entries = config.QUEUE_DLQ_MAX_ENTRIES
         pipe = _conn.pipeline()
-        pipe.rpush(DLQ_REDIS_KEY, payload)
-        pipe.ltrim(DLQ_REDIS_KEY, -max_entries, -1)
-        pipe.execute()
+        pipe.xadd(DLQ_REDIS_KEY, {"entry": _dlq_entry_json(entry)})
+        pipe.xlen(DLQ_REDIS_KEY)
+        _, length = pipe.execute()
+        overflow = length - config.QUEUE_DLQ_MAX_ENTRIES
+        if overflow > 0:
+            _trim_dlq(_conn, overflow)
     except Exception:
         logger.exception("Failed to push DLQ entry for %s", entry.doc_id)
+        remove_spill_file(entry.payload_path)
 
 
 class _NoopDeathPenalty:
@@ -405,6 +720,7 @@ class RedisIngestionQueue(BaseIngestionQueue):
         self._worker_threads: list[threading.Thread] = []
         self._rq_workers: list[Optional[ThreadSafeWorker]] = []
         self._stop_event = threading.Event()
+        self._scheduler_thread: threading.Thread | None = None
         spill_dir()
 
     # ------------------------------------------------------------------
@@ -417,6 +733,11 @@ class RedisIngestionQueue(BaseIngestionQueue):
             return
 
         self._stop_event.clear()
+        try:
+            await asyncio.to_thread(self._rebuild_fair_index)
+            await asyncio.to_thread(self._migrate_legacy_dlq)
+        except redis_lib.exceptions.RedisError as exc:
+            logger.warning("Could not rebuild queue state from Redis: %s", exc)
         self._rq_workers = [None] * config.QUEUE_WORKER_COUNT
         for i in range(config.QUEUE_WORKER_COUNT):
             t = threading.Thread(
@@ -427,6 +748,12 @@ class RedisIngestionQueue(BaseIngestionQueue):
             )
             t.start()
             self._worker_threads.append(t)
+        self._scheduler_thread = threading.Thread(
+            target=self._run_scheduler,
+            name="rq-scheduler",
+            daemon=True,
+        )
+        self._scheduler_thread.start()
         logger.info(
             "Redis ingestion queue started with %d worker thread(s) "
             "(max_size=%d, redis=%s, spill_dir=%s)",
@@ -445,11 +772,15 @@ class RedisIngestionQueue(BaseIngestionQueue):
         await asyncio.to_thread(self._join_worker_threads, 5.0)
         self._worker_threads.clear()
         self._rq_workers.clear()
+        self._scheduler_thread = None
         logger.info("Redis ingestion queue stopped")
 
     def _join_worker_threads(self, timeout: float) -> None:
         deadline = time.monotonic() + timeout
-        for t in self._worker_threads:
+        threads = list(self._worker_threads)
+        if self._scheduler_thread is not None:
+            threads.append(self._scheduler_thread)
+        for t in threads:
             remaining = max(0.0, deadline - time.monotonic())
             t.join(timeout=remaining)
 
@@ -458,9 +789,8 @@ class RedisIngestionQueue(BaseIngestionQueue):
     # ------------------------------------------------------------------
 
     def _sync_enqueue(self, job: QueueJob) -> int:
-        """Blocking RQ enqueue + temp-file write (runs off the event loop)."""
-        current_size = len(self._rq_queue)
-        if current_size >= config.QUEUE_MAX_SIZE:
+        """Blocking fair enqueue + temp-file write (runs off the event loop)."""
+        if self.queue_size() >= config.QUEUE_MAX_SIZE:
             raise QueueFull(
                 f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
             )
@@ -468,21 +798,82 @@ class RedisIngestionQueue(BaseIngestionQueue):
         temp_file_path = spill_dir() / job.doc_id
         temp_file_path.write_bytes(job.file_bytes)
 
-        self._rq_queue.enqueue(
-            _execute_job,
+        _enqueue_fair(
+            self._conn,
             job.doc_id,
             job.file_name,
             job.content_type,
             str(temp_file_path),
             job.attempt,
             job.tenant_id,
-            job_id=f"chatvector:{job.doc_id}:{job.attempt}",
-            job_timeout=600,
         )
+        try:
+            _dispatch_fair_jobs(self._conn, self._rq_queue)
+        except redis_lib.exceptions.RedisError as exc:
+            # The job is safely in its sub-queue; the scheduler thread retries.
+            logger.warning("Deferred dispatch after enqueue of %s: %s", job.doc_id, exc)
 
         position = self.queue_position(job.doc_id)
         return position if position is not None else 1
 
+    def _sync_enqueue_many(self, jobs: list[QueueJob]) -> list[int]:
+        """Pipelined fair enqueue of as many *jobs* as fit, then one dispatch pass."""
+        room = config.QUEUE_MAX_SIZE - self.queue_size()
+        accepted = jobs[:max(0, room)]
+        if not accepted:
+            return []
+
+        temp_paths: list[Path] = []
+        push = self._conn.register_script(_FAIR_PUSH_LUA)
+        pipe = self._conn.pipeline(transaction=False)
+        try:
+            for job in accepted:
+                temp_file_path = spill_dir() / job.doc_id
+                temp_file_path.write_bytes(job.file_bytes)
+                temp_paths.append(temp_file_path)
+                keys, args = _fair_push_params(
+                    job.doc_id,
+                    job.file_name,
+                    job.content_type,
+                    str(temp_file_path),
+                    job.attempt,
+                    job.tenant_id,
+                )
+                push(keys=keys, args=args, client=pipe)
+            seqs = [int(seq) for seq in pipe.execute()]
+        except Exception:
+            for path in temp_paths:
+                remove_spill_file(str(path))
+            raise
+
+        try:
+            _dispatch_fair_jobs(self._conn, self._rq_queue)
+        except redis_lib.exceptions.RedisError as exc:
+            logger.warning(
+                "Deferred dispatch after batch enqueue of %d job(s): %s", len(accepted), exc
+            )
+
+        tenant_keys = sorted({tenant_queue_key(job.tenant_id) for job in accepted})
+        pipe = self._conn.pipeline(transaction=False)
+        for tenant_key in tenant_keys:
+            pipe.get(_position_key(f"dequeued:{tenant_key}"))
+        dequeued = {
+            tenant_key: int(raw or 0)
+            for tenant_key, raw in zip(tenant_keys, pipe.execute())
+        }
+        return [
+            max(1, seq - dequeued[tenant_queue_key(job.tenant_id)])
+            for job, seq in zip(accepted, seqs)
+        ]
+
+    async def enqueue_many(self, jobs: list[QueueJob]) -> list[int]:
+        positions = await asyncio.to_thread(self._sync_enqueue_many, jobs)
+        logger.info(
+            "Enqueued %d of %d document(s) in one batch [redis]",
+            len(positions), len(jobs),
+        )
+        return positions
+
     async def enqueue(self, job: QueueJob) -> int:
         position = await asyncio.to_thread(self._sync_enqueue, job)
         logger.info(
@@ -492,33 +883,181 @@ class RedisIngestionQueue(BaseIngestionQueue):
         return position
 
     def queue_position(self, doc_id: str) -> Optional[int]:
+        """1-indexed position within the document's tenant sub-queue, or None."""
+        entry = self._conn.hget(_position_key("seq"), doc_id)
+        if entry is None:
+            return None
+        seq, _, tenant_key = (
+            entry.decode() if isinstance(entry, bytes) else entry
+        ).partition(":")
+        dequeued = self._conn.get(_position_key(f"dequeued:{tenant_key}"))
+        return max(1, int(seq) - int(dequeued or 0))
+
+    def _tenant_job_payloads(self) -> dict[str, list[bytes]]:
+        """Waiting job payloads per tenant sub-queue, in dispatch order (two round trips)."""
+        pipe = self._conn.pipeline()
+        for cls in QUEUE_PRIORITY_CLASSES:
+            pipe.lrange(_fair_key(f"rr:{cls}"), 0, -1)
+        tenant_keys = [
+            raw.decode() if isinstance(raw, bytes) else raw
+            for rotation in pipe.execute()
+            for raw in rotation
+        ]
+        if not tenant_keys:
+            return {}
+        pipe = self._conn.pipeline()
+        for tenant_key in tenant_keys:
+            pipe.lrange(_fair_key(f"jobs:{tenant_key}"), 0, -1)
+        return dict(zip(tenant_keys, pipe.execute()))
+
+    def _rebuild_fair_index(self) -> None:
+        """Re-derive positions and per-tenant depths from Redis (startup only, O(depth))."""
+        ordered: dict[str, list[str]] = {}
         job_ids = self._rq_queue.job_ids
-        for i, jid in enumerate(job_ids):
-            if doc_id in jid:
-                return i + 1
-        return None
+        for rq_job in RQJob.fetch_many(job_ids, connection=self._conn):
+            if rq_job is None or len(rq_job.args) < 1:
+                continue
+            tenant_id = rq_job.args[5] if len(rq_job.args) > 5 else None
+            ordered.setdefault(tenant_queue_key(tenant_id), []).append(rq_job.args[0])
+        for tenant_key, payloads in self._tenant_job_payloads().items():
+            for raw in payloads:
+                try:
+                    ordered.setdefault(tenant_key, []).append(json.loads(raw)["doc_id"])
+                except (json.JSONDecodeError, KeyError):
+                    continue
+
+        stale_keys = list(self._conn.scan_iter(match=_position_key("*")))
+        pipe = self._conn.pipeline()
+        if stale_keys:
+            pipe.delete(*stale_keys)
+        pipe.delete(_fair_key("depth"), _fair_key("served"))
+        for tenant_key, doc_ids in ordered.items():
+            for seq, doc_id in enumerate(doc_ids, start=1):
+                pipe.hset(_position_key("seq"), doc_id, f"{seq}:{tenant_key}")
+            pipe.set(_position_key(f"enqueued:{tenant_key}"), len(doc_ids))
+            pipe.hset(_fair_key("depth"), tenant_key, len(doc_ids))
+        pipe.execute()
 
     def queue_size(self) -> int:
-        return len(self._rq_queue)
+        return _queued_job_count(self._conn)
+
+    def tenant_depths(self) -> dict[str, int]:
+        depths = self._conn.hgetall(_fair_key("depth"))
+        result: dict[str, int] = {}
+        for raw_tenant, raw_count in depths.items():
+            count = int(raw_count)
+            if count > 0:
+                tenant_key = raw_tenant.decode() if isinstance(raw_tenant, bytes) else raw_tenant
+                result[tenant_key] = count
+        return result
 
     def dlq_jobs(self) -> list[DLQEntry]:
-        raw_entries = self._conn.lrange(DLQ_REDIS_KEY, 0, -1)
         result: list[DLQEntry] = []
-        for raw in raw_entries:
+        cursor: Optional[str] = None
+        while True:
+            page = self.dlq_page(cursor=cursor, limit=500)
+            result.extend(page.entries)
+            if page.next_cursor is None:
+                return result
+            cursor = page.next_cursor
+
+    def dlq_page(
+        self,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+    ) -> DLQPage:
+        start = "-" if cursor is None else _next_stream_id(cursor)
+        entries: list[DLQEntry] = []
+        while True:
+            batch = self._conn.xrange(DLQ_REDIS_KEY, min=start, max="+", count=limit)
+            if not batch:
+                return DLQPage(entries=entries)
+            for entry_id, fields in batch:
+                entry = _dlq_entry_from_stream(entry_id, fields)
+                if entry is None or not dlq_entry_visible(entry, tenant_id):
+                    continue
+                entries.append(entry)
+                if len(entries) == limit:
+                    return DLQPage(entries=entries, next_cursor=entry.entry_id)
+            last_id = batch[-1][0]
+            start = _next_stream_id(
+                last_id.decode() if isinstance(last_id, bytes) else last_id
+            )
+
+    async def _claim_dlq_entries(
+        self, entry_ids: list[str], tenant_id: Optional[str]
+    ) -> list[DLQEntry]:
+        return await asyncio.to_thread(self._claim_dlq_entries_sync, entry_ids, tenant_id)
+
+    def _claim_dlq_entries_sync(
+        self, entry_ids: list[str], tenant_id: Optional[str]
+    ) -> list[DLQEntry]:
+        claimed: list[DLQEntry] = []
+        for entry_id in dict.fromkeys(entry_ids):
             try:
-                data = json.loads(raw)
-                result.append(DLQEntry(
-                    doc_id=data["doc_id"],
-                    file_name=data["file_name"],
-                    content_type=data["content_type"],
-                    attempt=data["attempt"],
-                    error=data["error"],
-                    tenant_id=data.get("tenant_id"),
-                    failed_at=datetime.fromisoformat(data["failed_at"]),
-                ))
-            except (json.JSONDecodeError, KeyError) as exc:
-                logger.warning("Skipping malformed DLQ entry: %s", exc)
-        return result
+                _next_stream_id(entry_id)
+            except ValueError:
+                continue
+            found = self._conn.xrange(DLQ_REDIS_KEY, min=entry_id, max=entry_id)
+            if not found:
+                continue
+            entry = _dlq_entry_from_stream(*found[0])
+            if (
+                entry is None
+                or entry.tenant_id is None
+                or not dlq_entry_visible(entry, tenant_id)
+                or not entry.payload_path
+                or not Path(entry.payload_path).exists()
+            ):
+                continue
+            # XDEL is the claim: only one concurrent replayer gets 1 back.
+            if self._conn.xdel(DLQ_REDIS_KEY, entry_id):
+                claimed.append(entry)
+        return claimed
+
+    async def _restore_dlq_entry(self, entry: DLQEntry) -> None:
+        await asyncio.to_thread(_push_dlq_entry, entry, conn=self._conn)
+
+    async def _enqueue_dlq_payload(self, entry: DLQEntry) -> None:
+        # The spill file is reused as-is; no bytes pass through this process.
+        def _enqueue() -> None:
+            if self.queue_size() >= config.QUEUE_MAX_SIZE:
+                raise QueueFull(
+                    f"Ingestion queue is at capacity ({config.QUEUE_MAX_SIZE})"
+                )
+            _enqueue_fair(
+                self._conn,
+                entry.doc_id,
+                entry.file_name,
+                entry.content_type,
+                entry.payload_path,
+                0,
+                entry.tenant_id,
+            )
+            _dispatch_fair_jobs(self._conn, self._rq_queue)
+
+        await asyncio.to_thread(_enqueue)
+
+    def _migrate_legacy_dlq(self) -> None:
+        """Move entries from the pre-stream DLQ list into the stream (startup)."""
+        # RENAME claims the list so concurrently starting processes migrate it once.
+        claimed_key = f"{LEGACY_DLQ_REDIS_KEY}:migrating:{uuid.uuid4().hex}"
+        try:
+            self._conn.rename(LEGACY_DLQ_REDIS_KEY, claimed_key)
+        except redis_lib.exceptions.ResponseError:
+            return  # nothing to migrate
+        raw_entries = self._conn.lrange(claimed_key, 0, -1)
+        pipe = self._conn.pipeline()
+        for raw in raw_entries:
+            pipe.xadd(DLQ_REDIS_KEY, {"entry": raw})
+        pipe.delete(claimed_key)
+        pipe.execute()
+        logger.info("Migrated %d legacy DLQ entries to %s", len(raw_entries), DLQ_REDIS_KEY)
+
+    def scheduled_retry_count(self) -> int:
+        return self._conn.zcard(RETRY_SCHEDULE_KEY)
 
     def active_worker_count(self) -> int:
         """Workers in this API process that finished RQ bootstrap and are listening."""
@@ -530,24 +1069,106 @@ class RedisIngestionQueue(BaseIngestionQueue):
 
     def clear_stale_jobs(self, failed_doc_ids: set[str]) -> int:
         """
-        Remove queued RQ jobs whose doc_id is in *failed_doc_ids*.
+        Remove queued jobs (RQ list, tenant sub-queues and scheduled retries)
+        whose doc_id is in *failed_doc_ids*.
 
         Called during startup reconciliation: after db.fail_stale_documents()
         marks DB rows as failed, this method cleans up the corresponding
         Redis jobs so they are not executed by workers.
+
+        Set-based: each structure is read once, matched against the id set
+        in O(1) per job, and cleaned up in one pipelined write, so the cost
+        is a handful of round trips regardless of how many jobs are queued.
         """
-        removed = 0
-        for jid in list(self._rq_queue.job_ids):
-            for doc_id in failed_doc_ids:
-                if doc_id in jid:
-                    try:
-                        rq_job = RQJob.fetch(jid, connection=self._conn)
-                        rq_job.cancel()
-                        rq_job.delete()
-                        removed += 1
-                    except Exception:
-                        logger.warning("Could not remove stale RQ job %s", jid)
-                    break
+        if not failed_doc_ids:
+            return 0
+        depth_key = _fair_key("depth")
+        removed_per_tenant: collections.Counter[str] = collections.Counter()
+
+        # Ready RQ buffer: the doc id is encoded in the job id, so only the
+        # stale jobs are fetched (one pipelined HGETALL batch) for their tenant.
+        stale_job_ids = [
+            jid for jid in self._rq_queue.job_ids
+            if _doc_id_from_job_id(jid) in failed_doc_ids
+        ]
+        removed_jobs = 0
+        if stale_job_ids:
+            rq_jobs = RQJob.fetch_many(stale_job_ids, connection=self._conn)
+            tenants = [
+                tenant_queue_key(
+                    rq_job.args[5] if rq_job is not None and len(rq_job.args) > 5 else None
+                )
+                for rq_job in rq_jobs
+            ]
+            pipe = self._conn.pipeline()
+            for jid in stale_job_ids:
+                pipe.lrem(self._rq_queue.key, 0, jid)
+            pipe.delete(*(RQJob.key_for(jid) for jid in stale_job_ids))
+            lrem_results = pipe.execute()[:-1]
+            for tenant_key, lremmed in zip(tenants, lrem_results):
+                if lremmed:
+                    removed_jobs += 1
+                    removed_per_tenant[tenant_key] += 1
+
+        # Tenant sub-queues: two pipelined reads, one pipelined LREM batch.
+        sub_queue_removals: list[tuple[str, bytes]] = []
+        for tenant_key, payloads in self._tenant_job_payloads().items():
+            for raw in payloads:
+                try:
+                    doc_id = json.loads(raw)["doc_id"]
+                except (json.JSONDecodeError, KeyError):
+                    continue
+                if doc_id in failed_doc_ids:
+                    sub_queue_removals.append((tenant_key, raw))
+        if sub_queue_removals:
+            pipe = self._conn.pipeline()
+            for tenant_key, raw in sub_queue_removals:
+                pipe.lrem(_fair_key(f"jobs:{tenant_key}"), 1, raw)
+            for (tenant_key, _), lremmed in zip(sub_queue_removals, pipe.execute()):
+                if lremmed:
+                    removed_jobs += 1
+                    removed_per_tenant[tenant_key] += 1
+
+        # Scheduled retries: one ZRANGE, one multi-member ZREM.
+        stale_retries = []
+        for member in self._conn.zrange(RETRY_SCHEDULE_KEY, 0, -1):
+            try:
+                doc_id = json.loads(member)["doc_id"]
+            except (json.JSONDecodeError, KeyError):
+                continue
+            if doc_id in failed_doc_ids:
+                stale_retries.append(member)
+
+        # Positions are seq - dequeued, so only cleared jobs ahead of every
+        # surviving job of their tenant may advance the dequeued counter;
+        # counting one from behind would move survivors ahead of real jobs.
+        cleared_seqs: dict[str, list[int]] = collections.defaultdict(list)
+        lowest_remaining: dict[str, int] = {}
+        for raw_doc_id, raw_entry in self._conn.hgetall(_position_key("seq")).items():
+            doc_id = raw_doc_id.decode() if isinstance(raw_doc_id, bytes) else raw_doc_id
+            seq_text, _, tenant_key = (
+                raw_entry.decode() if isinstance(raw_entry, bytes) else raw_entry
+            ).partition(":")
+            seq = int(seq_text)
+            if doc_id in failed_doc_ids:
+                cleared_seqs[tenant_key].append(seq)
+            elif seq < lowest_remaining.get(tenant_key, seq + 1):
+                lowest_remaining[tenant_key] = seq
+
+        pipe = self._conn.pipeline()
+        if stale_retries:
+            pipe.zrem(RETRY_SCHEDULE_KEY, *stale_retries)
+        for tenant_key, count in removed_per_tenant.items():
+            pipe.hincrby(depth_key, tenant_key, -count)
+        for tenant_key, seqs in cleared_seqs.items():
+            lowest = lowest_remaining.get(tenant_key)
+            ahead = sum(1 for seq in seqs if lowest is None or seq < lowest)
+            if ahead:
+                pipe.incrby(_position_key(f"dequeued:{tenant_key}"), ahead)
+        pipe.hdel(_position_key("seq"), *failed_doc_ids)
+        results = pipe.execute()
+        removed = removed_jobs + (results[0] if stale_retries else 0)
+
         if removed:
             logger.info("Cleared %d stale RQ jobs during reconciliation", removed)
         return removed
@@ -556,6 +1177,23 @@ class RedisIngestionQueue(BaseIngestionQueue):
     # Internal
     # ------------------------------------------------------------------
 
+    def _run_scheduler(self) -> None:
+        """Promote due retries and keep the RQ buffer topped up until stopped."""
+        conn = redis_lib.Redis.from_url(config.REDIS_URL, **redis_connection_kwargs())
+        rq_queue = RQQueue(RQ_QUEUE_NAME, connection=conn)
+        while not self._stop_event.wait(_SCHEDULER_INTERVAL_SEC):
+            try:
+                promoted = _promote_due_retries(conn)
+                _dispatch_fair_jobs(conn, rq_queue)
+            except redis_lib.exceptions.RedisError as exc:
+                logger.warning("Queue scheduler could not reach Redis: %s", exc)
+                continue
+            except Exception:
+                logger.exception("Queue scheduler failed")
+                continue
+            if promoted:
+                logger.info("Promoted %d scheduled retries", promoted)
+
     def _run_worker(self, worker_id: int) -> None:
         """Run a ThreadSafeWorker in a loop; restarts on unexpected exit."""
         logger.info("RQ worker thread-%d starting", worker_id)
@@ -58,6 +58,9 @@ class _QueueProxy:
     async def enqueue(self, job):
         return await _get_ingestion_queue().enqueue(job)
 
+    async def enqueue_many(self, jobs):
+        return await _get_ingestion_queue().enqueue_many(jobs)
+
     def queue_position(self, doc_id):
         return _get_ingestion_queue().queue_position(doc_id)
 
@@ -67,6 +70,18 @@ class _QueueProxy:
     def dlq_jobs(self):
         return _get_ingestion_queue().dlq_jobs()
 
+    def dlq_page(self, **kwargs):
+        return _get_ingestion_queue().dlq_page(**kwargs)
+
+    async def replay_dlq(self, entry_ids, **kwargs):
+        return await _get_ingestion_queue().replay_dlq(entry_ids, **kwargs)
+
+    def scheduled_retry_count(self):
+        return _get_ingestion_queue().scheduled_retry_count()
+
+    def tenant_depths(self):
+        return _get_ingestion_queue().tenant_depths()
+
     def active_worker_count(self):
         return _get_ingestion_queue().active_worker_count()
 
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 _reranker_provider: RerankerProvider | None = None
 
-VALID_RERANKER_PROVIDERS = {"similarity"}
+VALID_RERANKER_PROVIDERS = {"similarity", "fake"}
 
 
 def _reset_reranker_provider() -> None:
@@ -38,6 +38,11 @@ def get_reranker_provider() -> RerankerProvider:
     if name == "similarity":
         _reranker_provider = SimilarityRerankerProvider()
         logger.info("Using similarity reranker provider")
+    elif name == "fake":
+        from services.reranker.fake import FakeRerankerProvider
+
+        _reranker_provider = FakeRerankerProvider()
+        logger.warning("Using fake reranker provider (load testing only)")
     else:
         raise ValueError(
             f"Unknown RERANKER_PROVIDER={name!r}. "
@@ -0,0 +1,56 @@
+"""Deterministic reranker with simulated latency, for offline load testing."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from dataclasses import replace
+
+from core.config import config
+from db.base import SCORE_TYPE_RERANKED
+from services.providers.fake import sample_latency
+from services.reranker.base import RerankRequest, RerankResult, RerankerProvider
+from services.reranker.similarity import _chunk_key
+
+
+def _fake_score(query: str, key: str) -> float:
+    digest = hashlib.sha256(f"{query}\x00{key}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / float(1 << 64)
+
+
+class FakeRerankerProvider(RerankerProvider):
+    """Scores each (query, chunk) pair from a hash after a sampled delay.
+
+    Stands in for a remote cross-encoder: the order is stable for a given query
+    but unrelated to relevance. No faults are injected, because callers do not
+    expect reranking to fail.
+    """
+
+    async def rerank(self, request: RerankRequest) -> RerankResult:
+        original_order = [_chunk_key(chunk) for chunk in request.candidates]
+        await asyncio.sleep(sample_latency(config.FAKE_RERANKER_LATENCY_MS))
+
+        scored = sorted(
+            (
+                (_fake_score(request.query, key), chunk)
+                for key, chunk in zip(original_order, request.candidates)
+            ),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+        limit = request.top_k if request.top_k is not None else len(scored)
+        reranked = [
+            replace(
+                chunk,
+                similarity=score,
+                score_type=SCORE_TYPE_RERANKED,
+                reranker_score=score,
+                rerank_order=rerank_order,
+            )
+            for rerank_order, (score, chunk) in enumerate(scored[:limit], start=1)
+        ]
+        return RerankResult(
+            candidates=reranked,
+            original_order=original_order,
+            reranked_order=[_chunk_key(chunk) for chunk in reranked],
+        )
@@ -62,6 +62,11 @@ async def list_sessions(tenant_id: Optional[str] = None) -> list[Session]:
 async def delete_session(
     session_id: str, tenant_id: Optional[str] = None
 ) -> bool:
+    from services.chat_turn_writer import chat_turn_writer
+
+    # Buffered turns must not be written after the delete, or they would
+    # outlive the session.
+    await chat_turn_writer.discard_session(session_id, tenant_id)
     deleted = await db.delete_session_record(session_id, tenant_id)
     if deleted:
         logger.info(f"Deleted session: {session_id}")
@@ -0,0 +1,220 @@
+"""Rolling per-session summaries that stand in for older chat turns in prompts."""
+
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime
+from typing import Optional
+
+import db
+from core.config import config
+from services.context_service import estimate_tokens
+from services.providers import get_llm_provider
+from services.providers.concurrency import get_llm_concurrency_limiter
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ROLE = "summary"
+
+# Unsummarized messages read (oldest first) per summary LLM call.
+_SUMMARY_SCAN_MESSAGES = 200
+_SUMMARY_TEMPERATURE = 0.1
+
+_SUMMARY_SYSTEM_INSTRUCTION = (
+    "You maintain a running summary of a conversation between a user and a "
+    "document question-answering assistant. Merge the new messages into the "
+    "existing summary. Keep the facts, names, numbers, documents and decisions "
+    "later questions may refer back to; drop pleasantries and repetition. "
+    "Write plain prose in the third person and return only the updated summary."
+)
+
+
+def split_summary(history: list[dict]) -> tuple[Optional[dict], list[dict]]:
+    """Separate a leading summary message from the raw messages after it."""
+    if history and history[0].get("role") == SUMMARY_ROLE:
+        return history[0], history[1:]
+    return None, history
+
+
+def recent_history(history: list[dict], limit: int) -> list[dict]:
+    """Return the last *limit* raw messages, keeping a leading summary message."""
+    summary, messages = split_summary(history)
+    recent = messages[-limit:] if limit > 0 else []
+    return [summary, *recent] if summary is not None else recent
+
+
+def _format_messages(messages: list[dict]) -> str:
+    lines = []
+    for message in messages:
+        role = "User" if message.get("role") == "user" else "Assistant"
+        lines.append(f"{role}: {(message.get('content') or '').strip()}")
+    return "\n".join(lines)
+
+
+async def _summarize(previous_summary: Optional[str], messages: list[dict]) -> Optional[str]:
+    user_text = (
+        f"Existing summary:\n{previous_summary or '(none)'}\n\n"
+        f"New messages:\n{_format_messages(messages)}"
+    )
+    provider = get_llm_provider()
+    text = await get_llm_concurrency_limiter().call(
+        lambda: provider.generate(
+            user_text,
+            system_instruction=_SUMMARY_SYSTEM_INSTRUCTION,
+            temperature=_SUMMARY_TEMPERATURE,
+            max_output_tokens=config.SESSION_SUMMARY_MAX_OUTPUT_TOKENS,
+        )
+    )
+    text = (text or "").strip()
+    return text or None
+
+
+class SessionSummarizer:
+    """Folds older session turns into the session's rolling summary.
+
+    After each stored turn ``schedule`` starts (at most) one background update
+    per session. The update reads the summary plus the messages it does not
+    cover yet; once those exceed SESSION_SUMMARY_TRIGGER_TOKENS, everything but
+    the last SESSION_SUMMARY_KEEP_MESSAGES is merged into the summary with one
+    LLM call. History loaded with ``with_summary=True`` then returns the
+    summary in place of the folded messages.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[tuple[str, str], asyncio.Task] = {}
+        self._rerun: set[tuple[str, str]] = set()
+        self.scheduled = 0
+        self.updated = 0
+        self.skipped = 0
+        self.conflicts = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.SESSION_SUMMARY_ENABLED
+
+    def clear(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+        self._rerun.clear()
+        self.scheduled = self.updated = self.skipped = self.conflicts = self.failed = 0
+
+    def schedule(self, session_id: Optional[str], tenant_id: str) -> None:
+        """Queue a summary update for the session; coalesces with one in flight."""
+        if not self.enabled or not session_id:
+            return
+        key = (tenant_id, session_id)
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            # Re-check once the running update finishes.
+            self._rerun.add(key)
+            return
+        self.scheduled += 1
+        self._tasks[key] = asyncio.create_task(self._run(key))
+
+    async def _run(self, key: tuple[str, str]) -> None:
+        tenant_id, session_id = key
+        try:
+            while True:
+                self._rerun.discard(key)
+                try:
+                    await self.update(session_id, tenant_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.failed += 1
+                    logger.warning(
+                        "Session summary update failed for session %s", session_id, exc_info=True
+                    )
+                if key not in self._rerun:
+                    break
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                del self._tasks[key]
+
+    async def update(self, session_id: str, tenant_id: str) -> bool:
+        """Fold older messages into the summary when over the threshold; True if stored.
+
+        Unsummarized messages are read oldest first, _SUMMARY_SCAN_MESSAGES at
+        a time, so a long backlog is folded in order over several LLM calls.
+        """
+        stored = False
+        while True:
+            history = await db.get_session_history(
+                session_id=session_id,
+                tenant_id=tenant_id,
+                limit=_SUMMARY_SCAN_MESSAGES,
+                with_summary=True,
+                oldest_first=True,
+            )
+            summary, messages = split_summary(history)
+            # A full page means newer messages remain; only the last page keeps
+            # its tail raw.
+            caught_up = len(messages) < _SUMMARY_SCAN_MESSAGES
+            keep = config.SESSION_SUMMARY_KEEP_MESSAGES if caught_up else 0
+            fold = messages[: max(0, len(messages) - keep)]
+            # Fold whole turns so a question is never summarized without its answer.
+            if fold and fold[-1].get("role") == "user":
+                fold = fold[:-1]
+            if (
+                not fold
+                or fold[-1].get("created_at") is None
+                or (
+                    caught_up
+                    and estimate_tokens(_format_messages(messages))
+                    <= config.SESSION_SUMMARY_TRIGGER_TOKENS
+                )
+            ):
+                if not stored:
+                    self.skipped += 1
+                return stored
+
+            new_summary = await _summarize(summary["content"] if summary else None, fold)
+            if new_summary is None:
+                self.failed += 1
+                return stored
+
+            if not await db.store_session_summary(
+                session_id,
+                tenant_id,
+                new_summary,
+                datetime.fromisoformat(fold[-1]["created_at"]),
+                previous_through=datetime.fromisoformat(summary["created_at"]) if summary else None,
+            ):
+                # Another process summarized first; the next turn re-checks.
+                self.conflicts += 1
+                return stored
+            stored = True
+            self.updated += 1
+            logger.info(
+                "Folded %d messages into the summary for session %s", len(fold), session_id
+            )
+            if caught_up:
+                return True
+
+    async def stop(self) -> None:
+        """Cancel in-flight updates; they are re-attempted after the next turn."""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        self._rerun.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": sum(1 for task in self._tasks.values() if not task.done()),
+            "scheduled": self.scheduled,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "conflicts": self.conflicts,
+            "failed": self.failed,
+        }
+
+
+session_summarizer = SessionSummarizer()
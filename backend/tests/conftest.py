@@ -87,3 +87,63 @@ def _reset_db_service_singleton():
     yield
     db_module.db_service = None
     reset_session_factory()
+
+
+@pytest.fixture(autouse=True)
+def _reset_query_transform_cache():
+    """Keep cached query transformations from leaking between tests."""
+    from services.query_service import _transform_cache
+
+    _transform_cache.clear()
+    yield
+    _transform_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_chat_singleflight():
+    """Keep in-flight chat registrations and counters from leaking between tests."""
+    from services.chat_service import _chat_singleflight
+
+    _chat_singleflight.clear()
+    yield
+    _chat_singleflight.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_chat_turn_writer():
+    """Drop buffered chat turns and restart the flush loop per test."""
+    from services.chat_turn_writer import chat_turn_writer
+
+    chat_turn_writer.clear()
+    yield
+    chat_turn_writer.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_session_summarizer():
+    """Cancel background summary updates left over from a previous test."""
+    from services.session_summary_service import session_summarizer
+
+    session_summarizer.clear()
+    yield
+    session_summarizer.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_query_embedding_hedger():
+    """Drop latency samples, hedge budget and counters between tests."""
+    from services.providers.hedging import query_embedding_hedger
+
+    query_embedding_hedger.clear()
+    yield
+    query_embedding_hedger.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_provider_http_clients():
+    """Give each test fresh shared provider HTTP clients (they bind to a loop)."""
+    from services.providers.transport import reset_http_clients
+
+    reset_http_clients()
+    yield
+    reset_http_clients()
@@ -563,7 +563,7 @@ async def test_cross_tenant_chat_returns_404():
 
     doc_id = UUID("00000000-0000-0000-0000-000000000001")
 
-    with patch("routes.chat.db.get_document", new=AsyncMock(return_value=None)):
+    with patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=None)):
         with pytest.raises(HTTPException) as exc:
             await chat(
                 make_test_request("POST", "/chat"),
@@ -25,14 +25,11 @@ async def test_chat_route_stores_history_on_success():
         id = "test-session"
         tenant_id = None
 
+    preflight = db.ChatPreflight(session=MockSession(), document_status="completed", history=[])
     with patch(
         "routes.chat.answer_question_for_document", new=AsyncMock(return_value=payload)
     ), patch(
-        "routes.chat.get_or_create_session", new=AsyncMock(return_value=MockSession())
-    ), patch(
-        "routes.chat.register_session_document", new=AsyncMock()
-    ), patch(
-        "routes.chat.db.get_document", new=AsyncMock(return_value={"id": _DOC_ID_1})
+        "routes.chat.db.chat_preflight", new=AsyncMock(return_value=preflight)
     ):
         result = await chat(
             make_test_request("POST", "/chat"),
@@ -141,9 +138,30 @@ async def test_stream_finalization_persistence():
             session_id=session_id,
             tenant_id="dev",
             limit=config.MAX_SESSION_HISTORY_MESSAGES,
+            with_summary=False,
         )
         assert mock_store.await_count == 1
         call_kwargs = mock_store.call_args.kwargs
         assert call_kwargs["question"] == "Stream Q?"
         assert call_kwargs["answer"] == "stream part 1 stream part 2"
         assert call_kwargs["session_id"] == session_id
+
+
+@pytest.mark.asyncio
+async def test_chat_reuses_preflight_session_documents_for_scope():
+    """Scope resolution must not reload the session the preflight already loaded."""
+    from services.chat_service import _resolve_retrieval_doc_ids
+
+    doc_id = "00000000-0000-0000-0000-000000000001"
+    with patch("services.chat_service.get_session", new=AsyncMock()) as mock_get_session, \
+         patch("services.chat_service.get_tenant_document_ids", new=AsyncMock(return_value={doc_id})):
+        doc_ids = await _resolve_retrieval_doc_ids(
+            scope="session",
+            requested_doc_ids=[doc_id],
+            session_id="s1",
+            tenant_id="dev",
+            session_doc_ids=[doc_id],
+        )
+
+    assert doc_ids == [doc_id]
+    mock_get_session.assert_not_awaited()
@@ -13,11 +13,13 @@ _DOC_ID_2 = "00000000-0000-0000-0000-000000000002"
 
 from core.auth import AuthContext
 from core.session import Session
+from db import ChatPreflight
 from unittest.mock import ANY
 
 _FAKE_DOC = {"id": _DOC_ID_1, "file_name": "test.pdf", "status": "completed"}
 _FAKE_DOC_2 = {"id": _DOC_ID_2, "file_name": "test2.pdf", "status": "completed"}
 _FAKE_SESSION = Session(id="mock-session-id", tenant_id="dev")
+_FAKE_PREFLIGHT = ChatPreflight(session=_FAKE_SESSION, document_status="completed", history=[])
 
 
 def test_chat_route_delegates_to_chat_service():
@@ -25,9 +27,7 @@ def test_chat_route_delegates_to_chat_service():
 
     with (
         patch("routes.chat.answer_question_for_document", new=AsyncMock(return_value=payload)) as mock_chat,
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value=_FAKE_DOC)),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         result = asyncio.run(
             chat(
@@ -45,6 +45,8 @@ def test_chat_route_delegates_to_chat_service():
         auth=ANY,
         session_id=ANY,
         scope="session",
+        history=[],
+        session_doc_ids=[],
         debug_retrieval=False,
     )
 
@@ -153,6 +155,27 @@ def test_chat_batch_route_returns_422_for_value_error():
             assert exc.detail["code"] == "invalid_batch_request"
 
 
+def test_chat_route_returns_409_for_document_still_processing():
+    preflight = ChatPreflight(session=_FAKE_SESSION, document_status="embedding", history=[])
+
+    with (
+        patch("routes.chat.answer_question_for_document", new=AsyncMock()) as mock_chat,
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=preflight)),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(
+                chat(
+                    make_test_request("POST", "/chat"),
+                    ChatRequest(question="q", doc_id=_DOC_ID_1),
+                    auth=AuthContext(tenant_id="dev"),
+                )
+            )
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail["status"] == "embedding"
+    mock_chat.assert_not_awaited()
+
+
 def test_chat_route_rejects_invalid_scope():
     with pytest.raises(ValidationError, match="scope"):
         ChatRequest(question="q", doc_id=_DOC_ID_1, scope="global")  # type: ignore[arg-type]
@@ -180,9 +203,7 @@ async def test_chat_stream_route_enabled():
     with (
         patch("routes.chat.config") as mock_config,
         patch("routes.chat.answer_question_stream_for_document", new=mock_stream) as mock_answer,
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value=_FAKE_DOC)),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         mock_config.ENABLE_STREAMING = True
         response = await chat_stream(
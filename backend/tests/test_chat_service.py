@@ -19,6 +19,33 @@ def _mock_transform_result(question: str) -> QueryTransformResult:
     return QueryTransformResult(queries=[question], original_query=question)
 
 
+def _multi_search(per_query=None, *, return_value=None) -> AsyncMock:
+    """find_similar_chunks_multi stand-in built from a per-query search."""
+
+    async def fake(doc_id, query_embeddings, match_count, **kwargs):
+        results = []
+        for query_embedding in query_embeddings:
+            if per_query is None:
+                results.append(list(return_value or []))
+                continue
+            chunks = per_query(doc_id, query_embedding, match_count)
+            if asyncio.iscoroutine(chunks):
+                chunks = await chunks
+            results.append(chunks)
+        return results
+
+    return AsyncMock(side_effect=fake)
+
+
+def _scope_retrieval(chunks: list) -> AsyncMock:
+    """_retrieve_chunks_for_scope stand-in returning ``chunks`` for every query."""
+
+    async def fake(doc_ids, query_embeddings, *args, **kwargs):
+        return [list(chunks) for _ in query_embeddings]
+
+    return AsyncMock(side_effect=fake)
+
+
 def _parse_sse_event(raw: str) -> tuple[str, object]:
     lines = raw.strip().split("\n")
     event = lines[0].split(": ", 1)[1]
@@ -207,8 +234,8 @@ async def test_answer_questions_for_documents_batch_processes_queries():
         "services.chat_service.get_embeddings",
         new=AsyncMock(return_value=[[0.1, 0.2], [0.3, 0.4]]),
     ) as mock_embeddings, patch(
-        "services.chat_service.find_similar_chunks",
-        new=AsyncMock(side_effect=fake_find_similar_chunks),
+        "services.chat_service.find_similar_chunks_multi",
+        new=_multi_search(fake_find_similar_chunks),
     ) as mock_find, patch(
         "services.chat_service.build_context_from_chunks",
         side_effect=lambda chunks, session_context=None: "|".join([c.chunk_text for c in chunks]),
@@ -262,8 +289,8 @@ async def test_answer_questions_for_documents_batch_respects_retrieval_concurren
         "services.chat_service.get_embeddings",
         new=AsyncMock(return_value=[[0.1], [0.2], [0.3]]),
     ), patch(
-        "services.chat_service.find_similar_chunks",
-        new=AsyncMock(side_effect=fake_find_similar_chunks),
+        "services.chat_service.find_similar_chunks_multi",
+        new=_multi_search(fake_find_similar_chunks),
     ), patch(
         "services.chat_service.build_context_from_chunks",
         return_value="ctx",
@@ -293,9 +320,9 @@ async def test_answer_questions_for_documents_batch_returns_partial_failures():
         "services.chat_service.get_embeddings",
         new=AsyncMock(return_value=[[0.1], [0.2]]),
     ), patch(
-        "services.chat_service.find_similar_chunks",
-        new=AsyncMock(
-            side_effect=lambda doc_id, query_embedding, match_count, **kwargs: [
+        "services.chat_service.find_similar_chunks_multi",
+        new=_multi_search(
+            lambda doc_id, query_embedding, match_count: [
                 _FakeChunk(id="c1", chunk_text="ctx", document_id=doc_id, chunk_index=0)
             ]
         ),
@@ -316,6 +343,98 @@ async def test_answer_questions_for_documents_batch_returns_partial_failures():
     assert "LLM timeout" not in result[1]["error"]["message"]
 
 
+@pytest.mark.asyncio
+async def test_batch_dedupes_identical_items_and_shares_scope_retrieval():
+    queries = [
+        {"question": "Q1", "doc_ids": ["doc-a", "doc-b"]},
+        {"question": "Q2", "doc_ids": ["doc-a", "doc-b"]},
+        {"question": "Q1", "doc_ids": ["doc-a", "doc-b"]},
+    ]
+
+    async def fake_embed(texts):
+        return [[float(i)] for i, _ in enumerate(texts)]
+
+    mock_find = _multi_search(
+        lambda doc_id, query_embedding, match_count: [
+            _FakeChunk(
+                id=f"{doc_id}-{query_embedding[0]}",
+                chunk_text="ctx",
+                document_id=doc_id,
+                chunk_index=int(query_embedding[0]),
+            )
+        ]
+    )
+    with patch(
+        "services.chat_service.get_embeddings", new=AsyncMock(side_effect=fake_embed)
+    ) as mock_embeddings, patch(
+        "services.chat_service.find_similar_chunks_multi", new=mock_find
+    ), patch(
+        "services.chat_service.build_context_from_chunks", return_value="ctx"
+    ), patch(
+        "services.chat_service.generate_answer",
+        new=AsyncMock(side_effect=lambda question, context: (f"answer:{question}", 5, "m")),
+    ) as mock_answer:
+        result = await answer_questions_for_documents_batch(queries, auth=TEST_AUTH)
+
+    assert [item["answer"] for item in result] == ["answer:Q1", "answer:Q2", "answer:Q1"]
+    assert result[0] == result[2] and result[0] is not result[2]
+    assert [item["chunks"] for item in result] == [2, 2, 2]
+    mock_embeddings.assert_awaited_once_with(["Q1", "Q2"])
+    assert mock_answer.await_count == 2
+    # One multi-query pass per document, carrying both distinct questions.
+    assert mock_find.await_count == 2
+    assert all(
+        call.kwargs["query_texts"] == ["Q1", "Q2"] for call in mock_find.await_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_merges_identical_items_in_new_sessions():
+    queries = [
+        {"question": "Q1", "doc_ids": ["doc-a", "doc-b"], "session_id": "s1", "new_session": True},
+        {"question": "Q1", "doc_ids": ["doc-a", "doc-b"], "session_id": "s2", "new_session": True},
+        {"question": "Q1", "doc_ids": ["doc-a", "doc-b"], "session_id": "old"},
+    ]
+
+    async def fake_embed(texts):
+        return [[0.0] for _ in texts]
+
+    mock_find = _multi_search(
+        lambda doc_id, query_embedding, match_count: [
+            _FakeChunk(id=f"{doc_id}-0", chunk_text="ctx", document_id=doc_id, chunk_index=0)
+        ]
+    )
+    mock_history = AsyncMock(return_value=[])
+    mock_store = AsyncMock()
+    with patch(
+        "services.chat_service.get_embeddings", new=AsyncMock(side_effect=fake_embed)
+    ), patch(
+        "services.chat_service.find_similar_chunks_multi", new=mock_find
+    ), patch(
+        "services.chat_service.build_context_from_chunks", return_value="ctx"
+    ), patch(
+        "db.get_session_history", new=mock_history
+    ), patch(
+        "services.chat_turn_writer.chat_turn_writer.store_turn", new=mock_store
+    ), patch(
+        "services.chat_service.generate_answer",
+        new=AsyncMock(return_value=("answer", 5, "m")),
+    ) as mock_answer:
+        result = await answer_questions_for_documents_batch(queries, auth=TEST_AUTH)
+
+    # The two new sessions share one answer; the existing session is answered
+    # on its own history.
+    assert mock_answer.await_count == 2
+    mock_history.assert_awaited_once()
+    assert mock_history.await_args.kwargs["session_id"] == "old"
+    assert [item["session_id"] for item in result] == ["s1", "s2", "old"]
+    assert sorted(call.kwargs["session_id"] for call in mock_store.await_args_list) == [
+        "old",
+        "s1",
+        "s2",
+    ]
+
+
 @pytest.mark.asyncio
 async def test_answer_questions_for_documents_batch_rejects_duplicate_doc_ids():
     queries = [
@@ -430,7 +549,7 @@ async def test_batch_answer_includes_sources_in_ok_responses():
     with patch(
         "services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])
     ), patch(
-        "services.chat_service.find_similar_chunks", new=AsyncMock(return_value=chunks)
+        "services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=chunks)
     ), patch(
         "services.chat_service.build_context_from_chunks", return_value="ctx"
     ), patch(
@@ -453,7 +572,7 @@ async def test_batch_soft_llm_error_uses_same_error_codes_as_single_chat():
 
     with patch(
         "services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])
-    ), patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])), patch(
+    ), patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])), patch(
         "services.chat_service.build_context_from_chunks", return_value="ctx"
     ), patch(
         "services.chat_service.generate_answer",
@@ -510,6 +629,125 @@ async def test_answer_question_stream_for_document_success():
 
         assert chunks[3] == "event: done\ndata: [DONE]\n\n"
 
+@pytest.mark.asyncio
+async def test_identical_concurrent_chats_share_one_pipeline_run():
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def slow_generate(question, context):
+        started.set()
+        await release.wait()
+        return ("shared answer", 12, "m")
+
+    mock_generate = AsyncMock(side_effect=slow_generate)
+    with (
+        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
+        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
+        patch("services.chat_service.generate_answer", new=mock_generate),
+        patch("db.get_session_history", new=AsyncMock(return_value=[])),
+        patch("db.store_chat_turn", new=AsyncMock()) as mock_store,
+    ):
+        leader = asyncio.create_task(
+            answer_question_for_document("What is X?", "doc-1", session_id="s1", auth=TEST_AUTH)
+        )
+        await started.wait()
+        follower = asyncio.create_task(
+            answer_question_for_document("what is  x?", "doc-1", session_id="s2", auth=TEST_AUTH)
+        )
+        await asyncio.sleep(0)
+        release.set()
+        first, second = await asyncio.gather(leader, follower)
+
+    assert mock_generate.await_count == 1
+    assert first["answer"] == second["answer"] == "shared answer"
+    assert (first["session_id"], second["session_id"]) == ("s1", "s2")
+    assert second["question"] == "what is  x?"
+    stored_sessions = sorted(c.kwargs["session_id"] for c in mock_store.await_args_list)
+    assert stored_sessions == ["s1", "s2"]
+    assert chat_service_mod.chat_singleflight_stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_follower_ignores_results_from_an_earlier_lock_holder(monkeypatch):
+    monkeypatch.setattr(chat_service_mod.config, "CHAT_SINGLEFLIGHT_REDIS_ENABLED", True)
+    monkeypatch.setattr(chat_service_mod, "_SINGLEFLIGHT_REDIS_POLL_SECONDS", 0)
+    prefix = chat_service_mod.CHAT_SINGLEFLIGHT_REDIS_PREFIX
+    store = {
+        f"{prefix}:lock:k": "holder-2",
+        f"{prefix}:result:k:holder-1": json.dumps({"answer": "stale"}),
+    }
+    polls = 0
+
+    async def fake_get(key):
+        nonlocal polls
+        if key == f"{prefix}:lock:k":
+            polls += 1
+            if polls == 3:  # the current holder publishes while we wait
+                store[f"{prefix}:result:k:holder-2"] = json.dumps({"answer": "fresh"})
+        return store.get(key)
+
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=None)  # lock already held
+    redis.get = AsyncMock(side_effect=fake_get)
+    fn = AsyncMock(return_value={"answer": "local"})
+    with patch("core.clients.redis_client", redis):
+        result = await chat_service_mod._chat_singleflight.do("k", fn)
+
+    assert result == {"answer": "fresh"}
+    fn.assert_not_awaited()
+    assert chat_service_mod.chat_singleflight_stats()["redis_coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_streams_attach_to_leader_tokens():
+    second_token = asyncio.Event()
+    calls = 0
+
+    async def gated_stream(q, c):
+        nonlocal calls
+        calls += 1
+        yield "part1 "
+        await second_token.wait()
+        yield "part2"
+
+    mock_provider = MagicMock()
+    mock_provider.model_name = "test-stream-model"
+
+    async def collect(session_id: str) -> list[str]:
+        return [
+            chunk
+            async for chunk in chat_service_mod.answer_question_stream_for_document(
+                "q", "doc-1", session_id=session_id, history=[], auth=TEST_AUTH
+            )
+        ]
+
+    with (
+        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
+        patch("services.chat_service._retrieve_chunks_for_documents", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
+        patch("services.chat_service.generate_answer_stream", new=gated_stream),
+        patch("services.providers.get_llm_provider", return_value=mock_provider),
+        patch("db.store_chat_turn", new=AsyncMock()) as mock_store,
+    ):
+        leader = asyncio.create_task(collect("s1"))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        # Joins after the first token was produced and must replay it.
+        follower = asyncio.create_task(collect("s2"))
+        await asyncio.sleep(0)
+        second_token.set()
+        leader_events, follower_events = await asyncio.gather(leader, follower)
+
+    assert calls == 1
+    for events, session_id in ((leader_events, "s1"), (follower_events, "s2")):
+        assert events[:2] == ['event: token\ndata: "part1 "\n\n', 'event: token\ndata: "part2"\n\n']
+        _, complete = _parse_sse_event(events[2])
+        assert complete["session_id"] == session_id
+        assert complete["model"] == "test-stream-model"
+    assert mock_store.await_count == 2
+
+
 @pytest.mark.asyncio
 async def test_stream_history_loaded_and_bounded_before_transform():
     """Streaming path must pass a bounded history slice to transform_query."""
@@ -785,7 +1023,7 @@ async def test_batch_includes_latency_and_model_per_query():
     with patch(
         "services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1], [0.2]])
     ), patch(
-        "services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])
+        "services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])
     ), patch(
         "services.chat_service.build_context_from_chunks", return_value="ctx"
     ), patch(
@@ -1021,7 +1259,7 @@ async def test_batch_history_bounded_to_window():
     with (
         patch("services.chat_service.config.QUERY_TRANSFORMATION_HISTORY_WINDOW", window),
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1], [0.2]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 0, "m"))),
         patch("db.get_session_history", new=AsyncMock(return_value=full_history)),
@@ -1052,7 +1290,7 @@ async def test_batch_no_history_for_queries_without_session_id():
 
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 0, "m"))),
         patch("services.chat_service.transform_query", new=fake_transform),
@@ -1070,7 +1308,7 @@ async def test_batch_history_tenant_isolation():
     """Each batch query's history load must use the tenant_id from the AuthContext."""
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 0, "m"))),
         patch("db.get_session_history", new=AsyncMock(return_value=[])) as mock_hist,
@@ -1120,8 +1358,8 @@ async def test_compare_batch_ignores_polluted_session_history_in_llm_context():
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
         patch(
-            "services.chat_service._retrieve_chunks_for_documents",
-            new=AsyncMock(return_value=sales_chunks),
+            "services.chat_service._retrieve_chunks_for_scope",
+            new=_scope_retrieval(sales_chunks),
         ),
         patch(
             "services.chat_service.generate_answer",
@@ -1172,8 +1410,8 @@ async def test_synthesize_batch_still_injects_session_history_into_llm_context()
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
         patch(
-            "services.chat_service._retrieve_chunks_for_documents",
-            new=AsyncMock(return_value=chunks),
+            "services.chat_service._retrieve_chunks_for_scope",
+            new=_scope_retrieval(chunks),
         ),
         patch(
             "services.chat_service.generate_answer",
@@ -1383,7 +1621,7 @@ async def test_stream_complete_includes_retrieval_debug_when_opted_in():
 async def test_batch_result_omits_retrieval_debug_by_default():
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1], [0.2]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 0, "m"))),
         patch(
@@ -1415,7 +1653,7 @@ async def test_batch_result_includes_retrieval_debug_when_opted_in():
 
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1], [0.2]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 0, "m"))),
         patch(
@@ -1444,7 +1682,7 @@ async def test_batch_soft_error_includes_retrieval_debug_when_opted_in():
 
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1], [0.2]])),
-        patch("services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])),
+        patch("services.chat_service.find_similar_chunks_multi", new=_multi_search(return_value=[])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch(
             "services.chat_service.generate_answer",
@@ -1511,3 +1749,112 @@ async def test_single_chat_still_uses_session_history_with_polluted_context():
     assert "[Session History]" in captured_contexts[0]
     assert "Earlier handbook answer about PTO." in captured_contexts[0]
     assert mock_store.await_count == 1
+
+
+@pytest.fixture
+def _speculative_retrieval(monkeypatch):
+    monkeypatch.setattr("services.chat_service.config.QUERY_TRANSFORMATION_ENABLED", True)
+    monkeypatch.setattr(
+        "services.chat_service.config.QUERY_SPECULATIVE_RETRIEVAL_ENABLED", True
+    )
+    monkeypatch.setattr(
+        "services.chat_service.config.QUERY_SPECULATIVE_SIMILARITY_THRESHOLD", 0.9
+    )
+
+
+@pytest.mark.asyncio
+async def test_speculative_retrieval_runs_while_transform_is_pending(_speculative_retrieval):
+    retrieval_started = asyncio.Event()
+    raw_chunk = _FakeChunk(id="c1", chunk_text="raw", document_id="doc-1", chunk_index=0)
+
+    async def fake_retrieve(**kwargs):
+        retrieval_started.set()
+        return [raw_chunk]
+
+    async def fake_transform(question, history=None):
+        # Would deadlock if retrieval only started after the transform returned.
+        await asyncio.wait_for(retrieval_started.wait(), timeout=1)
+        return _mock_transform_result(question)
+
+    mock_embed = AsyncMock(return_value=[[1.0, 0.0]])
+    with (
+        patch("services.chat_service.transform_query", new=fake_transform),
+        patch("services.chat_service.get_embeddings", new=mock_embed),
+        patch(
+            "services.chat_service._retrieve_chunks_for_documents",
+            new=AsyncMock(side_effect=fake_retrieve),
+        ) as mock_retrieve,
+    ):
+        _, chunks = await chat_service_mod._transform_and_retrieve(
+            "q", None, doc_ids=["doc-1"], match_count=5, tenant_id="dev"
+        )
+
+    assert chunks == [raw_chunk]
+    mock_embed.assert_awaited_once_with(["q"])
+    assert mock_retrieve.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_speculative_result_reused_only_for_similar_transformed_queries(
+    _speculative_retrieval,
+):
+    raw_chunk = _FakeChunk(id="c1", chunk_text="raw", document_id="doc-1", chunk_index=0)
+    far_chunk = _FakeChunk(id="c2", chunk_text="far", document_id="doc-1", chunk_index=7)
+    embeddings = {"q": [1.0, 0.0], "q rephrased": [0.99, 0.05], "broader topic": [0.0, 1.0]}
+
+    async def fake_embed(texts):
+        return [embeddings[t] for t in texts]
+
+    async def fake_retrieve(*, query_embedding, **kwargs):
+        return [raw_chunk] if query_embedding == embeddings["q"] else [far_chunk]
+
+    transform = QueryTransformResult(
+        queries=["q rephrased", "broader topic"], original_query="q"
+    )
+    with (
+        patch("services.chat_service.transform_query", new=AsyncMock(return_value=transform)),
+        patch("services.chat_service.get_embeddings", new=AsyncMock(side_effect=fake_embed)),
+        patch(
+            "services.chat_service._retrieve_chunks_for_documents",
+            new=AsyncMock(side_effect=fake_retrieve),
+        ) as mock_retrieve,
+    ):
+        _, chunks = await chat_service_mod._transform_and_retrieve(
+            "q", None, doc_ids=["doc-1"], match_count=5, tenant_id="dev"
+        )
+
+    assert chunks == [raw_chunk, far_chunk]
+    retrieved_with = [c.kwargs["query_embedding"] for c in mock_retrieve.await_args_list]
+    assert retrieved_with == [embeddings["q"], embeddings["broader topic"]]
+
+
+@pytest.mark.asyncio
+async def test_raw_question_among_transformed_queries_is_not_embedded_again(
+    _speculative_retrieval,
+):
+    raw_chunk = _FakeChunk(id="c1", chunk_text="raw", document_id="doc-1", chunk_index=0)
+    far_chunk = _FakeChunk(id="c2", chunk_text="far", document_id="doc-1", chunk_index=7)
+    embeddings = {"q": [1.0, 0.0], "broader topic": [0.0, 1.0]}
+
+    async def fake_embed(texts):
+        return [embeddings[t] for t in texts]
+
+    async def fake_retrieve(*, query_embedding, **kwargs):
+        return [raw_chunk] if query_embedding == embeddings["q"] else [far_chunk]
+
+    transform = QueryTransformResult(queries=["q", "broader topic"], original_query="q")
+    mock_embed = AsyncMock(side_effect=fake_embed)
+    with (
+        patch("services.chat_service.transform_query", new=AsyncMock(return_value=transform)),
+        patch("services.chat_service.get_embeddings", new=mock_embed),
+        patch(
+            "services.chat_service._retrieve_chunks_for_documents",
+            new=AsyncMock(side_effect=fake_retrieve),
+        ),
+    ):
+        _, chunks = await chat_service_mod._transform_and_retrieve(
+            "q", None, doc_ids=["doc-1"], match_count=5, tenant_id="dev"
+        )
+
+    assert chunks == [raw_chunk, far_chunk]
+    assert [c.args[0] for c in mock_embed.await_args_list] == [["q"], ["broader topic"]]
@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.chat_turn_writer import chat_turn_writer
+
+
+@pytest.fixture
+def _write_behind(monkeypatch):
+    monkeypatch.setattr("services.chat_turn_writer.config.CHAT_TURN_WRITE_BEHIND_ENABLED", True)
+    monkeypatch.setattr("services.chat_turn_writer.config.CHAT_TURN_WRITE_BEHIND_INTERVAL_MS", 10)
+    monkeypatch.setattr("services.chat_turn_writer.config.CHAT_TURN_WRITE_BEHIND_BATCH_SIZE", 100)
+
+
+@pytest.mark.asyncio
+async def test_disabled_writer_stores_turn_synchronously():
+    with patch("db.store_chat_turn", new=AsyncMock()) as mock_store:
+        await chat_turn_writer.store_turn("s1", "q", "a", "dev")
+
+    mock_store.assert_awaited_once_with(session_id="s1", question="q", answer="a", tenant_id="dev")
+
+
+@pytest.mark.asyncio
+async def test_turns_from_many_requests_flush_in_one_insert(_write_behind):
+    with (
+        patch("db.store_chat_turns", new=AsyncMock()) as mock_store_many,
+        patch("db.store_chat_turn", new=AsyncMock()) as mock_store_one,
+    ):
+        await asyncio.gather(
+            chat_turn_writer.store_turn("s1", "q1", "a1", "dev"),
+            chat_turn_writer.store_turn("s2", "q2", "a2", "dev"),
+            chat_turn_writer.store_turn("s1", "q3", "a3", "dev"),
+        )
+        mock_store_many.assert_not_awaited()
+        await asyncio.sleep(0.05)
+
+    mock_store_one.assert_not_awaited()
+    mock_store_many.assert_awaited_once()
+    [turns] = mock_store_many.await_args.args
+    assert [(t.session_id, t.question) for t in turns] == [("s1", "q1"), ("s2", "q2"), ("s1", "q3")]
+    assert chat_turn_writer.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_turns_are_visible_to_the_same_session(_write_behind):
+    committed = [{"id": "m0", "role": "user", "content": "old", "created_at": None}]
+    with patch("db.store_chat_turns", new=AsyncMock()):
+        await chat_turn_writer.store_turn("s1", "new q", "new a", "dev")
+        await chat_turn_writer.store_turn("s2", "other", "other", "dev")
+
+        merged = chat_turn_writer.merge_history("s1", "dev", committed, limit=20)
+        assert [m["content"] for m in merged] == ["old", "new q", "new a"]
+        assert chat_turn_writer.merge_history("s1", "other-tenant", committed, limit=20) == committed
+
+        # Once the insert is visible in history the buffered copy is not repeated.
+        merged_again = chat_turn_writer.merge_history("s1", "dev", merged, limit=20)
+        assert merged_again == merged
+        assert chat_turn_writer.merge_history("s1", "dev", committed, limit=2)[0]["content"] == "new q"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_turns_individually(_write_behind):
+    calls: list[int] = []
+
+    async def flaky_store(turns):
+        calls.append(len(turns))
+        if len(turns) > 1 or turns[0].session_id == "gone":
+            raise RuntimeError("insert failed")
+
+    with patch("db.store_chat_turns", new=AsyncMock(side_effect=flaky_store)):
+        await chat_turn_writer.store_turn("s1", "q1", "a1", "dev")
+        await chat_turn_writer.store_turn("gone", "q2", "a2", "dev")
+        await chat_turn_writer.flush()
+
+    assert calls == [2, 1, 1]
+    stats = chat_turn_writer.stats()
+    assert (stats["flushed"], stats["failed"], stats["pending"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_buffered_turns(_write_behind, monkeypatch):
+    monkeypatch.setattr("services.chat_turn_writer.config.CHAT_TURN_WRITE_BEHIND_INTERVAL_MS", 60_000)
+    with patch("db.store_chat_turns", new=AsyncMock()) as mock_store_many:
+        await chat_turn_writer.store_turn("s1", "q", "a", "dev")
+        await chat_turn_writer.stop()
+
+    mock_store_many.assert_awaited_once()
+    assert chat_turn_writer.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_deleted_session_turns_are_not_written(_write_behind, monkeypatch):
+    monkeypatch.setattr("services.chat_turn_writer.config.CHAT_TURN_WRITE_BEHIND_INTERVAL_MS", 60_000)
+    with patch("db.store_chat_turns", new=AsyncMock()) as mock_store_many:
+        await chat_turn_writer.store_turn("s1", "q", "a", "dev")
+        await chat_turn_writer.discard_session("s1")
+        await chat_turn_writer.stop()
+
+    mock_store_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_discard_session_waits_for_its_in_flight_insert(_write_behind):
+    release = asyncio.Event()
+    writing = asyncio.Event()
+
+    async def slow_store(turns):
+        writing.set()
+        await release.wait()
+
+    with patch("db.store_chat_turns", new=AsyncMock(side_effect=slow_store)):
+        await chat_turn_writer.store_turn("s1", "q", "a", "dev")
+        await asyncio.wait_for(writing.wait(), timeout=1)
+
+        discard = asyncio.create_task(chat_turn_writer.discard_session("s1", "dev"))
+        await asyncio.sleep(0.02)
+        # The insert is already running, so the delete must wait for it.
+        assert not discard.done()
+
+        release.set()
+        await asyncio.wait_for(discard, timeout=1)
+        assert chat_turn_writer.stats()["pending"] == 0
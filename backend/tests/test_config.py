@@ -24,3 +24,17 @@ def test_get_embedding_dim_missing_uses_provider(monkeypatch):
     with patch("services.providers.get_embedding_provider") as mock_get:
         mock_get.return_value.embedding_dim = 768
         assert get_embedding_dim() == 768
+
+def test_tenant_weights_and_priorities_parse(monkeypatch):
+    from core.config import _get_tenant_priorities, _get_tenant_weights
+    monkeypatch.setenv("QUEUE_TENANT_WEIGHTS", "acme=4, trial=1")
+    monkeypatch.setenv("QUEUE_TENANT_PRIORITIES", "acme=HIGH,backfill=low")
+    assert _get_tenant_weights() == {"acme": 4, "trial": 1}
+    assert _get_tenant_priorities() == {"acme": "high", "backfill": "low"}
+
+def test_tenant_priorities_reject_unknown_class(monkeypatch):
+    from core.config import _get_tenant_priorities
+    monkeypatch.setenv("QUEUE_TENANT_PRIORITIES", "acme=urgent")
+    with pytest.raises(ValueError) as exc:
+        _get_tenant_priorities()
+    assert "high, normal, low" in str(exc.value)
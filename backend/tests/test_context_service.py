@@ -6,12 +6,15 @@ Covers:
 - Normal concatenation + source labelling
 - Truncation at MAX_CONTEXT_CHARS (whole-chunk boundary, no mid-string slicing)
 """
+from dataclasses import replace
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from core.session import SessionContext
+from db.base import ChunkMatch
 from services.context_service import build_context_from_chunks
 
 
@@ -142,3 +145,128 @@ def test_session_context_truncates_chunks():
     # The session context is ~200 chars. We only have ~300 chars left for chunks.
     # Each chunk is ~200 chars + formatting, so only 1 chunk should fit.
     assert result.count("[Source:") == 1
+
+
+# ---------------------------------------------------------------------------
+# Span merging and token budget
+# ---------------------------------------------------------------------------
+
+def _indexed_chunk(
+    text: str,
+    chunk_index: int,
+    start: int,
+    *,
+    document_id: str = "d1",
+    similarity: float = 0.5,
+    page_number: int | None = None,
+):
+    return SimpleNamespace(
+        chunk_text=text,
+        file_name="doc.pdf",
+        page_number=page_number,
+        document_id=document_id,
+        chunk_index=chunk_index,
+        character_offset_start=start,
+        character_offset_end=start + len(text),
+        similarity=similarity,
+    )
+
+
+def test_adjacent_chunks_merge_without_duplicated_overlap():
+    document = "The quick brown fox jumps over the lazy dog near the river bank."
+    first = _indexed_chunk(document[0:30], 0, 0, page_number=1)
+    second = _indexed_chunk(document[20:50], 1, 20, page_number=2)
+    third = _indexed_chunk(document[40:], 2, 40, page_number=2)
+
+    result = build_context_from_chunks([second, third, first])
+
+    assert result == f"[Source: doc.pdf, pages 1-2]\n{document}"
+
+
+def test_non_adjacent_and_other_document_chunks_stay_separate():
+    chunks = [
+        _indexed_chunk("alpha", 0, 0),
+        _indexed_chunk("gamma", 2, 100),
+        _indexed_chunk("beta", 1, 0, document_id="d2"),
+    ]
+    result = build_context_from_chunks(chunks)
+    assert result.count("[Source:") == 3
+    assert result.index("alpha") < result.index("gamma") < result.index("beta")
+
+
+def test_chunk_retrieved_twice_is_emitted_once():
+    chunk = _indexed_chunk("repeated text", 4, 0)
+    result = build_context_from_chunks([chunk, chunk])
+    assert result.count("repeated text") == 1
+
+
+def test_token_budget_follows_model_context_window(monkeypatch):
+    from services.context_service import context_token_budget
+
+    monkeypatch.setattr("services.context_service.config.MAX_CONTEXT_TOKENS", 100_000)
+    monkeypatch.setattr("services.context_service.config.LLM_MAX_OUTPUT_TOKENS", 1024)
+    monkeypatch.setattr("services.context_service.config.CONTEXT_PROMPT_RESERVE_TOKENS", 1024)
+
+    assert context_token_budget("llama3") == 8_192 - 2048
+    assert context_token_budget("gpt-4o-mini") == 100_000
+
+
+def test_token_budget_fits_smallest_window_in_failover_chain(monkeypatch):
+    from services.context_service import context_token_budget
+
+    monkeypatch.setattr("services.context_service.config.MAX_CONTEXT_TOKENS", 100_000)
+    monkeypatch.setattr("services.context_service.config.LLM_MAX_OUTPUT_TOKENS", 1024)
+    monkeypatch.setattr("services.context_service.config.CONTEXT_PROMPT_RESERVE_TOKENS", 1024)
+    monkeypatch.setattr("services.context_service.config.LLM_PROVIDER", "openai")
+    monkeypatch.setattr("services.context_service.config.LLM_MODEL", "gpt-4o")
+    monkeypatch.setattr("services.context_service.config.LLM_FALLBACK_PROVIDERS", [])
+    assert context_token_budget() == 100_000
+
+    # An Ollama fallback on its default model (llama3, 8k) may answer instead.
+    monkeypatch.setattr(
+        "services.context_service.config.LLM_FALLBACK_PROVIDERS",
+        [("anthropic", None), ("ollama", None)],
+    )
+    assert context_token_budget() == 8_192 - 2048
+
+
+def test_packing_prefers_score_density_within_token_budget(monkeypatch):
+    monkeypatch.setattr("services.context_service.config.MAX_CONTEXT_TOKENS", 40)
+    monkeypatch.setattr("services.context_service.config.CONTEXT_CHARS_PER_TOKEN", 4.0)
+    # The long chunk ranks first but carries little score per token.
+    long_chunk = _indexed_chunk("L" * 120, 0, 0, document_id="d1", similarity=0.6)
+    short_a = _indexed_chunk("A" * 40, 0, 0, document_id="d2", similarity=0.5)
+    short_b = _indexed_chunk("B" * 40, 0, 0, document_id="d3", similarity=0.5)
+
+    result = build_context_from_chunks([long_chunk, short_a, short_b])
+
+    assert "L" * 120 not in result
+    assert "A" * 40 in result and "B" * 40 in result
+
+
+def test_best_member_of_chunk_matches_with_embeddings(monkeypatch):
+    monkeypatch.setattr("services.context_service.config.MAX_CONTEXT_TOKENS", 30)
+    monkeypatch.setattr("services.context_service.config.CONTEXT_CHARS_PER_TOKEN", 4.0)
+    document = "x" * 50 + "y" * 60
+
+    def _match(chunk_id, index, start, end, similarity):
+        return ChunkMatch(
+            id=chunk_id,
+            chunk_text=document[start:end],
+            document_id="d1",
+            embedding=np.ones(3, dtype=np.float32),
+            similarity=similarity,
+            chunk_index=index,
+            character_offset_start=start,
+            character_offset_end=end,
+            file_name="doc.pdf",
+        )
+
+    first = _match("c1", 0, 0, 60, 0.5)
+    second = _match("c2", 1, 50, 110, 0.9)
+    assert second == replace(second, embedding=np.zeros(3, dtype=np.float32))
+
+    # The merged span is over budget, so only its top-ranked chunk is kept.
+    result = build_context_from_chunks([second, replace(second), first])
+
+    assert result == f"[Source: doc.pdf]\n{second.chunk_text}"
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from services.embedding_service import get_embedding, get_embeddings
 import services.providers as providers_mod
@@ -28,9 +29,9 @@ async def test_get_embedding_success():
     text = "Hello world"
     embedding = await get_embedding(text)
 
-    assert isinstance(embedding, list)
-    assert len(embedding) == 3072
-    assert all(isinstance(v, float) for v in embedding)
+    assert isinstance(embedding, np.ndarray)
+    assert embedding.dtype == np.float32
+    assert embedding.shape == (3072,)
 
 
 async def test_get_embeddings_batch_success():
@@ -41,9 +42,9 @@ async def test_get_embeddings_batch_success():
     assert len(embeddings) == 2
 
     for emb in embeddings:
-        assert isinstance(emb, list)
-        assert len(emb) == 3072
-        assert all(isinstance(v, float) for v in emb)
+        assert isinstance(emb, np.ndarray)
+        assert emb.dtype == np.float32
+        assert emb.shape == (3072,)
 
 
 async def test_embedding_dimension_consistency():
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from db.base import ChunkMatch
+from services.providers.base import ProviderRateLimitError, ProviderTimeoutError
+from services.providers.fake import (
+    FakeEmbeddingProvider,
+    FakeLLMProvider,
+    reset_fake_randomness,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fast_fakes(monkeypatch):
+    for name in ("FAKE_EMBEDDING_LATENCY_MS", "FAKE_LLM_LATENCY_MS", "FAKE_RERANKER_LATENCY_MS"):
+        monkeypatch.setattr(f"services.providers.fake.config.{name}", 0.0)
+    monkeypatch.setattr("services.providers.fake.config.FAKE_LLM_TOKENS_PER_SEC", 10_000.0)
+    reset_fake_randomness(0)
+
+
+async def test_embeddings_are_deterministic_unit_vectors():
+    provider = FakeEmbeddingProvider(dim=64)
+
+    first, second, other = await provider.embed(["alpha", "alpha", "beta"])
+
+    assert provider.embedding_dim == 64
+    assert first.shape == (64,) and first.dtype == np.float32
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first, other)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    assert np.array_equal((await FakeEmbeddingProvider(dim=64).embed(["alpha"]))[0], first)
+
+
+async def test_generation_is_deterministic_and_streams_tokens(monkeypatch):
+    monkeypatch.setattr("services.providers.fake.config.FAKE_LLM_OUTPUT_TOKENS", 12)
+    provider = FakeLLMProvider()
+    kwargs = {"system_instruction": "s", "temperature": 0.2, "max_output_tokens": 8}
+
+    answer = await provider.generate("CONTEXT: invoices are due monthly", **kwargs)
+    chunks = [c async for c in provider.generate_stream("CONTEXT: invoices are due monthly", **kwargs)]
+
+    assert answer == await provider.generate("CONTEXT: invoices are due monthly", **kwargs)
+    # Capped by max_output_tokens, one chunk per token, same text as generate().
+    assert len(chunks) == 8
+    assert "".join(chunks) == answer
+    assert set(answer.split()) <= {"CONTEXT", "invoices", "are", "due", "monthly"}
+
+
+async def test_fault_injection(monkeypatch):
+    provider = FakeEmbeddingProvider(dim=8)
+
+    monkeypatch.setattr("services.providers.fake.config.FAKE_PROVIDER_RATE_LIMIT_RATE", 1.0)
+    with pytest.raises(ProviderRateLimitError):
+        await provider.embed(["x"])
+
+    monkeypatch.setattr("services.providers.fake.config.FAKE_PROVIDER_RATE_LIMIT_RATE", 0.0)
+    monkeypatch.setattr("services.providers.fake.config.FAKE_PROVIDER_TIMEOUT_RATE", 1.0)
+    monkeypatch.setattr("services.providers.fake.config.EMBEDDING_HTTP_TIMEOUT_SEC", 0.01)
+    with pytest.raises(ProviderTimeoutError):
+        await provider.embed(["x"])
+
+
+async def test_fake_reranker_is_stable_and_respects_top_k(monkeypatch):
+    from services.reranker import _reset_reranker_provider, get_reranker_provider
+    from services.reranker.base import RerankRequest
+    from services.reranker.fake import FakeRerankerProvider
+
+    monkeypatch.setattr("services.reranker.config.ENABLE_RERANKING", True)
+    monkeypatch.setattr("services.reranker.config.RERANKER_PROVIDER", "fake")
+    _reset_reranker_provider()
+    try:
+        provider = get_reranker_provider()
+    finally:
+        _reset_reranker_provider()
+    assert isinstance(provider, FakeRerankerProvider)
+
+    chunks = [
+        ChunkMatch(id=f"c{i}", chunk_text="t", document_id="d")
+        for i in range(5)
+    ]
+    first = await provider.rerank(RerankRequest(query="q", candidates=chunks, top_k=3))
+    second = await provider.rerank(RerankRequest(query="q", candidates=chunks, top_k=3))
+
+    assert first.reranked_order == second.reranked_order
+    assert len(first.candidates) == 3
+    assert [c.rerank_order for c in first.candidates] == [1, 2, 3]
+
+
+def test_factories_build_fake_providers():
+    import services.providers as providers
+
+    assert isinstance(providers.build_embedding_provider("fake"), FakeEmbeddingProvider)
+    assert isinstance(providers.build_llm_provider("fake"), FakeLLMProvider)
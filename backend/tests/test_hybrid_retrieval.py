@@ -156,8 +156,13 @@ async def test_find_keyword_chunks_returns_empty_when_column_missing():
                 Exception('column "content_tsv" does not exist'),
             )
 
-    results = await service._find_keyword_chunks(_FakeSession(), "doc-1", "keyword", 5)
+        async def rollback(self):
+            self.rolled_back = True
+
+    session = _FakeSession()
+    results = await service._find_keyword_chunks(session, "doc-1", "keyword", 5)
     assert results == []
+    assert session.rolled_back
 
 
 @pytest.mark.asyncio
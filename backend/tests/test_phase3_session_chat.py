@@ -481,21 +481,16 @@ async def test_prepare_batch_invalid_later_item_skips_all_setup():
         {"question": "bad", "doc_ids": [missing_doc]},
     ]
 
-    async def fake_get_document(doc_id, tenant_id=tenant_id):
-        if doc_id == good_doc:
-            return {"id": good_doc}
-        return None
-
     with (
-        patch("db.get_document", new=AsyncMock(side_effect=fake_get_document)),
         patch(
-            "services.session_service.get_or_create_session",
-            new=AsyncMock(),
-        ) as mock_create,
+            "db.get_document_statuses",
+            new=AsyncMock(return_value={good_doc: "completed"}),
+        ),
         patch(
-            "services.session_service.register_session_document",
-            new=AsyncMock(),
-        ) as mock_bind,
+            "db.resolve_batch_sessions",
+            new=AsyncMock(return_value=({}, ["new-session"])),
+        ) as mock_sessions,
+        patch("db.add_session_documents", new=AsyncMock()) as mock_bind,
     ):
         service_items, slot_results = await prepare_batch_chat_items(
             raw,
@@ -504,12 +499,80 @@ async def test_prepare_batch_invalid_later_item_skips_all_setup():
         )
 
     assert len(service_items) == 1
+    assert service_items[0][1]["session_id"] == "new-session"
     assert slot_results[1] is not None
     assert slot_results[1]["error"]["code"] == "document_not_found"
-    mock_create.assert_awaited_once()
+    mock_sessions.assert_awaited_once_with(tenant_id, [], 1)
     mock_bind.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_prepare_batch_uses_one_status_query_and_one_binding_upsert():
+    tenant_id = "tenant-batch"
+    doc_a = "00000000-0000-0000-0000-000000000001"
+    doc_b = "00000000-0000-0000-0000-000000000002"
+    doc_pending = "00000000-0000-0000-0000-000000000003"
+    raw = [
+        {"question": "q1", "doc_ids": [doc_a]},
+        {"question": "q2", "doc_ids": [doc_a, doc_b]},
+        {"question": "q3", "doc_ids": [doc_pending]},
+    ]
+    with (
+        patch(
+            "db.get_document_statuses",
+            new=AsyncMock(
+                return_value={doc_a: "completed", doc_b: "completed", doc_pending: "processing"}
+            ),
+        ) as mock_statuses,
+        patch(
+            "db.resolve_batch_sessions",
+            new=AsyncMock(return_value=({"batch-session": "batch-session"}, [])),
+        ) as mock_sessions,
+        patch("db.add_session_documents", new=AsyncMock()) as mock_bind,
+    ):
+        service_items, slot_results = await prepare_batch_chat_items(
+            raw,
+            tenant_id=tenant_id,
+            batch_session_id="batch-session",
+        )
+
+    mock_statuses.assert_awaited_once_with([doc_a, doc_b, doc_pending], tenant_id=tenant_id)
+    mock_sessions.assert_awaited_once_with(tenant_id, ["batch-session", "batch-session"], 0)
+    mock_bind.assert_awaited_once_with(
+        [("batch-session", doc_a), ("batch-session", doc_b)]
+    )
+    assert [index for index, _ in service_items] == [0, 1]
+    assert slot_results[2]["error"]["code"] == "document_not_ready"
+
+
+@pytest.mark.asyncio
+async def test_prepare_batch_resolves_all_sessions_in_one_call():
+    tenant_id = "tenant-batch"
+    doc = "00000000-0000-0000-0000-000000000001"
+    raw = [
+        {"question": "q1", "doc_ids": [doc]},
+        {"question": "q2", "doc_ids": [doc], "session_id": "mine"},
+        {"question": "q3", "doc_ids": [doc]},
+        {"question": "q4", "doc_ids": [doc], "session_id": "theirs"},
+    ]
+
+    with (
+        patch("db.get_document_statuses", new=AsyncMock(return_value={doc: "completed"})),
+        patch(
+            "db.resolve_batch_sessions",
+            new=AsyncMock(return_value=({"mine": "mine", "theirs": "fresh"}, ["n1", "n2"])),
+        ) as mock_sessions,
+        patch("db.add_session_documents", new=AsyncMock()),
+    ):
+        service_items, _ = await prepare_batch_chat_items(
+            raw, tenant_id=tenant_id, batch_session_id=None
+        )
+
+    mock_sessions.assert_awaited_once_with(tenant_id, ["mine", "theirs"], 2)
+    assert [q["session_id"] for _, q in service_items] == ["n1", "mine", "n2", "fresh"]
+    assert [bool(q.get("new_session")) for _, q in service_items] == [True, False, True, True]
+
+
 @pytest.mark.asyncio
 async def test_batch_embedding_failure_returns_structured_errors():
     with (
@@ -539,7 +602,7 @@ async def test_single_document_batch_does_not_persist_history():
     with (
         patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
         patch("services.chat_service._resolve_retrieval_doc_ids", new=AsyncMock(return_value=["doc-1"])),
-        patch("services.chat_service._retrieve_chunks_for_documents", new=AsyncMock(return_value=[])),
+        patch("services.chat_service._retrieve_chunks_for_scope", new=AsyncMock(return_value=[[]])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=AsyncMock(return_value=("ans", 1, "m"))),
         patch(
@@ -585,9 +648,9 @@ async def test_batch_llm_concurrency_bounded(monkeypatch):
     ]
 
     with (
-        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]] * 6)),
+        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
         patch("services.chat_service._resolve_retrieval_doc_ids", new=AsyncMock(return_value=["doc-a", "doc-b"])),
-        patch("services.chat_service._retrieve_chunks_for_documents", new=AsyncMock(return_value=[])),
+        patch("services.chat_service._retrieve_chunks_for_scope", new=AsyncMock(return_value=[[]])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=counting_generate),
         patch(
@@ -631,9 +694,9 @@ async def test_batch_llm_semaphore_shared_across_concurrent_requests(monkeypatch
     ]
 
     with (
-        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]] * 4)),
+        patch("services.chat_service.get_embeddings", new=AsyncMock(return_value=[[0.1]])),
         patch("services.chat_service._resolve_retrieval_doc_ids", new=AsyncMock(return_value=["doc-a", "doc-b"])),
-        patch("services.chat_service._retrieve_chunks_for_documents", new=AsyncMock(return_value=[])),
+        patch("services.chat_service._retrieve_chunks_for_scope", new=AsyncMock(return_value=[[]])),
         patch("services.chat_service.build_context_from_chunks", return_value="ctx"),
         patch("services.chat_service.generate_answer", new=counting_generate),
         patch(
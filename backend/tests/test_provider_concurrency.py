@@ -0,0 +1,194 @@
+"""Tests for adaptive (AIMD) provider concurrency limits."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from services.providers.base import ProviderAuthError, ProviderRateLimitError
+from services.providers.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    get_embedding_concurrency_limiter,
+    get_llm_concurrency_limiter,
+    reset_provider_concurrency_limiters,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiters():
+    reset_provider_concurrency_limiters()
+    yield
+    reset_provider_concurrency_limiters()
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    kwargs = dict(initial_limit=4, min_limit=1, max_limit=16, decrease_factor=0.5)
+    kwargs.update(overrides)
+    return AdaptiveConcurrencyLimiter("test", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_never_exceeds_limit():
+    limiter = _limiter(initial_limit=2, max_limit=2)
+    active = 0
+    peak = 0
+
+    async def _work():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(limiter.call(_work) for _ in range(10)))
+    assert results == ["ok"] * 10
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_successes_increase_limit_additively():
+    limiter = _limiter(initial_limit=4)
+
+    async def _ok():
+        return 1
+
+    # +1/limit per success: roughly one extra slot per window of successes.
+    for _ in range(5):
+        await limiter.call(_ok)
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_halves_limit_once_per_burst():
+    limiter = _limiter(initial_limit=8)
+
+    async def _throttled():
+        raise ProviderRateLimitError("429")
+
+    for _ in range(3):
+        with pytest.raises(ProviderRateLimitError):
+            await limiter.call(_throttled)
+    assert limiter.limit == 4
+    assert limiter.stats()["overloads"] == 3
+
+
+@pytest.mark.asyncio
+async def test_timeout_counts_as_overload_but_slot_wait_does_not():
+    limiter = _limiter(initial_limit=1, max_limit=1)
+    gate = asyncio.Event()
+
+    async def _slow_holder():
+        await gate.wait()
+        return "held"
+
+    holder = asyncio.create_task(limiter.call(_slow_holder))
+    await asyncio.sleep(0)
+
+    async def _fast():
+        return "fast"
+
+    # Waiting behind the holder longer than the timeout must not time out.
+    waiter = asyncio.create_task(limiter.call(_fast, timeout=0.05))
+    await asyncio.sleep(0.1)
+    gate.set()
+    assert await holder == "held"
+    assert await waiter == "fast"
+
+    async def _hang():
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.call(_hang, timeout=0.01)
+    assert limiter.stats()["overloads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_leave_limit_unchanged():
+    limiter = _limiter(initial_limit=4)
+
+    async def _bad_key():
+        raise ProviderAuthError("401")
+
+    with pytest.raises(ProviderAuthError):
+        await limiter.call(_bad_key)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    limiter = _limiter(initial_limit=1, max_limit=1)
+    gate = asyncio.Event()
+
+    async def _hold():
+        await gate.wait()
+
+    holder = asyncio.create_task(limiter.call(_hold))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    gate.set()
+    await holder
+    assert limiter.stats()["waiting"] == 0
+    assert limiter.in_flight == 0
+
+
+def test_waiters_on_other_event_loops_are_woken():
+    limiter = _limiter(initial_limit=1, max_limit=1)
+    results: list[str] = []
+
+    async def _job(tag: str):
+        async def _work():
+            await asyncio.sleep(0.02)
+            return tag
+        results.append(await limiter.call(_work))
+
+    threads = [
+        threading.Thread(target=lambda t=tag: asyncio.run(_job(t)))
+        for tag in ("a", "b", "c")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert sorted(results) == ["a", "b", "c"]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_limiter_passes_through(monkeypatch):
+    monkeypatch.setattr("services.providers.concurrency.config.PROVIDER_ADAPTIVE_CONCURRENCY_ENABLED", False)
+    limiter = get_llm_concurrency_limiter()
+
+    async def _ok():
+        return "ok"
+
+    assert await limiter.call(_ok) == "ok"
+    assert limiter.stats()["enabled"] is False
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_get_embeddings_records_rate_limit_on_embedding_limiter(monkeypatch):
+    from services import embedding_service
+
+    monkeypatch.setattr("services.providers.concurrency.config.PROVIDER_CONCURRENCY_INITIAL", 8)
+    provider = AsyncMock()
+    provider.embed.side_effect = [ProviderRateLimitError("429"), [[0.1, 0.2]]]
+
+    with patch.object(embedding_service, "get_embedding_provider", return_value=provider), \
+         patch("utils.retry.asyncio.sleep", new=AsyncMock()):
+        result = await embedding_service.get_embeddings(["hello"])
+
+    np.testing.assert_allclose(result, [[0.1, 0.2]], rtol=1e-6)
+    stats = get_embedding_concurrency_limiter().stats()
+    assert stats["overloads"] == 1
+    assert stats["successes"] == 1
+    assert stats["limit"] == 4
@@ -0,0 +1,226 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.providers.base import (
+    EmbeddingProvider,
+    LLMProvider,
+    ProviderError,
+    ProviderRateLimitError,
+)
+from services.providers.failover import (
+    CircuitBreaker,
+    FailoverEmbeddingProvider,
+    FailoverLLMProvider,
+    build_embedding_failover,
+)
+
+
+class _FakeLLM(LLMProvider):
+    def __init__(self, model: str, *, error: Exception | None = None, chunks=("a", "b")):
+        self._model = model
+        self.error = error
+        self.chunks = chunks
+        self.calls = 0
+
+    async def generate(self, prompt, *, system_instruction, temperature, max_output_tokens,
+                       extra_params=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return f"{self._model}:{prompt}"
+
+    async def generate_stream(self, prompt, *, system_instruction, temperature, max_output_tokens,
+                              extra_params=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        for chunk in self.chunks:
+            yield chunk
+
+
+class _FakeEmbedder(EmbeddingProvider):
+    def __init__(self, model: str, value: float, *, error: Exception | None = None):
+        self._model = model
+        self.value = value
+        self.error = error
+
+    async def embed(self, texts):
+        if self.error:
+            raise self.error
+        return [[self.value] for _ in texts]
+
+
+def _generate(provider):
+    return provider.generate("q", system_instruction="s", temperature=0.0, max_output_tokens=8)
+
+
+@pytest.fixture
+def _breaker_config(monkeypatch):
+    monkeypatch.setattr("services.providers.failover.config.PROVIDER_BREAKER_MIN_CALLS", 2)
+    monkeypatch.setattr("services.providers.failover.config.PROVIDER_BREAKER_FAILURE_RATE", 0.5)
+    monkeypatch.setattr("services.providers.failover.config.PROVIDER_BREAKER_OPEN_SEC", 30.0)
+
+
+def test_breaker_opens_on_error_rate_and_closes_after_trial(_breaker_config, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("services.providers.failover.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("llm:test", slow_call_sec=5.0)
+
+    breaker.record(True, 0.1)
+    breaker.record(False, 0.1)
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+    clock[0] += 31
+    assert breaker.allow() is True  # the single half-open trial
+    assert breaker.allow() is False
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures(_breaker_config):
+    breaker = CircuitBreaker("embedding:test", slow_call_sec=1.0)
+    breaker.record(True, 2.0)
+    breaker.record(True, 3.0)
+    assert breaker.state == "open"
+    assert breaker.stats()["failures"] == 2
+
+
+async def test_llm_chain_fails_over_on_transient_errors(_breaker_config):
+    primary = _FakeLLM("gpt", error=ProviderRateLimitError("429"))
+    fallback = _FakeLLM("claude")
+    chain = FailoverLLMProvider([("openai", primary), ("anthropic", fallback)])
+
+    assert await _generate(chain) == "claude:q"
+    assert await _generate(chain) == "claude:q"
+    # The primary's breaker is open now: the third call goes straight to the fallback.
+    assert await _generate(chain) == "claude:q"
+    assert primary.calls == 2
+    stats = chain.stats()
+    assert stats["failovers"] == 2
+    assert stats["providers"]["openai"]["state"] == "open"
+    assert chain.model_name == "claude"
+
+
+async def test_llm_chain_does_not_fail_over_on_request_errors(_breaker_config):
+    primary = _FakeLLM("gpt", error=ProviderError("bad request"))
+    fallback = _FakeLLM("claude")
+    chain = FailoverLLMProvider([("openai", primary), ("anthropic", fallback)])
+
+    with pytest.raises(ProviderError, match="bad request"):
+        await _generate(chain)
+    assert fallback.calls == 0
+
+
+async def test_stream_fails_over_before_first_chunk(_breaker_config):
+    primary = _FakeLLM("gpt", error=ProviderRateLimitError("429"))
+    fallback = _FakeLLM("claude", chunks=("x", "y"))
+    chain = FailoverLLMProvider([("openai", primary), ("anthropic", fallback)])
+
+    chunks = [
+        chunk
+        async for chunk in chain.generate_stream(
+            "q", system_instruction="s", temperature=0.0, max_output_tokens=8
+        )
+    ]
+    assert chunks == ["x", "y"]
+
+
+async def test_embedding_chain_takes_limiter_slots_and_fails_over(_breaker_config):
+    primary = _FakeEmbedder("voyage-3-large", 1.0, error=ProviderRateLimitError("429"))
+    fallback = _FakeEmbedder("mxbai-embed-large", 2.0)
+    chain = FailoverEmbeddingProvider([("voyage", primary), ("ollama", fallback)], 1024)
+
+    assert await chain.embed(["t"]) == [[2.0]]
+    assert chain.embedding_dim == 1024
+
+
+async def test_batching_members_are_called_without_their_own_retries(_breaker_config, monkeypatch):
+    class _BatchingEmbedder(_FakeEmbedder):
+        dispatches_batches = True
+
+        async def embed(self, texts, *, max_retries=3):
+            self.max_retries = max_retries
+            return await super().embed(texts)
+
+    sleeps = []
+
+    async def _no_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("utils.retry.asyncio.sleep", _no_sleep)
+    primary = _BatchingEmbedder("voyage-3-large", 1.0, error=ProviderRateLimitError("429"))
+    fallback = _BatchingEmbedder("voyage-3-large", 2.0)
+    chain = FailoverEmbeddingProvider([("voyage", primary), ("voyage-eu", fallback)], 1024)
+
+    assert await chain.embed(["t"]) == [[2.0]]
+    assert primary.max_retries == 0
+    assert fallback.max_retries == 0
+    assert sleeps == []  # handed over at once, no backoff before failing over
+
+
+async def test_ingestion_never_falls_back_to_a_different_model(_breaker_config):
+    primary = _FakeEmbedder("voyage-3-large", 1.0, error=ProviderRateLimitError("429"))
+    fallback = _FakeEmbedder("mxbai-embed-large", 2.0)
+    chain = FailoverEmbeddingProvider(
+        [("voyage", primary), ("ollama", fallback)], 1024, query_only=frozenset({"ollama"})
+    )
+
+    with pytest.raises(ProviderRateLimitError):
+        await chain.embed(["t"], max_retries=0)
+    assert await chain.embed(["t"], max_retries=0, query=True) == [[2.0]]
+
+
+def test_embedding_fallbacks_must_match_stored_dimension(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_DIM", raising=False)
+    monkeypatch.setattr("services.providers.openai.config.OPENAI_API_KEY", "test-key")
+    primary = MagicMock(
+        spec=EmbeddingProvider, embedding_dim=3072, _model="models/gemini-embedding-001"
+    )
+
+    with pytest.raises(ValueError, match="1536-dimensional"):
+        build_embedding_failover("gemini", primary, [("openai", None)])
+
+    with pytest.raises(ValueError, match="EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS"):
+        build_embedding_failover("gemini", primary, [("openai", "text-embedding-3-large")])
+
+    monkeypatch.setattr(
+        "services.providers.failover.config.EMBEDDING_FALLBACK_ALLOW_OTHER_MODELS", True
+    )
+    chain = build_embedding_failover("gemini", primary, [("openai", "text-embedding-3-large")])
+    assert list(chain.stats()["providers"]) == [
+        "gemini:models/gemini-embedding-001",
+        "openai:text-embedding-3-large",
+    ]
+    assert chain._query_only == frozenset({"openai:text-embedding-3-large"})
+
+    with pytest.raises(ValueError, match="Unknown embedding model"):
+        build_embedding_failover("gemini", primary, [("ollama", "my-custom-model")])
+
+
+def test_llm_factory_wraps_configured_chain(monkeypatch):
+    import services.providers as providers
+    import services.providers.anthropic as anthropic_provider
+    import services.providers.openai as openai_provider
+
+    # Some tests reload core.config, so patch the instance each module holds.
+    for module in (providers, openai_provider, anthropic_provider):
+        monkeypatch.setattr(module.config, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(module.config, "ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setattr(module.config, "LLM_MODEL", "gpt-4o")
+    monkeypatch.setattr(providers.config, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(
+        providers.config, "LLM_FALLBACK_PROVIDERS", [("anthropic", None), ("ollama", "llama3.1")]
+    )
+    monkeypatch.setattr(providers, "_llm_provider", None)
+
+    provider = providers.get_llm_provider()
+
+    assert isinstance(provider, FailoverLLMProvider)
+    # Fallbacks use their own default models, not the primary's LLM_MODEL.
+    assert list(provider.stats()["providers"]) == [
+        "openai:gpt-4o",
+        "anthropic:claude-sonnet-4-20250514",
+        "ollama:llama3.1",
+    ]
@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.providers.base import ProviderConnectionError
+from services.providers.hedging import RequestHedger
+
+
+@pytest.fixture
+def hedger(monkeypatch):
+    monkeypatch.setattr("services.providers.hedging.config.EMBEDDING_HEDGE_ENABLED", True)
+    monkeypatch.setattr("services.providers.hedging.config.EMBEDDING_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr("services.providers.hedging.config.EMBEDDING_HEDGE_MIN_DELAY_MS", 0)
+    monkeypatch.setattr("services.providers.hedging.config.EMBEDDING_HEDGE_BUDGET_RATIO", 0.5)
+    hedger = RequestHedger("test")
+    # Recent latencies of 10 ms put the trigger at ~10 ms.
+    for _ in range(3):
+        hedger._record(0.01)
+    return hedger
+
+
+async def test_slow_call_is_hedged_and_hedge_wins(hedger):
+    hedger._tokens = 1.0
+    calls = 0
+
+    async def embed():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.0)
+        return calls
+
+    assert await asyncio.wait_for(hedger.call(embed), timeout=0.5) == 2
+    stats = hedger.stats()
+    assert (stats["calls"], stats["hedged"], stats["hedge_wins"]) == (1, 1, 1)
+
+
+async def test_fast_call_is_not_hedged(hedger):
+    hedger._tokens = 1.0
+    fn = AsyncMock(return_value=[[0.1]])
+
+    assert await hedger.call(fn) == [[0.1]]
+    fn.assert_awaited_once()
+    assert hedger.stats()["hedged"] == 0
+
+
+async def test_hedges_are_capped_by_budget(hedger, monkeypatch):
+    monkeypatch.setattr("services.providers.hedging.config.EMBEDDING_HEDGE_PERCENTILE", 50)
+    started = 0
+
+    async def slow():
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    # 0.5 tokens per call: four slow calls may hedge twice.
+    for _ in range(4):
+        await hedger.call(slow)
+
+    stats = hedger.stats()
+    assert stats["hedged"] == 2
+    assert stats["budget_exhausted"] == 2
+    assert started == 6
+
+
+async def test_failed_primary_falls_back_to_hedge(hedger):
+    hedger._tokens = 1.0
+    calls = 0
+
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.03)
+            raise ProviderConnectionError("reset")
+        await asyncio.sleep(0.05)
+        return "hedge"
+
+    assert await hedger.call(flaky) == "hedge"
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+async def test_ingestion_embeddings_are_never_hedged(monkeypatch):
+    from services import embedding_service
+
+    provider = AsyncMock()
+    provider.dispatches_batches = False
+    provider.embed = AsyncMock(return_value=[[0.1]])
+    with (
+        patch("services.embedding_service.get_embedding_provider", return_value=provider),
+        patch.object(embedding_service.query_embedding_hedger, "call", new=AsyncMock()) as hedged_call,
+    ):
+        await embedding_service.get_embeddings(["chunk"])
+        hedged_call.assert_not_awaited()
+        await embedding_service.get_query_embeddings(["question"])
+        hedged_call.assert_awaited_once()
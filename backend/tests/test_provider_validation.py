@@ -115,6 +115,22 @@ class TestValidateProviderConfiguration:
         with pytest.raises(ProviderConfigError, match="Mixed providers are supported"):
             validate_provider_configuration(_snapshot("anthropic", "voyage", env=env))
 
+    def test_fallback_providers_need_credentials(self):
+        env = _env(ANTHROPIC_API_KEY=None, VOYAGE_API_KEY=None)
+        snapshot = ProviderConfigSnapshot(
+            llm_provider="openai",
+            embedding_provider="openai",
+            enable_streaming=False,
+            env=env,
+            llm_fallbacks=("anthropic", "ollama"),
+            embedding_fallbacks=("voyage",),
+        )
+        with pytest.raises(ProviderConfigError) as exc_info:
+            validate_provider_configuration(snapshot)
+        message = str(exc_info.value)
+        assert "ANTHROPIC_API_KEY" in message and "LLM_FALLBACK_PROVIDERS" in message
+        assert "VOYAGE_API_KEY" in message and "EMBEDDING_FALLBACK_PROVIDERS" in message
+
     def test_streaming_enabled_with_streaming_llm_passes(self):
         for llm in LLM_PROVIDER_NAMES:
             validate_provider_configuration(
@@ -1,5 +1,6 @@
 """Unit tests for provider implementations — mock the SDK/HTTP calls."""
 
+import numpy as np
 import pytest
 
 from services.providers.base import (
@@ -378,12 +379,12 @@ class TestGeminiEmbedParsing:
 
         provider = GeminiEmbeddingProvider(api_key="test-key")
 
-        def fake_embed_content(*, model, contents):
+        async def fake_embed_content(*, model, contents):
             result = MagicMock()
             result.embeddings = [MagicMock(values=[0.1, 0.2, 0.3]) for _ in contents]
             return result
 
-        provider._client.models.embed_content = fake_embed_content
+        provider._client.aio.models.embed_content = fake_embed_content
 
         result = await provider.embed(["hello", "world"])
 
@@ -399,7 +400,7 @@ class TestGeminiEmbedParsing:
 
         call_batch_sizes: list[int] = []
 
-        def fake_embed_content(*, model, contents):
+        async def fake_embed_content(*, model, contents):
             call_batch_sizes.append(len(contents))
             result = MagicMock()
             # Tag each embedding with its batch size so we can assert order.
@@ -408,7 +409,7 @@ class TestGeminiEmbedParsing:
             ]
             return result
 
-        provider._client.models.embed_content = fake_embed_content
+        provider._client.aio.models.embed_content = fake_embed_content
 
         texts = [f"t{i}" for i in range(150)]
         result = await provider.embed(texts)
@@ -421,6 +422,49 @@ class TestGeminiEmbedParsing:
         assert result[149] == [50.0]
 
 
+class TestGeminiAsyncClient:
+    """Gemini calls use ``client.aio`` instead of thread-wrapped sync calls."""
+
+    async def test_generate_awaits_async_client_without_threads(self):
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from services.providers.gemini import GeminiLLMProvider
+
+        provider = GeminiLLMProvider(api_key="test-key")
+        provider._client.aio.models.generate_content = AsyncMock(
+            return_value=MagicMock(text="answer")
+        )
+        provider._client.models.generate_content = MagicMock(
+            side_effect=AssertionError("sync client must not be used")
+        )
+
+        with patch("asyncio.to_thread", side_effect=AssertionError("no thread hop")):
+            result = await provider.generate(
+                "q", system_instruction="s", temperature=0.1, max_output_tokens=16
+            )
+
+        assert result == "answer"
+        provider._client.aio.models.generate_content.assert_awaited_once()
+
+    async def test_async_api_errors_are_classified(self):
+        from unittest.mock import AsyncMock
+
+        import httpx
+        from google.genai.errors import APIError
+        from services.providers.gemini import GeminiEmbeddingProvider
+
+        provider = GeminiEmbeddingProvider(api_key="test-key")
+        provider._client.aio.models.embed_content = AsyncMock(
+            side_effect=APIError(
+                429,
+                httpx.Response(429, json={"error": {"status": "RESOURCE_EXHAUSTED"}}),
+            )
+        )
+
+        with pytest.raises(ProviderRateLimitError):
+            await provider.embed(["hello"])
+
+
 # ---------------------------------------------------------------------------
 # OpenAI generate() response parsing
 # ---------------------------------------------------------------------------
@@ -613,7 +657,28 @@ class TestVoyageEmbedParsing:
 
         result = await provider.embed(["a", "b"])
 
-        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        np.testing.assert_allclose(result, [[0.1, 0.2], [0.3, 0.4]], rtol=1e-6)
+
+    async def test_requests_and_decodes_base64_embeddings(self):
+        import base64
+        from unittest.mock import AsyncMock, MagicMock
+        from services.providers.voyage import VoyageEmbeddingProvider
+
+        provider = VoyageEmbeddingProvider(api_key="test-key")
+        packed = base64.b64encode(np.array([0.5, -1.0], dtype="<f4").tobytes()).decode()
+
+        fake_response = MagicMock()
+        fake_response.raise_for_status = MagicMock()
+        fake_response.json = MagicMock(
+            return_value={"data": [{"object": "embedding", "embedding": packed, "index": 0}]}
+        )
+        provider._client.post = AsyncMock(return_value=fake_response)
+
+        [vector] = await provider.embed(["a"])
+
+        assert provider._client.post.call_args.kwargs["json"]["encoding_format"] == "base64"
+        assert vector.dtype == np.float32
+        assert vector.tolist() == [0.5, -1.0]
 
     async def test_missing_api_key_raises_auth_error(self, monkeypatch):
         from services.providers.voyage import VoyageEmbeddingProvider, config
@@ -657,10 +722,120 @@ class TestVoyageEmbedParsing:
 
         assert call_count == 3
         assert len(result) == total
-        assert result[0] == [1.0, 1.0, 1.0]
-        assert result[BATCH - 1] == [1.0, 1.0, 1.0]
-        assert result[BATCH] == [2.0, 2.0, 2.0]
-        assert result[-1] == [3.0, 3.0, 3.0]
+        assert result[0].tolist() == [1.0, 1.0, 1.0]
+        assert result[BATCH - 1].tolist() == [1.0, 1.0, 1.0]
+        assert result[BATCH].tolist() == [2.0, 2.0, 2.0]
+        assert result[-1].tolist() == [3.0, 3.0, 3.0]
+
+
+class TestOpenAIEmbedParsing:
+    async def test_requests_base64_and_decodes_float32(self):
+        import base64
+        from unittest.mock import AsyncMock, MagicMock
+        from services.providers.openai import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key")
+        packed = base64.b64encode(np.array([0.25, 2.0], dtype="<f4").tobytes()).decode()
+        provider._client.embeddings.create = AsyncMock(
+            return_value=MagicMock(data=[MagicMock(embedding=packed)])
+        )
+
+        [vector] = await provider.embed(["a"])
+
+        kwargs = provider._client.embeddings.create.call_args.kwargs
+        assert kwargs["encoding_format"] == "base64"
+        assert vector.dtype == np.float32
+        assert vector.tolist() == [0.25, 2.0]
+
+
+# ---------------------------------------------------------------------------
+# Concurrent batch dispatch (Gemini, Voyage)
+# ---------------------------------------------------------------------------
+
+
+class TestEmbeddingBatchDispatch:
+    """dispatch_embedding_batches runs batches concurrently, keeps input order,
+    and retries a failed batch without re-sending the others."""
+
+    async def test_batches_run_concurrently_up_to_limit_in_order(self, monkeypatch):
+        import asyncio
+
+        from services.providers.batching import dispatch_embedding_batches
+
+        monkeypatch.setattr("services.providers.batching.config.EMBEDDING_BATCH_CONCURRENCY", 2)
+        in_flight = 0
+        peak = 0
+
+        async def embed_batch(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later batches finish first; output must still follow input order.
+            await asyncio.sleep(0.01 / int(batch[0]))
+            in_flight -= 1
+            return [[float(text)] for text in batch]
+
+        texts = [str(i) for i in range(1, 11)]
+        result = await dispatch_embedding_batches(texts, 2, embed_batch, func_name="test")
+
+        assert result == [[float(i)] for i in range(1, 11)]
+        assert peak == 2
+
+    async def test_failed_batch_is_retried_alone(self, monkeypatch):
+        from services.providers.batching import dispatch_embedding_batches
+
+        monkeypatch.setattr("services.providers.batching.DEFAULT_BASE_DELAY", 0)
+        calls: list[str] = []
+
+        async def embed_batch(batch):
+            calls.append(batch[0])
+            if batch[0] == "c" and calls.count("c") == 1:
+                raise ProviderRateLimitError("slow down")
+            return [[0.0] for _ in batch]
+
+        result = await dispatch_embedding_batches(
+            ["a", "b", "c", "d"], 1, embed_batch, func_name="test"
+        )
+
+        assert len(result) == 4
+        assert sorted(calls) == ["a", "b", "c", "c", "d"]
+
+    async def test_max_retries_zero_makes_one_attempt(self):
+        from services.providers.batching import dispatch_embedding_batches
+
+        calls = 0
+
+        async def embed_batch(batch):
+            nonlocal calls
+            calls += 1
+            raise ProviderRateLimitError("slow down")
+
+        with pytest.raises(ProviderRateLimitError):
+            await dispatch_embedding_batches(
+                ["a"], 1, embed_batch, func_name="test", max_retries=0
+            )
+        assert calls == 1
+
+    async def test_permanent_failure_cancels_remaining_batches(self, monkeypatch):
+        import asyncio
+
+        from services.providers.batching import dispatch_embedding_batches
+
+        monkeypatch.setattr("services.providers.batching.config.EMBEDDING_BATCH_CONCURRENCY", 2)
+        started: list[str] = []
+
+        async def embed_batch(batch):
+            started.append(batch[0])
+            if batch[0] == "a":
+                raise ProviderAuthError("bad key")
+            await asyncio.sleep(1)
+            return [[0.0]]
+
+        with pytest.raises(ProviderAuthError):
+            await dispatch_embedding_batches(
+                ["a", "b", "c", "d"], 1, embed_batch, func_name="test"
+            )
+        assert "d" not in started
 
 
 # ---------------------------------------------------------------------------
@@ -751,6 +926,89 @@ class TestProviderSdkRetryOwnership:
         assert provider._client.max_retries == 0
 
 
+class TestSharedHttpClients:
+    """Providers on the same host share one tuned httpx pool."""
+
+    def test_providers_share_one_client_per_host(self, monkeypatch):
+        from services.providers.ollama import OllamaEmbeddingProvider, OllamaLLMProvider
+        from services.providers.openai import OpenAIEmbeddingProvider, OpenAILLMProvider
+
+        monkeypatch.setattr("services.providers.transport.config.PROVIDER_HTTP_MAX_CONNECTIONS", 7)
+        monkeypatch.setattr("services.providers.transport.config.PROVIDER_HTTP_MAX_KEEPALIVE", 3)
+
+        embed = OllamaEmbeddingProvider(base_url="http://ollama:11434")
+        llm = OllamaLLMProvider(base_url="http://OLLAMA:11434/")
+        assert embed._client is llm._client
+        pool = embed._client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+
+        openai_embed = OpenAIEmbeddingProvider(api_key="test-key")
+        openai_llm = OpenAILLMProvider(api_key="test-key")
+        assert openai_embed._client._client is openai_llm._client._client
+        assert openai_embed._client._client is not embed._client
+
+    async def test_requests_use_absolute_urls_and_per_call_timeouts(self, monkeypatch):
+        from unittest.mock import AsyncMock, MagicMock
+
+        from core.config import config
+        from services.providers.ollama import OllamaEmbeddingProvider
+
+        monkeypatch.setattr("services.providers.transport.config.PROVIDER_HTTP_CONNECT_TIMEOUT_SEC", 2.0)
+        provider = OllamaEmbeddingProvider(base_url="http://ollama:11434")
+        fake_response = MagicMock()
+        fake_response.raise_for_status = MagicMock()
+        fake_response.json = MagicMock(return_value={"embeddings": [[0.1]]})
+        provider._client.post = AsyncMock(return_value=fake_response)
+
+        await provider.embed(["hi"])
+
+        url = provider._client.post.await_args.args[0]
+        timeout = provider._client.post.await_args.kwargs["timeout"]
+        assert url == "http://ollama:11434/api/embed"
+        assert timeout.read == float(config.EMBEDDING_HTTP_TIMEOUT_SEC)
+        assert timeout.connect == 2.0
+
+    async def test_closed_clients_are_rebuilt(self):
+        from services.providers.transport import close_http_clients, get_http_client
+
+        client = get_http_client("http://ollama:11434")
+        await close_http_clients()
+        assert client.is_closed
+        assert get_http_client("http://ollama:11434") is not client
+
+    async def test_warmup_ignores_unreachable_hosts(self, monkeypatch):
+        import httpx
+
+        from services.providers.transport import get_http_client, warm_http_clients
+
+        up = get_http_client("http://up.example")
+        down = get_http_client("http://down.example")
+        calls: list[str] = []
+
+        async def ok_head(url, **kwargs):
+            calls.append(url)
+            return httpx.Response(404)
+
+        async def failing_head(url, **kwargs):
+            calls.append(url)
+            raise httpx.ConnectError("refused")
+
+        monkeypatch.setattr(up, "head", ok_head)
+        monkeypatch.setattr(down, "head", failing_head)
+
+        assert await warm_http_clients(2) == 2
+        assert sorted(calls) == ["http://down.example/"] * 2 + ["http://up.example/"] * 2
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        from services.providers import transport
+
+        monkeypatch.setattr(transport.config, "PROVIDER_HTTP2_ENABLED", True)
+        monkeypatch.setattr(transport.importlib.util, "find_spec", lambda name: None)
+        assert transport._http2_enabled() is False
+        assert transport.get_http_client("https://api.example.com")._transport._pool._http2 is False
+
+
 class TestGeminiHttpTimeouts:
     def test_embedding_client_configures_http_timeout_ms(self):
         from unittest.mock import patch
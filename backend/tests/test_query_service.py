@@ -503,3 +503,52 @@ def test_retrieval_debug_omits_strategy_when_transformation_disabled(monkeypatch
         "original_query": "plain question",
         "transformed_queries": ["plain question"],
     }
+
+
+@pytest.mark.asyncio
+async def test_transform_cache_reuses_result_for_normalized_question(monkeypatch):
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_ENABLED", True)
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_STRATEGY", "expand")
+    fake_llm = AsyncMock(return_value="alt one\nalt two")
+    monkeypatch.setattr(query_service_mod, "_llm_transform", fake_llm)
+
+    first = await transform_query("What is PTO?")
+    second = await transform_query("  what is   pto? ")
+
+    assert fake_llm.await_count == 1
+    assert first.queries == ["What is PTO?", "alt one", "alt two"]
+    assert second.queries == ["  what is   pto? ", "alt one", "alt two"]
+    assert second.transformation_strategy == "expand"
+    stats = query_service_mod.query_transform_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_transform_cache_keys_on_history_and_strategy(monkeypatch):
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_ENABLED", True)
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_STRATEGY", "rewrite")
+    fake_llm = AsyncMock(return_value="rewritten")
+    monkeypatch.setattr(query_service_mod, "_llm_transform", fake_llm)
+
+    await transform_query("tell me more", history=[{"role": "user", "content": "PTO"}])
+    await transform_query("tell me more", history=[{"role": "user", "content": "401k"}])
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_STRATEGY", "stepback")
+    await transform_query("tell me more", history=[{"role": "user", "content": "401k"}])
+
+    assert query_service_mod.query_transform_cache_stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_transform_cache_skips_results_from_failed_llm_calls(monkeypatch):
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_ENABLED", True)
+    monkeypatch.setattr(config, "QUERY_TRANSFORMATION_STRATEGY", "rewrite")
+    provider = AsyncMock()
+    provider.model_name = "test-model"
+    provider.generate.side_effect = [RuntimeError("llm down"), "rewritten"]
+
+    with patch("services.query_service.get_llm_provider", return_value=provider):
+        assert (await transform_query("q")).queries == ["q"]
+        assert (await transform_query("q")).queries == ["rewritten"]
+        assert (await transform_query("q")).queries == ["rewritten"]
+
+    assert provider.generate.await_count == 2
@@ -1,6 +1,6 @@
 """Parametrized contract tests for memory and Redis queue backends."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -78,6 +78,117 @@ async def test_memory_dlq_respects_max_entries(monkeypatch):
     assert [e.doc_id for e in entries] == ["d2", "d3"]
 
 
+@pytest.fixture
+def _spill_to_tmp(monkeypatch, tmp_path):
+    monkeypatch.setattr("core.config.config.QUEUE_SPILL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _dlq_entry(doc_id: str, **kwargs) -> DLQEntry:
+    return DLQEntry(
+        doc_id=doc_id,
+        file_name="f.pdf",
+        content_type="application/pdf",
+        attempt=3,
+        error="boom",
+        **kwargs,
+    )
+
+
+def test_memory_dlq_page_cursor_and_tenant_filter():
+    queue = AsyncioIngestionQueue()
+    for i in range(5):
+        queue._append_dlq(_dlq_entry(f"d{i}", tenant_id="t1" if i % 2 == 0 else "t2"))
+
+    first = queue.dlq_page(limit=2, tenant_id="t1")
+    assert [e.doc_id for e in first.entries] == ["d0", "d2"]
+    second = queue.dlq_page(cursor=first.next_cursor, limit=2, tenant_id="t1")
+    assert [e.doc_id for e in second.entries] == ["d4"]
+    assert second.next_cursor is None
+    with pytest.raises(ValueError):
+        queue.dlq_page(cursor="abc")
+
+
+@pytest.mark.asyncio
+async def test_memory_dead_letter_spills_payload_and_trim_removes_it(
+    monkeypatch, _spill_to_tmp
+):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_DLQ_MAX_ENTRIES", 1)
+    queue = AsyncioIngestionQueue()
+    await queue._dead_letter(_make_job("doc-old"), "boom")
+    old_path = _spill_to_tmp / "doc-old"
+    assert queue.dlq_jobs()[0].payload_path == str(old_path)
+    assert old_path.read_bytes() == b"bytes"
+
+    await queue._dead_letter(_make_job("doc-new"), "boom")
+    assert [e.doc_id for e in queue.dlq_jobs()] == ["doc-new"]
+    assert not old_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_memory_replay_requeues_from_spill_file(_spill_to_tmp):
+    queue = AsyncioIngestionQueue()
+    job = _make_job("doc-replay")
+    job.tenant_id = "t1"
+    job.attempt = 3
+    await queue._dead_letter(job, "boom")
+    queue._append_dlq(_dlq_entry("doc-no-payload", tenant_id="t1"))
+    entry_ids = [e.entry_id for e in queue.dlq_jobs()]
+
+    status_mock = AsyncMock()
+    with patch("db.update_document_status", new=status_mock):
+        replayed = await queue.replay_dlq(entry_ids, tenant_id="t1")
+
+    assert [e.doc_id for e in replayed] == ["doc-replay"]
+    status_mock.assert_awaited_once_with(
+        doc_id="doc-replay", status="queued", tenant_id="t1"
+    )
+    requeued = queue._queue.get_nowait()
+    assert (requeued.file_bytes, requeued.attempt) == (b"bytes", 0)
+    assert [e.doc_id for e in queue.dlq_jobs()] == ["doc-no-payload"]
+    assert not (_spill_to_tmp / "doc-replay").exists()
+
+
+@pytest.mark.asyncio
+async def test_memory_replay_returns_entries_to_dlq_when_queue_full(
+    monkeypatch, _spill_to_tmp
+):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MAX_SIZE", 1)
+    queue = AsyncioIngestionQueue()
+    await queue.enqueue(_make_job("doc-blocking"))
+    job = _make_job("doc-replay")
+    job.tenant_id = "t1"
+    await queue._dead_letter(job, "boom")
+
+    status_mock = AsyncMock()
+    with patch("db.update_document_status", new=status_mock):
+        replayed = await queue.replay_dlq([queue.dlq_jobs()[0].entry_id])
+
+    assert replayed == []
+    assert [e.doc_id for e in queue.dlq_jobs()] == ["doc-replay"]
+    assert status_mock.await_args.kwargs["status"] == "failed"
+    assert (_spill_to_tmp / "doc-replay").exists()
+
+
+@pytest.mark.asyncio
+async def test_memory_replay_marks_document_failed_when_enqueue_errors(_spill_to_tmp):
+    queue = AsyncioIngestionQueue()
+    job = _make_job("doc-replay")
+    job.tenant_id = "t1"
+    await queue._dead_letter(job, "boom")
+
+    status_mock = AsyncMock()
+    with (
+        patch("db.update_document_status", new=status_mock),
+        patch.object(queue, "_enqueue_dlq_payload", new=AsyncMock(side_effect=OSError("disk"))),
+        pytest.raises(OSError),
+    ):
+        await queue.replay_dlq([queue.dlq_jobs()[0].entry_id])
+
+    assert [e.doc_id for e in queue.dlq_jobs()] == ["doc-replay"]
+    assert [c.kwargs["status"] for c in status_mock.await_args_list] == ["queued", "failed"]
+
+
 @pytest.mark.redis_integration
 @pytest.mark.asyncio
 async def test_redis_start_idempotent(monkeypatch):
@@ -2,12 +2,13 @@
 
 import asyncio
 import threading
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from services.queue_asyncio import AsyncioIngestionQueue
 from services.queue_base import (
+    RedisTokenBucketRateLimiter,
     TokenBucketRateLimiter,
     get_process_embedding_rate_limiter,
     reset_process_embedding_rate_limiter,
@@ -92,3 +93,58 @@ async def test_memory_queue_workers_share_one_limiter():
         assert id(queue._rate_limiter) == limiter_id
     finally:
         await queue.stop()
+
+
+def _fake_redis_conn(script_side_effect):
+    conn = MagicMock()
+    conn.register_script.return_value = MagicMock(side_effect=script_side_effect)
+    return conn
+
+
+def test_process_limiters_are_per_provider(monkeypatch):
+    monkeypatch.setattr("core.config.config.QUEUE_EMBEDDING_RATE_LIMITER", "local")
+    monkeypatch.setattr(
+        "core.config.config.QUEUE_EMBEDDING_RPS_BY_PROVIDER", {"openai": 10.0}
+    )
+    openai_limiter = get_process_embedding_rate_limiter("openai")
+    gemini_limiter = get_process_embedding_rate_limiter("gemini")
+
+    assert openai_limiter is not gemini_limiter
+    assert openai_limiter is get_process_embedding_rate_limiter("openai")
+    assert openai_limiter._rate == 10.0
+
+
+def test_redis_mode_builds_shared_bucket_keyed_by_provider(monkeypatch):
+    monkeypatch.setattr("core.config.config.QUEUE_EMBEDDING_RATE_LIMITER", "redis")
+    with patch("redis.Redis.from_url", return_value=_fake_redis_conn([0])):
+        limiter = get_process_embedding_rate_limiter("voyage")
+
+    assert isinstance(limiter, RedisTokenBucketRateLimiter)
+    assert limiter.key == "chatvector:ratelimit:embedding:voyage"
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_waits_for_reported_delay():
+    conn = _fake_redis_conn([20, 0])
+    limiter = RedisTokenBucketRateLimiter(rate=1.0, capacity=1.0, key="k", conn=conn)
+
+    with patch("services.queue_base.asyncio.sleep", new=AsyncMock()) as sleep:
+        await limiter.acquire()
+
+    sleep.assert_awaited_once_with(0.02)
+    assert conn.register_script.return_value.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_falls_back_to_local_bucket_when_redis_down():
+    import redis as redis_lib
+
+    conn = _fake_redis_conn(redis_lib.exceptions.ConnectionError("down"))
+    limiter = RedisTokenBucketRateLimiter(rate=100.0, capacity=100.0, key="k", conn=conn)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert limiter.using_fallback
+    # Second acquire stays on the local bucket instead of hammering Redis.
+    assert conn.register_script.return_value.call_count == 1
@@ -39,7 +39,10 @@ pytestmark = [
 from services.queue_base import DLQEntry, QueueFull, QueueJob
 from services.queue_redis import (
     DLQ_REDIS_KEY,
+    RETRY_SCHEDULE_KEY,
     RedisIngestionQueue,
+    _dispatch_fair_jobs,
+    _promote_due_retries,
     _push_dlq_entry,
     spill_dir,
 )
@@ -141,6 +144,25 @@ async def test_queue_full_raised_at_capacity(monkeypatch):
         await queue.enqueue(_make_job("doc-cap-3"))
 
 
+@pytest.mark.asyncio
+async def test_enqueue_many_pipelines_jobs_up_to_capacity(monkeypatch):
+    """A batch is enqueued in one pipeline; jobs past capacity are left to the caller."""
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 3)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_WORKER_COUNT", 1)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    queue = RedisIngestionQueue()
+
+    jobs = [_make_job(f"doc-a{i}") for i in range(1, 4)] + [_make_job("doc-b1")]
+    jobs[-1].tenant_id = "b"
+
+    assert await queue.enqueue_many(jobs) == [1, 2, 3]
+    assert queue.queue_size() == 3
+    assert queue.queue_position("doc-a3") == 3
+    assert (spill_dir() / "doc-a3").exists()
+    assert not (spill_dir() / "doc-b1").exists()
+    assert await queue.enqueue_many([jobs[-1]]) == []
+
+
 # ---------------------------------------------------------------------------
 # queue_size and queue_position
 # ---------------------------------------------------------------------------
@@ -178,6 +200,42 @@ async def test_queue_position_finds_job(monkeypatch):
     assert pos_a < pos_b
 
 
+@pytest.mark.asyncio
+async def test_queue_position_advances_as_jobs_are_dequeued(monkeypatch):
+    """position = seq - dequeued; the picked-up doc drops out of the index."""
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    from services.queue_redis import _record_dequeue
+
+    queue = RedisIngestionQueue()
+    for doc_id in ("doc-seq-a", "doc-seq-b", "doc-seq-c"):
+        await queue.enqueue(_make_job(doc_id))
+
+    queue._rq_queue.pop_job_id()
+    _record_dequeue(queue._conn, "doc-seq-a")
+
+    assert queue.queue_position("doc-seq-a") is None
+    assert queue.queue_position("doc-seq-b") == 1
+    assert queue.queue_position("doc-seq-c") == 2
+
+
+@pytest.mark.asyncio
+async def test_start_rebuilds_fair_index_from_redis(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    from services.queue_redis import _position_key
+
+    queue = RedisIngestionQueue()
+    await queue.enqueue(_make_job("doc-idx-a"))
+    await queue.enqueue(_make_job("doc-idx-b"))
+    queue._conn.delete(_position_key("seq"), _position_key("enqueued:-"))
+
+    queue._rebuild_fair_index()
+
+    assert queue.queue_position("doc-idx-a") == 1
+    assert queue.queue_position("doc-idx-b") == 2
+
+
 @pytest.mark.asyncio
 async def test_queue_position_returns_none_for_unknown(monkeypatch):
     """queue_position() returns None for a doc_id not in the queue."""
@@ -206,10 +264,10 @@ def test_dlq_entry_stored_in_redis(monkeypatch):
     _push_dlq_entry(entry)
 
     conn = redis_lib.Redis.from_url(_REDIS_TEST_URL)
-    raw = conn.lrange(DLQ_REDIS_KEY, 0, -1)
+    raw = conn.xrange(DLQ_REDIS_KEY)
     assert len(raw) == 1
 
-    data = json.loads(raw[0])
+    data = json.loads(raw[0][1][b"entry"])
     assert data["doc_id"] == "doc-dlq-1"
     assert data["error"] == "max retries exceeded"
     assert data["attempt"] == 3
@@ -267,6 +325,153 @@ async def test_temp_file_cleaned_after_successful_processing(monkeypatch):
     assert not temp_path.exists()
 
 
+# ---------------------------------------------------------------------------
+# Delayed retries
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_transient_failure_schedules_retry_without_sleeping(monkeypatch):
+    """The worker parks the retry in the schedule set and returns immediately."""
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_JOB_MAX_RETRIES", 3)
+
+    queue = RedisIngestionQueue()
+    await queue.enqueue(_make_job("doc-retry"))
+    queue._rq_queue.empty()
+    temp_path = spill_dir() / "doc-retry"
+
+    mock_pipeline_cls = MagicMock()
+    mock_pipeline_cls.return_value.process_document_background = AsyncMock(
+        side_effect=RuntimeError("service unavailable")
+    )
+    sleep_mock = AsyncMock()
+
+    with (
+        patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls),
+        patch("db.update_document_status", new=AsyncMock()),
+        patch("services.queue_redis.asyncio.sleep", sleep_mock),
+    ):
+        from services.queue_redis import _async_execute_job
+        await _async_execute_job(
+            "doc-retry", "test.pdf", "application/pdf", str(temp_path), 0,
+        )
+
+    sleep_mock.assert_not_called()
+    assert len(queue._rq_queue) == 0
+    assert queue.scheduled_retry_count() == 1
+    assert temp_path.exists()
+
+    conn = redis_lib.Redis.from_url(_REDIS_TEST_URL)
+    assert _promote_due_retries(conn, now=float("inf")) == 1
+    assert queue.scheduled_retry_count() == 0
+    assert _dispatch_fair_jobs(conn, queue._rq_queue) == 1
+    assert queue._rq_queue.job_ids == ["chatvector:doc-retry:1"]
+
+
+def test_promote_skips_retries_that_are_not_due(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    from services.queue_redis import _schedule_retry
+
+    queue = RedisIngestionQueue()
+    conn = redis_lib.Redis.from_url(_REDIS_TEST_URL)
+    _schedule_retry(conn, 3600, "doc-later", "f.pdf", "application/pdf", "/tmp/x", 1)
+
+    assert _promote_due_retries(conn) == 0
+    assert conn.zcard(RETRY_SCHEDULE_KEY) == 1
+    assert len(queue._rq_queue) == 0
+
+
+# ---------------------------------------------------------------------------
+# Startup reconciliation
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_clear_stale_jobs_removes_jobs_from_every_structure(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_WORKER_COUNT", 1)
+    from services.queue_redis import _schedule_retry
+
+    queue = RedisIngestionQueue()
+    for doc_id, tenant in (
+        ("stale-a", "t1"), ("stale-b", "t1"), ("keep-c", "t2"), ("keep-e", "t1")
+    ):
+        job = _make_job(doc_id)
+        job.tenant_id = tenant
+        await queue.enqueue(job)
+    _schedule_retry(queue._conn, 3600, "stale-d", "f.pdf", "application/pdf", "/tmp/x", 1, "t1")
+
+    # stale-a sits in the RQ buffer, stale-b in t1's sub-queue, stale-d in the
+    # retry schedule.
+    removed = queue.clear_stale_jobs({"stale-a", "stale-b", "stale-d", "unknown"})
+
+    assert removed == 3
+    assert queue._rq_queue.job_ids == []
+    assert queue.scheduled_retry_count() == 0
+    assert queue.tenant_depths() == {"t1": 1, "t2": 1}
+    assert queue.queue_position("stale-b") is None
+    assert queue.queue_position("keep-c") == 1
+    # Both removed t1 jobs were ahead of keep-e.
+    assert queue.queue_position("keep-e") == 1
+
+
+@pytest.mark.asyncio
+async def test_clear_stale_jobs_keeps_positions_of_jobs_ahead_of_it(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_WORKER_COUNT", 1)
+
+    queue = RedisIngestionQueue()
+    for doc_id in ("keep-a", "keep-b", "stale-c", "keep-d"):
+        job = _make_job(doc_id)
+        job.tenant_id = "t1"
+        await queue.enqueue(job)
+
+    assert queue.clear_stale_jobs({"stale-c"}) == 1
+
+    assert queue.queue_position("keep-a") == 1
+    assert queue.queue_position("keep-b") == 2
+    # keep-d may read one too far back, but never ahead of a waiting job.
+    assert queue.queue_position("keep-d") == 4
+
+
+# ---------------------------------------------------------------------------
+# Fair scheduling
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_small_tenant_is_dispatched_ahead_of_bulk_backlog(monkeypatch):
+    """A tenant's single upload is not stuck behind another tenant's bulk import."""
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_WORKER_COUNT", 1)
+
+    queue = RedisIngestionQueue()
+    for i in range(4):
+        job = _make_job(f"doc-bulk-{i}")
+        job.tenant_id = "bulk"
+        await queue.enqueue(job)
+    small = _make_job("doc-small")
+    small.tenant_id = "small"
+    assert await queue.enqueue(small) == 1
+
+    assert queue.tenant_depths() == {"bulk": 4, "small": 1}
+    dispatched = []
+    while queue._rq_queue.job_ids:
+        dispatched.append(queue._rq_queue.pop_job_id())
+        _dispatch_fair_jobs(queue._conn, queue._rq_queue)
+    # doc-bulk-0 already sat in the one-slot RQ buffer; after that the
+    # rotation alternates tenants instead of draining "bulk" first.
+    assert dispatched == [
+        "chatvector:doc-bulk-0:0",
+        "chatvector:doc-bulk-1:0",
+        "chatvector:doc-small:0",
+        "chatvector:doc-bulk-2:0",
+        "chatvector:doc-bulk-3:0",
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Spill dir, payload errors, DLQ cap, worker names, start idempotency
 # ---------------------------------------------------------------------------
@@ -322,12 +527,87 @@ def test_dlq_trim_keeps_newest_entries(monkeypatch):
         ))
 
     conn = redis_lib.Redis.from_url(_REDIS_TEST_URL)
-    raw = conn.lrange(DLQ_REDIS_KEY, 0, -1)
+    raw = conn.xrange(DLQ_REDIS_KEY)
     assert len(raw) == 3
-    ids = [json.loads(r)["doc_id"] for r in raw]
+    ids = [json.loads(fields[b"entry"])["doc_id"] for _, fields in raw]
     assert ids == ["doc-2", "doc-3", "doc-4"]
 
 
+def test_dlq_trim_removes_spill_files_of_dropped_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_DLQ_MAX_ENTRIES", 1)
+    old_payload = tmp_path / "doc-old"
+    old_payload.write_bytes(b"old")
+
+    for doc_id, path in (("doc-old", old_payload), ("doc-new", None)):
+        _push_dlq_entry(DLQEntry(
+            doc_id=doc_id,
+            file_name="f.pdf",
+            content_type="application/pdf",
+            attempt=3,
+            error="boom",
+            payload_path=str(path) if path else None,
+        ))
+
+    assert not old_payload.exists()
+
+
+def test_dlq_page_walks_stream_with_cursor_and_tenant_filter(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    for i in range(5):
+        _push_dlq_entry(DLQEntry(
+            doc_id=f"doc-page-{i}",
+            file_name="f.pdf",
+            content_type="application/pdf",
+            attempt=0,
+            error="boom",
+            tenant_id="t1" if i % 2 == 0 else "t2",
+        ))
+
+    queue = RedisIngestionQueue()
+    first = queue.dlq_page(limit=2, tenant_id="t1")
+    assert [e.doc_id for e in first.entries] == ["doc-page-0", "doc-page-2"]
+    second = queue.dlq_page(cursor=first.next_cursor, limit=2, tenant_id="t1")
+    assert [e.doc_id for e in second.entries] == ["doc-page-4"]
+    assert second.next_cursor is None
+
+    with pytest.raises(ValueError):
+        queue.dlq_page(cursor="not-a-stream-id")
+
+
+@pytest.mark.asyncio
+async def test_replay_reenqueues_from_spill_file(monkeypatch):
+    monkeypatch.setattr("services.queue_redis.config.REDIS_URL", _REDIS_TEST_URL)
+    monkeypatch.setattr("services.queue_redis.config.QUEUE_MAX_SIZE", 100)
+    payload = spill_dir() / "doc-replay"
+    payload.write_bytes(b"pdf")
+    for doc_id, path in (("doc-replay", payload), ("doc-lost", None)):
+        _push_dlq_entry(DLQEntry(
+            doc_id=doc_id,
+            file_name="f.pdf",
+            content_type="application/pdf",
+            attempt=3,
+            error="boom",
+            tenant_id="t1",
+            payload_path=str(path) if path else None,
+        ))
+    queue = RedisIngestionQueue()
+    entry_ids = [e.entry_id for e in queue.dlq_jobs()]
+
+    status_mock = AsyncMock()
+    with patch("db.update_document_status", new=status_mock):
+        assert await queue.replay_dlq(entry_ids, tenant_id="t2") == []
+        replayed = await queue.replay_dlq(entry_ids, tenant_id="t1")
+
+    assert [e.doc_id for e in replayed] == ["doc-replay"]
+    status_mock.assert_awaited_once_with(
+        doc_id="doc-replay", status="queued", tenant_id="t1"
+    )
+    assert [e.doc_id for e in queue.dlq_jobs()] == ["doc-lost"]
+    assert queue.queue_position("doc-replay") == 1
+    assert payload.exists()
+
+
 def test_rq_worker_names_unique_under_same_pid(monkeypatch):
     from services.queue_redis import _rq_worker_name
 
@@ -52,5 +52,66 @@ def test_queue_stats_returns_200_in_non_production(monkeypatch):
             data = resp.json()
         assert "queue_size" in data
         assert "dlq" in data
+        concurrency = data["provider_concurrency"]
+        assert set(concurrency) == {"embedding", "llm"}
+        assert concurrency["llm"]["limit"] >= 1
+        assert set(data["provider_http"]) == {"hosts", "http2", "max_connections", "max_keepalive"}
+        assert data["provider_http"]["max_connections"] >= 1
+    finally:
+        limiter.reset()
+
+
+def _memory_queue(monkeypatch):
+    from core.config import config as main_config
+    from services.queue_service import _get_ingestion_queue, _reset_queue_singleton
+
+    monkeypatch.setattr(main_config, "APP_ENV", "development")
+    monkeypatch.setattr(main_config, "QUEUE_BACKEND", "memory")
+    monkeypatch.delenv("DEV_TENANT_ID", raising=False)
+    _reset_queue_singleton()
+    return _get_ingestion_queue()
+
+
+def test_dlq_routes_return_404_in_production(monkeypatch):
+    monkeypatch.setattr(config, "APP_ENV", "production")
+    limiter.reset()
+    try:
+        with TestClient(_queue_app()) as client:
+            assert client.get("/queue/dlq").status_code == 404
+            resp = client.post("/queue/dlq/replay", json={"entry_ids": ["1"]})
+            assert resp.status_code == 404
+    finally:
+        limiter.reset()
+
+
+def test_dlq_routes_page_and_replay_tenant_entries(monkeypatch):
+    from services.queue_base import DLQEntry
+
+    queue = _memory_queue(monkeypatch)
+    for doc_id, tenant_id in (("d1", "dev"), ("d2", "other"), ("d3", "dev")):
+        queue._append_dlq(DLQEntry(
+            doc_id=doc_id,
+            file_name=f"{doc_id}.txt",
+            content_type="text/plain",
+            attempt=3,
+            error="boom",
+            tenant_id=tenant_id,
+        ))
+    limiter.reset()
+    try:
+        with TestClient(_queue_app()) as client:
+            first = client.get("/queue/dlq", params={"limit": 1}).json()
+            second = client.get(
+                "/queue/dlq", params={"limit": 1, "cursor": first["next_cursor"]}
+            ).json()
+            stats = client.get("/queue/stats").json()
+            replay = client.post("/queue/dlq/replay", json={"entry_ids": ["1", "2"]}).json()
+
+        assert [e["doc_id"] for e in first["entries"]] == ["d1"]
+        assert [e["doc_id"] for e in second["entries"]] == ["d3"]
+        assert [e["doc_id"] for e in stats["dlq"]] == ["d1", "d3"]
+        assert stats["dlq"][0]["replayable"] is False
+        # No stored payload for "1", and "2" belongs to another tenant.
+        assert replay == {"replayed": [], "skipped": ["1", "2"]}
     finally:
         limiter.reset()
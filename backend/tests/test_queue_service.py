@@ -33,22 +33,45 @@ def _force_memory_backend(monkeypatch):
     _reset_queue_singleton()
 
 
+@pytest.fixture(autouse=True)
+def _spill_to_tmp(monkeypatch, tmp_path):
+    """Dead-lettered uploads are written to QUEUE_SPILL_DIR; keep them out of /tmp."""
+    monkeypatch.setattr("core.config.config.QUEUE_SPILL_DIR", str(tmp_path))
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_job(doc_id: str = "doc-test") -> QueueJob:
+def _make_job(doc_id: str = "doc-test", tenant_id: str | None = None) -> QueueJob:
     return QueueJob(
         doc_id=doc_id,
         file_name="test.pdf",
         content_type="application/pdf",
         file_bytes=b"fake-pdf-bytes",
+        tenant_id=tenant_id,
     )
 
 
+async def _tick(delay: float = 0.005) -> None:
+    """Yield to the loop for *delay* seconds without ``asyncio.sleep`` (often patched)."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    loop.call_later(delay, fut.set_result, None)
+    await fut
+
+
 async def _drain(service: AsyncioIngestionQueue, timeout: float = 3.0) -> None:
-    """Wait for all queued jobs to be processed (or timeout)."""
-    await asyncio.wait_for(service._queue.join(), timeout=timeout)
+    """Wait until queued jobs and scheduled retries are processed (or timeout)."""
+
+    async def _settle() -> None:
+        while True:
+            await service._queue.join()
+            if service.scheduled_retry_count() == 0 and service._queue.empty():
+                return
+            await _tick()
+
+    await asyncio.wait_for(_settle(), timeout=timeout)
 
 
 # ---------------------------------------------------------------------------
@@ -77,13 +100,77 @@ async def test_queue_position_returns_none_after_job_dequeued():
     await service.enqueue(job)
     assert service.queue_position("doc-gone") == 1
 
-    service._queue.get_nowait()
-    service._pending_doc_ids.popleft()
+    service._record_dequeue(service._queue.get_nowait())
     service._queue.task_done()
 
     assert service.queue_position("doc-gone") is None
 
 
+@pytest.mark.asyncio
+async def test_queue_position_is_seq_minus_dequeued_count():
+    """Positions shift forward by one for every job a worker picks up."""
+    service = AsyncioIngestionQueue()
+    for doc_id in ("doc-a", "doc-b", "doc-c"):
+        await service.enqueue(_make_job(doc_id))
+
+    job = service._queue.get_nowait()
+    service._record_dequeue(job)
+    service._queue.task_done()
+
+    assert service.queue_position("doc-a") is None
+    assert service.queue_position("doc-b") == 1
+    assert service.queue_position("doc-c") == 2
+
+
+def _drain_order(service: AsyncioIngestionQueue) -> list[str]:
+    order = []
+    while not service._queue.empty():
+        job = service._queue.get_nowait()
+        service._record_dequeue(job)
+        service._queue.task_done()
+        order.append(job.doc_id)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_single_upload_not_stuck_behind_other_tenants_bulk_import():
+    """Tenants take turns; positions count only the tenant's own queued jobs."""
+    service = AsyncioIngestionQueue()
+    for i in range(3):
+        await service.enqueue(_make_job(f"bulk-{i}", tenant_id="bulk"))
+
+    assert await service.enqueue(_make_job("small-0", tenant_id="small")) == 1
+    assert service.tenant_depths() == {"bulk": 3, "small": 1}
+    assert _drain_order(service) == ["bulk-0", "small-0", "bulk-1", "bulk-2"]
+
+
+@pytest.mark.asyncio
+async def test_tenant_weight_sets_jobs_per_turn(monkeypatch):
+    monkeypatch.setattr("core.config.config.QUEUE_TENANT_WEIGHTS", {"heavy": 2})
+    service = AsyncioIngestionQueue()
+    for i in range(3):
+        await service.enqueue(_make_job(f"heavy-{i}", tenant_id="heavy"))
+        await service.enqueue(_make_job(f"light-{i}", tenant_id="light"))
+
+    assert _drain_order(service) == [
+        "heavy-0", "heavy-1", "light-0", "heavy-2", "light-1", "light-2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_class_is_served_first(monkeypatch):
+    monkeypatch.setattr(
+        "core.config.config.QUEUE_TENANT_PRIORITIES",
+        {"backfill": "low", "paid": "high"},
+    )
+    service = AsyncioIngestionQueue()
+    await service.enqueue(_make_job("backfill-0", tenant_id="backfill"))
+    await service.enqueue(_make_job("free-0", tenant_id="free"))
+    await service.enqueue(_make_job("paid-0", tenant_id="paid"))
+
+    assert _drain_order(service) == ["paid-0", "free-0", "backfill-0"]
+
+
 @pytest.mark.asyncio
 async def test_enqueue_raises_queue_full_at_capacity(monkeypatch):
     """QueueFull is raised when the queue hits QUEUE_MAX_SIZE."""
@@ -97,6 +184,17 @@ async def test_enqueue_raises_queue_full_at_capacity(monkeypatch):
         await service.enqueue(_make_job("doc-3"))
 
 
+@pytest.mark.asyncio
+async def test_enqueue_many_stops_at_capacity(monkeypatch):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MAX_SIZE", 2)
+    service = AsyncioIngestionQueue()
+
+    positions = await service.enqueue_many([_make_job(f"doc-{i}") for i in range(3)])
+
+    assert positions == [1, 2]
+    assert service.queue_position("doc-2") is None
+
+
 # ---------------------------------------------------------------------------
 # Worker – successful processing
 # ---------------------------------------------------------------------------
@@ -156,6 +254,88 @@ async def test_worker_passes_correct_file_bytes_to_pipeline():
     assert kwargs["file_bytes"] == b"hello world"
 
 
+# ---------------------------------------------------------------------------
+# Worker – disk spill mode
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_spill_mode_queues_descriptor_and_reads_bytes_in_worker(monkeypatch, tmp_path):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MEMORY_SPILL_ENABLED", True)
+    service = AsyncioIngestionQueue()
+    service._rate_limiter.acquire = AsyncMock()
+
+    await service.enqueue(_make_job("doc-spill"))
+    queued = service._queue._queue.pop()
+    service._queue._put(queued)
+    assert queued.file_bytes == b""
+    assert (tmp_path / "doc-spill").read_bytes() == b"fake-pdf-bytes"
+
+    mock_pipeline_cls = MagicMock()
+    mock_pipeline_inst = mock_pipeline_cls.return_value
+    mock_pipeline_inst.process_document_background = AsyncMock()
+    with patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls):
+        await service.start()
+        try:
+            await _drain(service)
+        finally:
+            await service.stop()
+
+    kwargs = mock_pipeline_inst.process_document_background.await_args.kwargs
+    assert kwargs["file_bytes"] == b"fake-pdf-bytes"
+    assert not (tmp_path / "doc-spill").exists()
+
+
+@pytest.mark.asyncio
+async def test_spill_mode_dlq_entry_takes_over_spill_file(monkeypatch, tmp_path):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MEMORY_SPILL_ENABLED", True)
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 0)
+    service = AsyncioIngestionQueue()
+    service._rate_limiter.acquire = AsyncMock()
+
+    mock_pipeline_cls = MagicMock()
+    mock_pipeline_cls.return_value.process_document_background = AsyncMock(
+        side_effect=RuntimeError("service unavailable")
+    )
+    with patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls):
+        await service.start()
+        try:
+            await service.enqueue(_make_job("doc-spill-dlq"))
+            await _drain(service)
+        finally:
+            await service.stop()
+
+    [entry] = service.dlq_jobs()
+    assert entry.payload_path == str(tmp_path / "doc-spill-dlq")
+    assert (tmp_path / "doc-spill-dlq").exists()
+
+
+@pytest.mark.asyncio
+async def test_spill_mode_missing_payload_fails_document(monkeypatch, tmp_path):
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MEMORY_SPILL_ENABLED", True)
+    service = AsyncioIngestionQueue()
+    service._rate_limiter.acquire = AsyncMock()
+    await service.enqueue(_make_job("doc-gone"))
+    (tmp_path / "doc-gone").unlink()
+
+    mock_pipeline_cls = MagicMock()
+    mock_pipeline_cls.return_value.process_document_background = AsyncMock()
+    status_mock = AsyncMock()
+    with (
+        patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls),
+        patch("services.queue_asyncio.db.update_document_status", new=status_mock),
+    ):
+        await service.start()
+        try:
+            await _drain(service)
+        finally:
+            await service.stop()
+
+    mock_pipeline_cls.return_value.process_document_background.assert_not_awaited()
+    assert status_mock.await_args.kwargs["error"]["code"] == "job_payload_missing"
+    [entry] = service.dlq_jobs()
+    assert (entry.error, entry.payload_path) == ("job_payload_missing", None)
+
+
 # ---------------------------------------------------------------------------
 # Worker – retry and dead-letter queue
 # ---------------------------------------------------------------------------
@@ -167,6 +347,7 @@ async def test_failed_job_retries_then_moves_to_dlq(monkeypatch):
     lands in the dead-letter queue.  Total pipeline calls = max_retries + 1.
     """
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 2)
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_RETRY_BASE_DELAY", 0.001)
 
     service = AsyncioIngestionQueue()
     service._rate_limiter.acquire = AsyncMock()
@@ -199,6 +380,7 @@ async def test_failed_job_retries_then_moves_to_dlq(monkeypatch):
 async def test_job_in_dlq_has_correct_attempt_count(monkeypatch):
     """DLQ job's attempt counter reflects how many times the job was retried."""
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 1)
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_RETRY_BASE_DELAY", 0.001)
 
     service = AsyncioIngestionQueue()
     service._rate_limiter.acquire = AsyncMock()
@@ -267,14 +449,23 @@ async def test_upload_pipeline_error_4xx_goes_to_dlq_without_retry(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_retryable_failure_sleeps_before_requeue(monkeypatch):
-    """Generic failures backoff (full jitter) before requeue; success on second attempt."""
+async def test_retryable_failure_schedules_delayed_retry(monkeypatch):
+    """Generic failures are parked with full-jitter backoff; success on second attempt."""
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 2)
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_RETRY_BASE_DELAY", 10.0)
 
     service = AsyncioIngestionQueue()
     service._rate_limiter.acquire = AsyncMock()
 
+    delays: list[float] = []
+    schedule = service._schedule_retry
+
+    def _record_and_expedite(job, delay):
+        delays.append(delay)
+        schedule(job, 0.0)
+
+    service._schedule_retry = _record_and_expedite
+
     mock_pipeline_cls = MagicMock()
     mock_pipeline_inst = mock_pipeline_cls.return_value
     mock_pipeline_inst.process_document_background = AsyncMock(
@@ -295,12 +486,50 @@ async def test_retryable_failure_sleeps_before_requeue(monkeypatch):
             await service.stop()
 
     assert mock_pipeline_inst.process_document_background.await_count == 2
-    sleep_mock.assert_awaited_once()
-    delay = sleep_mock.await_args.args[0]
-    assert 0.0 <= delay <= 20.0
+    sleep_mock.assert_not_called()
+    assert len(delays) == 1
+    assert 0.0 <= delays[0] <= 20.0
     assert len(service.dlq_jobs()) == 0
 
 
+@pytest.mark.asyncio
+async def test_worker_moves_on_while_retry_waits_out_backoff(monkeypatch):
+    """A parked retry must not hold the only worker: the next job runs immediately."""
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_WORKER_COUNT", 1)
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 1)
+    monkeypatch.setattr("services.queue_asyncio.config.QUEUE_RETRY_BASE_DELAY", 60.0)
+    monkeypatch.setattr("services.queue_asyncio.random.uniform", lambda a, b: b)
+
+    service = AsyncioIngestionQueue()
+    service._rate_limiter.acquire = AsyncMock()
+
+    processed: list[str] = []
+
+    async def _process(**kwargs):
+        processed.append(kwargs["doc_id"])
+        if kwargs["doc_id"] == "doc-slow-retry":
+            raise RuntimeError("service unavailable")
+
+    mock_pipeline_cls = MagicMock()
+    mock_pipeline_cls.return_value.process_document_background = AsyncMock(
+        side_effect=_process
+    )
+
+    with (
+        patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls),
+        patch("services.queue_asyncio.db.update_document_status", new=AsyncMock()),
+    ):
+        await service.start()
+        try:
+            await service.enqueue(_make_job("doc-slow-retry"))
+            await service.enqueue(_make_job("doc-healthy"))
+            await asyncio.wait_for(service._queue.join(), timeout=3.0)
+            assert processed == ["doc-slow-retry", "doc-healthy"]
+            assert service.scheduled_retry_count() == 1
+        finally:
+            await service.stop()
+
+
 @pytest.mark.asyncio
 async def test_auth_error_goes_to_dlq_without_retry(monkeypatch):
     """ProviderAuthError is non-retryable and should not consume retry budget."""
@@ -336,7 +565,7 @@ async def test_auth_error_goes_to_dlq_without_retry(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_retry_requeue_on_full_queue_moves_to_dlq_without_hanging(monkeypatch):
-    """Workers must not block on queue.put() when the queue is full during retry."""
+    """A retry that comes due while the queue is full goes to the DLQ instead of blocking."""
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_MAX_SIZE", 1)
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_WORKER_COUNT", 1)
     monkeypatch.setattr("services.queue_asyncio.config.QUEUE_JOB_MAX_RETRIES", 2)
@@ -345,14 +574,19 @@ async def test_retry_requeue_on_full_queue_moves_to_dlq_without_hanging(monkeypa
     service = AsyncioIngestionQueue()
     service._rate_limiter.acquire = AsyncMock()
 
+    release = asyncio.Event()
     call_count = 0
 
     async def fail_and_fill_queue(**kwargs):
         nonlocal call_count
         call_count += 1
         if call_count == 1:
-            service._queue.put_nowait(_make_job("blocker"))
+            service._queue.put_nowait(_make_job("blocker-1"))
             raise RuntimeError("transient unavailable")
+        if call_count == 2:
+            # Keep the only worker busy while the queue stays full.
+            service._queue.put_nowait(_make_job("blocker-2"))
+            await release.wait()
         return None
 
     mock_pipeline_cls = MagicMock()
@@ -361,19 +595,24 @@ async def test_retry_requeue_on_full_queue_moves_to_dlq_without_hanging(monkeypa
         side_effect=fail_and_fill_queue
     )
 
+    async def _wait_for_dlq() -> None:
+        while not service.dlq_jobs():
+            await _tick()
+
     with (
         patch("services.ingestion_pipeline.IngestionPipeline", mock_pipeline_cls),
         patch("services.queue_asyncio.db.update_document_status", new=AsyncMock()),
-        patch("services.queue_asyncio.asyncio.sleep", new=AsyncMock()),
     ):
         await service.start()
         try:
             await service.enqueue(_make_job("doc-a"))
+            await asyncio.wait_for(_wait_for_dlq(), timeout=3.0)
+            release.set()
             await asyncio.wait_for(service._queue.join(), timeout=3.0)
         finally:
+            release.set()
             await service.stop()
 
-    assert len(service.dlq_jobs()) >= 1
     assert any(entry.doc_id == "doc-a" for entry in service.dlq_jobs())
 
 
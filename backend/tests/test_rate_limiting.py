@@ -21,6 +21,7 @@ from slowapi import Limiter
 from core.auth import AuthContext, require_auth
 from core.config import config
 from core.session import Session
+from db import ChatPreflight
 from middleware.rate_limit import get_rate_limit_key, limiter
 from routes.chat import router as chat_router
 from routes.upload import router as upload_router
@@ -28,6 +29,7 @@ from tests.request_utils import make_test_request
 from limits import RateLimitItemPerMinute
 
 _FAKE_SESSION = Session(id="rate-limit-session", tenant_id="dev")
+_FAKE_PREFLIGHT = ChatPreflight(session=_FAKE_SESSION, document_status="completed", history=[])
 _BACKEND_DIR = Path(__file__).resolve().parents[1]
 load_dotenv(_BACKEND_DIR / ".env", override=False)
 
@@ -135,9 +137,7 @@ def test_post_chat_returns_429_after_limit_exceeded(client):
             "routes.chat.answer_question_for_document",
             new=AsyncMock(return_value=_mock_chat_result(question="hello", answer="ok")),
         ),
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value={"id": _CHAT_DOC_ID})),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         for _ in range(_CHAT_WINDOW):
             assert client.post("/chat", json=payload).status_code == 200
@@ -169,9 +169,7 @@ def test_429_includes_retry_after_header(client):
             "routes.chat.answer_question_for_document",
             new=AsyncMock(return_value=_mock_chat_result(question="q", answer="a")),
         ),
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value={"id": _CHAT_DOC_ID})),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         for _ in range(_CHAT_WINDOW):
             client.post("/chat", json=payload)
@@ -188,9 +186,7 @@ def test_two_tenants_sharing_ip_have_separate_buckets(multi_tenant_client):
             "routes.chat.answer_question_for_document",
             new=AsyncMock(return_value=_mock_chat_result(question="hello", answer="ok")),
         ),
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value={"id": _CHAT_DOC_ID})),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         for _ in range(_CHAT_WINDOW):
             assert (
@@ -225,9 +221,7 @@ def test_one_tenant_across_ips_shares_one_bucket(multi_tenant_client):
             "routes.chat.answer_question_for_document",
             new=AsyncMock(return_value=_mock_chat_result(question="hello", answer="ok")),
         ),
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value={"id": _CHAT_DOC_ID})),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
         patch(
             "middleware.rate_limit.get_remote_address",
             side_effect=["10.0.0.1", "10.0.0.2", "10.0.0.3"],
@@ -265,9 +259,7 @@ def test_endpoint_specific_limits_are_independent(multi_tenant_client):
             "routes.chat.answer_question_for_document",
             new=AsyncMock(return_value=_mock_chat_result(question="hello", answer="ok")),
         ),
-        patch("routes.chat.db.get_document", new=AsyncMock(return_value={"id": _CHAT_DOC_ID})),
-        patch("routes.chat.get_or_create_session", new=AsyncMock(return_value=_FAKE_SESSION)),
-        patch("routes.chat.register_session_document", new=AsyncMock()),
+        patch("routes.chat.db.chat_preflight", new=AsyncMock(return_value=_FAKE_PREFLIGHT)),
     ):
         for _ in range(_UPLOAD_WINDOW):
             assert (
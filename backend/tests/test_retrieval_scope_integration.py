@@ -193,7 +193,7 @@ async def test_batch_level_scope_applied_when_items_omit_scope():
         "services.chat_service.get_embeddings",
         new=AsyncMock(return_value=[[0.1, 0.2]]),
     ), patch(
-        "services.chat_service.find_similar_chunks", new=AsyncMock(return_value=[])
+        "services.chat_service.find_similar_chunks_multi", new=AsyncMock(return_value=[[]])
     ) as mock_find, patch(
         "services.chat_service.build_context_from_chunks", return_value="ctx"
     ), patch(
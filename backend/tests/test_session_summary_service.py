@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.chat_turn_writer import chat_turn_writer
+from services.query_service import _format_history_context
+from services.session_summary_service import recent_history, session_summarizer
+
+
+def _message(i: int, role: str, content: str = "x" * 400) -> dict:
+    return {
+        "id": f"m{i}",
+        "role": role,
+        "content": content,
+        "created_at": str(datetime(2026, 1, 1, 12, 0, i)),
+    }
+
+
+def _turns(count: int) -> list[dict]:
+    messages = []
+    for turn in range(count):
+        messages.append(_message(2 * turn, "user"))
+        messages.append(_message(2 * turn + 1, "assistant"))
+    return messages
+
+
+_SUMMARY = {
+    "id": "summary:s1",
+    "role": "summary",
+    "content": "User asked about pricing.",
+    "created_at": "2026-01-01 11:00:00",
+}
+
+
+@pytest.fixture
+def _summaries_on(monkeypatch):
+    monkeypatch.setattr("services.session_summary_service.config.SESSION_SUMMARY_ENABLED", True)
+    monkeypatch.setattr("services.session_summary_service.config.SESSION_SUMMARY_TRIGGER_TOKENS", 500)
+    monkeypatch.setattr("services.session_summary_service.config.SESSION_SUMMARY_KEEP_MESSAGES", 4)
+
+
+def test_recent_history_keeps_leading_summary():
+    history = [_SUMMARY, *_turns(4)]
+    recent = recent_history(history, 2)
+    assert [m["id"] for m in recent] == ["summary:s1", "m6", "m7"]
+    assert recent_history(_turns(2), 2) == _turns(2)[-2:]
+    assert "Summary of earlier conversation: User asked about pricing." in _format_history_context(recent)
+
+
+@pytest.mark.asyncio
+async def test_update_folds_older_turns_into_summary(_summaries_on):
+    history = [_SUMMARY, *_turns(5)]
+    with (
+        patch("db.get_session_history", new=AsyncMock(return_value=history)) as mock_history,
+        patch(
+            "services.session_summary_service._summarize",
+            new=AsyncMock(return_value="Updated summary."),
+        ) as mock_summarize,
+        patch("db.store_session_summary", new=AsyncMock(return_value=True)) as mock_store,
+    ):
+        assert await session_summarizer.update("s1", "dev") is True
+
+    assert mock_history.await_args.kwargs["with_summary"] is True
+    previous, folded = mock_summarize.await_args.args
+    assert previous == "User asked about pricing."
+    # The last 4 messages (2 turns) stay raw.
+    assert [m["id"] for m in folded] == ["m0", "m1", "m2", "m3", "m4", "m5"]
+    mock_store.assert_awaited_once_with(
+        "s1",
+        "dev",
+        "Updated summary.",
+        datetime(2026, 1, 1, 12, 0, 5),
+        previous_through=datetime(2026, 1, 1, 11, 0, 0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_folds_a_long_backlog_oldest_first(_summaries_on, monkeypatch):
+    monkeypatch.setattr("services.session_summary_service._SUMMARY_SCAN_MESSAGES", 4)
+    pages = [_turns(2), [_SUMMARY, *_turns(5)[4:8]], [_SUMMARY, *_turns(5)[8:]]]
+    with (
+        patch("db.get_session_history", new=AsyncMock(side_effect=pages)) as mock_history,
+        patch(
+            "services.session_summary_service._summarize",
+            new=AsyncMock(return_value="Updated summary."),
+        ) as mock_summarize,
+        patch("db.store_session_summary", new=AsyncMock(return_value=True)) as mock_store,
+    ):
+        assert await session_summarizer.update("s1", "dev") is True
+
+    assert mock_history.await_args.kwargs["oldest_first"] is True
+    folded = [[m["id"] for m in call.args[1]] for call in mock_summarize.await_args_list]
+    assert folded == [["m0", "m1", "m2", "m3"], ["m4", "m5", "m6", "m7"]]
+    assert [call.args[3] for call in mock_store.await_args_list] == [
+        datetime(2026, 1, 1, 12, 0, 3),
+        datetime(2026, 1, 1, 12, 0, 7),
+    ]
+    assert session_summarizer.stats()["updated"] == 2
+
+
+@pytest.mark.asyncio
+async def test_update_skips_short_history(_summaries_on):
+    with (
+        patch("db.get_session_history", new=AsyncMock(return_value=_turns(3)[:1])),
+        patch("services.session_summary_service._summarize", new=AsyncMock()) as mock_summarize,
+        patch("db.store_session_summary", new=AsyncMock()) as mock_store,
+    ):
+        assert await session_summarizer.update("s1", "dev") is False
+
+    mock_summarize.assert_not_awaited()
+    mock_store.assert_not_awaited()
+    assert session_summarizer.stats()["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_turns_schedule_one_update_per_session(_summaries_on):
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def slow_update(session_id, tenant_id):
+        calls.append(session_id)
+        await release.wait()
+        return True
+
+    with (
+        patch("db.store_chat_turn", new=AsyncMock()),
+        patch.object(session_summarizer, "update", new=slow_update),
+    ):
+        await chat_turn_writer.store_turn("s1", "q1", "a", "dev")
+        await asyncio.sleep(0)
+        assert calls == ["s1"]
+        await chat_turn_writer.store_turn("s1", "q2", "a", "dev")
+        await chat_turn_writer.store_turn("s1", "q3", "a", "dev")
+        assert calls == ["s1"]
+        release.set()
+        await asyncio.sleep(0.01)
+
+    # Turns stored during the first update trigger exactly one re-check.
+    assert calls == ["s1", "s1"]
+    assert session_summarizer.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_summarizer_does_not_schedule():
+    with patch("db.store_chat_turn", new=AsyncMock()):
+        await chat_turn_writer.store_turn("s1", "q", "a", "dev")
+    assert session_summarizer.stats()["scheduled"] == 0
@@ -52,3 +52,12 @@ async def test_fail_stale_documents_global_marks_in_progress_as_failed():
 
     updated = await svc.fail_stale_documents_global(["queued", "extracting", "embedding"])
     assert updated == {"doc-1", "doc-2"}
+
+
+def test_redis_job_ids_map_back_to_doc_ids():
+    from services.queue_redis import _doc_id_from_job_id, _retry_job_id
+
+    doc_id = "6f1c2e9a-1d2b-4c3d-8e9f-0a1b2c3d4e5f"
+    assert _doc_id_from_job_id(_retry_job_id(doc_id, 2)) == doc_id
+    assert _doc_id_from_job_id("rq-generated-id") is None
+    assert _doc_id_from_job_id("chatvector:doc:not-an-attempt") is None
@@ -93,6 +93,18 @@ async def test_embedding_health_check_single_attempt_on_rate_limit():
     assert call_count == 1
 
 
+@pytest.mark.asyncio
+async def test_embedding_probe_asks_batching_providers_for_one_attempt():
+    from services import embedding_service
+
+    provider = MagicMock(dispatches_batches=True)
+    provider.embed = AsyncMock(return_value=[[0.1]])
+    with patch("services.embedding_service.get_embedding_provider", return_value=provider):
+        await embedding_service.probe_embedding_health("ping")
+
+    provider.embed.assert_awaited_once_with(["ping"], max_retries=0)
+
+
 @pytest.mark.asyncio
 async def test_llm_health_check_ok_when_probe_returns_tuple():
     with patch(
@@ -1,11 +1,14 @@
 from unittest.mock import AsyncMock, patch
 
+import io
+import zipfile
+
 import pytest
 from fastapi import HTTPException, UploadFile
 
 from core.auth import AuthContext
 from request_utils import make_test_request
-from routes.upload import upload
+from routes.upload import upload, upload_batch
 from services.queue_service import QueueFull
 from services.ingestion_pipeline import UploadPipelineError
 
@@ -125,3 +128,105 @@ async def test_upload_route_does_not_bind_session_when_enqueue_fails():
     assert exc_info.value.status_code == 503
     mock_get_session.assert_not_awaited()
     mock_register.assert_not_awaited()
+
+
+def _upload_file(filename: str, content_type: str, data: bytes) -> AsyncMock:
+    mock_file = AsyncMock(spec=UploadFile)
+    mock_file.filename = filename
+    mock_file.content_type = content_type
+    mock_file.read = AsyncMock(return_value=data)
+    return mock_file
+
+
+def _zip_bytes(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_upload_batch_creates_documents_once_and_reports_per_file():
+    files = [
+        _upload_file("a.pdf", "application/pdf", b"%PDF-1.4 a"),
+        _upload_file("bad.docx", "application/msword", b"x"),
+        _upload_file("docs.zip", "application/zip", _zip_bytes({
+            "nested/b.txt": b"hello",
+            "c.png": b"png",
+        })),
+    ]
+
+    with (
+        patch(
+            "routes.upload.db.create_documents",
+            new=AsyncMock(return_value=["doc-a", "doc-b"]),
+        ) as mock_create,
+        patch("routes.upload.db.update_documents_status", new=AsyncMock()) as mock_status,
+        patch(
+            "routes.upload.ingestion_queue.enqueue_many",
+            new=AsyncMock(return_value=[1, 2]),
+        ) as mock_enqueue,
+    ):
+        result = await upload_batch(
+            make_test_request("POST", "/upload/batch"),
+            files,
+            auth=AuthContext(tenant_id="tenant-123"),
+        )
+
+    mock_create.assert_awaited_once_with(
+        ["a.pdf", "b.txt"], tenant_id="tenant-123", status="queued"
+    )
+    mock_status.assert_not_awaited()
+    jobs = mock_enqueue.await_args.args[0]
+    assert [(j.doc_id, j.content_type, j.file_bytes) for j in jobs] == [
+        ("doc-a", "application/pdf", b"%PDF-1.4 a"),
+        ("doc-b", "text/plain", b"hello"),
+    ]
+    assert (result["accepted"], result["rejected"]) == (2, 2)
+    docs = result["documents"]
+    assert [d["file_name"] for d in docs] == ["a.pdf", "bad.docx", "b.txt", "c.png"]
+    assert [d["status"] for d in docs] == ["queued", "rejected", "queued", "rejected"]
+    assert docs[2]["queue_position"] == 2
+    assert docs[1]["error"]["code"] == "invalid_file_type"
+
+
+@pytest.mark.asyncio
+async def test_upload_batch_fails_documents_that_do_not_fit_in_queue():
+    files = [_upload_file(f"{i}.txt", "text/plain", b"text") for i in range(3)]
+
+    with (
+        patch(
+            "routes.upload.db.create_documents",
+            new=AsyncMock(return_value=["doc-0", "doc-1", "doc-2"]),
+        ),
+        patch("routes.upload.db.update_documents_status", new=AsyncMock()) as mock_status,
+        patch("routes.upload.ingestion_queue.enqueue_many", new=AsyncMock(return_value=[5])),
+    ):
+        result = await upload_batch(
+            make_test_request("POST", "/upload/batch"),
+            files,
+            auth=AuthContext(tenant_id="tenant-123"),
+        )
+
+    assert mock_status.await_args.args[:2] == (["doc-1", "doc-2"], "failed")
+    assert [d["status"] for d in result["documents"]] == ["queued", "failed", "failed"]
+    assert result["documents"][1]["error"]["code"] == "queue_full"
+
+
+@pytest.mark.asyncio
+async def test_upload_batch_rejects_too_many_files(monkeypatch):
+    monkeypatch.setattr("routes.upload.config.UPLOAD_BATCH_MAX_FILES", 2)
+    archive = _zip_bytes({f"{i}.txt": b"text" for i in range(3)})
+
+    with patch("routes.upload.db.create_documents", new=AsyncMock()) as mock_create:
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_batch(
+                make_test_request("POST", "/upload/batch"),
+                [_upload_file("bulk.zip", "application/zip", archive)],
+                auth=AuthContext(tenant_id="tenant-123"),
+            )
+
+    assert exc_info.value.status_code == 413
+    assert exc_info.value.detail["code"] == "too_many_files"
+    mock_create.assert_not_awaited()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from pgvector import Vector
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg
+
+from core.vectors import (
+    Float32Vector,
+    as_embeddings,
+    cosine_similarity,
+    decode_pgvector,
+    encode_pgvector,
+)
+
+
+def test_binary_codec_matches_pgvector_and_round_trips():
+    vector = np.random.default_rng(0).standard_normal(3072).astype(np.float32)
+
+    encoded = encode_pgvector(vector)
+    decoded = decode_pgvector(bytes(encoded))
+
+    assert bytes(encoded) == Vector(vector).to_binary()
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, vector)
+
+
+def test_as_embeddings_packs_lists_and_passes_arrays_through():
+    rows = as_embeddings([[0.5, 1.0], [2.0, 4.0]])
+    assert [row.dtype for row in rows] == [np.float32, np.float32]
+    assert rows[0].base is rows[1].base  # one matrix, not one array per row
+
+    arrays = [np.ones(2, dtype=np.float32)]
+    assert as_embeddings(arrays)[0] is arrays[0]
+
+    with pytest.raises(ValueError):
+        as_embeddings([[1.0], [1.0, 2.0]])
+
+
+def test_column_binds_arrays_on_asyncpg_and_text_elsewhere():
+    column_type = Float32Vector(3)
+
+    bound = column_type.bind_processor(asyncpg.dialect())([1, 2, 3])
+    assert isinstance(bound, np.ndarray) and bound.dtype == np.float32
+    assert column_type.bind_processor(psycopg.dialect())([1, 2, 3]) == "[1.0,2.0,3.0]"
+
+    with pytest.raises(ValueError, match="expected 3 dimensions"):
+        column_type.bind_processor(asyncpg.dialect())([1.0, 2.0])
+
+
+def test_cosine_similarity():
+    a = np.array([1.0, 0.0], dtype=np.float32)
+    assert cosine_similarity(a, [1.0, 1.0]) == pytest.approx(2**-0.5)
+    assert cosine_similarity(a, [0.0, 0.0]) == 0.0
@@ -141,9 +141,10 @@ async def retry_async(
                 raise
             cap = base_delay * (backoff ** attempt)
             delay = random.uniform(0, cap)
+            after = f" after {timeout}s" if timeout is not None else ""
             logger.warning(
                 f"Attempt {attempt + 1}/{max_attempts} timed out for "
-                f"{func_name} after {timeout}s, retrying in {delay:.2f}s",
+                f"{func_name}{after}, retrying in {delay:.2f}s",
                 extra={
                     "error_type": "TimeoutError",
                     "timeout_seconds": timeout,